@@ -11,13 +11,12 @@ Flask 기반 웹 서버로 다음 기능을 제공합니다:
 """
 from flask import Flask, jsonify, render_template, request, session, redirect, url_for, Response, stream_with_context
 from flask_cors import CORS
-from kis_api import KiwoomApi
-from data_fetcher import DataFetcher
-from theme_service import ThemeService
-from finviz_market_crawler import FinvizMarketFetcher
+from service_container import ServiceContainer
+from llm_scheduler import LLMScheduler, priority_scope
 from datetime import timedelta, datetime
 import config
 import json
+import threading
 from logger import Logger
 
 app = Flask(__name__)
@@ -27,33 +26,72 @@ CORS(app)  # CORS 활성화 (프론트엔드 연동)
 app.secret_key = getattr(config, 'SECRET_KEY', 'default-secret-key')
 app.permanent_session_lifetime = timedelta(days=7) # 로그인 7일 유지
 
-# Kiwoom API 인스턴스 생성
-kiwoom = KiwoomApi()
+# 애플리케이션 범위 서비스 컨테이너 (서버 시작 시 1회 생성, 모든 요청이 공유)
+services = ServiceContainer()
 
-# 관심종목 관리 인스턴스 생성
-data_fetcher = DataFetcher()
-
-# 테마 서비스 인스턴스 생성
-theme_service = ThemeService()
-
-# 글로벌 마켓 데이터 페처 생성
-market_fetcher = FinvizMarketFetcher()
-# Gemini 서비스 인스턴스 생성 (시장 분석용)
-from gemini_service import GeminiService
-gemini_service = GeminiService()
-
-# 환율 정보 페처 생성
-from exchange_rate_fetcher import ExchangeRateFetcher
-exchange_rate_fetcher = ExchangeRateFetcher()
+kiwoom = services.kiwoom  # Kiwoom API
+data_fetcher = services.data_fetcher  # 관심종목 관리
+theme_service = services.theme_service  # 테마 서비스
+market_fetcher = services.market_fetcher  # 글로벌 마켓 데이터 페처
+gemini_service = services.gemini  # Gemini 서비스 (시장 분석용)
+exchange_rate_fetcher = services.exchange_rate_fetcher  # 환율 정보 페처
+ohlcv_store = services.ohlcv_store  # 일봉 OHLCV 로컬 저장소
+analysis_service = services.analysis  # 종목 종합 분석 서비스
+screener = services.screener  # 유니버스 스크리너
+shared_cache = services.shared_cache  # 프로세스 간 공유 캐시
 
 global_market_cache = {
     'data': None,
     'last_updated': None
 }
 
+# 글로벌 마켓 데이터 공유 캐시 키 / 다른 워커가 이 시간(초) 안에 갱신했으면 스크래핑 생략
+GLOBAL_MARKET_SHARED_KEY = "market:global"
+GLOBAL_MARKET_SHARED_FRESH = 600
+
+# 묶음 감성 분석 요청당 최대 종목 수
+SENTIMENT_BATCH_MAX_CODES = getattr(config, 'SENTIMENT_BATCH_MAX_CODES', 50)
+
+def _sync_global_market_from_shared():
+    """다른 워커 프로세스가 갱신한 글로벌 마켓 데이터가 더 최신이면 로컬 캐시로 가져옴"""
+    data, updated_at, _ = shared_cache.get_entry(GLOBAL_MARKET_SHARED_KEY)
+    if data is None:
+        return False
+    updated = datetime.fromtimestamp(updated_at)
+    if global_market_cache['last_updated'] is None or updated > global_market_cache['last_updated']:
+        global_market_cache['data'] = data
+        global_market_cache['last_updated'] = updated
+    return True
+
+def _store_global_market_data(data, now):
+    """로컬 + 공유 캐시에 글로벌 마켓 데이터 저장"""
+    global_market_cache['data'] = data
+    global_market_cache['last_updated'] = now
+    shared_cache.set(GLOBAL_MARKET_SHARED_KEY, data)
+
 def update_global_market_data():
-    """글로벌 마켓 데이터 강제 갱신 (스케줄러용)"""
+    """
+    글로벌 마켓 데이터 강제 갱신 (스케줄러용)
+    워커 프로세스마다 스케줄러가 돌아도 호스트 전체에서 한 프로세스만 스크래핑/AI 분석을 수행
+    """
     global global_market_cache
+    started = datetime.now()
+    
+    try:
+        with shared_cache.lock(GLOBAL_MARKET_SHARED_KEY, timeout=300):
+            # 락을 기다리는 동안 다른 워커가 방금 갱신했으면 그 결과 사용
+            _sync_global_market_from_shared()
+            last_updated = global_market_cache['last_updated']
+            if last_updated and (started - last_updated).total_seconds() < GLOBAL_MARKET_SHARED_FRESH:
+                Logger.info("Market", "Using global market data updated by another worker.")
+                return True
+            return _fetch_global_market_data()
+    except TimeoutError:
+        Logger.warning("Market", "Timed out waiting for another worker, updating directly.")
+        return _fetch_global_market_data()
+
+def _fetch_global_market_data():
+    """글로벌 마켓 데이터 스크래핑 + AI 분석 후 저장"""
     now = datetime.now()
     
     Logger.info("Market", f"Updating global market data at {now}...")
@@ -64,15 +102,17 @@ def update_global_market_data():
         
         # 2. 시장 핵심 이벤트 (뉴스 헤드라인 -> AI 분석)
         headlines = market_fetcher.get_market_headlines()
-        market_events = gemini_service.analyze_market_events(headlines, force_refresh=True)
-        
-        # 3. 한국 증시 영향 분석 (New)
-        korea_impact = gemini_service.analyze_korea_market_impact(
-            us_indices=indices,
-            us_themes=themes,
-            us_events=market_events.get('events', []),
-            force_refresh=True
-        )
+        # 백그라운드 작업이므로 사용자 요청의 Gemini 호출보다 뒤로 (LLM 스케줄러 PREWARM 우선순위)
+        with priority_scope(LLMScheduler.PREWARM):
+            market_events = gemini_service.analyze_market_events(headlines, force_refresh=True)
+            
+            # 3. 한국 증시 영향 분석 (New)
+            korea_impact = gemini_service.analyze_korea_market_impact(
+                us_indices=indices,
+                us_themes=themes,
+                us_events=market_events.get('events', []),
+                force_refresh=True
+            )
 
         data = {
             'indices': indices,
@@ -82,8 +122,7 @@ def update_global_market_data():
             'korea_impact': korea_impact
         }
         
-        global_market_cache['data'] = data
-        global_market_cache['last_updated'] = now
+        _store_global_market_data(data, now)
         Logger.info("Market", "Update complete.")
         return True
     except Exception as e:
@@ -94,7 +133,8 @@ def get_global_market_data():
     """글로벌 마켓 데이터 조회 (캐시 반환)"""
     global global_market_cache
     
-    # 데이터가 없으면 최초 1회 실행
+    # 다른 워커가 갱신한 데이터 확인 후, 그래도 없으면 최초 1회 실행
+    _sync_global_market_from_shared()
     if global_market_cache['data'] is None:
         update_global_market_data()
         
@@ -184,6 +224,8 @@ def get_price(code):
         
         price_info = kiwoom.get_current_price(code)
         if price_info:
+            # 장중이면 해당 종목의 증분 지표 상태에 현재가 반영
+            analysis_service.record_live_price(code, price_info)
             return jsonify({
                 'success': True,
                 'data': price_info
@@ -283,22 +325,42 @@ def get_minute_chart(code):
             'message': str(e)
         }), 500
 
+@app.route('/api/chart/daily/<code>')
+def get_daily_chart(code):
+    """일봉 차트 데이터 조회 (로컬 OHLCV 저장소)"""
+    try:
+        limit = request.args.get('limit', 200, type=int)
+        force_refresh = request.args.get('refresh', '').lower() == 'true'
+        
+        chart_data = ohlcv_store.get_daily_chart(
+            code,
+            min_bars=max(limit, analysis_service.CHART_MIN_BARS),
+            limit=limit,
+            force_refresh=force_refresh
+        )
+        if chart_data:
+            return jsonify({
+                'success': True,
+                'data': chart_data
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': '차트 데이터 조회 실패'
+            }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
 @app.route('/api/analysis/full/<code>')
 def get_full_analysis(code):
     """종목 종합 분석"""
     try:
-        from stock_analysis_service import StockAnalysisService
-        
         # 종목 코드 정규화 (A 접두사 제거)
         normalized_code = code.lstrip('A') if code.startswith('A') else code
         
-        if not kiwoom.access_token:
-            kiwoom.get_access_token()
-        
-        analysis_service = StockAnalysisService()
-        # 서비스의 kiwoom 인스턴스를 현재 토큰으로 동기화
-        analysis_service.kiwoom = kiwoom
-        
         # 쿼리 파라미터 확인
         force_refresh = request.args.get('refresh', '').lower() == 'true'
         lightweight = request.args.get('lightweight', '').lower() == 'true'
@@ -330,17 +392,10 @@ def stream_full_analysis(code):
     """종합 분석을 스트리밍으로 전송 (Server-Sent Events)"""
     def generate():
         try:
-            from stock_analysis_service import StockAnalysisService
             from technical_indicators import TechnicalIndicators
            
             normalized_code = code.lstrip('A') if code.startswith('A') else code
             
-            if not kiwoom.access_token:
-                kiwoom.get_access_token()
-            
-            analysis_service = StockAnalysisService()
-            analysis_service.kiwoom = kiwoom
-            
             # 1단계: 기본 정보 즉시 전송
             price_info = kiwoom.get_current_price(normalized_code)
             supply_demand = analysis_service.get_supply_demand_data(normalized_code)
@@ -353,14 +408,12 @@ def stream_full_analysis(code):
             yield f"data: {json.dumps({'type': 'market_impact', 'data': korea_impact})}\n\n"
 
             # 2단계: 차트 & 기술적 지표 & 펀더멘털
-            chart_data = kiwoom.get_daily_chart_data(normalized_code)
-            
-            # 기술적 지표 계산을 위해 날짜 오름차순 정렬 (과거 -> 현재)
-            if chart_data:
-                chart_data.sort(key=lambda x: x['date'])
+            # 로컬 OHLCV 저장소에서 조회 (날짜 오름차순, 필요 시에만 증분 조회)
+            chart_data = ohlcv_store.get_daily_chart(normalized_code, min_bars=analysis_service.CHART_MIN_BARS)
                 
-            technical = TechnicalIndicators.calculate_indicators(chart_data)
-            bollinger = TechnicalIndicators.calculate_bollinger_bands(chart_data)
+            indicators = TechnicalIndicators.calculate_all(chart_data)
+            technical = indicators['technical']
+            bollinger = indicators['bollinger']
             fundamental_data = kiwoom.get_stock_fundamental_info(normalized_code)
             
             yield f"data: {json.dumps({'type': 'technical', 'data': {'indicators': technical, 'bollinger': bollinger, 'fundamental': fundamental_data}})}\n\n"
@@ -399,17 +452,10 @@ def stream_full_analysis(code):
             # 4단계: AI 전망 (별도 실행 및 스트리밍)
             try:
                 # 시장 데이터 구성 (Outlook 생성용)
-                # 테마 정보는 ThemeService에서 직접 조회 (빠름)
+                # 테마 정보는 ThemeService의 미리 계산된 순위 사용 (정렬 없음)
                 market_themes = "정보 없음"
                 try:
-                    all_themes = analysis_service.theme_service.get_themes().get('themes', [])
-                    sorted_themes = sorted(all_themes, key=lambda x: float(x.get('flu_rt', 0) or 0), reverse=True)
-                    top_themes = []
-                    for t in sorted_themes[:3]:
-                        name = t.get('thema_nm')
-                        rate = t.get('flu_rt')
-                        top_themes.append(f"{name}({rate}%)")
-                    market_themes = ", ".join(top_themes) if top_themes else "정보 없음"
+                    market_themes = analysis_service.theme_service.get_market_themes_string(3)
                 except Exception as e:
                     Logger.error("Stream", f"테마 조회 실패: {e}")
 
@@ -427,7 +473,8 @@ def stream_full_analysis(code):
                     'rate': price_info.get('rate')
                 }
                 
-                outlook = analysis_service.gemini.generate_outlook(
+                # 응답이 도착하는 대로 섹션별 중간 결과(outlook_partial)를 보내고, 마지막에 최종 결과(outlook) 전송
+                for event_type, outlook in analysis_service.gemini.generate_outlook_stream(
                     stock_name=stock_name,
                     stock_info=stock_info_for_outlook,
                     supply_demand=supply_demand,
@@ -437,10 +484,8 @@ def stream_full_analysis(code):
                     fundamental_data=fundamental_data,
                     bollinger_data=bollinger,
                     force_refresh=False
-                )
-                
-                # 전망 결과 전송
-                yield f"data: {json.dumps({'type': 'outlook', 'data': outlook})}\n\n"
+                ):
+                    yield f"data: {json.dumps({'type': event_type, 'data': outlook})}\n\n"
                 
             except Exception as e:
                 Logger.error("Stream", f"AI 전망 생성 실패: {e}")
@@ -471,14 +516,6 @@ def stream_full_analysis(code):
 def get_supply_demand(code):
     """수급 데이터 조회"""
     try:
-        from stock_analysis_service import StockAnalysisService
-        
-        if not kiwoom.access_token:
-            kiwoom.get_access_token()
-        
-        analysis_service = StockAnalysisService()
-        analysis_service.kiwoom = kiwoom
-        
         supply_demand = analysis_service.get_supply_demand_data(code)
         
         return jsonify({
@@ -492,6 +529,24 @@ def get_supply_demand(code):
             'message': str(e)
         }), 500
 
+@app.route('/api/analysis/supply-demand/<code>/history')
+def get_supply_demand_history(code):
+    """수급 추이 조회 (일자별 외국인/기관/개인 순매수)"""
+    try:
+        days = request.args.get('days', 20, type=int)
+        history = analysis_service.get_supply_demand_history(code, days=max(1, min(days, 120)))
+        
+        return jsonify({
+            'success': True,
+            'data': history
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
 @app.route('/api/config')
 def get_config():
     """프론트엔드 설정 제공"""
@@ -503,15 +558,23 @@ def get_config():
         }
     })
 
+@app.route('/api/analysis/stats')
+def get_analysis_stats():
+    """AI 분석 캐시/중복 실행 방지/LLM 스케줄러(큐 깊이, 대기 시간, 토큰) 통계"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': gemini_service.get_stats()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/analysis/sentiment/<code>')
 def get_sentiment_analysis(code):
     """종목의 감성 분석 결과만 반환 (카드 표시용)"""
     try:
-        from stock_analysis_service import StockAnalysisService
-        stock_analysis = StockAnalysisService()
-        
         # 종합 분석 호출 (캐싱 활용)
-        result = stock_analysis.get_full_analysis(code)
+        result = analysis_service.get_full_analysis(code, priority=LLMScheduler.SENTIMENT)
         
         if result['success']:
             data = result['data']
@@ -532,21 +595,40 @@ def get_sentiment_analysis(code):
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+@app.route('/api/analysis/sentiment/batch', methods=['POST'])
+def get_sentiment_analysis_batch():
+    """
+    여러 종목의 감성 분석 결과 (카드 표시용, 묶음 전망으로 AI 호출 수 절감)
+    
+    Body: {"codes": ["005930", "000660", ...], "refresh": false}
+    Returns: {"success": true, "data": {종목코드: 감성 분석 결과}} - 조회 실패/묶음 결과 없는 종목은 제외 (클라이언트가 종목별 요청으로 대체)
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        codes = [str(code).strip() for code in body.get('codes') or [] if str(code).strip()]
+        if not codes:
+            return jsonify({'success': False, 'message': '종목 코드가 필요합니다'}), 400
+        if len(codes) > SENTIMENT_BATCH_MAX_CODES:
+            return jsonify({'success': False, 'message': f'한 번에 최대 {SENTIMENT_BATCH_MAX_CODES}개 종목까지 요청할 수 있습니다'}), 400
+        
+        data = analysis_service.get_batch_sentiment(
+            codes,
+            force_refresh=bool(body.get('refresh')),
+            global_market_data=get_global_market_data()
+        )
+        return jsonify({'success': True, 'data': data})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/analysis/news/<code>')
 def get_news_analysis(code):
     """뉴스 분석"""
     try:
-        from gemini_service import GeminiService
-        
         # 종목명 조회
-        if not kiwoom.access_token:
-            kiwoom.get_access_token()
-        
         price_info = kiwoom.get_current_price(code)
         stock_name = price_info.get('name', '알 수 없음') if price_info else '알 수 없음'
         
-        gemini = GeminiService()
-        news_analysis = gemini.search_and_analyze_news(
+        news_analysis = gemini_service.search_and_analyze_news(
             stock_name=stock_name,
             stock_code=code,
             current_price=price_info.get('price') if price_info else None,
@@ -620,8 +702,9 @@ def stream_global_market():
     """글로벌 마켓 데이터 스트리밍 (순차 로딩용)"""
     def generate():
         try:
-            # 0. 캐시 확인
+            # 0. 캐시 확인 (다른 워커 프로세스가 갱신한 데이터 포함)
             global global_market_cache
+            _sync_global_market_from_shared()
             cached_data = global_market_cache.get('data')
             last_updated = global_market_cache.get('last_updated')
             
@@ -688,8 +771,7 @@ def stream_global_market():
                 'events': market_events.get('events', []),
                 'korea_impact': korea_impact
             }
-            global_market_cache['data'] = data
-            global_market_cache['last_updated'] = datetime.now()
+            _store_global_market_data(data, datetime.now())
             
             yield f"data: {json.dumps({'type': 'complete'})}\n\n"
             
@@ -774,6 +856,54 @@ def remove_from_watchlist():
 # 테마 API
 # ================================================================
 
+@app.route('/api/screener')
+def get_screener():
+    """
+    유니버스 스크리너 (테마 종목 + 관심종목 + 보유종목, 사전 계산 스냅샷 필터/정렬)
+    
+    Query:
+        rsi_min, rsi_max, pb_min, pb_max: RSI / %B 범위
+        macd: golden/dead/above/below, ma: 정배열/역배열(bull/bear)/골든크로스/데드크로스
+        squeeze: true/false, source: theme/watchlist/holdings
+        sort: rsi/macd_gap/percent_b/bandwidth/change_rate/close, order: asc/desc, limit
+    """
+    try:
+        squeeze = request.args.get('squeeze')
+        result = screener.screen(
+            rsi_min=request.args.get('rsi_min', type=float),
+            rsi_max=request.args.get('rsi_max', type=float),
+            macd=request.args.get('macd') or None,
+            ma=request.args.get('ma') or None,
+            percent_b_min=request.args.get('pb_min', type=float),
+            percent_b_max=request.args.get('pb_max', type=float),
+            squeeze=None if not squeeze else squeeze.lower() == 'true',
+            source=request.args.get('source') or None,
+            sort=request.args.get('sort', 'rsi'),
+            order=request.args.get('order', 'desc'),
+            limit=request.args.get('limit', 50, type=int)
+        )
+        return jsonify({
+            'success': True,
+            'data': result
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/screener/refresh', methods=['POST'])
+def refresh_screener():
+    """스크리너 스냅샷 갱신 (백그라운드, sync=true이면 일봉 저장소부터 갱신)"""
+    try:
+        sync = request.args.get('sync', '').lower() == 'true'
+        threading.Thread(target=screener.refresh, kwargs={'sync': sync}, daemon=True).start()
+        return jsonify({
+            'success': True,
+            'message': '스크리너 갱신 시작'
+        }), 202
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/themes')
 def get_themes():
     """테마 목록 조회 (캐시된 데이터)"""
@@ -799,11 +929,28 @@ def search_themes():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/themes/hot')
+def get_hot_themes():
+    """등락률 상위 테마 + 테마 시장 폭 (테마 캐시 갱신 시 미리 계산)"""
+    try:
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        cache_info = theme_service.get_cache_info()
+        return jsonify({
+            'success': True,
+            'data': {
+                'updated_at': cache_info.get('updated_at'),
+                'themes': theme_service.get_hot_themes(limit),
+                'breadth': theme_service.get_theme_breadth()
+            }
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/themes/refresh', methods=['POST'])
 def refresh_themes():
-    """테마 캐시 수동 갱신"""
+    """테마 캐시 수동 갱신 (?full=1: 바뀌지 않은 테마도 구성 종목 전체 재조회)"""
     try:
-        success = theme_service.update_cache()
+        success = theme_service.update_cache(full_refresh=request.args.get('full') == '1')
         if success:
             return jsonify({
                 'success': True,
@@ -825,15 +972,14 @@ if __name__ == '__main__':
     if kiwoom.get_access_token():
         Logger.info("App", "인증 완료!")
     
-    # 2. 테마 캐시 초기화 (서버 시작 전 필수)
-    Logger.info("Theme", "테마 캐시 초기화 중...")
+    # 2. 테마 캐시 확인 (만료/없음이면 백그라운드에서 갱신, 서버는 바로 시작)
     if not theme_service.is_cache_valid():
-        Logger.info("Theme", "캐시가 없거나 만료됨. 새로 생성합니다...")
-        if theme_service.update_cache():
-            cache_info = theme_service.get_cache_info()
-            Logger.info("Theme", f"캐시 생성 완료: {cache_info.get('theme_count')}개 테마")
+        cache_info = theme_service.get_cache_info()
+        if cache_info.get('exists'):
+            Logger.info("Theme", f"캐시 만료. 기존 캐시({cache_info.get('theme_count')}개 테마)로 시작하고 백그라운드에서 갱신합니다...")
         else:
-            Logger.error("Theme", "캐시 생성 실패 - 서비스 제한 모드로 시작")
+            Logger.info("Theme", "캐시가 없음. 백그라운드에서 생성합니다 (완료 전까지 테마 기능 제한)...")
+        theme_service.refresh_in_background()
     else:
         cache_info = theme_service.get_cache_info()
         Logger.info("Theme", f"기존 캐시 사용: {cache_info.get('theme_count')}개 테마")
@@ -861,6 +1007,28 @@ scheduler.add_job(
     replace_existing=True
 )
 
+# 5. 스크리너 스냅샷 갱신 (평일 장 마감 후 일봉 저장소 동기화 + 일괄 계산)
+scheduler.add_job(
+    func=screener.refresh,
+    kwargs={'sync': True},
+    trigger='cron',
+    day_of_week='mon-fri',
+    hour=16,
+    minute=10,
+    id='screener_refresh',
+    replace_existing=True
+)
+
+# 6. AI 분석 캐시 저장소 정리 (매일 03:30, 보관 기간 지난 결과 삭제)
+scheduler.add_job(
+    func=gemini_service.cache.vacuum,
+    trigger='cron',
+    hour=3,
+    minute=30,
+    id='gemini_cache_vacuum',
+    replace_existing=True
+)
+
 # ================================================================
 # 시장 세션 API
 # ================================================================
@@ -906,6 +1074,8 @@ if __name__ == '__main__':
     scheduler.start()
     print("[Scheduler] ✓ 매일 오전 9시 자동 갱신 예약 완료")
     print("[Scheduler] ✓ 매일 07:00, 19:00 글로벌 마켓 데이터 갱신 예약 완료")
+    print("[Scheduler] ✓ 평일 16:10 스크리너 스냅샷 갱신 예약 완료")
+    print("[Scheduler] ✓ 매일 03:30 AI 분석 캐시 정리 예약 완료")
     
     print("\n서버 주소: http://localhost:5000")
     print("브라우저에서 위 주소로 접속하세요!\n")
@@ -0,0 +1,223 @@
+"""
+헤드리스 브라우저 세션 풀
+================================================================
+MK AI 검색 스크래핑은 뉴스 분석마다 Chrome을 새로 띄우고(드라이버 확인 포함 수 초)
+끝나면 종료하므로, 실제 검색보다 브라우저 기동 비용과 메모리 변동이 더 큽니다.
+이 모듈은 미리 띄운 브라우저 세션을 빌려주고(lease) 돌려받아 재사용합니다.
+
+- 풀 크기(size): 동시에 살아 있는 최대 세션 수 = 동시에 실행할 수 있는 검색 수
+- 재활용: max_uses회 사용했거나 사용 중 오류가 난 세션은 종료하고 다음 요청 때 새로 생성
+- 상태 확인: 빌려주기 전에 health_check(driver)로 확인, 응답이 없으면 폐기 후 새로 생성
+- 세션이 모두 사용 중이면 lease_timeout초까지 반납을 기다림 (초과 시 TimeoutError)
+- 브라우저 생성 방식(factory)은 호출자가 전달 (selenium 의존성은 mk_scraper에만)
+================================================================
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from logger import Logger
+
+
+class BrowserSession:
+    """풀에서 빌린 브라우저 세션 (driver + 사용 횟수)"""
+
+    __slots__ = ('driver', 'uses', 'created_at', 'broken')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+        self.broken = False
+
+    def mark_broken(self):
+        """사용 중 오류 발생: 반납 시 종료하고 다음 요청 때 새로 생성"""
+        self.broken = True
+
+
+class BrowserPool:
+    """재사용 가능한 브라우저 세션 풀 (스레드 안전)"""
+
+    def __init__(self, factory, size=2, max_uses=50, lease_timeout=60, health_check=None, name="browser"):
+        """
+        Args:
+            factory: 인자 없이 새 driver를 만드는 함수
+            size: 최대 세션 수 (동시 사용 상한)
+            max_uses: 세션당 최대 사용 횟수 (넘으면 종료 후 새로 생성, 0이면 제한 없음)
+            lease_timeout: 세션 반납 대기 상한 (초)
+            health_check: driver가 정상이면 True를 반환하는 함수 (없으면 확인 생략)
+            name: 로그 태그
+        """
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self.health_check = health_check
+        self.name = name
+
+        self._idle = deque()  # 반납된 세션 (최근 반납 순)
+        self._total = 0  # 살아 있는 세션 수 (사용 중 + 대기 중 + 생성 중)
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.leases = 0
+        self.created = 0
+        self.recycled = 0
+        self.health_failures = 0
+        self.errors = 0
+        self.wait_timeouts = 0
+
+    # ------------------------------------------------------------
+    # 빌리기 / 반납
+    # ------------------------------------------------------------
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        세션 하나를 빌려서 블록 안에서 사용 (블록을 벗어나면 반납)
+
+        Example:
+            with pool.lease() as session:
+                session.driver.get(url)
+
+        블록 안에서 예외가 나거나 session.mark_broken()을 호출하면 세션은 종료됨
+        """
+        session = self._acquire(self.lease_timeout if timeout is None else timeout)
+        try:
+            yield session
+        except BaseException:
+            session.broken = True
+            raise
+        finally:
+            self._release(session)
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError(f"{self.name} pool is closed")
+                    if self._idle:
+                        session = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        self._total += 1
+                        session = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.wait_timeouts += 1
+                        raise TimeoutError(f"{self.name} pool: no free session within {timeout}s")
+                    self._cond.wait(remaining)
+                self.leases += 1
+
+            if session is None:
+                return self._create()
+            if self._is_healthy(session):
+                return session
+
+            # 응답 없는 세션은 폐기하고 새로 생성 (자리는 그대로 유지)
+            self._quit(session)
+            with self._cond:
+                self.health_failures += 1
+            return self._create()
+
+    def _create(self):
+        """자리(_total)를 확보한 상태에서 호출: 새 세션 생성 (실패하면 자리 반환)"""
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._cond:
+                self._total -= 1
+                self.errors += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.created += 1
+        return BrowserSession(driver)
+
+    def _release(self, session):
+        session.uses += 1
+        retire = session.broken or (self.max_uses and session.uses >= self.max_uses)
+        with self._cond:
+            if session.broken:
+                self.errors += 1
+            if retire or self._closed:
+                self._total -= 1
+                self.recycled += 1 if retire else 0
+            else:
+                self._idle.append(session)
+            self._cond.notify()
+        if retire or self._closed:
+            if session.broken:
+                Logger.debug(self.name, "Session closed after error")
+            self._quit(session)
+
+    def _is_healthy(self, session):
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(session.driver))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------
+    # 미리 띄우기 / 종료
+    # ------------------------------------------------------------
+    def warm(self, count=None):
+        """
+        세션을 미리 생성해서 대기열에 넣음 (첫 요청의 브라우저 기동 시간 제거)
+
+        Returns:
+            새로 만든 세션 수
+        """
+        count = self.size if count is None else min(count, self.size)
+        started = 0
+        for _ in range(count):
+            with self._cond:
+                if self._closed or self._total >= count:
+                    break
+                self._total += 1
+            try:
+                session = self._create()
+            except Exception as e:
+                Logger.warning(self.name, f"Warm-up failed: {e}")
+                break
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+            started += 1
+        return started
+
+    def close(self):
+        """대기 중인 세션 종료 (사용 중인 세션은 반납 시 종료)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            self._quit(session)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'alive': self._total,
+                'idle': len(self._idle),
+                'in_use': self._total - len(self._idle),
+                'leases': self.leases,
+                'created': self.created,
+                'recycled': self.recycled,
+                'health_failures': self.health_failures,
+                'errors': self.errors,
+                'wait_timeouts': self.wait_timeouts
+            }
@@ -0,0 +1,271 @@
+"""
+AI 분석 결과 영구 저장소
+================================================================
+GeminiCache의 파일 계층(메모리 캐시 뒤)을 담당하는 저장소 인터페이스와 SQLite 구현입니다.
+
+- CacheStore: 저장소 인터페이스 (get / put / get_many / query / purge / vacuum)
+- SQLiteCacheStore: 파일 하나(cache/gemini_cache.db)에 (종목코드, 분석 타입)별 최신 결과 보관
+  - WAL 모드: 읽기와 쓰기가 서로 막지 않음 (분석 스레드 풀/웹 워커 동시 접근)
+  - 스레드별 커넥션, busy_timeout으로 쓰기 경합 대기
+  - 본문은 공백 없는 JSON, COMPRESS_MIN_BYTES 이상이면 zlib 압축
+  - 인덱스: (analysis_type, created_at), (code, analysis_type, created_at)
+    → "오늘 생성된 전체 outlook" 같은 타입/시간 범위 조회와 종목코드 접두어 조회
+- migrate_json_files(): 기존 {종목코드}_{타입}_{YYYYMMDD}.json 캐시 파일을 옮기고 삭제
+  (종목코드는 GeminiCache 조회와 같은 normalize_code 규칙으로 저장)
+================================================================
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+
+from logger import Logger
+
+
+def normalize_code(code):
+    """종목 코드 정규화 (A 접두사 제거, GeminiCache 조회 키와 같은 규칙)"""
+    return code[1:] if code and code.startswith('A') else code
+
+
+class CacheStore(ABC):
+    """분석 결과 저장소 인터페이스 (종목코드 + 분석 타입 → 최신 결과 1건)"""
+
+    @abstractmethod
+    def get(self, code, analysis_type):
+        """
+        Returns:
+            (data, created_at) - 없으면 (None, None)
+        """
+
+    @abstractmethod
+    def put(self, code, analysis_type, data, created_at=None):
+        """결과 저장 (같은 종목코드/분석 타입의 이전 결과는 교체)"""
+
+    def get_many(self, codes, analysis_type):
+        """
+        Returns:
+            dict: {code: (data, created_at)} - 없는 종목은 제외
+        """
+        return {code: record for code in codes for record in [self.get(code, analysis_type)] if record[0] is not None}
+
+    @abstractmethod
+    def query(self, analysis_type=None, code_prefix=None, since=None):
+        """
+        타입/종목코드 접두어/생성 시각 조건으로 조회
+
+        Returns:
+            list: [(code, analysis_type, data, created_at), ...] 생성 시각 내림차순
+        """
+
+    @abstractmethod
+    def delete(self, code, analysis_type):
+        """결과 삭제 (없으면 무시)"""
+
+    @abstractmethod
+    def purge(self, older_than):
+        """
+        created_at < older_than 항목 삭제
+
+        Returns:
+            int: 삭제 건수
+        """
+
+    def vacuum(self):
+        """삭제 후 빈 공간 정리"""
+
+    def close(self):
+        """커넥션 정리"""
+
+
+class SQLiteCacheStore(CacheStore):
+    """SQLite(WAL) 분석 결과 저장소"""
+
+    # 이 크기(바이트) 이상인 본문은 zlib 압축 (raw_response가 포함된 outlook/news는 대부분 해당)
+    COMPRESS_MIN_BYTES = 1024
+    ENCODING_JSON = 0
+    ENCODING_ZLIB = 1
+
+    # 기존 JSON 캐시 파일명: {종목코드}_{분석 타입}_{YYYYMMDD}.json
+    LEGACY_FILE_PATTERN = re.compile(r'^([0-9A-Za-z]+)_([a-z][a-z_]*)_(\d{8})\.json$')
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._init_schema()
+
+    # ------------------------------------------------------------
+    # 커넥션
+    # ------------------------------------------------------------
+    def _connect(self):
+        """현재 스레드 전용 커넥션 (autocommit)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                code TEXT NOT NULL,
+                analysis_type TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                encoding INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (code, analysis_type)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_code_type_created "
+                     "ON analysis_cache (code, analysis_type, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_type_created "
+                     "ON analysis_cache (analysis_type, created_at)")
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+    # ------------------------------------------------------------
+    # 직렬화
+    # ------------------------------------------------------------
+    @classmethod
+    def _encode(cls, data):
+        raw = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if len(raw) >= cls.COMPRESS_MIN_BYTES:
+            return cls.ENCODING_ZLIB, zlib.compress(raw, 6)
+        return cls.ENCODING_JSON, raw
+
+    @classmethod
+    def _decode(cls, encoding, payload):
+        raw = zlib.decompress(payload) if encoding == cls.ENCODING_ZLIB else bytes(payload)
+        return json.loads(raw.decode('utf-8'))
+
+    # ------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------
+    def get(self, code, analysis_type):
+        row = self._connect().execute(
+            "SELECT created_at, encoding, payload FROM analysis_cache WHERE code = ? AND analysis_type = ?",
+            (code, analysis_type)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return self._decode(row[1], row[2]), row[0]
+
+    def put(self, code, analysis_type, data, created_at=None):
+        encoding, payload = self._encode(data)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO analysis_cache (code, analysis_type, created_at, encoding, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (code, analysis_type, time.time() if created_at is None else created_at, encoding, payload)
+        )
+
+    def get_many(self, codes, analysis_type):
+        codes = list(dict.fromkeys(codes))
+        result = {}
+        conn = self._connect()
+        # SQLite 바인딩 변수 개수 제한(기본 999) 이내로 나눠서 조회
+        for start in range(0, len(codes), 500):
+            chunk = codes[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT code, created_at, encoding, payload FROM analysis_cache "
+                f"WHERE analysis_type = ? AND code IN ({placeholders})",
+                [analysis_type] + chunk
+            ).fetchall()
+            for code, created_at, encoding, payload in rows:
+                result[code] = (self._decode(encoding, payload), created_at)
+        return result
+
+    def query(self, analysis_type=None, code_prefix=None, since=None):
+        conditions, params = [], []
+        if analysis_type:
+            conditions.append("analysis_type = ?")
+            params.append(analysis_type)
+        if code_prefix:
+            # LIKE 대신 범위 비교 (인덱스 사용, 와일드카드 이스케이프 불필요)
+            conditions.append("code >= ? AND code < ?")
+            params.extend([code_prefix, code_prefix + '\uffff'])
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connect().execute(
+            f"SELECT code, analysis_type, created_at, encoding, payload FROM analysis_cache {where} "
+            f"ORDER BY created_at DESC",
+            params
+        ).fetchall()
+        return [(code, kind, self._decode(encoding, payload), created_at)
+                for code, kind, created_at, encoding, payload in rows]
+
+    def delete(self, code, analysis_type):
+        self._connect().execute(
+            "DELETE FROM analysis_cache WHERE code = ? AND analysis_type = ?", (code, analysis_type)
+        )
+
+    def purge(self, older_than):
+        cursor = self._connect().execute("DELETE FROM analysis_cache WHERE created_at < ?", (older_than,))
+        return cursor.rowcount
+
+    def vacuum(self):
+        conn = self._connect()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    # ------------------------------------------------------------
+    # 기존 JSON 파일 이전
+    # ------------------------------------------------------------
+    def migrate_json_files(self, cache_dir):
+        """
+        기존 JSON 캐시 파일을 저장소로 옮기고 삭제 (같은 키는 더 최근 파일/항목 유지)
+
+        Returns:
+            int: 옮긴 파일 수
+        """
+        if not os.path.isdir(cache_dir):
+            return 0
+
+        migrated = 0
+        for filename in sorted(os.listdir(cache_dir)):
+            match = self.LEGACY_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            path = os.path.join(cache_dir, filename)
+            code, analysis_type = normalize_code(match.group(1)), match.group(2)
+            try:
+                created_at = os.path.getmtime(path)
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+                _, existing_at = self.get(code, analysis_type)
+                if existing_at is None or existing_at < created_at:
+                    self.put(code, analysis_type, data, created_at=created_at)
+                os.remove(path)
+                migrated += 1
+            except Exception as e:
+                Logger.warning("Cache", f"Failed to migrate {filename}: {e}")
+
+        if migrated:
+            Logger.info("Cache", f"Migrated {migrated} JSON cache files into {os.path.basename(self.db_path)}")
+        return migrated
@@ -0,0 +1,62 @@
+"""
+테스트 공용 도우미
+- pytest는 자동으로 읽고, 스크립트로 직접 실행하는 테스트는 `from conftest import ...`로 사용
+- GeminiService는 실제 생성자로 만들고 Gemini 모델/환율 조회만 대역으로 주입
+"""
+import os
+from types import SimpleNamespace
+
+from cache_store import SQLiteCacheStore
+from gemini_cache import GeminiCache
+from gemini_service import GeminiService
+from llm_scheduler import LLMScheduler
+
+
+class FakeGeminiModel:
+    """
+    Gemini 모델 대역 (GeminiService의 model 인자)
+    respond(prompt, stream)의 반환값이 문자열이면 text 응답으로 감싸고, 그 밖의 값은 그대로 응답으로 사용
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.prompts = []
+        self.streams = []
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        self.prompts.append(prompt)
+        self.streams.append(stream)
+        response = self.respond(prompt, stream)
+        if isinstance(response, str):
+            return SimpleNamespace(text=response, usage_metadata=None)
+        return response
+
+
+class FakeExchangeRateFetcher:
+    """환율 조회 실패 (프롬프트에는 '정보 없음')"""
+
+    def get_usd_krw_rate(self):
+        return {'success': False}
+
+
+def make_gemini_service(cache_dir, respond, **kwargs):
+    """
+    테스트용 GeminiService (캐시는 cache_dir의 SQLite, 스케줄러 동시 실행 1)
+
+    Returns:
+        (service, model) - model.prompts로 실제 Gemini 호출을 확인
+    """
+    model = FakeGeminiModel(respond)
+    service = GeminiService(
+        cache=GeminiCache(store=SQLiteCacheStore(os.path.join(cache_dir, 'gemini_cache.db'))),
+        scheduler=LLMScheduler(max_concurrency=1),
+        model=model,
+        exchange_rate_fetcher=FakeExchangeRateFetcher(),
+        **kwargs
+    )
+    return service, model
+
+
+def close_gemini_service(service):
+    service.scheduler.close()
+    service.cache.store.close()
@@ -19,14 +19,15 @@ from logger import Logger
 class DataFetcher:
     """관심종목 데이터 조회 클래스"""
     
-    def __init__(self, stocks_file='stocks.json'):
+    def __init__(self, stocks_file='stocks.json', kiwoom_api=None):
         """초기화
         
         Args:
             stocks_file: 관심종목이 저장된 JSON 파일 경로
+            kiwoom_api: 공유 KiwoomApi 인스턴스 (없으면 새로 생성)
         """
         self.stocks_file = stocks_file
-        self.kiwoom_api = KiwoomApi()
+        self.kiwoom_api = kiwoom_api or KiwoomApi()
         
     def load_watchlist(self):
         """stocks.json에서 관심종목 리스트 읽기
@@ -1,43 +1,135 @@
 import os
-import json
 import datetime
+import threading
+import concurrent.futures
+
+import config
+from memory_cache import LRUMemoryCache
+from cache_store import SQLiteCacheStore, normalize_code
 
 class GeminiCache:
     """Gemini 서비스의 캐싱 로직을 담당하는 클래스"""
 
-    def __init__(self):
+    def __init__(self, store=None):
+        """
+        Args:
+            store: 영구 저장소 (CacheStore 구현, 기본값: cache/gemini_cache.db SQLite)
+        """
         # 캐시 디렉토리 생성
         self.cache_dir = os.path.join(os.path.dirname(__file__), 'cache')
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
             
+        # 영구 저장소 (종목코드 + 분석 타입별 최신 결과, 날짜가 바뀌어도 TTL 기준으로 유지)
+        # 기존 {종목코드}_{타입}_{날짜}.json 파일은 처음 실행 시 옮긴 뒤 삭제
+        if store is None:
+            store = SQLiteCacheStore(os.path.join(self.cache_dir, 'gemini_cache.db'))
+            store.migrate_json_files(self.cache_dir)
+        self.store = store
+        
+        # 저장소 보관 기간 (vacuum 시 이보다 오래된 결과 삭제)
+        self.RETENTION_DAYS = getattr(config, 'GEMINI_CACHE_RETENTION_DAYS', 7)
+            
         # 캐시 만료 시간 설정 (초 단위)
-        # 일반 캐시: 메모리 10분, 파일 60분
+        # 일반 캐시: 메모리 10분, 파일(영구 저장소) 60분
         self.CACHE_TTL_MEMORY = 600
         self.CACHE_TTL_FILE = 3600
         
         # 테마 캐시: 메모리 10분, 파일 12시간 (시장 테마는 하루 종일 큰 변화가 없음)
         self.CACHE_TTL_MEMORY_THEMES = 600
         self.CACHE_TTL_FILE_THEMES = 43200  # 12시간
+
+        # 분석 타입별 메모리 TTL (없는 타입은 CACHE_TTL_MEMORY)
+        # 섹터/핵심 테마는 종목별로 거의 바뀌지 않으므로 더 오래 보관
+        self.CACHE_TTL_MEMORY_BY_TYPE = getattr(config, 'GEMINI_CACHE_MEMORY_TTLS', {
+            'themes': self.CACHE_TTL_MEMORY_THEMES,
+            'sector': 1800,
+            'core_themes': 1800
+        })
             
-        # 메모리 캐시 초기화 (파일 I/O 감소 및 실패 대비)
-        # 구조: { 'key': { 'data': ..., 'timestamp': ... } }
-        self._memory_cache = {}
-
-    def get_cache_path(self, code, analysis_type):
-        """캐시 파일 경로 생성 (종목코드_타입_날짜.json)"""
-        # 종목 코드 정규화 (A 접두사 제거)
-        normalized_code = code.lstrip('A') if code and code.startswith('A') else code
-        today = datetime.datetime.now().strftime("%Y%m%d")
-        filename = f"{normalized_code}_{analysis_type}_{today}.json"
-        path = os.path.join(self.cache_dir, filename)
-        return path
-
-    def load(self, code, analysis_type, force_refresh=False):
+        # 메모리 캐시 (파일 I/O 감소 및 실패 대비)
+        # 항목 수/바이트 상한이 있는 LRU - 오래 실행되는 serve.py에서도 무한히 커지지 않음
+        # 만료 항목은 백그라운드에서 주기적으로 정리
+        self._memory_cache = LRUMemoryCache(
+            max_entries=getattr(config, 'GEMINI_CACHE_MEMORY_MAX_ENTRIES', 1000),
+            max_bytes=getattr(config, 'GEMINI_CACHE_MEMORY_MAX_BYTES', 64 * 1024 * 1024),
+            sweep_interval=getattr(config, 'GEMINI_CACHE_SWEEP_INTERVAL', 60),
+            name="gemini-cache"
+        )
+
+        # Stale-while-revalidate: 파일 TTL이 지난 뒤에도 STALE_GRACE초 동안은 기존 결과를 바로 반환하고
+        # 백그라운드에서 갱신 (revalidate 함수를 넘긴 load 호출만 해당, 그 이후는 기존처럼 호출자가 대기)
+        self.STALE_GRACE = getattr(config, 'GEMINI_CACHE_STALE_GRACE', 10800)  # 3시간
+        # 백그라운드 갱신 동시 실행 수 / 대기 상한 (넘으면 이번 요청은 오래된 결과만 반환)
+        self.REVALIDATE_WORKERS = getattr(config, 'GEMINI_CACHE_REVALIDATE_WORKERS', 2)
+        self.REVALIDATE_MAX_PENDING = getattr(config, 'GEMINI_CACHE_REVALIDATE_MAX_PENDING', 32)
+        self._revalidate_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.REVALIDATE_WORKERS, thread_name_prefix='gemini-revalidate'
+        )
+        self._revalidating = set()
+        self._revalidate_lock = threading.Lock()
+        self.stale_served = 0
+
+    def get_memory_ttl(self, analysis_type):
+        """분석 타입별 메모리 캐시 TTL (초)"""
+        return self.CACHE_TTL_MEMORY_BY_TYPE.get(analysis_type, self.CACHE_TTL_MEMORY)
+
+    def get_stats(self):
+        """메모리 캐시 통계 (항목 수, 크기, 적중/미스/만료/제거 횟수) + 오래된 결과 반환/갱신 현황"""
+        stats = self._memory_cache.stats()
+        with self._revalidate_lock:
+            stats['stale_served'] = self.stale_served
+            stats['revalidating'] = len(self._revalidating)
+        return stats
+
+    def schedule_revalidate(self, cache_key, revalidate):
+        """
+        백그라운드 갱신 예약 (같은 키는 1회만, 대기 상한 초과 시 예약하지 않음)
+
+        Returns:
+            bool: 예약 여부 (이미 갱신 중이면 True)
+        """
+        with self._revalidate_lock:
+            if cache_key in self._revalidating:
+                return True
+            if len(self._revalidating) >= self.REVALIDATE_MAX_PENDING:
+                return False
+            self._revalidating.add(cache_key)
+
+        def run():
+            try:
+                revalidate()
+            except Exception as e:
+                print(f"[Cache Error] Revalidate failed ({cache_key}): {e}")
+            finally:
+                with self._revalidate_lock:
+                    self._revalidating.discard(cache_key)
+
+        try:
+            self._revalidate_executor.submit(run)
+            return True
+        except RuntimeError as e:  # 종료 중인 인터프리터
+            print(f"[Cache Error] Revalidate not scheduled ({cache_key}): {e}")
+            with self._revalidate_lock:
+                self._revalidating.discard(cache_key)
+            return False
+
+    @staticmethod
+    def _normalize_code(code):
+        """종목 코드 정규화 (A 접두사 제거)"""
+        return normalize_code(code)
+
+    def get_file_ttl(self, analysis_type):
+        """분석 타입별 영구 저장소 TTL (초)"""
+        return self.CACHE_TTL_FILE_THEMES if analysis_type == 'themes' else self.CACHE_TTL_FILE
+
+    def load(self, code, analysis_type, force_refresh=False, revalidate=None):
         """
         캐시에서 데이터 로드 (메모리 -> 파일 순서)
         - force_refresh=True: 캐시 무시하고 (None, dict) 반환
         - 테마 캐시: 파일 12시간, 일반 캐시: 파일 60분
+        - revalidate: 인자 없는 갱신 함수. 지정하면 파일 TTL이 지났어도 STALE_GRACE 이내의 결과는
+          바로 반환하고 (cache_info['stale']=True) 이 함수를 백그라운드에서 실행
         Returns:
             (data, cache_info) - data는 캐싱된 데이터 또는 None, cache_info는 캐시 상태 정보
         """
@@ -51,43 +143,39 @@ class GeminiCache:
         cache_key = f"{code}_{analysis_type}"
         
         # TTL 선택: 테마는 12시간, 나머지는 기본값
-        is_themes = (analysis_type == 'themes')
-        memory_ttl = self.CACHE_TTL_MEMORY_THEMES if is_themes else self.CACHE_TTL_MEMORY
-        file_ttl = self.CACHE_TTL_FILE_THEMES if is_themes else self.CACHE_TTL_FILE
-
-        # 1. 메모리 캐시 확인
-        if cache_key in self._memory_cache:
-            mem_data = self._memory_cache[cache_key]
-            age = current_time - mem_data['timestamp']
-            if age <= memory_ttl:
-                cache_info['cached'] = True
-                cache_info['reason'] = 'memory_hit'
-                cache_info['age_seconds'] = age
-                return mem_data['data'], cache_info
-            else:
-                # 메모리 캐시 만료 -> 삭제
-                del self._memory_cache[cache_key]
+        file_ttl = self.get_file_ttl(analysis_type)
+
+        # 1. 메모리 캐시 확인 (만료 항목은 LRU 캐시가 미스로 처리하고 제거)
+        mem_data, age = self._memory_cache.get(cache_key, now=current_time)
+        if mem_data is not None:
+            cache_info['cached'] = True
+            cache_info['reason'] = 'memory_hit'
+            cache_info['age_seconds'] = age
+            return mem_data, cache_info
 
         try:
-            path = self.get_cache_path(code, analysis_type)
-            if os.path.exists(path):
-                # 파일 캐시 만료 체크
-                mtime = os.path.getmtime(path)
-                age = current_time - mtime
+            data, created_at = self.store.get(self._normalize_code(code), analysis_type)
+            if data is not None:
+                # 저장소 캐시 만료 체크
+                age = current_time - created_at
                 
                 if age > file_ttl:
-                    cache_info['reason'] = f'expired ({age:.1f}s > {file_ttl}s)'
                     cache_info['age_seconds'] = age
-                    return None, cache_info
+                    if revalidate is None or age > file_ttl + self.STALE_GRACE:
+                        cache_info['reason'] = f'expired ({age:.1f}s > {file_ttl}s)'
+                        return None, cache_info
+                    
+                    # 유예 구간: 오래된 결과를 바로 반환하고 백그라운드 갱신 (메모리 캐시에는 올리지 않음)
+                    cache_info['cached'] = True
+                    cache_info['stale'] = True
+                    cache_info['reason'] = 'stale'
+                    cache_info['revalidating'] = self.schedule_revalidate(cache_key, revalidate)
+                    with self._revalidate_lock:
+                        self.stale_served += 1
+                    return data, cache_info
                 
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 파일 캐시 적중 시 메모리 캐시에도 업데이트
-                self._memory_cache[cache_key] = {
-                    'data': data,
-                    'timestamp': mtime
-                }
+                # 저장소 적중 시 메모리 캐시에도 업데이트 (나이는 저장 시각 기준)
+                self._memory_cache.put(cache_key, data, ttl=self.get_memory_ttl(analysis_type), timestamp=created_at)
                 
                 cache_info['cached'] = True
                 cache_info['reason'] = 'hit'
@@ -101,32 +189,87 @@ class GeminiCache:
         return None, cache_info
 
     def save(self, code, analysis_type, data):
-        """데이터를 캐시에 저장 (메모리 + 파일 Atomic Write)"""
+        """데이터를 캐시에 저장 (메모리 + 영구 저장소)"""
         try:
             # 1. 메모리 캐시 저장
             cache_key = f"{code}_{analysis_type}"
-            self._memory_cache[cache_key] = {
-                'data': data,
-                'timestamp': datetime.datetime.now().timestamp()
-            }
-
-            # 2. 파일 캐시 저장 (Atomic Write: 임시 파일 -> 이름 변경)
-            path = self.get_cache_path(code, analysis_type)
-            temp_path = path + ".tmp"
-            
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            # 윈도우에서는 rename 시 대상 파일이 있으면 에러가 발생할 수 있으므로 replace 사용
-            if os.path.exists(path):
-                os.remove(path)
-            os.rename(temp_path, path)
+            self._memory_cache.put(cache_key, data, ttl=self.get_memory_ttl(analysis_type))
+
+            # 2. 영구 저장소 저장 (같은 종목/타입의 이전 결과를 교체)
+            self.store.put(self._normalize_code(code), analysis_type, data)
             
         except Exception as e:
             print(f"[Cache Error] Save failed: {e}")
-            # 임시 파일 정리
-            if 'temp_path' in locals() and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
+
+    def load_since(self, code, analysis_type, since):
+        """
+        since 이후 저장된 결과만 반환 (다른 프로세스가 방금 만든 결과 확인용, 메모리 캐시 미사용)
+
+        Returns:
+            data 또는 None
+        """
+        try:
+            data, created_at = self.store.get(self._normalize_code(code), analysis_type)
+        except Exception as e:
+            print(f"[Cache Error] Load failed: {e}")
+            return None
+        if data is None or created_at < since:
+            return None
+        self._memory_cache.put(f"{code}_{analysis_type}", data, ttl=self.get_memory_ttl(analysis_type), timestamp=created_at)
+        return data
+
+    def load_many(self, codes, analysis_type):
+        """
+        여러 종목의 유효한(TTL 이내) 결과를 한 번에 조회 (저장소 1회 조회)
+
+        Returns:
+            dict: {code: data} - 없거나 만료된 종목은 제외
+        """
+        current_time = datetime.datetime.now().timestamp()
+        file_ttl = self.get_file_ttl(analysis_type)
+        by_normalized = {self._normalize_code(code): code for code in codes}
+        try:
+            records = self.store.get_many(list(by_normalized), analysis_type)
+        except Exception as e:
+            print(f"[Cache Error] Bulk load failed: {e}")
+            return {}
+        return {
+            by_normalized[code]: data
+            for code, (data, created_at) in records.items()
+            if current_time - created_at <= file_ttl
+        }
+
+    def get_all(self, analysis_type, since=None, code_prefix=None):
+        """
+        분석 타입별 저장 결과 조회 (기본값: 오늘 0시 이후 생성된 결과)
+        예: get_all('outlook') → 오늘 생성된 전체 종목 전망
+
+        Returns:
+            list: [{'code', 'created_at', 'data'}, ...] 최신순
+        """
+        if since is None:
+            since = datetime.datetime.combine(datetime.date.today(), datetime.time()).timestamp()
+        try:
+            rows = self.store.query(analysis_type=analysis_type, code_prefix=code_prefix, since=since)
+        except Exception as e:
+            print(f"[Cache Error] Query failed: {e}")
+            return []
+        return [{'code': code, 'created_at': created_at, 'data': data} for code, _, data, created_at in rows]
+
+    def vacuum(self, retention_days=None):
+        """
+        보관 기간이 지난 결과 삭제 후 저장소 정리 (스케줄러에서 하루 1회 실행)
+
+        Returns:
+            int: 삭제 건수
+        """
+        retention_days = self.RETENTION_DAYS if retention_days is None else retention_days
+        cutoff = datetime.datetime.now().timestamp() - retention_days * 86400
+        try:
+            removed = self.store.purge(cutoff)
+            self.store.vacuum()
+            print(f"[Cache] Vacuum: {removed} entries older than {retention_days} days removed")
+            return removed
+        except Exception as e:
+            print(f"[Cache Error] Vacuum failed: {e}")
+            return 0
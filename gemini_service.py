@@ -4,37 +4,140 @@ import config
 import json
 import os
 import datetime
+import time
 import re  
+import concurrent.futures
+import queue
+import threading
 import prompts
 from gemini_cache import GeminiCache
+from prompt_cache import PromptCache
+from single_flight import SingleFlight
+from llm_scheduler import LLMScheduler, RetryableLLMError, priority_scope, current_priority
+from market_session import get_business_date
 from exchange_rate_fetcher import ExchangeRateFetcher
 from logger import Logger
 
 class GeminiService:
     """Google Gemini SDK를 사용한 AI 분석 서비스"""
     
-    def __init__(self):
-        genai.configure(api_key=config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(config.AI_MODEL)
+    # 다른 워커 프로세스의 같은 분석을 기다리는 최대 시간 (초, Gemini 120초 + 스크래핑 여유)
+    HOST_LOCK_TIMEOUT = 300
+    
+    # LLM 스케줄러 대기 상한 (초, 큐 대기 + Gemini 120초 + 백오프 재시도 여유)
+    SCHEDULER_WAIT_TIMEOUT = 300
+    
+    # 응답 예상 토큰 (분당 토큰 한도 계산용, 실제 사용량으로 보정됨)
+    ESTIMATED_OUTPUT_TOKENS = 2000
+    
+    def __init__(self, shared_cache=None, scheduler=None, cache=None, model=None, exchange_rate_fetcher=None):
+        """
+        Args:
+            shared_cache: 프로세스 간 공유 캐시 (SharedCache, 있으면 같은 호스트의 워커끼리 분석을 1회로 제한)
+            scheduler: LLM 호출 스케줄러 (LLMScheduler, 기본값: config 설정으로 생성)
+            cache: 분석 결과 캐시 (GeminiCache, 기본값: 기본 저장소로 생성)
+            model: generate_content(prompt, stream=..., request_options=...)를 제공하는 모델 클라이언트
+                   (기본값: config.AI_MODEL로 만든 genai.GenerativeModel)
+            exchange_rate_fetcher: 환율 조회기 (get_usd_krw_rate(), 기본값: ExchangeRateFetcher)
+        """
+        if model is None:
+            genai.configure(api_key=config.GEMINI_API_KEY)
+            model = genai.GenerativeModel(config.AI_MODEL)
+        self.model = model
         
         # 캐시 관리자 초기화
-        self.cache = GeminiCache()
+        self.cache = cache or GeminiCache()
+        # 프롬프트 입력(양자화) 해시 기준 결과 캐시 - 같은 상황이면 강제 갱신/다른 종목에서도 재사용
+        self.prompt_cache = PromptCache(self.cache.store)
+        # 캐시된 전망을 유지하는 가격 변동 범위 (%, 신호/수급 방향이 같아도 이보다 움직이면 새로 생성)
+        self.outlook_price_band_pct = getattr(config, 'OUTLOOK_PRICE_BAND_PCT', 3.0)
+        
+        # 동시 요청 중복 실행 방지 (같은 종목/분석 타입/영업일은 실행 중인 결과를 공유)
+        self.inflight = SingleFlight()
+        self.shared_cache = shared_cache
+        self.host_shared = 0  # 다른 프로세스의 결과를 사용한 횟수
+        
+        # Gemini 호출 동시 실행 상한/우선순위 큐 (요청 스레드는 결과 Future만 기다림)
+        self.scheduler = scheduler or LLMScheduler(
+            max_concurrency=getattr(config, 'GEMINI_MAX_CONCURRENCY', 2),
+            tokens_per_minute=getattr(config, 'GEMINI_TOKENS_PER_MINUTE', 0),
+            max_retries=getattr(config, 'GEMINI_MAX_RETRIES', 3),
+            name="gemini"
+        )
+        
+        # 카드 감성 분석용 묶음 전망 (한 번의 호출에 넣을 최대 종목 수)
+        self.outlook_batch_size = max(1, getattr(config, 'GEMINI_OUTLOOK_BATCH_SIZE', 10))
+        self.batch_calls = 0  # 묶음 전망 호출 수
+        self.batch_stocks = 0  # 묶음 전망으로 처리한 종목 수
+        self.batch_parse_failures = 0  # 묶음 응답에서 결과를 찾지 못한 종목 수 (개별 호출로 대체)
         
         # 환율 정보 페처 초기화
-        self.exchange_rate_fetcher = ExchangeRateFetcher()
+        self.exchange_rate_fetcher = exchange_rate_fetcher or ExchangeRateFetcher()
+        
+        # MK AI 검색용 브라우저 풀 (첫 사용 또는 warm_mk_browser_pool() 때 생성, selenium 필요)
+        self._mk_pool = None
+        self._mk_pool_lock = threading.Lock()
     
 
 
 
     def _call_gemini_api(self, prompt_text):
-        """Gemini SDK를 사용한 API 호출 (120초 timeout)"""
+        """
+        Gemini 호출을 LLM 스케줄러에 맡기고 결과를 기다림
+        우선순위는 호출 경로의 priority_scope()를 따름 (없으면 INTERACTIVE)
+        """
+        return self._submit_llm_job(prompt_text)
+
+    def _call_gemini_api_stream(self, prompt_text, on_text):
+        """
+        _call_gemini_api의 스트리밍 버전
+        응답 조각이 도착할 때마다 on_text(지금까지 받은 전체 텍스트)를 스케줄러 워커 스레드에서 호출
+        (429/503 재시도 시에는 처음부터 다시 호출되므로 누적 텍스트 기준으로 처리해야 함)
+        """
+        return self._submit_llm_job(prompt_text, on_text)
+
+    def _submit_llm_job(self, prompt_text, on_text=None):
+        """Gemini 호출 작업을 스케줄러에 제출하고 결과 대기 (실패 시 None)"""
+        priority = current_priority(LLMScheduler.INTERACTIVE)
+        future = self.scheduler.submit(
+            lambda: self._generate_content(prompt_text, on_text),
+            priority=priority,
+            estimated_tokens=self._estimate_tokens(prompt_text)
+        )
+        try:
+            return future.result(timeout=self.SCHEDULER_WAIT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            Logger.error("Gemini", f"Scheduler wait timed out ({self.SCHEDULER_WAIT_TIMEOUT}s, priority={LLMScheduler.PRIORITY_NAMES[priority]})")
+            return None
+        except RetryableLLMError as e:
+            Logger.error("Gemini", f"{e} - retries exhausted. Please try again later.")
+            return None
+        except Exception as e:
+            Logger.error("Gemini", f"Unexpected error: {type(e).__name__}: {e}")
+            return None
+
+    def _generate_content(self, prompt_text, on_text=None):
+        """
+        Gemini SDK를 사용한 API 호출 (120초 timeout, 스케줄러 워커 스레드에서 실행)
+        on_text가 있으면 스트리밍으로 받으면서 누적 텍스트를 전달
+        """
         try:
             # timeout 설정: 120초 (긴 분석에 대비)
             response = self.model.generate_content(
                 prompt_text,
+                stream=on_text is not None,
                 request_options={'timeout': 120}
             )
             
+            if on_text is not None:
+                return self._consume_stream(response, on_text)
+            
+            # 실제 사용 토큰으로 분당 토큰 집계 보정
+            usage = getattr(response, 'usage_metadata', None)
+            if usage is not None and getattr(usage, 'total_token_count', None):
+                self.scheduler.record_usage(usage.total_token_count)
+            
             # 디버깅: 응답 확인
             Logger.debug("Gemini", "Response received")
             Logger.debug("Gemini", f"Response object type: {type(response)}")
@@ -52,14 +155,15 @@ class GeminiService:
                 return None
                 
         except exceptions.DeadlineExceeded:
-            Logger.error("Gemini", "Timeout (60s exceeded). The model took too long to respond.")
+            Logger.error("Gemini", "Timeout (120s exceeded). The model took too long to respond.")
             return None
         except exceptions.ResourceExhausted:
-            Logger.error("Gemini", "Quota exceeded (429). Please try again later.")
-            return None
+            # 스케줄러가 백오프 후 재시도
+            Logger.warning("Gemini", "Quota exceeded (429). Backing off.")
+            raise RetryableLLMError("Quota exceeded (429)")
         except exceptions.ServiceUnavailable:
-            Logger.error("Gemini", "Service unavailable (503). Google servers might be overloaded.")
-            return None
+            Logger.warning("Gemini", "Service unavailable (503). Backing off.")
+            raise RetryableLLMError("Service unavailable (503)")
         except exceptions.GoogleAPICallError as e:
             Logger.error("Gemini", f"API Call Error ({e.code}): {e.message}")
             return None
@@ -69,6 +173,38 @@ class GeminiService:
             traceback.print_exc()
             return None
 
+    def _consume_stream(self, response, on_text):
+        """스트리밍 응답을 끝까지 읽으며 조각마다 on_text(누적 텍스트) 호출"""
+        text = ""
+        for chunk in response:
+            try:
+                piece = chunk.text
+            except ValueError:
+                # 텍스트 파트가 없는 조각 (안전 필터 차단 등)
+                piece = ""
+            if not piece:
+                continue
+            text += piece
+            try:
+                on_text(text)
+            except Exception as e:
+                Logger.warning("Gemini", f"Stream callback failed: {e}")
+        
+        # 스트림을 모두 읽은 뒤에 사용량 정보가 채워짐
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None and getattr(usage, 'total_token_count', None):
+            self.scheduler.record_usage(usage.total_token_count)
+        
+        if not text:
+            Logger.warning("Gemini", "No text in streamed response.")
+            return None
+        Logger.debug("Gemini", f"Streamed response text length: {len(text)}")
+        return text
+
+    def _estimate_tokens(self, prompt_text):
+        """호출 전 예상 토큰 (한글 위주 프롬프트: 약 2자당 1토큰 + 응답 예상분)"""
+        return len(prompt_text) // 2 + self.ESTIMATED_OUTPUT_TOKENS
+
     def search_news(self, query):
         """
         [Deprecated] Google Custom Search API를 사용한 뉴스 검색
@@ -102,16 +238,32 @@ class GeminiService:
             Logger.error("Search", f"Connection Error: {e}")
             return None
 
-    def search_and_analyze_news(self, stock_name, stock_code, current_price=None, change_rate=None, force_refresh=False):
+    def search_and_analyze_news(self, stock_name, stock_code, current_price=None, change_rate=None, force_refresh=False, priority=None):
         """
         종목 뉴스를 검색하고 AI로 분석 (MK AI 검색 + 구글 검색 동시 활용)
+        priority: LLM 스케줄러 우선순위 (LLMScheduler.INTERACTIVE/SENTIMENT, 기본값: INTERACTIVE)
         """
-        # 1. 캐시 확인
-        cached_data, cache_info = self.cache.load(stock_code, 'news', force_refresh)
+        def analyze(priority=priority):
+            # 같은 종목 뉴스 분석이 이미 진행 중이면 그 결과를 공유
+            with priority_scope(priority):
+                return self._run_single_flight(
+                    stock_code, 'news',
+                    lambda: self._analyze_news(stock_name, stock_code, current_price, change_rate)
+                )
+
+        # 1. 캐시 확인 (유효 시간이 조금 지난 결과는 바로 반환하고 백그라운드에서 갱신)
+        cached_data, cache_info = self.cache.load(
+            stock_code, 'news', force_refresh, revalidate=lambda: analyze(LLMScheduler.PREWARM)
+        )
         if cached_data:
             cached_data['_cache_info'] = cache_info
             return cached_data
 
+        # 2. 캐시 미스: 직접 분석
+        return analyze()
+
+    def _analyze_news(self, stock_name, stock_code, current_price=None, change_rate=None):
+        """뉴스 수집(MK + 네이버) 및 AI 분석 실행 (캐시 미스 시, 동시 요청당 1회)"""
         try:
             mk_report = ""
             google_news = ""
@@ -122,10 +274,13 @@ class GeminiService:
             def fetch_mk_report():
                 try:
                     from mk_scraper import MKScraper
-                    scraper = MKScraper(headless=True)
                     Logger.info("Gemini", f"MK AI 검색 시도: {stock_name}")
-                    mk_result = scraper.get_ai_answer(stock_name)
-                    scraper.close()
+                    # 미리 띄워 둔 브라우저 세션을 빌려서 검색 (오류 난 세션은 반납 시 재생성)
+                    with self._get_mk_pool().lease() as session:
+                        scraper = MKScraper(driver=session.driver)
+                        mk_result = scraper.get_ai_answer(stock_name)
+                        if scraper.last_error is not None:
+                            session.mark_broken()
 
                     if mk_result:
                         Logger.info("Gemini", f"MK AI 검색 성공 (길이: {len(mk_result)})")
@@ -175,6 +330,18 @@ class GeminiService:
             {mk_report}
             """
             
+            # 같은 입력(가격대/MK 리포트/뉴스 목록)으로 분석한 결과가 있으면 재사용
+            prompt_key, reused = self._reuse_prompt_result('INVESTMENT_ANALYSIS_PROMPT', {
+                'stock_code': stock_code,
+                'current_price': current_price,
+                'change_rate': change_rate,
+                'mk_report': mk_report,
+                'news_context': news_context
+            }, f"news {stock_code}")
+            if reused is not None:
+                self.cache.save(stock_code, 'news', reused)
+                return reused
+            
             prompt = prompts.INVESTMENT_ANALYSIS_PROMPT.format(
                 company_report=company_report,
                 news_context=news_context
@@ -262,6 +429,7 @@ class GeminiService:
 
             # 2. 결과 캐싱
             self.cache.save(stock_code, 'news', result)
+            self.prompt_cache.put('INVESTMENT_ANALYSIS_PROMPT', prompt_key, result)
             return result
             
         except Exception as e:
@@ -287,6 +455,14 @@ class GeminiService:
         try:
             headlines_str = "\n".join([f"- {h}" for h in headlines])
             
+            # 헤드라인이 그대로면 (강제 갱신이어도) 이전 분석 재사용
+            prompt_key, reused = self._reuse_prompt_result(
+                'MARKET_EVENT_ANALYSIS_PROMPT', {'headlines_list': headlines_str}, "market events"
+            )
+            if reused is not None:
+                self.cache.save('MARKET', 'events', reused)
+                return reused
+            
             prompt = prompts.MARKET_EVENT_ANALYSIS_PROMPT.format(
                 headlines_list=headlines_str
             )
@@ -314,6 +490,8 @@ class GeminiService:
 
             # 2. 결과 캐싱
             self.cache.save('MARKET', 'events', result)
+            if 'raw_text' not in result:
+                self.prompt_cache.put('MARKET_EVENT_ANALYSIS_PROMPT', prompt_key, result)
             return result
 
         except Exception as e:
@@ -345,6 +523,17 @@ class GeminiService:
             exchange_rate_data = self.exchange_rate_fetcher.get_usd_krw_rate()
             exchange_rate_str = f"{exchange_rate_data['rate']:,.2f}원 ({exchange_rate_data['status_text']})" if exchange_rate_data['success'] else "데이터 없음"
 
+            # 미국 지수/테마/이벤트와 환율(1원 단위)이 같으면 이전 분석 재사용
+            prompt_key, reused = self._reuse_prompt_result('KOREA_MARKET_IMPACT_PROMPT', {
+                'us_indices': us_indices,
+                'us_hot_themes': us_themes,
+                'us_key_events': events_str,
+                'usd_krw_rate': exchange_rate_data['rate'] if exchange_rate_data['success'] else None
+            }, "korea impact")
+            if reused is not None:
+                self.cache.save('MARKET', 'korea_impact', reused)
+                return reused
+
             prompt = prompts.KOREA_MARKET_IMPACT_PROMPT.format(
                 us_indices=us_indices,
                 us_hot_themes=us_themes,
@@ -372,6 +561,8 @@ class GeminiService:
 
             # 2. 결과 캐싱
             self.cache.save('MARKET', 'korea_impact', result)
+            if 'raw_text' not in result:
+                self.prompt_cache.put('KOREA_MARKET_IMPACT_PROMPT', prompt_key, result)
             return result
 
         except Exception as e:
@@ -471,19 +662,95 @@ class GeminiService:
             Logger.error("Gemini", f"핵심 테마 선정 실패: {e}")
             return []
 
-    def generate_outlook(self, stock_name, stock_info, supply_demand, technical_indicators, news_analysis, market_data=None, fundamental_data=None, theme_service=None, bollinger_data=None, force_refresh=False):
+    def generate_outlook(self, stock_name, stock_info, supply_demand, technical_indicators, news_analysis, market_data=None, fundamental_data=None, theme_service=None, bollinger_data=None, force_refresh=False, priority=None):
         """
         종합 정보를 바탕으로 AI 전망 생성 (캐싱 적용)
         Core + Active 테마 전략 적용
+        priority: LLM 스케줄러 우선순위 (LLMScheduler.INTERACTIVE/SENTIMENT, 기본값: INTERACTIVE)
         """
         stock_code = stock_info.get('code', 'unknown')
         
-        # 1. 캐시 확인
-        cached_data, cache_info = self.cache.load(stock_code, 'outlook', force_refresh)
+        def generate(priority=priority):
+            # 같은 종목 전망 생성이 이미 진행 중이면 그 결과를 공유
+            with priority_scope(priority):
+                return self._run_single_flight(
+                    stock_code, 'outlook',
+                    lambda: self._generate_outlook(stock_name, stock_info, supply_demand, technical_indicators, news_analysis,
+                                                   market_data, fundamental_data, theme_service, bollinger_data)
+                )
+
+        # 1. 캐시 확인 (유효 시간이 조금 지난 결과는 바로 반환하고 백그라운드에서 갱신)
+        cached_data, cache_info = self.cache.load(
+            stock_code, 'outlook', force_refresh, revalidate=lambda: generate(LLMScheduler.PREWARM)
+        )
+        cached_data = self._validate_outlook_inputs(
+            cached_data, stock_code, stock_info, supply_demand, technical_indicators, news_analysis, fundamental_data, bollinger_data
+        )
         if cached_data:
             cached_data['_cache_info'] = cache_info
             return cached_data
 
+        # 2. 캐시 미스: 직접 생성
+        return generate()
+
+    def generate_outlook_stream(self, stock_name, stock_info, supply_demand, technical_indicators, news_analysis, market_data=None, fundamental_data=None, theme_service=None, bollinger_data=None, force_refresh=False, priority=None):
+        """
+        generate_outlook의 스트리밍 버전 (상세 화면 SSE용)
+        Gemini 응답이 도착하는 대로 지금까지 파싱된 섹션을 먼저 전달하고, 최종 결과는 기존과 같이 캐싱
+        
+        Yields:
+            ('outlook_partial', partial) - 투자의견/핵심 논리/매매 시나리오(가격 전략)/상세 분석 중 지금까지 받은 부분
+            ('outlook', outlook) - 최종 결과 (generate_outlook과 같은 형식, 항상 마지막)
+            같은 종목 전망이 이미 생성 중이거나 캐시에 있으면 'outlook'만 전달
+        """
+        stock_code = stock_info.get('code', 'unknown')
+        updates = queue.Queue()
+        
+        def generate(priority=priority, on_partial=None):
+            with priority_scope(priority):
+                return self._run_single_flight(
+                    stock_code, 'outlook',
+                    lambda: self._generate_outlook(stock_name, stock_info, supply_demand, technical_indicators, news_analysis,
+                                                   market_data, fundamental_data, theme_service, bollinger_data,
+                                                   on_partial=on_partial)
+                )
+        
+        # 1. 캐시 확인 (generate_outlook과 동일)
+        cached_data, cache_info = self.cache.load(
+            stock_code, 'outlook', force_refresh, revalidate=lambda: generate(LLMScheduler.PREWARM)
+        )
+        cached_data = self._validate_outlook_inputs(
+            cached_data, stock_code, stock_info, supply_demand, technical_indicators, news_analysis, fundamental_data, bollinger_data
+        )
+        if cached_data:
+            cached_data['_cache_info'] = cache_info
+            yield 'outlook', cached_data
+            return
+        
+        # 2. 별도 스레드에서 생성하며 중간 결과를 큐로 전달
+        #    (클라이언트 연결이 끊겨도 생성은 끝까지 진행되어 캐시에 저장됨)
+        def run():
+            try:
+                outlook = generate(on_partial=lambda partial: updates.put(('outlook_partial', partial)))
+            except Exception as e:
+                Logger.error("Gemini", f"전망 생성 실패: {e}")
+                outlook = {'recommendation': "중립", 'confidence': 0, 'reasoning': f"분석 실패: {str(e)}", 'raw_response': ""}
+            updates.put(('outlook', outlook))
+        
+        threading.Thread(target=run, name=f"outlook-stream-{stock_code}", daemon=True).start()
+        while True:
+            kind, data = updates.get()
+            yield kind, data
+            if kind == 'outlook':
+                return
+
+    def _generate_outlook(self, stock_name, stock_info, supply_demand, technical_indicators, news_analysis, market_data=None, fundamental_data=None, theme_service=None, bollinger_data=None, on_partial=None):
+        """
+        전망 생성 실행 (캐시 미스 시, 동시 요청당 1회)
+        on_partial: 지정하면 스트리밍으로 생성하며 파싱된 섹션이 바뀔 때마다 on_partial(partial) 호출
+        """
+        stock_code = stock_info.get('code', 'unknown')
+        
         try:
             # --- 테마 분석 (Core + Active) ---
             stock_sector_str = "정보 없음"
@@ -495,19 +762,8 @@ class GeminiService:
                 # 2. 핵심 테마 선정 (AI)
                 core_themes = self.select_core_themes(stock_name, stock_code, all_themes)
                 
-                # 3. 오늘 강세 테마 (Active) 필터링
-                # 등락률이 1.0% 이상이거나, 상위 3개 테마
-                active_themes = []
-                for theme in all_themes:
-                    try:
-                        fluc = float(theme.get('theme_fluctuation', 0))
-                        if fluc >= 1.0:
-                            active_themes.append(f"{theme['theme_name']}({fluc}%)")
-                    except:
-                        pass
-                
-                # 상위 3개만 추리기
-                active_themes = active_themes[:3]
+                # 3. 오늘 강세 테마 (Active): 등락률 1.0% 이상 소속 테마 중 상위 3개 (테마 캐시 갱신 시 미리 계산)
+                active_themes = [f"{t['theme_name']}({t['fluctuation']}%)" for t in theme_service.get_active_themes(stock_code, limit=3)]
                 
                 # 프롬프트용 문자열 구성
                 stock_sector_str = f"- 핵심 테마(Identity): {', '.join(core_themes)}\n- 오늘 강세 테마(Active): {', '.join(active_themes) if active_themes else '없음 (모든 테마가 약세거나 보합)'}"
@@ -559,6 +815,25 @@ class GeminiService:
                 except:
                     pass
 
+            # 같은 종목 상태(신호/수급 방향/가격대) + 같은 시장 상황이면 이전 전망 재사용
+            input_state = self._outlook_state(stock_info, supply_demand, technical_indicators, news_analysis, bollinger_data)
+            prompt_key, reused = self._reuse_prompt_result('OUTLOOK_GENERATION_PROMPT', dict(
+                input_state,
+                market_cap=fundamental_data.get('market_cap_raw'),
+                per=fundamental_data.get('per'),
+                pbr=fundamental_data.get('pbr'),
+                roe=fundamental_data.get('roe'),
+                stock_name=stock_name,
+                stock_sector=stock_sector_str,
+                market_context=market_context_str,
+                current_hot_themes=current_hot_themes,
+                usd_krw_rate=exchange_rate_data['rate'] if exchange_rate_data['success'] else None
+            ), f"outlook {stock_code}")
+            if reused is not None:
+                reused['_input_state'] = input_state
+                self.cache.save(stock_code, 'outlook', reused)
+                return reused
+
             prompt = prompts.OUTLOOK_GENERATION_PROMPT.format(
                 stock_name=stock_name,
                 stock_sector=stock_sector_str,
@@ -591,169 +866,516 @@ class GeminiService:
                 is_squeeze="발생 (변동성 축소)" if bollinger_data and bollinger_data.get('summary', {}).get('is_squeeze') else "미발생"
             )
             
-            result_text = self._call_gemini_api(prompt)
+            if on_partial is None:
+                result_text = self._call_gemini_api(prompt)
+            else:
+                last_partial = {}
+                
+                def on_text(text):
+                    # 섹션 내용(가격 전략 포함)이 바뀐 경우에만 전달
+                    partial = self._parse_outlook_response(text, partial=True)
+                    if partial != last_partial:
+                        last_partial.clear()
+                        last_partial.update(partial)
+                        on_partial(partial)
+                
+                result_text = self._call_gemini_api_stream(prompt, on_text)
             
             if not result_text:
                 raise Exception("API 응답 없음")
             
-            # 1. 초기값 설정
-            parsed_data = {
-                "recommendation": "중립",
-                "confidence": 0,
-                "key_logic": "",         # 2번 핵심 논리 (추가됨)
-                "trading_scenario_raw": "", # 3번 시나리오 원문
-                "detailed_analysis": "", # 4번 상세 분석
-                "price_strategy": {      # 매매 전략 구조화
-                    "entry": "",
-                    "target": "",
-                    "stop_loss": ""
-                }
+            result = self._parse_outlook_response(result_text)
+            result['_cache_info'] = {'cached': False, 'reason': 'new_data', 'age_seconds': 0}
+            result['_input_state'] = input_state
+
+            # 2. 결과 캐싱
+            self.cache.save(stock_code, 'outlook', result)
+            self.prompt_cache.put('OUTLOOK_GENERATION_PROMPT', prompt_key, result)
+            return result
+            
+        except Exception as e:
+            Logger.error("Gemini", f"전망 생성 실패: {e}")
+            return {
+                'recommendation': "중립",
+                'confidence': 0,
+                'reasoning': f"분석 실패: {str(e)}",
+                'raw_response': ""
             }
 
-            lines = result_text.strip().split('\n')
-            current_section = None
+    def generate_outlook_batch(self, stocks, market_data=None, theme_service=None, force_refresh=False, priority=None):
+        """
+        여러 종목의 간략 전망을 한 번의 프롬프트로 생성 (카드 감성 분석용, 캐싱 적용)
+        
+        종목마다 generate_outlook + select_core_themes + 뉴스 분석을 따로 호출하는 대신,
+        종목별 요약 정보를 outlook_batch_size개씩 묶어 호출하고 응답을 종목별로 나눕니다.
+        (핵심 테마는 캐시된 값이나 테마 목록 앞쪽을, 뉴스는 캐시된 분석이나 네이버 헤드라인을 사용)
+        
+        Args:
+            stocks: [{'code', 'name', 'price', 'rate', 'supply_demand', 'technical', 'bollinger',
+                      'fundamental', 'news_analysis'(선택)}, ...]
+            market_data: get_market_context() 결과 (모든 종목 공통)
+            priority: LLM 스케줄러 우선순위 (기본값: INTERACTIVE)
+            
+        Returns:
+            dict: {code: outlook} - outlook은 generate_outlook 결과 형식 + 'news_sentiment'
+                  응답에서 찾지 못한 종목은 제외 (호출자가 개별 generate_outlook으로 대체)
+        """
+        stocks = {self.cache._normalize_code(stock['code']): stock for stock in stocks}
+        results = {}
+        
+        # 1. 캐시 확인
+        if not force_refresh:
+            for code, data in self.cache.load_many(list(stocks), 'outlook_batch').items():
+                data['_cache_info'] = {'cached': True, 'reason': 'batch_cache'}
+                results[code] = data
+        
+        pending = [code for code in stocks if code not in results]
+        if not pending:
+            return results
+        
+        # 2. 종목별 요약 블록 구성 (LLM 호출 없이: 캐시된 핵심 테마, 네이버 헤드라인)
+        core_themes = self.cache.load_many(pending, 'core_themes')
+        headlines = self._fetch_batch_headlines(
+            [code for code in pending if not stocks[code].get('news_analysis')]
+        )
+        blocks = {
+            code: self._format_batch_stock_block(code, stocks[code], core_themes.get(code), headlines.get(code), theme_service)
+            for code in pending
+        }
+        
+        market_data = market_data or {}
+        exchange_rate_data = self.exchange_rate_fetcher.get_usd_krw_rate()
+        common = {
+            'market_context': f"국내 {market_data.get('market_index', '정보 없음')} / "
+                              f"미국 {market_data.get('us_indices', '정보 없음')} / "
+                              f"미국 강세 섹터 {market_data.get('us_themes', '정보 없음')}",
+            'current_hot_themes': market_data.get('themes', '정보 없음'),
+            'usd_krw_exchange_rate': f"{exchange_rate_data['rate']:,.2f}원 ({exchange_rate_data['status_text']})"
+                                     if exchange_rate_data['success'] else "데이터 없음"
+        }
+        
+        # 3. 묶음별 호출 (스케줄러가 동시 실행 수를 제한하므로 묶음끼리는 병렬로 제출)
+        chunks = [pending[i:i + self.outlook_batch_size] for i in range(0, len(pending), self.outlook_batch_size)]
+        
+        def run_chunk(codes):
+            prompt = prompts.BATCH_OUTLOOK_PROMPT.format(
+                stock_count=len(codes),
+                stock_blocks="\n".join(blocks[code] for code in codes),
+                **common
+            )
+            with priority_scope(priority):
+                result_text = self._call_gemini_api(prompt)
+            return self._split_batch_outlook(result_text, codes) if result_text else {}
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            for parsed in executor.map(run_chunk, chunks):
+                for code, outlook in parsed.items():
+                    self.cache.save(code, 'outlook_batch', outlook)
+                    outlook['_cache_info'] = {'cached': False, 'reason': 'batch', 'age_seconds': 0}
+                    results[code] = outlook
+        
+        missing = [code for code in pending if code not in results]
+        self.batch_calls += len(chunks)
+        self.batch_stocks += len(pending) - len(missing)
+        self.batch_parse_failures += len(missing)
+        Logger.info("Gemini", f"묶음 전망: {len(pending)}종목 → {len(chunks)}회 호출"
+                              + (f", 결과 없음 {len(missing)}종목 {missing}" if missing else ""))
+        return results
+
+    def _fetch_batch_headlines(self, codes, limit=3):
+        """묶음 전망용 네이버 금융 최신 헤드라인 (종목당 limit개, 병렬 수집)"""
+        if not codes:
+            return {}
+        from naver_news_crawler import NaverNewsCrawler
+        crawler = NaverNewsCrawler()
+        
+        def fetch(code):
+            try:
+                return [news['headline'] for news in (crawler.get_news(code) or [])[:limit]]
+            except Exception as e:
+                Logger.warning("Gemini", f"네이버 뉴스 검색 실패 ({code}): {e}")
+                return []
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(codes))) as executor:
+            return dict(zip(codes, executor.map(fetch, codes)))
+
+    def _format_batch_stock_block(self, code, stock, core_themes, headlines, theme_service=None):
+        """묶음 전망 프롬프트의 종목별 요약 블록"""
+        if not core_themes and theme_service:
+            # 핵심 테마 캐시가 없으면 AI 선정 대신 테마 목록 앞쪽 사용
+            core_themes = [t['theme_name'] for t in theme_service.find_themes_by_stock(code)[:3]]
+        
+        news_analysis = stock.get('news_analysis')
+        if news_analysis:
+            news_context = f"{news_analysis.get('reason', '')} ({news_analysis.get('sentiment', '중립')})"
+        elif headlines:
+            news_context = " / ".join(headlines)
+        else:
+            news_context = "없음"
+        
+        technical = stock.get('technical') or {}
+        supply_demand = stock.get('supply_demand') or {}
+        fundamental = stock.get('fundamental') or {}
+        bollinger = stock.get('bollinger')
+        return prompts.BATCH_OUTLOOK_STOCK_BLOCK.format(
+            stock_code=code,
+            stock_name=stock.get('name', code),
+            core_themes=', '.join(core_themes) if core_themes else '정보 없음',
+            current_price=stock.get('price', 'N/A'),
+            change_rate=stock.get('rate', 'N/A'),
+            foreign_net=supply_demand.get('foreign_net', 'N/A'),
+            institution_net=supply_demand.get('institution_net', 'N/A'),
+            ma5=technical.get('ma5', 0),
+            ma20=technical.get('ma20', 0),
+            ma60=technical.get('ma60', 0),
+            ma_signal=technical.get('ma_signal', '중립'),
+            rsi=technical.get('rsi', 50),
+            rsi_signal=technical.get('rsi_signal', '중립'),
+            macd=technical.get('macd', 0),
+            macd_signal=technical.get('macd_signal', '중립'),
+            bollinger_summary=self._format_bollinger_summary(bollinger),
+            is_squeeze="발생" if bollinger and bollinger.get('summary', {}).get('is_squeeze') else "미발생",
+            market_cap=self._format_large_number(fundamental.get('market_cap_raw', '0')),
+            per=fundamental.get('per', 'N/A'),
+            pbr=fundamental.get('pbr', 'N/A'),
+            roe=fundamental.get('roe', 'N/A'),
+            news_context=news_context
+        )
+
+    def _split_batch_outlook(self, result_text, codes):
+        """
+        묶음 전망 응답을 "### 종목코드" 구분선으로 나눠 종목별 outlook으로 변환
+        
+        Returns:
+            dict: {code: outlook} - 요청한 종목 중 투자의견 섹션이 있는 종목만
+        """
+        wanted = set(codes)
+        results = {}
+        sections = re.split(r'^\s*#{2,4}\s*\[?A?([0-9A-Za-z]{6})\]?[^\n]*$', result_text, flags=re.MULTILINE)
+        for code, body in zip(sections[1::2], sections[2::2]):
+            if code not in wanted or code in results or not re.search(r'^\s*1\.\s*투자의견', body, flags=re.MULTILINE):
+                continue
+            
+            # 5. 뉴스 심리는 기존 전망 형식에 없으므로 분리한 뒤 나머지를 같은 파서로 처리
+            news_sentiment = '중립'
+            match = re.search(r'^\s*5\.\s*뉴스\s*심리[^\n]*$', body, flags=re.MULTILINE)
+            if match:
+                for label in ('긍정', '부정', '중립'):
+                    if label in match.group(0):
+                        news_sentiment = label
+                        break
+                body = body[:match.start()] + body[match.end():]
             
-            # 섹션별 버퍼
-            logic_buffer = []
-            scenario_buffer = []
-            analysis_buffer = []
+            outlook = self._parse_outlook_response(body.strip())
+            outlook['news_sentiment'] = news_sentiment
+            results[code] = outlook
+        return results
 
-            for line in lines:
-                line = line.strip()
-                if not line: continue
+    def _get_mk_pool(self):
+        """MK AI 검색용 브라우저 풀 (프로세스당 하나, 처음 호출 시 생성)"""
+        with self._mk_pool_lock:
+            if self._mk_pool is None:
+                from mk_scraper import create_browser_pool
+                self._mk_pool = create_browser_pool(headless=True)
+            return self._mk_pool
 
-                # ====================================================
-                # [섹션 감지 로직]
-                # ====================================================
-                if line.startswith("1.") or "투자의견" in line:
-                    current_section = "recommendation_section"
-                    
-                    # 1. 투자의견 및 신뢰도 파싱 (같은 라인에 있음)
-                    # 패턴: 1. 투자의견: [매수] (신뢰도: 80점)
-                    
-                    # A. 투자의견 추출
-                    if "강력매수" in line: parsed_data["recommendation"] = "강력매수"
-                    elif "분할매수" in line: parsed_data["recommendation"] = "분할매수"
-                    elif "매수" in line: parsed_data["recommendation"] = "매수"
-                    elif "매도" in line: parsed_data["recommendation"] = "매도"
-                    elif "관망" in line: parsed_data["recommendation"] = "관망"
-                    
-                    # B. 신뢰도 추출 (숫자 찾기)
-                    # 괄호 안의 '신뢰도: 00점'을 찾음
-                    conf_match = re.search(r'신뢰도[:\s]*(\d+)', line)
-                    if conf_match:
-                        parsed_data["confidence"] = int(conf_match.group(1))
-
-                elif line.startswith("2.") or "핵심 논리" in line:
-                    current_section = "key_logic"
-                    # [FIX] 같은 라인에 내용이 있는 경우 처리
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        if len(parts) > 1:
-                            content = parts[1].strip()
-                            if content:
-                                logic_buffer.append(content)
-                    
-                elif line.startswith("3.") or "매매 시나리오" in line:
-                    current_section = "trading_scenario"
-                    # [FIX] 같은 라인에 내용이 있는 경우 처리
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        if len(parts) > 1:
-                            content = parts[1].strip()
-                            if content:
-                                scenario_buffer.append(content)
-                                # 가격 전략 파싱 시도
-                                if ":" in content:
-                                    try:
-                                        key_part, value_part = content.split(":", 1)
-                                        key_clean = key_part.replace("-", "").strip()
-                                        value_clean = value_part.strip()
-                                        
-                                        if "진입" in key_clean:
-                                            parsed_data["price_strategy"]["entry"] = value_clean
-                                        elif "목표" in key_clean:
-                                            parsed_data["price_strategy"]["target"] = value_clean
-                                        elif "손절" in key_clean:
-                                            parsed_data["price_strategy"]["stop_loss"] = value_clean
-                                    except:
-                                        pass
-                    
-                elif line.startswith("4.") or "상세 분석" in line:
-                    current_section = "detailed_analysis"
-                    # [FIX] 같은 라인에 내용이 있는 경우 처리
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        if len(parts) > 1:
-                            content = parts[1].strip()
-                            if content:
-                                analysis_buffer.append(content)
+    def warm_mk_browser_pool(self):
+        """
+        서버 시작 시 백그라운드에서 호출: ChromeDriver 경로 확인 + 브라우저 세션 미리 생성
+        (config.MK_BROWSER_WARM_SESSIONS개, 기본값 1)
+        """
+        try:
+            from mk_scraper import resolve_driver_path
+            resolve_driver_path()
+            started = self._get_mk_pool().warm(getattr(config, 'MK_BROWSER_WARM_SESSIONS', 1))
+            Logger.info("Gemini", f"MK 브라우저 풀 준비 완료 (세션 {started}개)")
+        except Exception as e:
+            Logger.warning("Gemini", f"MK 브라우저 풀 준비 실패 (첫 검색 때 다시 시도): {e}")
 
-                # ====================================================
-                # [섹션별 내용 수집]
-                # ====================================================
-                else:
-                    if current_section == "key_logic":
-                        # 불릿 포인트 등 내용 수집
-                        logic_buffer.append(line)
-                        
-                    elif current_section == "trading_scenario":
-                        scenario_buffer.append(line)
-                        
-                        # 가격 전략 정밀 파싱 (- 진입: 10000원 (근거...))
-                        # 콜론(:) 기준으로 값을 분리
-                        if ":" in line:
-                            key_part, value_part = line.split(":", 1)
-                            key_clean = key_part.replace("-", "").strip()
-                            value_clean = value_part.strip()
-                            
-                            if "진입" in key_clean:
-                                parsed_data["price_strategy"]["entry"] = value_clean
-                            elif "목표" in key_clean:
-                                parsed_data["price_strategy"]["target"] = value_clean
-                            elif "손절" in key_clean:
-                                parsed_data["price_strategy"]["stop_loss"] = value_clean
-
-                    elif current_section == "detailed_analysis":
-                        analysis_buffer.append(line)
-
-            # 버퍼 내용을 parsed_data에 할당
-            parsed_data["key_logic"] = "\n".join(logic_buffer)
-            parsed_data["trading_scenario_raw"] = "\n".join(scenario_buffer)
-            parsed_data["detailed_analysis"] = "\n".join(analysis_buffer)
+    def _reuse_prompt_result(self, template_name, key_inputs, label):
+        """
+        같은 프롬프트 입력(정규화/양자화 기준)으로 생성한 결과 조회
+        
+        Returns:
+            (prompt_key, result) - result는 없으면 None (생성 후 prompt_cache.put(template_name, prompt_key, ...)로 저장)
+        """
+        prompt_key = self.prompt_cache.make_key(template_name, key_inputs)
+        result = self.prompt_cache.get(template_name, prompt_key)
+        if result is not None:
+            Logger.info("Gemini", f"[{label}] 입력이 같은 이전 분석 재사용 (프롬프트 캐시)")
+            if isinstance(result, dict):
+                result['_cache_info'] = {'cached': True, 'reason': 'prompt_cache', 'age_seconds': 0}
+        return prompt_key, result
 
-            result = {
-                'recommendation': parsed_data['recommendation'],  # 투자의견 (매수/중립/매도)
-                'confidence': parsed_data['confidence'],          # 신뢰도 (0~100)
+    # 바뀌면 전망을 새로 만드는 종목 상태 (가격은 outlook_price_band_pct 범위로 따로 비교)
+    OUTLOOK_STATE_FIELDS = ('rsi_signal', 'macd_signal', 'ma_signal', 'foreign_trend', 'institution_trend',
+                            'news_sentiment', 'is_squeeze')
+
+    def _outlook_state(self, stock_info, supply_demand, technical_indicators, news_analysis, bollinger_data=None):
+        """
+        전망의 전제가 되는 종목 상태 (지표 신호 라벨, 수급 방향, 뉴스 심리, 스퀴즈 여부, 기준 가격)
+        RSI/MACD 수치나 수급 수량처럼 장중 틱마다 바뀌는 값은 넣지 않음
+        """
+        technical_indicators = technical_indicators or {}
+        supply_demand = supply_demand or {}
+        summary = (bollinger_data or {}).get('summary') or {}
+        return {
+            'stock_code': stock_info.get('code'),
+            'current_price': PromptCache.to_number(stock_info.get('price')),
+            'rsi_signal': technical_indicators.get('rsi_signal'),
+            'macd_signal': technical_indicators.get('macd_signal'),
+            'ma_signal': technical_indicators.get('ma_signal'),
+            'foreign_trend': self._trend(supply_demand.get('foreign_net')),
+            'institution_trend': self._trend(supply_demand.get('institution_net')),
+            'news_sentiment': (news_analysis or {}).get('sentiment'),
+            'is_squeeze': bool(summary.get('is_squeeze'))
+        }
+
+    @staticmethod
+    def _trend(value):
+        """순매수 방향 (1: 매수, -1: 매도, 0: 없음/알 수 없음)"""
+        number = PromptCache.to_number(value)
+        if not number:
+            return 0
+        return 1 if number > 0 else -1
+
+    def _outlook_change(self, cached_state, state):
+        """캐시된 전망 이후 실질적으로 바뀐 항목 (없으면 None)"""
+        for field in self.OUTLOOK_STATE_FIELDS:
+            if cached_state.get(field) != state.get(field):
+                return field
+        cached_price, price = cached_state.get('current_price'), state.get('current_price')
+        if cached_price and price is not None:
+            if abs(price / cached_price - 1) * 100 > self.outlook_price_band_pct:
+                return 'current_price'
+        return None
+
+    def _validate_outlook_inputs(self, cached_data, stock_code, stock_info, supply_demand, technical_indicators, news_analysis, fundamental_data=None, bollinger_data=None):
+        """
+        캐시된 전망을 만들 때와 비교해 신호 라벨/수급 방향/뉴스 심리가 바뀌었거나
+        가격이 outlook_price_band_pct 이상 움직였으면 무효화 (TTL 안이라도 새로 생성)
+        """
+        if not cached_data or not cached_data.get('_input_state'):
+            return cached_data
+        state = self._outlook_state(stock_info, supply_demand, technical_indicators, news_analysis, bollinger_data)
+        changed = self._outlook_change(cached_data['_input_state'], state)
+        if changed is None:
+            return cached_data
+        Logger.info("Gemini", f"[outlook] {stock_code}: {changed} 변경으로 캐시 무효화")
+        return None
+
+    def _parse_outlook_response(self, result_text, partial=False):
+        """
+        전망 응답 텍스트(1. 투자의견 ~ 4. 상세 분석 형식)를 outlook 딕셔너리로 변환
+        partial=True: 스트리밍 중인 일부 텍스트 (원문 대체/원문 필드 없이 지금까지의 섹션만, 'partial': True)
+        """
+        # 1. 초기값 설정
+        parsed_data = {
+            "recommendation": "중립",
+            "confidence": 0,
+            "key_logic": "",         # 2번 핵심 논리 (추가됨)
+            "trading_scenario_raw": "", # 3번 시나리오 원문
+            "detailed_analysis": "", # 4번 상세 분석
+            "price_strategy": {      # 매매 전략 구조화
+                "entry": "",
+                "target": "",
+                "stop_loss": ""
+            }
+        }
+
+        lines = result_text.strip().split('\n')
+        current_section = None
+        
+        # 섹션별 버퍼
+        logic_buffer = []
+        scenario_buffer = []
+        analysis_buffer = []
+
+        for line in lines:
+            line = line.strip()
+            if not line: continue
+
+            # ====================================================
+            # [섹션 감지 로직]
+            # ====================================================
+            if line.startswith("1.") or "투자의견" in line:
+                current_section = "recommendation_section"
                 
-                # [NEW] 프롬프트의 '2. 핵심 논리 (3줄 요약)' 부분
-                'key_logic': parsed_data['key_logic'],
+                # 1. 투자의견 및 신뢰도 파싱 (같은 라인에 있음)
+                # 패턴: 1. 투자의견: [매수] (신뢰도: 80점)
                 
-                # [NEW] 진입가/목표가/손절가가 분리된 딕셔너리 {'entry':.., 'target':.., 'stop_loss':..}
-                'price_strategy': parsed_data['price_strategy'],
+                # A. 투자의견 추출
+                if "강력매수" in line: parsed_data["recommendation"] = "강력매수"
+                elif "분할매수" in line: parsed_data["recommendation"] = "분할매수"
+                elif "매수" in line: parsed_data["recommendation"] = "매수"
+                elif "매도" in line: parsed_data["recommendation"] = "매도"
+                elif "관망" in line: parsed_data["recommendation"] = "관망"
                 
-                # '3. 매매 시나리오' 섹션의 원문 텍스트 (줄글 형태가 필요할 때 사용)
-                'trading_scenario': parsed_data['trading_scenario_raw'],
+                # B. 신뢰도 추출 (숫자 찾기)
+                # 괄호 안의 '신뢰도: 00점'을 찾음
+                conf_match = re.search(r'신뢰도[:\s]*(\d+)', line)
+                if conf_match:
+                    parsed_data["confidence"] = int(conf_match.group(1))
+
+            elif line.startswith("2.") or "핵심 논리" in line:
+                current_section = "key_logic"
+                # [FIX] 같은 라인에 내용이 있는 경우 처리
+                if ":" in line:
+                    parts = line.split(":", 1)
+                    if len(parts) > 1:
+                        content = parts[1].strip()
+                        if content:
+                            logic_buffer.append(content)
                 
-                # '4. 상세 분석' 섹션 (기존 reasoning 대응)
-                # 내용이 없으면(파싱 실패 시) 원문 전체를 넣는 안전장치 포함
-                'detailed_analysis': parsed_data['detailed_analysis'] if parsed_data['detailed_analysis'] else result_text,
-                'raw_response': result_text,
-                '_cache_info': {'cached': False, 'reason': 'new_data', 'age_seconds': 0}
-            }
+            elif line.startswith("3.") or "매매 시나리오" in line:
+                current_section = "trading_scenario"
+                # [FIX] 같은 라인에 내용이 있는 경우 처리
+                if ":" in line:
+                    parts = line.split(":", 1)
+                    if len(parts) > 1:
+                        content = parts[1].strip()
+                        if content:
+                            scenario_buffer.append(content)
+                            # 가격 전략 파싱 시도
+                            if ":" in content:
+                                try:
+                                    key_part, value_part = content.split(":", 1)
+                                    key_clean = key_part.replace("-", "").strip()
+                                    value_clean = value_part.strip()
+                                    
+                                    if "진입" in key_clean:
+                                        parsed_data["price_strategy"]["entry"] = value_clean
+                                    elif "목표" in key_clean:
+                                        parsed_data["price_strategy"]["target"] = value_clean
+                                    elif "손절" in key_clean:
+                                        parsed_data["price_strategy"]["stop_loss"] = value_clean
+                                except:
+                                    pass
+                
+            elif line.startswith("4.") or "상세 분석" in line:
+                current_section = "detailed_analysis"
+                # [FIX] 같은 라인에 내용이 있는 경우 처리
+                if ":" in line:
+                    parts = line.split(":", 1)
+                    if len(parts) > 1:
+                        content = parts[1].strip()
+                        if content:
+                            analysis_buffer.append(content)
 
-            # 2. 결과 캐싱
-            self.cache.save(stock_code, 'outlook', result)
-            return result
+            # ====================================================
+            # [섹션별 내용 수집]
+            # ====================================================
+            else:
+                if current_section == "key_logic":
+                    # 불릿 포인트 등 내용 수집
+                    logic_buffer.append(line)
+                    
+                elif current_section == "trading_scenario":
+                    scenario_buffer.append(line)
+                    
+                    # 가격 전략 정밀 파싱 (- 진입: 10000원 (근거...))
+                    # 콜론(:) 기준으로 값을 분리
+                    if ":" in line:
+                        key_part, value_part = line.split(":", 1)
+                        key_clean = key_part.replace("-", "").strip()
+                        value_clean = value_part.strip()
+                        
+                        if "진입" in key_clean:
+                            parsed_data["price_strategy"]["entry"] = value_clean
+                        elif "목표" in key_clean:
+                            parsed_data["price_strategy"]["target"] = value_clean
+                        elif "손절" in key_clean:
+                            parsed_data["price_strategy"]["stop_loss"] = value_clean
+
+                elif current_section == "detailed_analysis":
+                    analysis_buffer.append(line)
+
+        # 버퍼 내용을 parsed_data에 할당
+        parsed_data["key_logic"] = "\n".join(logic_buffer)
+        parsed_data["trading_scenario_raw"] = "\n".join(scenario_buffer)
+        parsed_data["detailed_analysis"] = "\n".join(analysis_buffer)
+
+        result = {
+            'recommendation': parsed_data['recommendation'],  # 투자의견 (매수/중립/매도)
+            'confidence': parsed_data['confidence'],          # 신뢰도 (0~100)
             
-        except Exception as e:
-            Logger.error("Gemini", f"전망 생성 실패: {e}")
-            return {
-                'recommendation': "중립",
-                'confidence': 0,
-                'reasoning': f"분석 실패: {str(e)}",
-                'raw_response': ""
+            # [NEW] 프롬프트의 '2. 핵심 논리 (3줄 요약)' 부분
+            'key_logic': parsed_data['key_logic'],
+            
+            # [NEW] 진입가/목표가/손절가가 분리된 딕셔너리 {'entry':.., 'target':.., 'stop_loss':..}
+            'price_strategy': parsed_data['price_strategy'],
+            
+            # '3. 매매 시나리오' 섹션의 원문 텍스트 (줄글 형태가 필요할 때 사용)
+            'trading_scenario': parsed_data['trading_scenario_raw'],
+            
+            # '4. 상세 분석' 섹션 (기존 reasoning 대응)
+            # 내용이 없으면(파싱 실패 시) 원문 전체를 넣는 안전장치 포함
+            'detailed_analysis': parsed_data['detailed_analysis'] if parsed_data['detailed_analysis'] else result_text,
+            'raw_response': result_text
+        }
+        if partial:
+            result['detailed_analysis'] = parsed_data['detailed_analysis']
+            result['partial'] = True
+            del result['raw_response']
+        return result
+
+    def _run_single_flight(self, stock_code, analysis_type, fn):
+        """
+        (종목코드, 분석 타입, 영업일) 단위로 동시 실행을 1회로 제한
+        먼저 들어온 요청이 실행하고, 실행 중에 들어온 요청은 같은 결과의 사본을 받음
+        """
+        code = stock_code[1:] if stock_code and stock_code.startswith('A') else stock_code
+        key = (code, analysis_type, get_business_date())
+        result, shared = self.inflight.do(key, lambda: self._run_once_per_host(key, fn))
+        
+        if shared and isinstance(result, dict):
+            Logger.info("Gemini", f"[{analysis_type}] {code}: 진행 중인 분석 결과 공유 (중복 호출 생략)")
+            result = dict(result)
+            result['_cache_info'] = {'cached': True, 'reason': 'shared_inflight', 'age_seconds': 0}
+        return result
+
+    def _run_once_per_host(self, key, fn):
+        """
+        같은 호스트의 다른 워커 프로세스와 분석 실행을 1회로 제한
+        키별 프로세스 간 락을 잡은 뒤, 기다리는 동안 다른 프로세스가 저장한 결과가 있으면 그것을 사용
+        (분석 결과 저장소 cache/gemini_cache.db는 모든 프로세스가 공유)
+        """
+        if self.shared_cache is None:
+            return fn()
+        
+        code, analysis_type, business_date = key
+        started = time.time()
+        try:
+            with self.shared_cache.lock(f"gemini:{code}:{analysis_type}:{business_date}", timeout=self.HOST_LOCK_TIMEOUT):
+                data = self.cache.load_since(code, analysis_type, started)
+                if data is not None:
+                    Logger.info("Gemini", f"[{analysis_type}] {code}: 다른 워커 프로세스의 분석 결과 사용")
+                    self.host_shared += 1
+                    data['_cache_info'] = {'cached': True, 'reason': 'shared_process', 'age_seconds': time.time() - started}
+                    return data
+                return fn()
+        except TimeoutError:
+            Logger.warning("Gemini", f"[{analysis_type}] {code}: 다른 프로세스 대기 시간 초과, 직접 분석")
+            return fn()
+
+    def get_stats(self):
+        """
+        캐시/중복 실행 방지/LLM 스케줄러 통계
+        (shared = 절약한 분석 실행 수, host_shared = 다른 프로세스 결과 사용 수, scheduler = 큐 깊이/대기 시간/토큰,
+         outlook_batch = 묶음 전망 호출/처리 종목/개별 호출로 대체한 종목 수, prompt_cache = 입력 해시 캐시 적중률, mk_browser_pool = MK 검색 브라우저 세션)
+        """
+        return {
+            'cache': self.cache.get_stats(),
+            'single_flight': dict(self.inflight.stats(), host_shared=self.host_shared),
+            'scheduler': self.scheduler.stats(),
+            'prompt_cache': self.prompt_cache.stats(),
+            'mk_browser_pool': self._mk_pool.stats() if self._mk_pool is not None else None,
+            'outlook_batch': {
+                'calls': self.batch_calls,
+                'stocks': self.batch_stocks,
+                'parse_failures': self.batch_parse_failures
             }
+        }
 
     def _format_large_number(self, value_str):
         """
@@ -7,6 +7,7 @@ import json
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from kis_api import KiwoomApi
+from ohlcv_store import OhlcvStore
 
 def calculate_bollinger_features(data, window=20, num_std=2):
     df = pd.DataFrame(data)
@@ -30,11 +31,12 @@ def calculate_bollinger_features(data, window=20, num_std=2):
     return df
 
 def main():
-    api = KiwoomApi()
+    store = OhlcvStore(KiwoomApi())
     code = "005930" # Samsung Electronics
     
-    print(f"Fetching data for {code}...")
-    daily_data = api.get_daily_chart_data(code)
+    # 최근 200일 표시 + 120일 스퀴즈 판단 + 20일 밴드에 필요한 이력 확보 (로컬 저장소 증분 갱신)
+    print(f"Loading data for {code}...")
+    daily_data = store.get_daily_chart(code, min_bars=200 + 120 + 20)
     
     if not daily_data:
         print("Failed to fetch data.")
@@ -0,0 +1,207 @@
+"""
+벡터화 기술적 지표 엔진 (NumPy)
+================================================================
+연속된 float64 배열을 한 번 받아 모든 지표를 한 번에 계산합니다.
+행 단위 Python 반복 없이 누적합(cumsum)과 재귀 필터(EMA) 커널만 사용합니다.
+
+- ema: y[n] = a*x[n] + (1-a)*y[n-1] (pandas ewm(adjust=False) 커널로 계산, 기존 결과와 비트 단위로 동일)
+- rolling_mean / rolling_std: 기준값을 뺀(centering) 누적합 차분, 구간 내 NaN이 있으면 NaN
+- rolling_min: sliding_window_view 기반, 구간 내 NaN이 있으면 NaN (pandas min_periods=window와 동일)
+- 모든 함수는 마지막 축(axis=-1)을 시간 축으로 보므로 (종목 수, 봉 수) 2차원 배열도 그대로 처리
+
+TechnicalIndicators(technical_indicators.py)는 이 엔진을 감싼 얇은 래퍼입니다.
+================================================================
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+def as_float_array(values):
+    """값 목록 → float64 배열 (숫자로 변환할 수 없는 값은 NaN)"""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([_to_float(v) for v in values], dtype=np.float64)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def fill_gaps(x):
+    """
+    NaN 채우기 (마지막 축 기준): 중간 NaN은 직전 값, 앞쪽 NaN은 첫 유효값으로 채움
+    EMA처럼 NaN이 이후 값 전체로 번지는 재귀 계산 전에 사용
+    """
+    x = np.asarray(x, dtype=np.float64)
+    valid = ~np.isnan(x)
+    if valid.all():
+        return x
+    n = x.shape[-1]
+    idx = np.where(valid, np.arange(n), 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    filled = np.take_along_axis(x, idx, axis=-1)
+    # 앞쪽 NaN: 첫 유효값으로 채움
+    first = np.argmax(valid, axis=-1)
+    first_val = np.take_along_axis(x, first[..., None], axis=-1)
+    return np.where(np.isnan(filled), first_val, filled)
+
+
+def ema(x, alpha):
+    """
+    지수이동평균 (pandas ewm(alpha=alpha, adjust=False).mean()과 동일, y[0] = x[0])
+
+    닫힌 형태(블록 누적합)로 풀면 보합 구간에서도 1e-11 수준의 오차가 남아 MACD 신호가 바뀌므로,
+    재귀식은 pandas의 ewm 커널로 정확히 계산 (2차원 입력은 행마다 열 하나로 넘겨 한 번에 처리)
+    NaN은 pandas와 같이 처리 (직전 값 유지, 이후 가중치 감쇠)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if x.shape[-1] == 0:
+        return np.empty_like(x)
+    columns = pd.DataFrame(x.reshape(-1, x.shape[-1]).T)
+    y = columns.ewm(alpha=alpha, adjust=False).mean().to_numpy(dtype=np.float64)
+    return np.ascontiguousarray(y.T).reshape(x.shape)
+
+
+def _window_sums(x, window, squares=False):
+    """
+    구간 합 (마지막 축). 반환 길이는 n - window + 1
+    Returns: (sum, sum_sq 또는 None, has_nan, ref)
+    """
+    valid = ~np.isnan(x)
+    # 기준값(행의 첫 유효값)을 빼서 누적합의 자릿수 손실을 줄임
+    # 평균 대신 실제 값을 쓰므로 정수 가격이면 x - ref와 구간 합이 모두 정확함
+    first = np.argmax(valid, axis=-1)[..., None]
+    ref = np.nan_to_num(np.take_along_axis(x, first, axis=-1))  # 전부 NaN인 행은 0
+    centered = np.where(valid, x - ref, 0.0)
+
+    pad = [(0, 0)] * (x.ndim - 1) + [(1, 0)]
+    csum = np.pad(np.cumsum(centered, axis=-1), pad)
+    total = csum[..., window:] - csum[..., :-window]
+
+    total_sq = None
+    if squares:
+        csq = np.pad(np.cumsum(centered * centered, axis=-1), pad)
+        total_sq = csq[..., window:] - csq[..., :-window]
+
+    cnan = np.pad(np.cumsum(~valid, axis=-1), pad)
+    has_nan = (cnan[..., window:] - cnan[..., :-window]) > 0
+    return total, total_sq, has_nan, ref
+
+
+def _constant_windows(x, window):
+    """구간 내 모든 값이 같은지 (pandas는 이 경우 평균=값, 표준편차=0을 정확히 반환)"""
+    view = sliding_window_view(x, window, axis=-1)
+    return view.max(axis=-1) == view.min(axis=-1)
+
+
+def rolling_mean(x, window):
+    """단순 이동평균 (pandas rolling(window).mean()과 동일, 앞쪽 window-1개는 NaN)"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if window < 1 or window > x.shape[-1]:
+        return out
+
+    total, _, has_nan, ref = _window_sums(x, window)
+    mean = (total + ref * window) / window
+    const = _constant_windows(x, window)
+    mean = np.where(const, x[..., window - 1:], mean)
+    out[..., window - 1:] = np.where(has_nan, np.nan, mean)
+    return out
+
+
+def rolling_std(x, window, ddof=1):
+    """이동 표준편차 (pandas rolling(window).std()와 동일, 표본 표준편차)"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if window - ddof < 1 or window > x.shape[-1]:
+        return out
+
+    total, total_sq, has_nan, _ = _window_sums(x, window, squares=True)
+    var = (total_sq - total * total / window) / (window - ddof)
+    var = np.maximum(var, 0.0)
+    var = np.where(_constant_windows(x, window), 0.0, var)
+    out[..., window - 1:] = np.where(has_nan, np.nan, np.sqrt(var))
+    return out
+
+
+def rolling_min(x, window):
+    """이동 최솟값 (pandas rolling(window).min()과 동일, 구간에 NaN이 있으면 NaN)"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if window < 1 or window > x.shape[-1]:
+        return out
+    out[..., window - 1:] = sliding_window_view(x, window, axis=-1).min(axis=-1)
+    return out
+
+
+def rsi(close, period=14):
+    """RSI (Wilder's smoothing, alpha = 1/period). 하락분 평균이 0이면 100"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    with np.errstate(invalid='ignore'):
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+    avg_gain = ema(gain, 1.0 / period)
+    avg_loss = ema(loss, 1.0 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+        values = 100 - (100 / (1 + rs))
+    return np.where(np.isnan(values), 100.0, values)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD 라인과 시그널 라인 (EMA span 기준, alpha = 2 / (span + 1), NaN 종가는 기존과 같이 ewm 규칙으로 처리)"""
+    line = ema(close, 2.0 / (fast + 1)) - ema(close, 2.0 / (slow + 1))
+    return line, ema(line, 2.0 / (signal + 1))
+
+
+def bollinger(close, window=20, num_std=2, squeeze_window=120, squeeze_ratio=1.05):
+    """
+    볼린저 밴드 / %B / 밴드폭 / 스퀴즈
+
+    squeeze_window가 데이터 길이보다 길면 데이터 길이를 사용 (기존 계산과 동일)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    sma = rolling_mean(close, window)
+    std = rolling_std(close, window)
+    upper = sma + std * num_std
+    lower = sma - std * num_std
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = (close - lower) / (upper - lower)
+        bandwidth = (upper - lower) / sma
+    min_bandwidth = rolling_min(bandwidth, min(squeeze_window, close.shape[-1]))
+    with np.errstate(invalid='ignore'):
+        is_squeeze = bandwidth <= (min_bandwidth * squeeze_ratio)
+    return {
+        'sma': sma,
+        'std': std,
+        'upper': upper,
+        'lower': lower,
+        'percent_b': percent_b,
+        'bandwidth': bandwidth,
+        'min_bandwidth': min_bandwidth,
+        'is_squeeze': is_squeeze
+    }
+
+
+def compute_all(close, bb_window=20, num_std=2, squeeze_window=120):
+    """
+    종가 배열 하나로 전체 지표 계산 (1차원 또는 (종목 수, 봉 수) 2차원)
+
+    Returns:
+        dict: 입력과 같은 모양의 배열들
+              rsi, macd, macd_signal, ma5, ma20, ma60,
+              sma, std, upper, lower, percent_b, bandwidth, min_bandwidth, is_squeeze
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    result = {'rsi': rsi(close)}
+    result['macd'], result['macd_signal'] = macd(close)
+    result['ma5'] = rolling_mean(close, 5)
+    result['ma20'] = rolling_mean(close, 20)
+    result['ma60'] = rolling_mean(close, 60)
+    result.update(bollinger(close, window=bb_window, num_std=num_std, squeeze_window=squeeze_window))
+    return result
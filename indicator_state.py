@@ -0,0 +1,465 @@
+"""
+증분(스트리밍) 기술적 지표 상태
+================================================================
+장중에는 당일 봉만 바뀌는데 매 분석마다 전체 차트로 RSI/MACD/MA/볼린저를 다시 계산하지 않도록,
+종목별로 지표 누적값을 들고 있다가 마지막 봉 갱신을 O(1)로 반영합니다.
+
+- 확정 구간(committed): 마지막 봉 이전까지의 누적값
+  EMA(12/26/시그널), RSI 평균 상승/하락폭, 이동평균 구간 합, 볼린저 구간 제곱합,
+  스퀴즈 판단용 밴드폭 최솟값(단조 deque)
+- 잠정 봉(pending): 장중 갱신되는 마지막 봉. 같은 날짜면 교체, 다음 날짜가 오면 확정 후 교체
+- technical() / bollinger_summary()는 TechnicalIndicators.calculate_indicators /
+  calculate_bollinger_bands(summary)와 같은 값을 반환 (신호 판단 로직 공유)
+- to_dict() / from_dict()로 직렬화하여 OHLCV 저장소 옆(cache/ohlcv/{code}.indicators.json)에 저장
+
+가격은 정수(원 단위)이므로 기준값을 뺀 구간 합/제곱합은 오차 없이 더하고 뺄 수 있습니다.
+================================================================
+"""
+import json
+import math
+import os
+import threading
+from collections import deque
+
+from logger import Logger
+from technical_indicators import TechnicalIndicators
+
+
+class IncrementalIndicatorState:
+    """종목 하나의 증분 지표 상태"""
+
+    VERSION = 1
+
+    MA_WINDOWS = (5, 20, 60)
+    BB_WINDOW = 20
+    NUM_STD = 2
+    SQUEEZE_WINDOW = 120
+    SQUEEZE_RATIO = 1.05
+
+    RSI_ALPHA = 1 / 14
+    FAST_ALPHA = 2 / (12 + 1)
+    SLOW_ALPHA = 2 / (26 + 1)
+    SIGNAL_ALPHA = 2 / (9 + 1)
+
+    def __init__(self):
+        self.count = 0  # 확정 봉 수
+        self.committed_date = None
+        self.last_close = None
+        self.ref = None  # 구간 합 기준값 (첫 종가)
+
+        self.ema_fast = self.ema_slow = self.signal = None
+        self.avg_gain = self.avg_loss = None
+
+        # 최근 확정 종가 (기준값 차감), 가장 긴 창(60) - 1개만 필요
+        self.closes = deque(maxlen=max(self.MA_WINDOWS + (self.BB_WINDOW,)) - 1)
+        # 창 크기 w별 최근 (w - 1)개 확정 종가의 합 / 볼린저 창 제곱합
+        self.sums = {w: 0.0 for w in self.MA_WINDOWS + (self.BB_WINDOW,)}
+        self.sum_sq = 0.0
+
+        # 마지막 확정 봉의 MA5/MA20 (골든/데드크로스 판단용)
+        self.prev_ma5 = math.nan
+        self.prev_ma20 = math.nan
+
+        # 최근 (SQUEEZE_WINDOW - 1)개 확정 봉의 밴드폭 최솟값 후보 [(봉 순번, 밴드폭), ...] (오름차순)
+        self.bandwidths = deque()
+
+        self.pending = None  # (date, close)
+
+    # ------------------------------------------------------------
+    # 생성 / 갱신
+    # ------------------------------------------------------------
+    @classmethod
+    def from_bars(cls, bars):
+        """
+        일봉 목록(날짜 오름차순)으로 상태 구성 - 마지막 봉은 잠정 봉으로 둠
+
+        Args:
+            bars: [{'date', 'close', ...}, ...]
+        """
+        state = cls()
+        for bar in bars:
+            state.update(bar['date'], bar['close'])
+        return state
+
+    def update(self, date, close):
+        """
+        마지막 봉 반영 (O(1))
+        - 잠정 봉과 같은 날짜: 종가 교체
+        - 더 늦은 날짜: 잠정 봉을 확정하고 새 잠정 봉 설정
+        - 더 이른 날짜: 무시
+
+        Returns:
+            bool: 반영 여부
+        """
+        date = str(date)
+        close = float(close)
+        if self.pending is not None:
+            if date < self.pending[0]:
+                return False
+            if date > self.pending[0]:
+                self._commit(*self.pending)
+        elif self.committed_date is not None and date <= self.committed_date:
+            return False
+        self.pending = (date, close)
+        return True
+
+    def catch_up(self, bars):
+        """
+        저장소 일봉과 상태를 맞춤 (확정 구간이 일치하면 이후 봉만 반영)
+
+        Returns:
+            bool: 증분 반영 성공 여부 (False면 from_bars로 다시 구성해야 함)
+        """
+        if self.committed_date is None or not bars:
+            return False
+
+        # 확정 마지막 봉 위치 찾기 (대부분 끝에서 1~2번째)
+        index = None
+        for i in range(len(bars) - 1, max(-1, len(bars) - 12), -1):
+            if str(bars[i]['date']) == self.committed_date:
+                index = i
+                break
+
+        # 위치/개수/종가가 다르면 (과거 보충, 수정주가 반영 등) 다시 구성
+        if index is None or index + 1 != self.count or float(bars[index]['close']) != self.last_close:
+            return False
+
+        for bar in bars[index + 1:]:
+            self.update(bar['date'], bar['close'])
+        return True
+
+    def _commit(self, date, close):
+        """잠정 봉을 확정 구간에 반영"""
+        values = self._evaluate(close)
+        centered = close - self.ref if self.ref is not None else 0.0
+        if self.ref is None:
+            self.ref = close
+
+        # EMA / RSI 누적값
+        self.ema_fast = values['ema_fast']
+        self.ema_slow = values['ema_slow']
+        self.signal = values['macd_signal']
+        self.avg_gain = values['avg_gain']
+        self.avg_loss = values['avg_loss']
+
+        # 구간 합: 새 값 추가, 창에서 빠지는 값 제거
+        for window in self.sums:
+            self.sums[window] += centered
+            if len(self.closes) >= window - 1:
+                self.sums[window] -= self.closes[-(window - 1)]
+        self.sum_sq += centered * centered
+        if len(self.closes) >= self.BB_WINDOW - 1:
+            dropped = self.closes[-(self.BB_WINDOW - 1)]
+            self.sum_sq -= dropped * dropped
+        self.closes.append(centered)
+
+        # 밴드폭 최솟값 deque (단조 증가 유지, 창 밖 항목 제거)
+        bandwidth = values['bandwidth']
+        if not math.isnan(bandwidth):
+            while self.bandwidths and self.bandwidths[-1][1] >= bandwidth:
+                self.bandwidths.pop()
+            self.bandwidths.append((self.count, bandwidth))
+        while self.bandwidths and self.bandwidths[0][0] <= self.count - (self.SQUEEZE_WINDOW - 1):
+            self.bandwidths.popleft()
+
+        self.prev_ma5 = values['ma5']
+        self.prev_ma20 = values['ma20']
+        self.last_close = close
+        self.committed_date = date
+        self.count += 1
+
+    # ------------------------------------------------------------
+    # 계산 (확정 누적값 + 잠정 종가)
+    # ------------------------------------------------------------
+    def _evaluate(self, close):
+        """확정 누적값에 close를 다음 봉으로 더했을 때의 지표 값 (상태 변경 없음)"""
+        n = self.count + 1
+        ref = self.ref if self.ref is not None else close
+        centered = close - ref
+
+        if self.count == 0:
+            ema_fast = ema_slow = close
+            avg_gain = avg_loss = 0.0
+            macd_signal = 0.0
+        else:
+            delta = close - self.last_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            avg_gain = self.RSI_ALPHA * gain + (1 - self.RSI_ALPHA) * self.avg_gain
+            avg_loss = self.RSI_ALPHA * loss + (1 - self.RSI_ALPHA) * self.avg_loss
+            ema_fast = self.FAST_ALPHA * close + (1 - self.FAST_ALPHA) * self.ema_fast
+            ema_slow = self.SLOW_ALPHA * close + (1 - self.SLOW_ALPHA) * self.ema_slow
+            macd_signal = None  # MACD 계산 후 결정
+
+        macd = ema_fast - ema_slow
+        if macd_signal is None:
+            macd_signal = self.SIGNAL_ALPHA * macd + (1 - self.SIGNAL_ALPHA) * self.signal
+
+        rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+
+        def mean(window):
+            if n < window:
+                return math.nan
+            return (self.sums[window] + centered) / window + ref
+
+        values = {
+            'n': n,
+            'close': close,
+            'ema_fast': ema_fast,
+            'ema_slow': ema_slow,
+            'avg_gain': avg_gain,
+            'avg_loss': avg_loss,
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': macd_signal,
+        }
+        for window in self.MA_WINDOWS:
+            values[f'ma{window}'] = mean(window)
+
+        # 볼린저 밴드
+        sma = mean(self.BB_WINDOW)
+        if n < self.BB_WINDOW:
+            std = math.nan
+        else:
+            total = self.sums[self.BB_WINDOW] + centered
+            total_sq = self.sum_sq + centered * centered
+            std = math.sqrt(max((total_sq - total * total / self.BB_WINDOW) / (self.BB_WINDOW - 1), 0.0))
+        upper = sma + std * self.NUM_STD
+        lower = sma - std * self.NUM_STD
+        percent_b = self._divide(close - lower, upper - lower)
+        bandwidth = self._divide(upper - lower, sma)
+
+        # 스퀴즈: 최근 SQUEEZE_WINDOW개 밴드폭이 모두 있어야 판단 (기존 rolling min 규칙과 동일)
+        is_squeeze = False
+        if n >= self.BB_WINDOW + self.SQUEEZE_WINDOW - 1 and not math.isnan(bandwidth):
+            window_min = min(self.bandwidths[0][1], bandwidth) if self.bandwidths else bandwidth
+            is_squeeze = bandwidth <= window_min * self.SQUEEZE_RATIO
+
+        values.update({
+            'sma': sma, 'std': std, 'upper': upper, 'lower': lower,
+            'percent_b': percent_b, 'bandwidth': bandwidth, 'is_squeeze': is_squeeze
+        })
+        return values
+
+    @staticmethod
+    def _divide(a, b):
+        """NumPy와 같은 나눗셈 결과 (0으로 나누면 inf/NaN)"""
+        if math.isnan(a) or math.isnan(b):
+            return math.nan
+        if b == 0:
+            return math.nan if a == 0 else math.copysign(math.inf, a)
+        return a / b
+
+    def current(self):
+        """잠정 봉 기준 지표 값 (잠정 봉이 없으면 None)"""
+        if self.pending is None:
+            return None
+        return self._evaluate(self.pending[1])
+
+    def technical(self):
+        """TechnicalIndicators.calculate_indicators와 같은 결과"""
+        values = self.current()
+        if values is None or values['n'] < 20:
+            return TechnicalIndicators._get_default_indicators()
+        return TechnicalIndicators.summarize_values(
+            count=values['n'],
+            current_price=values['close'],
+            rsi=values['rsi'],
+            macd=values['macd'],
+            macd_signal_line=values['macd_signal'],
+            ma5=values['ma5'],
+            ma20=values['ma20'],
+            ma60=values['ma60'] if values['n'] >= 60 else values['close'],
+            prev_ma5=self.prev_ma5,
+            prev_ma20=self.prev_ma20
+        )
+
+    def bollinger_summary(self):
+        """TechnicalIndicators.calculate_bollinger_bands()['summary']와 같은 결과 (데이터 부족 시 None)"""
+        values = self.current()
+        if values is None or values['n'] < self.BB_WINDOW:
+            return None
+        return TechnicalIndicators.summarize_bollinger_values(
+            values['upper'], values['sma'], values['lower'],
+            values['bandwidth'], values['percent_b'], values['is_squeeze']
+        )
+
+    def bollinger_history_point(self):
+        """볼린저 히스토리 마지막 항목 (calculate_bollinger_bands()['history'][-1] 형식, 데이터 부족 시 None)"""
+        values = self.current()
+        if values is None or values['n'] < self.BB_WINDOW:
+            return None
+
+        def rounded(value, digits):
+            return None if math.isnan(value) else round(value, digits)
+
+        return {
+            'date': self.pending[0],
+            'close': int(values['close']),
+            'upper': rounded(values['upper'], 0),
+            'middle': rounded(values['sma'], 0),
+            'lower': rounded(values['lower'], 0),
+            'bandwidth': rounded(values['bandwidth'], 4),
+            'is_squeeze': bool(values['is_squeeze'])
+        }
+
+    # ------------------------------------------------------------
+    # 직렬화
+    # ------------------------------------------------------------
+    def to_dict(self):
+        def num(value):
+            return None if value is None or math.isnan(value) else value
+
+        return {
+            'version': self.VERSION,
+            'count': self.count,
+            'committed_date': self.committed_date,
+            'last_close': self.last_close,
+            'ref': self.ref,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'signal': self.signal,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'closes': list(self.closes),
+            'sums': {str(w): v for w, v in self.sums.items()},
+            'sum_sq': self.sum_sq,
+            'prev_ma5': num(self.prev_ma5),
+            'prev_ma20': num(self.prev_ma20),
+            'bandwidths': [list(item) for item in self.bandwidths],
+            'pending': list(self.pending) if self.pending else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')}")
+
+        def num(value):
+            return math.nan if value is None else value
+
+        state = cls()
+        state.count = data['count']
+        state.committed_date = data['committed_date']
+        state.last_close = data['last_close']
+        state.ref = data['ref']
+        state.ema_fast = data['ema_fast']
+        state.ema_slow = data['ema_slow']
+        state.signal = data['signal']
+        state.avg_gain = data['avg_gain']
+        state.avg_loss = data['avg_loss']
+        state.closes.extend(data['closes'])
+        state.sums = {int(w): v for w, v in data['sums'].items()}
+        state.sum_sq = data['sum_sq']
+        state.prev_ma5 = num(data['prev_ma5'])
+        state.prev_ma20 = num(data['prev_ma20'])
+        state.bandwidths = deque((seq, bw) for seq, bw in data['bandwidths'])
+        state.pending = tuple(data['pending']) if data.get('pending') else None
+        return state
+
+
+class IndicatorStateStore:
+    """종목별 IncrementalIndicatorState 저장소 (메모리 + OHLCV 저장소 옆 JSON 파일)"""
+
+    # 증분 계산을 사용할 최소 일봉 수 (이하이면 전체 계산이 더 단순하고 충분히 빠름)
+    MIN_BARS = IncrementalIndicatorState.BB_WINDOW + 1
+
+    def __init__(self, base_dir=None):
+        """
+        Args:
+            base_dir: 저장 디렉토리 (기본값: cache/ohlcv - 일봉 파일과 같은 위치)
+        """
+        self.base_dir = base_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'ohlcv')
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def live_indicators(self, code, bars, date=None, price=None):
+        """
+        일봉과 상태를 맞추고 (필요 시) 현재가를 반영한 뒤 최신 지표 반환
+
+        Args:
+            bars: 날짜 오름차순 일봉 목록 (OhlcvStore.get_daily_chart 결과)
+            date, price: 실시간 현재가와 그 영업일 (없으면 일봉 마지막 봉 기준)
+
+        Returns:
+            {'technical', 'bollinger_summary', 'history_point', 'committed_count'}
+        """
+        with self._lock:
+            state = self._sync(code, bars)
+            close = self._parse_price(price)
+            if date and close:
+                state.update(date, close)
+            return {
+                'technical': state.technical(),
+                'bollinger_summary': state.bollinger_summary(),
+                'history_point': state.bollinger_history_point(),
+                'committed_count': state.count
+            }
+
+    def apply_price(self, code, date, price):
+        """
+        실시간 현재가 반영 (이미 로드된 상태만, O(1))
+
+        Returns:
+            bool: 반영 여부 (상태가 없거나 가격을 해석할 수 없으면 False)
+        """
+        close = self._parse_price(price)
+        if not close:
+            return False
+        with self._lock:
+            state = self._states.get(code)
+            return state is not None and state.update(date, close)
+
+    def _sync(self, code, bars):
+        """일봉과 상태를 맞춤 (확정 구간이 같으면 새 봉만 O(1)씩 반영, 다르면 다시 구성)"""
+        state = self._states.get(code) or self._load(code)
+        before = (state.count, state.pending) if state else None
+
+        if state is None or not state.catch_up(bars):
+            state = IncrementalIndicatorState.from_bars(bars)
+
+        self._states[code] = state
+        if (state.count, state.pending) != before:
+            self._save(code, state)
+        return state
+
+    @staticmethod
+    def _parse_price(price):
+        """현재가 문자열 → float (등락 부호(+/-), 콤마 제거). 해석 불가 시 None"""
+        if price is None:
+            return None
+        try:
+            close = abs(float(str(price).replace(',', '')))
+        except (TypeError, ValueError):
+            return None
+        return close if close > 0 else None
+
+    def save(self, code):
+        with self._lock:
+            state = self._states.get(code)
+            if state is not None:
+                self._save(code, state)
+
+    def _path(self, code):
+        return os.path.join(self.base_dir, f"{code}.indicators.json")
+
+    def _load(self, code):
+        path = self._path(code)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return IncrementalIndicatorState.from_dict(json.load(f))
+        except Exception as e:
+            Logger.warning("Indicators", f"{code}: failed to load indicator state ({e}), rebuilding")
+            return None
+
+    def _save(self, code, state):
+        path = self._path(code)
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state.to_dict(), f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            Logger.warning("Indicators", f"{code}: failed to save indicator state: {e}")
@@ -4,31 +4,72 @@
 키움증권 개발자 센터의 REST API를 Python으로 래핑한 클라이언트입니다.
 
 주요 기능:
-- OAuth 2.0 인증 토큰 발급 및 관리
+- OAuth 2.0 인증 토큰 발급 및 관리 (프로세스 전역 공유, token_manager.py)
+- keep-alive 커넥션 풀 및 HTTP 재시도 (공유 세션)
 - 현재가 조회 (get_current_price)
 - 계좌 잔고 조회 (get_account_balance)
-- 일봉 차트 데이터 조회 (get_daily_chart_data)
-- 투자자별 매매 동향 조회 (get_investor_trading)
+- 일봉 차트 데이터 조회 (get_daily_chart_data, get_daily_chart_page - 연속조회)
+- 투자자별 매매 동향 조회 (get_investor_trading, get_investor_flow_history)
 - 시장 지수 조회 (get_market_index)
 
 API 문서: https://www.kiwoom.com/
 ================================================================
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import datetime
 import time
 import threading
+import concurrent.futures
+from collections import OrderedDict
 import config
 from logger import Logger
+from rate_limiter import RateLimiter
+from token_manager import TokenManager
+from market_session import MarketSession
 
 class KiwoomApi:
     """키움 REST API 클라이언트 클래스"""
     
     # 클래스 레벨 rate limiter (모든 인스턴스에서 공유)
-    _rate_lock = threading.Lock()
-    _last_request_time = 0
-    _min_request_interval = 0.15  # 150ms 간격 (초당 약 6회)
+    # 전역 버킷 + API ID별 토큰 버킷: (초당 허용량, 버스트 용량)
+    RATE_LIMIT_GLOBAL = getattr(config, 'KIWOOM_RATE_LIMIT_GLOBAL', (6, 6))
+    RATE_LIMIT_DEFAULT = getattr(config, 'KIWOOM_RATE_LIMIT_DEFAULT', (3, 3))
+    RATE_LIMITS = getattr(config, 'KIWOOM_RATE_LIMITS', {
+        'ka10001': (5, 5),  # 주식기본정보 (현재가/펀더멘털)
+        'ka10081': (3, 3),  # 일봉 차트
+        'ka10059': (3, 3),  # 투자자별 매매동향
+        'ka90001': (2, 2),  # 테마 그룹 리스트
+        'ka90002': (3, 3),  # 테마 구성 종목
+        'kt00018': (1, 2),  # 계좌 평가 잔고
+    })
+    _rate_limiter = RateLimiter(
+        global_rate=RATE_LIMIT_GLOBAL[0], global_burst=RATE_LIMIT_GLOBAL[1],
+        default_rate=RATE_LIMIT_DEFAULT[0], default_burst=RATE_LIMIT_DEFAULT[1],
+        limits=RATE_LIMITS
+    )
+    
+    # 클래스 레벨 HTTP 세션 (keep-alive 커넥션 풀, 모든 인스턴스에서 공유)
+    _session = None
+    _session_lock = threading.Lock()
+    
+    # 커넥션 풀 / 재시도 설정 (config.py에서 재정의 가능)
+    POOL_CONNECTIONS = getattr(config, 'KIWOOM_POOL_CONNECTIONS', 4)  # 호스트별 풀 개수
+    POOL_MAXSIZE = getattr(config, 'KIWOOM_POOL_MAXSIZE', 10)  # 호스트당 최대 커넥션 수
+    HTTP_RETRIES = getattr(config, 'KIWOOM_HTTP_RETRIES', 3)
+    HTTP_BACKOFF = getattr(config, 'KIWOOM_HTTP_BACKOFF', 0.3)  # 0.3s, 0.6s, 1.2s...
+    HTTP_TIMEOUT = getattr(config, 'KIWOOM_HTTP_TIMEOUT', 10)
+    
+    # 투자자별 수급 캐시 ((종류, 종목, 영업일) → (만료 시각, 값), LRU, 모든 인스턴스에서 공유)
+    INVESTOR_CACHE_TTL_REGULAR = getattr(config, 'KIWOOM_INVESTOR_CACHE_TTL_REGULAR', 30)  # 정규장 중 당일
+    INVESTOR_CACHE_TTL_TODAY = getattr(config, 'KIWOOM_INVESTOR_CACHE_TTL_TODAY', 300)  # 장 외 시간 당일
+    INVESTOR_CACHE_MAX = getattr(config, 'KIWOOM_INVESTOR_CACHE_MAX', 1000)
+    _investor_cache = OrderedDict()
+    _investor_cache_lock = threading.Lock()
+    # 매수/매도/순매수 동시 조회용 스레드 풀
+    _investor_executor = concurrent.futures.ThreadPoolExecutor(max_workers=6, thread_name_prefix='investor')
     
     def __init__(self):
         """API 클라이언트 초기화 - config.py에서 설정 값 로드"""
@@ -36,11 +77,78 @@ class KiwoomApi:
         self.app_key = config.APP_KEY
         self.app_secret = config.APP_SECRET
         self.account_no = config.ACCOUNT_NO
-        self.access_token = None  # OAuth 토큰 (get_access_token으로 발급)
-        self.token_expired = None  # 토큰 만료 시간
+        # OAuth 토큰은 프로세스 전역 TokenManager가 관리 (모든 인스턴스가 같은 토큰 공유)
+        self._tokens = TokenManager.for_credentials(self.base_url, self.app_key, self._issue_token)
+
+    @property
+    def access_token(self):
+        """현재 유효한 토큰 (네트워크 요청 없음, 없거나 만료 시 None)"""
+        return self._tokens.peek()
+
+    @property
+    def token_expired(self):
+        """토큰 만료 시간 (키움 expires_dt 원본 문자열)"""
+        return self._tokens.expires_dt
+
+    @classmethod
+    def _get_session(cls):
+        """
+        공유 HTTP 세션 반환 (최초 호출 시 생성)
+        - keep-alive로 TCP/TLS 핸드셰이크를 요청마다 반복하지 않음
+        - 5xx 응답 및 커넥션 리셋 시 지수 백오프로 자동 재시도
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry = Retry(
+                        total=cls.HTTP_RETRIES,
+                        connect=cls.HTTP_RETRIES,
+                        read=cls.HTTP_RETRIES,
+                        status=cls.HTTP_RETRIES,
+                        backoff_factor=cls.HTTP_BACKOFF,
+                        status_forcelist=(500, 502, 503, 504),
+                        # 키움 REST API는 조회도 POST를 사용하므로 POST 재시도 허용
+                        allowed_methods=frozenset(['GET', 'POST']),
+                        raise_on_status=False
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=cls.POOL_CONNECTIONS,
+                        pool_maxsize=cls.POOL_MAXSIZE,
+                        max_retries=retry,
+                        pool_block=True  # 풀이 가득 차면 새 커넥션 대신 반환 대기
+                    )
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({'Connection': 'keep-alive'})
+                    cls._session = session
+                    Logger.debug("API", f"HTTP session created (pool={cls.POOL_MAXSIZE}, retries={cls.HTTP_RETRIES})")
+        return cls._session
+
+    def _http(self, url, headers, body=None, method='POST'):
+        """공유 세션으로 HTTP 요청 전송"""
+        session = self._get_session()
+        if method == 'POST':
+            return session.post(url, headers=headers, data=json.dumps(body) if body else None, timeout=self.HTTP_TIMEOUT)
+        return session.get(url, headers=headers, timeout=self.HTTP_TIMEOUT)
 
     def get_access_token(self):
-        """Issues an OAuth 2.0 Access Token (Kiwoom)."""
+        """
+        유효한 OAuth 2.0 접근토큰 확보 (Kiwoom)
+        공유 토큰이 유효하면 재사용하고, 없거나 만료되었을 때만 발급을 요청합니다.
+
+        Returns:
+            bool: 토큰 확보 여부
+        """
+        return self._tokens.get_token() is not None
+
+    def _issue_token(self):
+        """
+        접근토큰 발급 요청 (TokenManager가 single-flight로 호출)
+
+        Returns:
+            (token, expires) 튜플, 실패 시 None
+        """
         url = f"{self.base_url}/oauth2/token"
         headers = {"content-type": "application/json"}
         body = {
@@ -51,61 +159,58 @@ class KiwoomApi:
 
         Logger.info("Auth", f"Requesting token from {url}...")
         try:
-            res = requests.post(url, headers=headers, data=json.dumps(body), timeout=10)
+            res = self._http(url, headers, body)
             
             if res.status_code == 200:
                 data = res.json()
                 # API 문서에 따라 성공 여부 확인 (보통 return_code 사용 안할 수도 있음, 토큰 존재 여부 확인)
                 if 'token' in data or 'access_token' in data:
-                    self.access_token = data.get('token') or data.get('access_token')
-                    self.token_expired = data.get('expires_dt') or data.get('expires_in')
-                    Logger.info("Auth", f"Token issued successfully. Expires: {self.token_expired}")
-                    return True
+                    token = data.get('token') or data.get('access_token')
+                    expires = data.get('expires_dt') or data.get('expires_in')
+                    Logger.info("Auth", f"Token issued successfully. Expires: {expires}")
+                    return token, expires
                 elif data.get('return_code') == 0: # 기존 로직 유지
-                    self.access_token = data.get('token')
-                    self.token_expired = data.get('expires_dt')
-                    Logger.info("Auth", f"Token issued successfully. Expires: {self.token_expired}")
-                    return True
+                    Logger.info("Auth", f"Token issued successfully. Expires: {data.get('expires_dt')}")
+                    return data.get('token'), data.get('expires_dt')
                 else:
                     Logger.error("Auth", f"Failed: {data.get('return_msg')}")
-                    return False
+                    return None
             else:
                 Logger.error("Auth", f"HTTP Error {res.status_code}: {res.text}")
-                return False
+                return None
         except Exception as e:
             Logger.error("Auth", f"Connection Error: {e}")
-            return False
+            return None
 
-    def _send_request(self, url, headers, body=None, method='POST'):
+    def _send_request(self, url, headers, body=None, method='POST', resp_headers=None):
         """
         API 요청을 보내고 토큰 만료(8005) 시 자동 갱신 및 재시도하는 헬퍼 메소드
-        Rate limiting 적용: 초당 약 6회로 제한
-        """
-        # Rate limiting: 이전 요청과의 간격 확보
-        with KiwoomApi._rate_lock:
-            current_time = time.time()
-            elapsed = current_time - KiwoomApi._last_request_time
-            if elapsed < KiwoomApi._min_request_interval:
-                sleep_time = KiwoomApi._min_request_interval - elapsed
-                time.sleep(sleep_time)
-            KiwoomApi._last_request_time = time.time()
+        Rate limiting 적용: 전역 + API ID별 토큰 버킷 (RATE_LIMITS 참고)
         
-        # 1. 토큰이 없으면 발급 시도
-        if not self.access_token:
-            Logger.info("API", "No token found. Requesting new token...")
-            if not self.get_access_token():
-                return None
+        resp_headers: dict를 넘기면 성공 응답의 헤더(cont-yn, next-key 등)를 채워줌
+        """
+        # Rate limiting: API ID별 토큰 버킷에서 토큰 확보 (대기는 락 밖에서 수행)
+        api_id = headers.get("api-id", "unknown")
+        limiter_wait = KiwoomApi._rate_limiter.acquire(api_id)
+        
+        # 1. 공유 토큰 확보 (없으면 발급 - 동시 요청 시에도 발급은 1회)
+        token = self._tokens.get_token()
+        if not token:
+            Logger.error("API", "No valid token available.")
+            return None
 
         # 헤더에 최신 토큰 적용
-        headers["authorization"] = f"Bearer {self.access_token}"
+        headers["authorization"] = f"Bearer {token}"
 
         try:
-            if method == 'POST':
-                res = requests.post(url, headers=headers, data=json.dumps(body) if body else None, timeout=10)
-            else:
-                res = requests.get(url, headers=headers, timeout=10)
+            request_start = time.monotonic()
+            res = self._http(url, headers, body, method)
+            network_time = time.monotonic() - request_start
+            Logger.debug("API", f"{api_id}: limiter wait {limiter_wait * 1000:.0f}ms, network {network_time * 1000:.0f}ms")
 
             if res.status_code == 200:
+                if resp_headers is not None:
+                    resp_headers.update(res.headers)
                 # Kiwoom API는 헤더에서 charset을 제대로 명시하지 않음
                 # UTF-8로 먼저 시도하고, 실패하면 EUC-KR 시도
                 try:
@@ -140,17 +245,18 @@ class KiwoomApi:
                 if is_token_error:
                     Logger.warning("API", f"Token invalid (Code: {code}, Msg: {msg}). Refreshing token and retrying...")
                     
-                    if self.get_access_token():
+                    # 다른 스레드가 이미 갱신했다면 발급 없이 새 토큰을 받음
+                    new_token = self._tokens.refresh(stale_token=token)
+                    if new_token:
                         # 헤더 업데이트 및 재시도
-                        headers["authorization"] = f"Bearer {self.access_token}"
+                        headers["authorization"] = f"Bearer {new_token}"
                         Logger.info("API", f"Retrying request to {url} with new token...")
                         
-                        if method == 'POST':
-                            res = requests.post(url, headers=headers, data=json.dumps(body) if body else None, timeout=10)
-                        else:
-                            res = requests.get(url, headers=headers, timeout=10)
+                        res = self._http(url, headers, body, method)
                             
                         if res.status_code == 200:
+                            if resp_headers is not None:
+                                resp_headers.update(res.headers)
                             # Retry decoding
                             try:
                                 return res.json()
@@ -168,14 +274,14 @@ class KiwoomApi:
             # 401 Unauthorized 처리
             elif res.status_code == 401:
                 Logger.warning("API", f"HTTP 401 Unauthorized. Refreshing token...")
-                if self.get_access_token():
-                    headers["authorization"] = f"Bearer {self.access_token}"
-                    if method == 'POST':
-                        res = requests.post(url, headers=headers, data=json.dumps(body) if body else None, timeout=10)
-                    else:
-                        res = requests.get(url, headers=headers, timeout=10)
+                new_token = self._tokens.refresh(stale_token=token)
+                if new_token:
+                    headers["authorization"] = f"Bearer {new_token}"
+                    res = self._http(url, headers, body, method)
                     
                     if res.status_code == 200:
+                        if resp_headers is not None:
+                            resp_headers.update(res.headers)
                         return res.json()
 
             else:
@@ -186,6 +292,11 @@ class KiwoomApi:
             Logger.error("API", f"Request Error: {e}")
             return None
 
+    @classmethod
+    def get_rate_limit_stats(cls):
+        """API ID별 rate limiter 대기 통계 반환 (limiter 대기 vs 네트워크 지연 분석용)"""
+        return cls._rate_limiter.get_stats()
+
     def _clean_code(self, code):
         """종목코드에서 'A' 접두사 제거"""
         if code and isinstance(code, str) and code.startswith('A'):
@@ -333,7 +444,24 @@ class KiwoomApi:
 
     def get_daily_chart_data(self, code, date=None):
         """
-        일봉 차트 데이터 조회 (Kiwoom ka10081)
+        일봉 차트 데이터 조회 (Kiwoom ka10081, 첫 페이지)
+        전체 이력이 필요하면 ohlcv_store.OhlcvStore를 사용하세요.
+        """
+        bars, _ = self.get_daily_chart_page(code, base_dt=date)
+        return bars
+
+    def get_daily_chart_page(self, code, base_dt=None, next_key=None):
+        """
+        일봉 차트 한 페이지 조회 (Kiwoom ka10081, 연속조회 지원)
+
+        Args:
+            code: 종목코드
+            base_dt: 기준일자 YYYYMMDD (이 날짜부터 과거 방향으로 조회, 기본값: 오늘)
+            next_key: 이전 페이지 응답의 next-key (연속조회 시)
+
+        Returns:
+            (bars, next_key): bars는 최신일 우선 목록 (실패 시 None),
+                              next_key는 다음(더 과거) 페이지가 없으면 None
         """
         code = self._clean_code(code)
         url = f"{self.base_url}/api/dostk/chart" 
@@ -342,8 +470,11 @@ class KiwoomApi:
             "content-type": "application/json;charset=UTF-8",
             "api-id": "ka10081"
         }
+        if next_key:
+            headers["cont-yn"] = "Y"
+            headers["next-key"] = next_key
         
-        try_date = date or datetime.datetime.now().strftime("%Y%m%d")
+        try_date = base_dt or datetime.datetime.now().strftime("%Y%m%d")
         
         body = {
             "stk_cd": code,
@@ -352,150 +483,238 @@ class KiwoomApi:
             "upd_stkpc_tp": "1"
         }
 
-        Logger.debug("Chart", f"Requesting data for {code} (base_dt: {try_date})...")
-        data = self._send_request(url, headers, body)
+        Logger.debug("Chart", f"Requesting data for {code} (base_dt: {try_date}, cont: {bool(next_key)})...")
+        resp_headers = {}
+        data = self._send_request(url, headers, body, resp_headers=resp_headers)
         
         if data and data.get('return_code') == 0:
             output = data.get('stk_dt_pole_chart_qry', data.get('output', []))
             if output:
                 Logger.debug("Chart", f"[OK] Got {len(output)} records")
                 
-                # 키 매핑 (Raw API -> Standard)
                 mapped_output = []
                 for item in output:
-                    # KIS/Kiwoom API Key Mapping
-                    # stck_clpr: 종가, stck_oprc: 시가, stck_hgpr: 고가, stck_lwpr: 저가, acml_vol: 거래량
-                    # Fallback for other variations (cur_prc etc)
-                    
-                    try:
-                        mapped_item = {
-                            'date': item.get('stck_bsop_date', item.get('dt', '')),
-                            'close': int(item.get('stck_clpr', item.get('cur_prc', 0))),
-                            'open': int(item.get('stck_oprc', item.get('opn_prc', 0))),
-                            'high': int(item.get('stck_hgpr', item.get('high_pric', 0))),
-                            'low': int(item.get('stck_lwpr', item.get('low_pric', 0))),
-                            'volume': int(item.get('acml_vol', item.get('trde_qty', 0)))
-                        }
+                    mapped_item = self._map_chart_item(item)
+                    if mapped_item:
                         mapped_output.append(mapped_item)
-                    except (ValueError, TypeError):
-                        continue
-                        
-                return mapped_output
+                
+                cont = {k.lower(): v for k, v in resp_headers.items()}
+                has_next = str(cont.get('cont-yn', 'N')).upper() == 'Y'
+                return mapped_output, (cont.get('next-key') or None if has_next else None)
             else:
                 Logger.warning("Chart", f"[FAIL] No data available for {code}")
-                return None
+                return [], None
         else:
             if data: Logger.error("Chart", f"API Error: {data.get('return_msg')}")
+            return None, None
+
+    @staticmethod
+    def _map_chart_item(item):
+        """
+        키 매핑 (Raw API -> Standard)
+        stck_clpr: 종가, stck_oprc: 시가, stck_hgpr: 고가, stck_lwpr: 저가, acml_vol: 거래량
+        Fallback for Kiwoom ka10081 keys (cur_prc, open_pric, high_pric, low_pric, trde_qty)
+        """
+        def to_int(val):
+            # 가격 필드에 등락 부호(+/-)가 붙어 오는 경우 대비
+            return abs(int(str(val).replace(',', '')))
+        
+        try:
+            return {
+                'date': item.get('stck_bsop_date', item.get('dt', '')),
+                'close': to_int(item.get('stck_clpr', item.get('cur_prc', 0))),
+                'open': to_int(item.get('stck_oprc', item.get('open_pric', item.get('opn_prc', 0)))),
+                'high': to_int(item.get('stck_hgpr', item.get('high_pric', 0))),
+                'low': to_int(item.get('stck_lwpr', item.get('low_pric', 0))),
+                'volume': to_int(item.get('acml_vol', item.get('trde_qty', 0)))
+            }
+        except (ValueError, TypeError):
             return None
 
-    def get_investor_trading(self, code, date=None):
+    def _resolve_investor_date(self, date=None):
+        """조회 기준일 결정 (주말/장 시작 전이면 직전 영업일)"""
+        return date or MarketSession.get_business_date()
+
+    def _investor_cache_ttl(self, date):
         """
-        투자자별 매매동향 조회 (Kiwoom ka10059)
-        date: YYYYMMDD string (optional, default: today)
+        날짜별 투자자 수급 캐시 TTL (초)
+        - 정규장 중 당일: 짧은 TTL (장중 수급은 계속 변함)
+        - 장 외 시간 당일: 중간 TTL (장 마감 후 확정치 반영 대기)
+        - 지난 영업일: None (확정 데이터 → 만료 없음)
+        """
+        today = datetime.datetime.now().strftime("%Y%m%d")
+        if date < today:
+            return None
+        session = MarketSession.get_current_session()["session"]
+        if session in (MarketSession.REGULAR, MarketSession.POST_AUCTION):
+            return self.INVESTOR_CACHE_TTL_REGULAR
+        return self.INVESTOR_CACHE_TTL_TODAY
+
+    @classmethod
+    def _investor_cache_get(cls, key):
+        with cls._investor_cache_lock:
+            entry = cls._investor_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and time.time() >= expires_at:
+                del cls._investor_cache[key]
+                return None
+            cls._investor_cache.move_to_end(key)
+            return value
+
+    @classmethod
+    def _investor_cache_put(cls, key, value, ttl):
+        expires_at = None if ttl is None else time.time() + ttl
+        with cls._investor_cache_lock:
+            cls._investor_cache[key] = (expires_at, value)
+            cls._investor_cache.move_to_end(key)
+            while len(cls._investor_cache) > cls.INVESTOR_CACHE_MAX:
+                cls._investor_cache.popitem(last=False)
+
+    def _fetch_investor_rows(self, code, date, trade_type):
+        """
+        ka10059 단일 조회 (trde_tp: 1=매수, 2=매도, 3=순매수)
+
+        Returns:
+            list: stk_invsr_orgn 행 목록 (최신일 우선), 실패 시 None
         """
-        code = self._clean_code(code)
         url = f"{self.base_url}/api/dostk/stkinfo"
-        
         headers = {
             "content-type": "application/json;charset=UTF-8",
             "api-id": "ka10059"
         }
-        
-        # Determine target date (handle weekends and pre-market)
-        if date:
-            today_date = date
-        else:
-            now = datetime.datetime.now()
-            weekday = now.weekday() # Mon=0, Sun=6
-            current_time = now.time()
-            market_start_time = datetime.time(9, 0) # 09:00
-            
-            # Default to today
-            target_date = now
-            
-            if weekday == 5: # Saturday -> Friday
-                target_date = now - datetime.timedelta(days=1)
-            elif weekday == 6: # Sunday -> Friday
-                target_date = now - datetime.timedelta(days=2)
-            elif current_time < market_start_time: # Weekday before 9am
-                if weekday == 0: # Monday morning -> Friday
-                    target_date = now - datetime.timedelta(days=3)
-                else: # Other weekday mornings -> Yesterday
-                    target_date = now - datetime.timedelta(days=1)
-            
-            today_date = target_date.strftime("%Y%m%d")
-            
-        # print(f"[Debug] get_investor_trading date: {today_date} (Weekday: {now.weekday()})")
-        
-        # 1. 매수 데이터 조회 (trde_tp="1")
-        buy_body = {
-            "stk_cd": code, "dt": today_date, "amt_qty_tp": "1", "trde_tp": "1", "unit_tp": "1"
-        }
-        
-        foreign_buy = 0
-        institution_buy = 0
-        individual_buy = 0
-        
-        data_buy = self._send_request(url, headers, buy_body)
-        if data_buy and data_buy.get('return_code') == 0:
-            output = data_buy.get('stk_invsr_orgn', [])
-            if output:
-                buy_data = output[0]
-                foreign_buy = int(buy_data.get('frgnr_invsr', 0))
-                institution_buy = int(buy_data.get('orgn', 0))
-                individual_buy = int(buy_data.get('prsn_invsr', 0)) # prsn_invsr 추정
-
-        # 2. 매도 데이터 조회 (trde_tp="2") - 음수로 반환됨
-        sell_body = {
-            "stk_cd": code, "dt": today_date, "amt_qty_tp": "1", "trde_tp": "2", "unit_tp": "1"
+        body = {
+            "stk_cd": code, "dt": date, "amt_qty_tp": "1", "trde_tp": trade_type, "unit_tp": "1"
         }
-        
-        foreign_sell = 0
-        institution_sell = 0
-        individual_sell = 0
-        
-        data_sell = self._send_request(url, headers, sell_body)
-        if data_sell and data_sell.get('return_code') == 0:
-            output = data_sell.get('stk_invsr_orgn', [])
-            if output:
-                sell_data = output[0]
-                # 음수로 오므로 절대값 처리
-                foreign_sell = abs(int(sell_data.get('frgnr_invsr', 0)))
-                institution_sell = abs(int(sell_data.get('orgn', 0)))
-                individual_sell = abs(int(sell_data.get('prsn_invsr', 0)))
-
-        # 3. 순매수(Net) 데이터 조회 (trde_tp="3")
-        net_body = {
-            "stk_cd": code, "dt": today_date, "amt_qty_tp": "1", "trde_tp": "3", "unit_tp": "1"
+
+        data = self._send_request(url, headers, body)
+        if data and data.get('return_code') == 0:
+            return data.get('stk_invsr_orgn', [])
+        if data:
+            Logger.warning("API", f"ka10059 (trde_tp={trade_type}) failed for {code}: {data.get('return_msg')}")
+        return None
+
+    @staticmethod
+    def _investor_values(row):
+        """행에서 (외국인, 기관, 개인) 값 추출"""
+        def to_int(val):
+            try:
+                return int(str(val).replace(',', '').replace('+', ''))
+            except (TypeError, ValueError):
+                return 0
+        # 개인은 문서상 ind_invsr, 일부 응답은 prsn_invsr
+        individual = row.get('ind_invsr', row.get('prsn_invsr', 0))
+        return to_int(row.get('frgnr_invsr', 0)), to_int(row.get('orgn', 0)), to_int(individual)
+
+    def get_investor_trading(self, code, date=None, use_cache=True):
+        """
+        투자자별 매매동향 조회 (Kiwoom ka10059)
+        매수/매도/순매수 3건을 동시에 조회하고 (종목, 영업일) 단위로 캐싱합니다.
+
+        Args:
+            code: 종목코드
+            date: YYYYMMDD string (optional, default: 기준 영업일)
+            use_cache: False이면 캐시를 무시하고 새로 조회
+        """
+        code = self._clean_code(code)
+        target_date = self._resolve_investor_date(date)
+        cache_key = ('flow', code, target_date)
+
+        if use_cache:
+            cached = self._investor_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        # 3건 동시 조회 (요청 간격은 rate limiter가 조절)
+        futures = {
+            trade_type: KiwoomApi._investor_executor.submit(self._fetch_investor_rows, code, target_date, trade_type)
+            for trade_type in ("1", "2", "3")
         }
-        
-        foreign_net = 0
-        institution_net = 0
-        individual_net = 0
-        
-        data_net = self._send_request(url, headers, net_body)
-        if data_net and data_net.get('return_code') == 0:
-            output = data_net.get('stk_invsr_orgn', [])
-            if output:
-                net_data = output[0]
-                foreign_net = int(net_data.get('frgnr_invsr', 0))
-                institution_net = int(net_data.get('orgn', 0))
-                individual_net = int(net_data.get('prsn_invsr', 0))
-        
+        rows = {trade_type: future.result() for trade_type, future in futures.items()}
+
+        if all(r is None for r in rows.values()):
+            return None
+
+        def first_row(trade_type):
+            output = rows[trade_type]
+            return self._investor_values(output[0]) if output else (0, 0, 0)
+
+        # 1. 매수, 2. 매도 (음수로 오므로 절대값 처리), 3. 순매수
+        foreign_buy, institution_buy, individual_buy = first_row("1")
+        foreign_sell, institution_sell, individual_sell = (abs(v) for v in first_row("2"))
+        foreign_net, institution_net, individual_net = first_row("3")
+
         # 만약 Net 데이터가 0이면 계산값 사용 (fallback)
         if foreign_net == 0 and foreign_buy != 0:
             foreign_net = foreign_buy - foreign_sell
         if institution_net == 0 and institution_buy != 0:
             institution_net = institution_buy - institution_sell
-            
-        return {
+
+        result = {
+            'date': target_date,
             'foreign_buy': foreign_buy, 'foreign_sell': foreign_sell,
             'foreign_net': foreign_net,
             'institution_buy': institution_buy, 'institution_sell': institution_sell,
             'institution_net': institution_net,
-            'individual_net': individual_net # 추가
+            'individual_buy': individual_buy, 'individual_sell': individual_sell,
+            'individual_net': individual_net
         }
 
+        # 일부 구간만 실패한 결과는 캐싱하지 않음 (다음 요청에서 재조회)
+        ttl = self._investor_cache_ttl(target_date)
+        if all(r is not None for r in rows.values()):
+            self._investor_cache_put(cache_key, result, ttl)
+        # 순매수 응답에는 과거 일자 행도 포함되므로 추이 캐시도 함께 채움
+        if rows["3"]:
+            self._investor_cache_put(('history', code, target_date), self._build_flow_series(rows["3"]), ttl)
+        return result
+
+    def get_investor_flow_history(self, code, days=20, date=None, use_cache=True):
+        """
+        투자자별 순매수 추이 조회 (ka10059 순매수 1회 조회)
+        추세 차트용으로 일자별 외국인/기관/개인 순매수만 담은 시계열을 반환합니다.
+
+        Args:
+            code: 종목코드
+            days: 최대 일수
+            date: 기준일 YYYYMMDD (optional, default: 기준 영업일)
+
+        Returns:
+            list: [{'date', 'foreign_net', 'institution_net', 'individual_net'}, ...] (과거 → 최근)
+        """
+        code = self._clean_code(code)
+        target_date = self._resolve_investor_date(date)
+        cache_key = ('history', code, target_date)
+
+        series = self._investor_cache_get(cache_key) if use_cache else None
+        if series is None:
+            output = self._fetch_investor_rows(code, target_date, "3")
+            if output is None:
+                return None
+
+            series = self._build_flow_series(output)
+            self._investor_cache_put(cache_key, series, self._investor_cache_ttl(target_date))
+
+        return series[-days:] if days else list(series)
+
+    def _build_flow_series(self, output):
+        """순매수 응답 행 목록 → 일자별 순매수 시계열 (과거 → 최근)"""
+        series = []
+        for row in output:
+            row_date = row.get('dt')
+            if not row_date:
+                continue
+            foreign, institution, individual = self._investor_values(row)
+            series.append({
+                'date': row_date,
+                'foreign_net': foreign,
+                'institution_net': institution,
+                'individual_net': individual
+            })
+        series.sort(key=lambda x: x['date'])
+        return series
+
     def get_market_index(self, market_code):
         """
         시장 지수 조회 (코스피: 001, 코스닥: 101)
@@ -0,0 +1,322 @@
+"""
+LLM 호출 스케줄러
+================================================================
+Gemini 호출은 한 번에 수십 초씩 걸리므로, 요청 스레드가 각자 호출하면
+waitress 워커 전부가 Gemini 응답을 기다리느라 단순 시세 요청까지 밀립니다.
+이 모듈은 전용 워커 스레드와 우선순위 큐로 LLM 호출을 대신 실행합니다.
+
+- 동시 실행 상한(max_concurrency): 전용 워커 스레드 수
+- 우선순위: INTERACTIVE(상세 화면) > SENTIMENT(카드 감성) > PREWARM(백그라운드 갱신)
+  같은 우선순위 안에서는 먼저 들어온 작업부터 실행
+- 분당 토큰 한도(tokens_per_minute): 최근 60초 사용량(예상치 → 실제 사용량으로 보정)이
+  한도를 넘으면 오래된 사용분이 빠질 때까지 다음 작업 시작을 미룸
+- 적응형 백오프: 작업이 RetryableLLMError(429/503)를 던지면 스케줄러 전체를 잠시 멈추고
+  (연속 실패마다 2배, 최대 backoff_max초) 같은 작업을 다시 큐에 넣음, 성공하면 백오프 초기화
+- submit()은 concurrent.futures.Future를 반환 (호출자는 result(timeout)으로 대기)
+- 우선순위 범위(priority_scope): 호출 경로 깊은 곳의 LLM 호출에 우선순위를 전달 (스레드별)
+================================================================
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class RetryableLLMError(Exception):
+    """잠시 후 다시 시도하면 성공할 수 있는 오류 (할당량 초과 429, 서버 과부하 503)"""
+
+    def __init__(self, message, retry_after=None):
+        """
+        Args:
+            retry_after: 서버가 알려준 재시도 대기 시간 (초, 없으면 스케줄러 백오프 사용)
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Job:
+    __slots__ = ('fn', 'priority', 'estimated_tokens', 'future', 'submitted_at', 'attempts', 'usage')
+
+    def __init__(self, fn, priority, estimated_tokens):
+        self.fn = fn
+        self.priority = priority
+        self.estimated_tokens = estimated_tokens
+        self.future = Future()
+        self.submitted_at = time.monotonic()
+        self.attempts = 0
+        self.usage = None  # 토큰 사용 기록 [timestamp, tokens] (실행 중 실제 사용량으로 보정)
+
+
+_scope = threading.local()
+
+
+@contextmanager
+def priority_scope(priority):
+    """
+    이 블록 안에서 현재 스레드가 하는 LLM 호출의 우선순위 지정 (None이면 바깥 범위 유지)
+
+    Example:
+        with priority_scope(LLMScheduler.PREWARM):
+            service.analyze_market_events(headlines)
+    """
+    previous = getattr(_scope, 'priority', None)
+    if priority is not None:
+        _scope.priority = priority
+    try:
+        yield
+    finally:
+        _scope.priority = previous
+
+
+def current_priority(default):
+    """현재 스레드의 우선순위 범위 (없으면 default)"""
+    priority = getattr(_scope, 'priority', None)
+    return default if priority is None else priority
+
+
+class LLMScheduler:
+    """우선순위 큐 + 동시 실행 상한 + 분당 토큰 한도 + 적응형 백오프 (스레드 안전)"""
+
+    INTERACTIVE = 0  # 종목 상세 화면 (사용자가 기다리는 중)
+    SENTIMENT = 1  # 카드 감성 분석
+    PREWARM = 2  # 백그라운드 갱신/시장 분석
+    PRIORITY_NAMES = {INTERACTIVE: 'interactive', SENTIMENT: 'sentiment', PREWARM: 'prewarm'}
+
+    # 토큰 사용량 집계 구간 (초)
+    WINDOW_SECONDS = 60
+
+    def __init__(self, max_concurrency=2, tokens_per_minute=0, max_retries=3,
+                 backoff_base=2.0, backoff_max=60.0, name="llm"):
+        """
+        Args:
+            max_concurrency: 동시에 실행할 최대 작업 수 (워커 스레드 수)
+            tokens_per_minute: 분당 토큰 한도 (0이면 제한 없음)
+            max_retries: RetryableLLMError 발생 시 작업별 최대 재시도 횟수
+            backoff_base: 첫 백오프 시간 (초)
+            backoff_max: 최대 백오프 시간 (초)
+            name: 워커 스레드 이름 접두어
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.tokens_per_minute = tokens_per_minute or 0
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._queue = []  # (priority, seq, job)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._running = 0
+        self._current = threading.local()
+
+        self._backoff = 0.0
+        self._paused_until = 0.0
+        self._token_log = deque()  # [timestamp, tokens] (시간순)
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.retries = 0
+        self.backoffs = 0
+        self.tokens_used = 0
+        self._wait_total = {priority: 0.0 for priority in self.PRIORITY_NAMES}
+        self._wait_max = {priority: 0.0 for priority in self.PRIORITY_NAMES}
+        self._started = {priority: 0 for priority in self.PRIORITY_NAMES}
+
+        self._workers = []
+        for i in range(self.max_concurrency):
+            thread = threading.Thread(target=self._worker_loop, name=f"{name}-worker-{i}", daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    # ------------------------------------------------------------
+    # 작업 제출
+    # ------------------------------------------------------------
+    def submit(self, fn, priority=INTERACTIVE, estimated_tokens=0):
+        """
+        Args:
+            fn: 인자 없는 작업 함수 (워커 스레드에서 실행)
+            priority: INTERACTIVE / SENTIMENT / PREWARM (작을수록 먼저)
+            estimated_tokens: 예상 사용 토큰 (분당 한도 계산용, 실행 중 record_usage()로 보정)
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if priority not in self.PRIORITY_NAMES:
+            raise ValueError(f"unknown priority: {priority}")
+        job = _Job(fn, priority, max(0, int(estimated_tokens)))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is closed")
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+            self.submitted += 1
+            self._cond.notify()
+        return job.future
+
+    def record_usage(self, tokens):
+        """
+        작업 함수 안에서 호출: 실행 중인 작업의 예상 토큰을 실제 사용량으로 교체
+        (워커 스레드가 아닌 곳에서 호출하면 사용량만 누적)
+        """
+        tokens = max(0, int(tokens))
+        job = getattr(self._current, 'job', None)
+        with self._cond:
+            if job is not None and job.usage is not None:
+                self.tokens_used += tokens - job.usage[1]
+                job.usage[1] = tokens
+            else:
+                self._token_log.append([time.monotonic(), tokens])
+                self.tokens_used += tokens
+            self._cond.notify_all()
+
+    def close(self):
+        """대기 중인 작업을 취소하고 워커 스레드 종료 (실행 중인 작업은 끝까지 실행)"""
+        with self._cond:
+            self._closed = True
+            pending, self._queue = self._queue, []
+            self._cond.notify_all()
+        for _, _, job in pending:
+            if job.future.cancel():
+                self.cancelled += 1
+
+    # ------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                if job is None:
+                    return
+            self._run(job)
+
+    def _next_job(self):
+        """락을 잡은 상태에서 호출: 실행 가능한 다음 작업 (종료 시 None)"""
+        while True:
+            if self._closed:
+                return None
+            if not self._queue:
+                self._cond.wait()
+                continue
+
+            now = time.monotonic()
+            job = self._queue[0][2]
+            delay = max(self._paused_until - now, self._token_delay(job.estimated_tokens, now))
+            if delay > 0:
+                self._cond.wait(delay)
+                continue
+
+            heapq.heappop(self._queue)
+            if job.attempts == 0 and not job.future.set_running_or_notify_cancel():
+                self.cancelled += 1  # 대기 중에 호출자가 취소 (타임아웃 등)
+                continue
+
+            wait = now - job.submitted_at
+            self._wait_total[job.priority] += wait
+            self._wait_max[job.priority] = max(self._wait_max[job.priority], wait)
+            self._started[job.priority] += 1
+
+            job.usage = [now, job.estimated_tokens]
+            self._token_log.append(job.usage)
+            self.tokens_used += job.estimated_tokens
+            self._running += 1
+            return job
+
+    def _run(self, job):
+        job.attempts += 1
+        self._current.job = job
+        try:
+            result = job.fn()
+        except RetryableLLMError as e:
+            self._on_retryable(job, e)
+        except BaseException as e:
+            with self._cond:
+                self.failed += 1
+            job.future.set_exception(e)
+        else:
+            with self._cond:
+                self.completed += 1
+                self._backoff = 0.0
+            job.future.set_result(result)
+        finally:
+            self._current.job = None
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+    def _on_retryable(self, job, error):
+        """429/503: 스케줄러 전체 일시 정지 후 재시도 (재시도 한도를 넘으면 호출자에게 오류 전달)"""
+        with self._cond:
+            self.backoffs += 1
+            self._backoff = min(self.backoff_max, self._backoff * 2 if self._backoff else self.backoff_base)
+            pause = max(self._backoff, error.retry_after or 0)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+            if job.attempts <= self.max_retries and not self._closed:
+                self.retries += 1
+                heapq.heappush(self._queue, (job.priority, next(self._seq), job))
+                return
+            self.failed += 1
+        job.future.set_exception(error)
+
+    def _token_delay(self, tokens, now):
+        """락을 잡은 상태에서 호출: tokens를 더 써도 분당 한도 이내가 될 때까지 남은 시간 (초)"""
+        self._expire_tokens(now)
+        if not self.tokens_per_minute or not self._token_log:
+            return 0.0
+        used = sum(entry[1] for entry in self._token_log)
+        excess = used + tokens - self.tokens_per_minute
+        if excess <= 0:
+            return 0.0
+        # 오래된 사용분부터 빠진다고 보고, 초과분이 모두 빠지는 시각까지 대기
+        # (한도보다 큰 작업은 구간이 완전히 비면 실행)
+        for timestamp, amount in self._token_log:
+            excess -= amount
+            if excess <= 0:
+                break
+        return timestamp + self.WINDOW_SECONDS - now
+
+    def _expire_tokens(self, now):
+        while self._token_log and now - self._token_log[0][0] >= self.WINDOW_SECONDS:
+            self._token_log.popleft()
+
+    # ------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------
+    def stats(self):
+        with self._cond:
+            now = time.monotonic()
+            self._expire_tokens(now)
+            queued = {name: 0 for name in self.PRIORITY_NAMES.values()}
+            for priority, _, _ in self._queue:
+                queued[self.PRIORITY_NAMES[priority]] += 1
+            waits = {
+                self.PRIORITY_NAMES[priority]: {
+                    'started': started,
+                    'avg_wait_ms': round(self._wait_total[priority] / started * 1000, 1) if started else 0.0,
+                    'max_wait_ms': round(self._wait_max[priority] * 1000, 1)
+                }
+                for priority, started in self._started.items()
+            }
+            return {
+                'max_concurrency': self.max_concurrency,
+                'running': self._running,
+                'queued': queued,
+                'queue_depth': len(self._queue),
+                'waits': waits,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'retries': self.retries,
+                'backoffs': self.backoffs,
+                'backoff_seconds': round(self._backoff, 1),
+                'paused_seconds_remaining': round(max(0.0, self._paused_until - now), 1),
+                'tokens_per_minute_limit': self.tokens_per_minute,
+                'tokens_last_minute': sum(entry[1] for entry in self._token_log),
+                'tokens_used': self.tokens_used
+            }
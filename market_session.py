@@ -11,7 +11,7 @@
 - CLOSED: 거래시간 외
 """
 
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Dict, Tuple
 
 class MarketSession:
@@ -142,6 +142,40 @@ class MarketSession:
         session_info = cls.get_current_session()
         return session_info["session"] in [cls.PRE_MARKET, cls.POST_CLOSE, cls.AFTER_HOURS]
     
+    @classmethod
+    def get_business_date(cls, now: datetime = None) -> str:
+        """
+        조회 기준 영업일을 반환합니다.
+        
+        - 주말: 직전 금요일
+        - 평일 09:00 이전: 직전 영업일 (월요일은 금요일)
+        - 그 외: 오늘
+        (공휴일은 고려하지 않음)
+        
+        Args:
+            now: 기준 시각 (기본값: 현재 시각)
+            
+        Returns:
+            str: YYYYMMDD
+        """
+        if now is None:
+            now = datetime.now()
+        
+        weekday = now.weekday()  # 0=월요일, 6=일요일
+        target_date = now
+        
+        if weekday == 5:  # 토요일 -> 금요일
+            target_date = now - timedelta(days=1)
+        elif weekday == 6:  # 일요일 -> 금요일
+            target_date = now - timedelta(days=2)
+        elif now.time() < cls.SESSIONS[cls.REGULAR]["start"]:  # 평일 장 시작 전
+            if weekday == 0:  # 월요일 오전 -> 금요일
+                target_date = now - timedelta(days=3)
+            else:  # 그 외 평일 오전 -> 어제
+                target_date = now - timedelta(days=1)
+        
+        return target_date.strftime("%Y%m%d")
+    
     @classmethod
     def get_session_badge_style(cls, session_code: str) -> str:
         """
@@ -205,3 +239,13 @@ def is_extended_hours() -> bool:
         bool: 시간외 거래 여부
     """
     return MarketSession.is_extended_hours()
+
+
+def get_business_date() -> str:
+    """
+    조회 기준 영업일(YYYYMMDD)을 반환하는 편의 함수
+    
+    Returns:
+        str: 영업일
+    """
+    return MarketSession.get_business_date()
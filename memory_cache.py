@@ -0,0 +1,191 @@
+"""
+크기 제한 LRU 메모리 캐시
+================================================================
+여러 스레드(waitress 워커, 분석 스레드 풀)가 함께 쓰는 프로세스 내 캐시입니다.
+
+- 항목 수 상한(max_entries)과 대략적인 바이트 예산(max_bytes)을 넘으면
+  가장 오래 사용하지 않은 항목부터 제거
+- 항목별 TTL: 저장 시 지정, 조회 시 만료된 항목은 미스로 처리하고 제거
+- 백그라운드 스레드가 sweep_interval초마다 만료 항목 정리 (같은 키를 다시 조회하지 않아도 메모리 반환)
+- 모든 접근은 락으로 보호, 적중/미스/만료/제거 카운터 제공
+
+항목 크기는 JSON 직렬화 길이로 추정합니다 (Gemini 응답처럼 dict/str 위주인 값 기준).
+================================================================
+"""
+import json
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+class LRUMemoryCache:
+    """스레드 안전한 크기 제한 LRU + TTL 캐시"""
+
+    def __init__(self, max_entries=500, max_bytes=64 * 1024 * 1024, sweep_interval=60, name="cache"):
+        """
+        Args:
+            max_entries: 최대 항목 수
+            max_bytes: 대략적인 전체 크기 상한 (바이트)
+            sweep_interval: 만료 항목 정리 주기 (초, 0이면 백그라운드 정리 안 함)
+            name: 정리 스레드 이름
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # key -> [value, timestamp, ttl, size] (앞쪽이 가장 오래 사용하지 않은 항목)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+        self._stop = threading.Event()
+        if sweep_interval and sweep_interval > 0:
+            # 스레드가 캐시를 강하게 참조하지 않도록 weakref 사용 (캐시가 버려지면 스레드도 종료)
+            thread = threading.Thread(
+                target=LRUMemoryCache._sweep_loop,
+                args=(weakref.ref(self), self._stop, sweep_interval),
+                name=f"{name}-sweeper",
+                daemon=True
+            )
+            thread.start()
+
+    # ------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------
+    def get(self, key, now=None):
+        """
+        Returns:
+            (value, age_seconds) - 없거나 만료되었으면 (None, None)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+
+            value, timestamp, ttl, _ = entry
+            age = now - timestamp
+            if ttl is not None and age > ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, age
+
+    def put(self, key, value, ttl=None, timestamp=None):
+        """
+        Args:
+            ttl: 유효 시간 (초, None이면 만료 없음 - 크기 제한으로만 제거)
+            timestamp: 데이터 생성 시각 (기본값: 현재, 파일에서 읽은 값은 파일 수정 시각)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        size = self._estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # 단일 항목이 예산보다 크면 캐시하지 않음 (다른 항목을 전부 밀어내지 않도록)
+            if self.max_bytes and size > self.max_bytes:
+                return False
+            self._entries[key] = [value, timestamp, ttl, size]
+            self._bytes += size
+            self._evict_over_budget()
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    # ------------------------------------------------------------
+    # 정리
+    # ------------------------------------------------------------
+    def sweep(self, now=None):
+        """
+        만료 항목 제거
+
+        Returns:
+            int: 제거한 항목 수
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [key for key, (_, timestamp, ttl, _) in self._entries.items()
+                       if ttl is not None and now - timestamp > ttl]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def close(self):
+        """백그라운드 정리 스레드 종료"""
+        self._stop.set()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'expirations': self.expirations,
+                'evictions': self.evictions
+            }
+
+    @staticmethod
+    def _sweep_loop(cache_ref, stop, interval):
+        while not stop.wait(interval):
+            cache = cache_ref()
+            if cache is None:
+                return
+            cache.sweep()
+            del cache
+
+    def _evict_over_budget(self):
+        """락을 잡은 상태에서 호출: 상한을 넘는 동안 LRU 항목 제거"""
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[3]
+
+    @staticmethod
+    def _estimate_size(value):
+        """값의 대략적인 크기 (바이트)"""
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        try:
+            return len(json.dumps(value, ensure_ascii=False, default=str))
+        except (TypeError, ValueError):
+            return sys.getsizeof(value)
@@ -4,31 +4,89 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
+)
 from webdriver_manager.chrome import ChromeDriverManager
+import threading
 import time
 
+import config
+from browser_pool import BrowserPool
+
+# 답변이 없거나 늦게 뜬 경우의 예외 (정상적인 "결과 없음", 브라우저 세션은 그대로 재사용)
+NO_ANSWER_ERRORS = (TimeoutException, NoSuchElementException, StaleElementReferenceException)
+
+# ChromeDriver 경로 (프로세스당 한 번만 확인/다운로드)
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """ChromeDriverManager().install()은 버전 확인에 수 초가 걸리므로 결과를 재사용"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def build_options(headless=True):
+    options = Options()
+    if headless:
+        options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    # User Agent 설정 (차단 방지)
+    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    return options
+
+
+def create_driver(headless=True):
+    return webdriver.Chrome(service=Service(resolve_driver_path()), options=build_options(headless))
+
+
+def driver_alive(driver):
+    """브라우저 프로세스가 살아 있고 명령에 응답하는지 확인"""
+    return driver.execute_script("return 1") == 1
+
+
+def create_browser_pool(headless=True):
+    """
+    MK AI 검색용 브라우저 풀 (config.MK_BROWSER_POOL_SIZE개까지 동시 검색)
+    """
+    return BrowserPool(
+        factory=lambda: create_driver(headless),
+        size=getattr(config, 'MK_BROWSER_POOL_SIZE', 2),
+        max_uses=getattr(config, 'MK_BROWSER_MAX_USES', 50),
+        lease_timeout=getattr(config, 'MK_BROWSER_LEASE_TIMEOUT', 60),
+        health_check=driver_alive,
+        name="MKBrowser"
+    )
+
+
 class MKScraper:
-    def __init__(self, headless=True):
-        self.options = Options()
-        if headless:
-            self.options.add_argument('--headless')
-        self.options.add_argument('--no-sandbox')
-        self.options.add_argument('--disable-dev-shm-usage')
-        self.options.add_argument('--window-size=1920,1080')
-        # User Agent 설정 (차단 방지)
-        self.options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        self.driver = None
+    def __init__(self, headless=True, driver=None):
+        """
+        Args:
+            headless: 직접 브라우저를 띄울 때 헤드리스 모드 여부
+            driver: 브라우저 풀에서 빌린 driver (있으면 그대로 사용하고 close()에서 종료하지 않음)
+        """
+        self.headless = headless
+        self.driver = driver
+        self._owns_driver = driver is None
+        self.last_error = None  # 마지막 검색 중 발생한 브라우저/세션 오류 (풀 세션 재활용 판단용, 답변 없음은 제외)
 
     def _init_driver(self):
         if not self.driver:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=self.options)
+            self.driver = create_driver(self.headless)
 
     def get_ai_answer(self, query):
         """
         매경 AI 검색에서 쿼리에 대한 답변을 스크래핑합니다.
         """
+        self.last_error = None
         try:
             self._init_driver()
             url = "https://www.mk.co.kr/aisearch"
@@ -98,16 +156,20 @@ class MKScraper:
                     
             except Exception as e:
                 print(f"[Scraper] Error finding answer container: {e}")
+                # 답변 없음(대기 시간 초과/요소 없음)은 결과 없음으로 처리, 세션 자체 오류만 기록
+                if isinstance(e, WebDriverException) and not isinstance(e, NO_ANSWER_ERRORS):
+                    self.last_error = e
                 return None
 
         except Exception as e:
             print(f"[Scraper Error] {e}")
+            self.last_error = e
             return None
 
     def close(self):
-        if self.driver:
+        if self.driver and self._owns_driver:
             self.driver.quit()
-            self.driver = None
+        self.driver = None
 
 if __name__ == "__main__":
     import sys
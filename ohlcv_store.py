@@ -0,0 +1,336 @@
+"""
+일봉 OHLCV 로컬 저장소
+================================================================
+종목별 일봉을 디스크에 컬럼 단위로 저장하고, 갱신 시 마지막 저장일 이후 봉만 받아 합칩니다.
+
+- 파일: cache/ohlcv/{종목코드}.npy - float64 (6, N) 배열 (date/open/high/low/close/volume 행)
+  각 컬럼이 연속된 메모리이므로 mmap으로 열어 close 등 필요한 열만 바로 사용
+- 메타: cache/ohlcv/{종목코드}.json - 마지막 동기화 시각, 과거 이력 끝 도달 여부
+- 갱신 규칙
+  - 마지막 봉이 장 마감 후 동기화된 확정 봉이면 네트워크 요청 없음
+  - 장중 당일 봉(잠정)은 LIVE_TTL 초마다 다시 조회
+  - 최신 페이지를 받아 저장된 마지막 날짜 이후 봉으로 교체 (저장 구간과 겹칠 때까지만 연속조회)
+  - 더 긴 이력이 필요하면(min_bars) 가장 오래된 날짜부터 ka10081 연속조회로 과거 방향 보충
+- 파일은 임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일만 봄)
+================================================================
+"""
+import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import config
+from logger import Logger
+from market_session import MarketSession
+
+
+class OhlcvStore:
+    """종목별 일봉 OHLCV 디스크 저장소 (프로세스 내 공유)"""
+
+    FIELDS = ('date', 'open', 'high', 'low', 'close', 'volume')
+    DATE, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+    # 장중 잠정 봉 재조회 간격 (초)
+    LIVE_TTL = getattr(config, 'OHLCV_LIVE_TTL', 60)
+    # 과거 이력 보충 시 한 번에 요청할 최대 페이지 수
+    MAX_BACKFILL_PAGES = getattr(config, 'OHLCV_MAX_BACKFILL_PAGES', 5)
+    # 최신 봉 갱신 시 저장 구간과 겹칠 때까지 따라갈 최대 페이지 수
+    MAX_CATCHUP_PAGES = 3
+    # Windows는 mmap 중인 파일을 교체할 수 없으므로 메모리로 읽음
+    MMAP_MODE = 'r' if os.name != 'nt' else None
+
+    def __init__(self, api, base_dir=None):
+        """
+        Args:
+            api: KiwoomApi 인스턴스 (get_daily_chart_page 사용)
+            base_dir: 저장 디렉토리 (기본값: cache/ohlcv)
+        """
+        self.api = api
+        self.base_dir = base_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'ohlcv')
+        os.makedirs(self.base_dir, exist_ok=True)
+
+        # 종목별 갱신 락 (같은 종목 동시 요청 시 네트워크 조회는 1회)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    def get_bars(self, code, min_bars=0, force_refresh=False):
+        """
+        일봉 배열 반환 (필요 시 증분 갱신)
+
+        Args:
+            code: 종목코드
+            min_bars: 최소 필요 봉 수 (부족하면 과거 방향 연속조회로 보충)
+            force_refresh: True이면 신선도와 관계없이 최신 페이지 재조회
+
+        Returns:
+            np.ndarray: (6, N) 날짜 오름차순 배열 (행 순서는 FIELDS). 데이터가 없으면 None
+        """
+        code = self._clean_code(code)
+        bars, meta = self._load(code)
+
+        if not force_refresh and self._is_fresh(bars, meta) and not self._needs_backfill(bars, meta, min_bars):
+            return bars
+
+        with self._lock_for(code):
+            # 락 대기 중 다른 스레드가 갱신했을 수 있으므로 다시 확인
+            bars, meta = self._load(code)
+            changed = False
+
+            if force_refresh or not self._is_fresh(bars, meta):
+                updated = self._catch_up(code, bars)
+                if updated is not None:
+                    if bars is None or bars.shape[1] == 0 or updated[self.DATE, 0] != bars[self.DATE, 0]:
+                        meta['history_complete'] = False  # 이력이 새로 구성됨 → 과거 보충 다시 허용
+                    bars = updated
+                    meta['synced_at'] = time.time()
+                    changed = True
+
+            if self._needs_backfill(bars, meta, min_bars):
+                bars, complete = self._backfill(code, bars, min_bars)
+                meta['history_complete'] = complete
+                changed = True
+
+            if changed and bars is not None:
+                self._write(code, bars, meta)
+                bars, _ = self._load(code)
+
+        return bars
+
+    def get_daily_chart(self, code, min_bars=0, limit=None, force_refresh=False):
+        """
+        일봉 목록 반환 (get_daily_chart_data와 같은 dict 형식, 날짜 오름차순)
+
+        Args:
+            limit: 최근 N개만 반환 (기본값: 전체)
+        """
+        bars = self.get_bars(code, min_bars=min_bars, force_refresh=force_refresh)
+        if bars is None or bars.shape[1] == 0:
+            return []
+        if limit:
+            bars = bars[:, -limit:]
+        return self.to_records(bars)
+
+    def load_bars(self, code):
+        """
+        저장된 일봉 배열만 반환 (네트워크 요청 없음, 유니버스 일괄 계산용)
+
+        Returns:
+            np.ndarray: (6, N) 날짜 오름차순 배열. 저장된 데이터가 없으면 None
+        """
+        bars, _ = self._load(self._clean_code(code))
+        if bars is None or bars.shape[1] == 0:
+            return None
+        return bars
+
+    @classmethod
+    def to_records(cls, bars):
+        """(6, N) 배열 → [{'date', 'open', 'high', 'low', 'close', 'volume'}, ...]"""
+        columns = np.asarray(bars, dtype=np.int64).tolist()
+        dates = [str(d) for d in columns[cls.DATE]]
+        return [
+            {'date': d, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            for d, o, h, l, c, v in zip(dates, columns[cls.OPEN], columns[cls.HIGH],
+                                        columns[cls.LOW], columns[cls.CLOSE], columns[cls.VOLUME])
+        ]
+
+    @classmethod
+    def from_records(cls, records):
+        """[{'date', ...}, ...] → (6, N) 날짜 오름차순 배열 (같은 날짜는 마지막 값 사용)"""
+        by_date = {}
+        for r in records:
+            try:
+                by_date[int(r['date'])] = r
+            except (KeyError, TypeError, ValueError):
+                continue
+        bars = np.empty((len(cls.FIELDS), len(by_date)), dtype=np.float64)
+        for i, d in enumerate(sorted(by_date)):
+            r = by_date[d]
+            bars[:, i] = (d, r['open'], r['high'], r['low'], r['close'], r['volume'])
+        return bars
+
+    # ------------------------------------------------------------
+    # 신선도 판단
+    # ------------------------------------------------------------
+    def _is_fresh(self, bars, meta, now=None):
+        """저장된 봉이 현재 시점에 충분히 최신인지 확인"""
+        if bars is None or bars.shape[1] == 0:
+            return False
+
+        now = now or datetime.datetime.now()
+        synced_at = meta.get('synced_at', 0)
+        age = now.timestamp() - synced_at
+
+        last_date = int(bars[self.DATE, -1])
+        business_date = int(MarketSession.get_business_date(now))
+        close_time = MarketSession.SESSIONS[MarketSession.POST_AUCTION]["end"]
+        last_close = datetime.datetime.combine(
+            datetime.datetime.strptime(str(last_date), "%Y%m%d").date(), close_time
+        ).timestamp()
+
+        if last_date >= business_date:
+            if synced_at >= last_close:
+                return True  # 장 마감 후 동기화된 확정 봉
+            if now.timestamp() < last_close:
+                return age < self.LIVE_TTL  # 장중 잠정 봉
+            return False  # 장중에 받은 봉 → 확정 봉으로 교체 필요
+
+        # 마지막 봉이 기준 영업일보다 이전 (휴장일이거나 아직 미동기화)
+        return age < self.LIVE_TTL
+
+    def _needs_backfill(self, bars, meta, min_bars):
+        if not min_bars or meta.get('history_complete'):
+            return False
+        return bars is None or bars.shape[1] < min_bars
+
+    # ------------------------------------------------------------
+    # 네트워크 갱신
+    # ------------------------------------------------------------
+    def _catch_up(self, code, bars):
+        """
+        최신 페이지를 받아 저장된 마지막 날짜 이후 봉을 교체/추가
+
+        Returns:
+            갱신된 배열 (조회 실패 시 None)
+        """
+        records, next_key = self.api.get_daily_chart_page(code)
+        if records is None:
+            return None
+
+        if bars is None or bars.shape[1] == 0:
+            return self.from_records(records)
+
+        last_date = int(bars[self.DATE, -1])
+        pages = 1
+        # 마지막 저장일까지 닿지 않았으면 연속조회 (오랜만에 갱신하는 경우)
+        while next_key and pages < self.MAX_CATCHUP_PAGES and min(int(r['date']) for r in records) > last_date:
+            more, next_key = self.api.get_daily_chart_page(code, next_key=next_key)
+            if not more:
+                break
+            records.extend(more)
+            pages += 1
+
+        fresh = self.from_records(records)
+        if fresh.shape[1] == 0:
+            return bars
+
+        if fresh[self.DATE, 0] > last_date:
+            # 공백 구간이 남음 → 저장 이력을 이어 붙일 수 없으므로 새로 받은 구간으로 대체
+            Logger.warning("OHLCV", f"{code}: gap after {last_date}, replacing stored history")
+            return fresh
+
+        # 수정주가 반영 여부 확인: 겹치는 확정 구간의 종가가 다르면 이력 전체 교체
+        overlap_dates = np.intersect1d(bars[self.DATE, :-1], fresh[self.DATE])
+        if overlap_dates.size:
+            stored_close = bars[self.CLOSE, np.searchsorted(bars[self.DATE], overlap_dates)]
+            fresh_close = fresh[self.CLOSE, np.searchsorted(fresh[self.DATE], overlap_dates)]
+            if not np.array_equal(stored_close, fresh_close):
+                Logger.info("OHLCV", f"{code}: adjusted prices changed, replacing stored history")
+                return fresh
+
+        # 마지막 저장 봉(잠정일 수 있음)부터는 새로 받은 봉으로 교체
+        keep = bars[:, bars[self.DATE] < last_date]
+        tail = fresh[:, fresh[self.DATE] >= last_date]
+        return np.concatenate([keep, tail], axis=1)
+
+    def _backfill(self, code, bars, min_bars):
+        """
+        가장 오래된 저장일부터 과거 방향으로 연속조회하여 min_bars까지 보충
+
+        Returns:
+            (bars, history_complete)
+        """
+        if bars is None or bars.shape[1] == 0:
+            base_dt, have = None, 0
+        else:
+            base_dt, have = str(int(bars[self.DATE, 0])), bars.shape[1]
+
+        collected = []
+        next_key = None
+        complete = False
+        for _ in range(self.MAX_BACKFILL_PAGES):
+            records, next_key = self.api.get_daily_chart_page(code, base_dt=base_dt, next_key=next_key)
+            if not records:
+                complete = records is not None  # 빈 응답이면 이력 끝, None이면 조회 실패
+                break
+            # 기준일 자체는 이미 저장되어 있으므로 더 과거 봉만 수집
+            collected.extend(r for r in records if base_dt is None or r['date'] < base_dt)
+            if not next_key:
+                complete = True
+                break
+            if have + len(collected) >= min_bars:
+                break
+
+        if not collected:
+            return bars, complete
+
+        older = self.from_records(collected)
+        if bars is not None and bars.shape[1]:
+            older = older[:, older[self.DATE] < bars[self.DATE, 0]]
+            bars = np.concatenate([older, bars], axis=1)
+        else:
+            bars = older
+
+        Logger.debug("OHLCV", f"{code}: backfilled to {bars.shape[1]} bars (complete: {complete})")
+        return bars, complete
+
+    # ------------------------------------------------------------
+    # 파일 입출력
+    # ------------------------------------------------------------
+    def _path(self, code):
+        return os.path.join(self.base_dir, f"{code}.npy")
+
+    def _meta_path(self, code):
+        return os.path.join(self.base_dir, f"{code}.json")
+
+    def _load(self, code):
+        """저장된 배열과 메타 로드 (없으면 None, {})"""
+        bars, meta = None, {}
+        try:
+            if os.path.exists(self._path(code)):
+                bars = np.load(self._path(code), mmap_mode=self.MMAP_MODE)
+            if os.path.exists(self._meta_path(code)):
+                with open(self._meta_path(code), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+        except Exception as e:
+            Logger.warning("OHLCV", f"{code}: failed to load store ({e}), will refetch")
+            return None, {}
+        return bars, meta
+
+    def _write(self, code, bars, meta):
+        """임시 파일에 쓴 뒤 원자적으로 교체"""
+        path, meta_path = self._path(code), self._meta_path(code)
+        tmp_path, tmp_meta_path = path + ".tmp.npy", meta_path + ".tmp"
+        try:
+            np.save(tmp_path, np.ascontiguousarray(bars, dtype=np.float64))
+            with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, path)
+            os.replace(tmp_meta_path, meta_path)
+        except Exception as e:
+            Logger.error("OHLCV", f"{code}: failed to write store: {e}")
+            for p in (tmp_path, tmp_meta_path):
+                if os.path.exists(p):
+                    try:
+                        os.remove(p)
+                    except OSError:
+                        pass
+
+    def _lock_for(self, code):
+        with self._locks_guard:
+            lock = self._locks.get(code)
+            if lock is None:
+                lock = self._locks[code] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _clean_code(code):
+        """종목코드에서 'A' 접두사 제거"""
+        if code and isinstance(code, str) and code.startswith('A'):
+            return code[1:]
+        return code
@@ -0,0 +1,189 @@
+"""
+프롬프트 입력 기반(content-addressed) LLM 결과 캐시
+================================================================
+GeminiCache는 (종목코드, 분석 타입) 단위로 최신 결과를 보관하므로,
+강제 갱신 시에는 입력이 그대로여도 다시 호출하고 시세가 크게 움직여도 TTL 안에서는 이전 결과를 반환합니다.
+이 모듈은 prompts.* 템플릿에 들어가는 입력값을 정규화/양자화한 뒤 해시한 키로 결과를 보관합니다.
+
+- 같은 상황(같은 가격대, 지표, 뉴스, 테마)이면 강제 갱신이나 다른 종목 요청에서도 결과 재사용
+  (시장 이벤트/한국 증시 영향처럼 종목과 무관한 프롬프트는 입력이 같으면 그대로 공유)
+- 양자화 규칙 (필드 이름 기준, 중첩 dict/list에도 적용)
+  - 가격(현재가/이평선/볼린저 밴드): 호가 단위 × PROMPT_CACHE_PRICE_BAND_TICKS 단위로 반올림
+  - RSI: 소수점 PROMPT_CACHE_RSI_DECIMALS자리
+  - 수량/MACD (외국인/기관 순매수 등): 유효숫자 PROMPT_CACHE_SIGNIFICANT_DIGITS자리
+  - 등락률(%): PROMPT_CACHE_PERCENT_STEP 단위, %B: PROMPT_CACHE_RATIO_STEP 단위, 환율: 1원 단위
+  - 그 밖의 실수: 소수점 PROMPT_CACHE_FLOAT_DECIMALS자리, 문자열: 앞뒤/연속 공백 정리
+- 입력이 실질적으로 바뀌면 키가 달라지므로 별도 무효화 없이 새로 계산
+- 저장소: 분석 결과 저장소(SQLiteCacheStore)에 analysis_type='prompt:{템플릿 이름}', code=키로 보관
+  (보관 기간 정리는 GeminiCache.vacuum()이 함께 처리)
+================================================================
+"""
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+
+import config
+from logger import Logger
+
+
+class PromptCache:
+    """프롬프트 입력 해시 → LLM 결과 캐시"""
+
+    TYPE_PREFIX = "prompt:"
+
+    # 필드 이름 → 양자화 규칙
+    FIELD_RULES = {
+        'current_price': 'price', 'price': 'price',
+        'ma5': 'price', 'ma20': 'price', 'ma60': 'price',
+        'upper': 'price', 'middle': 'price', 'lower': 'price',
+        'rsi': 'rsi',
+        'foreign_net': 'significant', 'institution_net': 'significant', 'macd': 'significant',
+        'change_rate': 'percent', 'rate': 'percent',
+        'percent_b': 'ratio',
+        'usd_krw_rate': 'won',
+    }
+
+    # KRX 호가 단위 (가격 상한, 호가 단위)
+    TICK_SIZES = [(2000, 1), (5000, 5), (20000, 10), (50000, 50), (200000, 100), (500000, 500)]
+    MAX_TICK = 1000
+
+    _WHITESPACE = re.compile(r'\s+')
+
+    def __init__(self, store, ttl=None):
+        """
+        Args:
+            store: CacheStore 구현 (GeminiCache와 같은 저장소 사용)
+            ttl: 결과 유효 시간 (초, 기본값: config.PROMPT_CACHE_TTL 또는 6시간)
+        """
+        self.store = store
+        self.ttl = ttl if ttl is not None else getattr(config, 'PROMPT_CACHE_TTL', 6 * 3600)
+        self.price_band_ticks = getattr(config, 'PROMPT_CACHE_PRICE_BAND_TICKS', 10)
+        self.rsi_decimals = getattr(config, 'PROMPT_CACHE_RSI_DECIMALS', 1)
+        self.significant_digits = getattr(config, 'PROMPT_CACHE_SIGNIFICANT_DIGITS', 2)
+        self.percent_step = getattr(config, 'PROMPT_CACHE_PERCENT_STEP', 0.5)
+        self.ratio_step = getattr(config, 'PROMPT_CACHE_RATIO_STEP', 0.05)
+        self.float_decimals = getattr(config, 'PROMPT_CACHE_FLOAT_DECIMALS', 2)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------
+    # 키 생성
+    # ------------------------------------------------------------
+    def make_key(self, template_name, inputs):
+        """템플릿 이름 + 정규화된 입력값의 안정적인 해시 (32자리 16진수)"""
+        payload = json.dumps([template_name, self.normalize(inputs)], ensure_ascii=False,
+                             sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def normalize(self, value, field=None):
+        """입력값 정규화/양자화 (dict는 키 이름으로 규칙 선택)"""
+        if isinstance(value, dict):
+            return {str(key): self.normalize(item, key) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.normalize(item, field) for item in value]
+        if isinstance(value, bool) or value is None:
+            return value
+
+        number = self.to_number(value)
+        if number is None:
+            return self._WHITESPACE.sub(' ', value).strip() if isinstance(value, str) else value
+
+        rule = self.FIELD_RULES.get(field)
+        if rule == 'price':
+            return self.quantize_price(number)
+        if rule == 'rsi':
+            return round(number, self.rsi_decimals)
+        if rule == 'significant':
+            return self._round_significant(number, self.significant_digits)
+        if rule == 'percent':
+            return self._round_step(number, self.percent_step)
+        if rule == 'ratio':
+            return self._round_step(number, self.ratio_step)
+        if rule == 'won':
+            return int(round(number))
+        if isinstance(number, float):
+            return round(number, self.float_decimals)
+        return number
+
+    def quantize_price(self, price):
+        """호가 단위 × price_band_ticks 단위로 반올림"""
+        band = self.tick_size(price) * self.price_band_ticks
+        if band <= 0:
+            return price
+        return int(round(price / band) * band)
+
+    @classmethod
+    def tick_size(cls, price):
+        for limit, tick in cls.TICK_SIZES:
+            if abs(price) < limit:
+                return tick
+        return cls.MAX_TICK
+
+    @staticmethod
+    def _round_step(number, step):
+        if not step:
+            return number
+        return round(round(number / step) * step, 6)
+
+    @staticmethod
+    def _round_significant(number, digits):
+        if number == 0 or digits <= 0:
+            return number
+        ndigits = digits - 1 - int(math.floor(math.log10(abs(number))))
+        rounded = round(number, ndigits)
+        return int(rounded) if ndigits <= 0 else rounded
+
+    @staticmethod
+    def to_number(value):
+        """숫자 또는 숫자 문자열("75,500", "+1.2")이면 숫자, 아니면 None"""
+        if isinstance(value, (int, float)):
+            return value if not (isinstance(value, float) and math.isnan(value)) else None
+        if isinstance(value, str):
+            text = value.strip().replace(',', '')
+            if re.fullmatch(r'[+-]?\d+', text):
+                return int(text)
+            if re.fullmatch(r'[+-]?(\d+\.\d*|\.\d+)', text):
+                return float(text)
+        return None
+
+    # ------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------
+    def get(self, template_name, key):
+        """
+        Returns:
+            유효한(TTL 이내) 결과 또는 None
+        """
+        try:
+            data, created_at = self.store.get(key, self.TYPE_PREFIX + template_name)
+        except Exception as e:
+            Logger.warning("PromptCache", f"Read failed ({template_name}): {e}")
+            data, created_at = None, None
+
+        with self._lock:
+            if data is None or time.time() - created_at > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return data
+
+    def put(self, template_name, key, data):
+        try:
+            self.store.put(key, self.TYPE_PREFIX + template_name, data)
+        except Exception as e:
+            Logger.warning("PromptCache", f"Write failed ({template_name}): {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'ttl': self.ttl
+            }
@@ -145,6 +145,52 @@ OUTLOOK_GENERATION_PROMPT = """
    (미국 시장 상황에서 파생된 낙수 효과가 이 종목에 어떻게 적용되는지, 그리고 현재 수급과 차트 위치가 매수하기에 적절한 타이밍인지 논리적으로 서술하십시오.)
 """
 
+# 여러 종목 묶음 전망 프롬프트 (카드 감성 분석용, 종목별 결과는 "### 종목코드" 구분선으로 분리)
+BATCH_OUTLOOK_PROMPT = """
+당신은 '탑-다운(Top-Down)' 투자 전략에 특화된 수석 주식 애널리스트입니다.
+아래 공통 시장 상황을 바탕으로 **{stock_count}개 종목** 각각에 대해 간결한 실전 투자 의견을 제시하세요.
+
+---
+**[공통 시장 상황]**
+- 시장 요약(국내/미국 지수, 미국 강세 섹터): {market_context}
+- 한국 주도 테마: {current_hot_themes}
+- 환율: {usd_krw_exchange_rate}
+
+**[분석 지침]**
+1. 미국 강세 섹터와 종목의 핵심 테마가 겹치면 커플링 호재, 겹치지 않으면 개별 이슈로 판단하십시오.
+2. 외국인/기관 수급과 이평선, RSI, MACD, 볼린저 밴드 신호를 종합하십시오.
+3. 매매 전략 가격은 반드시 제공된 현재가와 이평선 가격을 기준으로 제시하십시오.
+4. 뉴스 헤드라인이 주어진 종목은 헤드라인의 톤으로 뉴스 심리를 판단하고, 없으면 '중립'으로 답하십시오.
+
+---
+**[분석 대상 종목]**
+{stock_blocks}
+
+---
+**[최종 답변 형식]**
+시스템 파싱을 위해 **모든 종목**에 대해 아래 형식을 정확히 반복하십시오. 종목 순서는 위와 같게, 구분선의 종목코드는 그대로 쓰십시오.
+
+### 종목코드
+1. 투자의견: [강력매수 / 분할매수 / 관망 / 매도] (신뢰도: 0-100점)
+2. 핵심 논리: (한 줄 요약)
+3. 매매 시나리오:
+   - 진입: [가격] (근거)
+   - 목표: [가격] (근거)
+   - 손절: [가격] (근거)
+4. 상세 분석: (2문장 이내)
+5. 뉴스 심리: [긍정 / 중립 / 부정]
+"""
+
+# 묶음 전망 프롬프트의 종목별 요약 블록
+BATCH_OUTLOOK_STOCK_BLOCK = """### {stock_code}
+- 종목명: {stock_name} / 핵심 테마: {core_themes}
+- 현재가: {current_price}원 (등락률 {change_rate}%) / 수급: 외국인 {foreign_net}주, 기관 {institution_net}주
+- 이평선: 5일 {ma5}원, 20일 {ma20}원, 60일 {ma60}원 ({ma_signal}) / RSI {rsi} ({rsi_signal}) / MACD {macd} ({macd_signal})
+- 볼린저 밴드: {bollinger_summary} (스퀴즈: {is_squeeze})
+- 밸류에이션: 시가총액 {market_cap}, PER {per}배, PBR {pbr}배, ROE {roe}%
+- 뉴스: {news_context}
+"""
+
 # 시장 이벤트 분석 프롬프트
 MARKET_EVENT_ANALYSIS_PROMPT = """
 [시스템 프롬프트]
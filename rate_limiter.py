@@ -0,0 +1,125 @@
+"""
+토큰 버킷 Rate Limiter
+================================================================
+키움 REST API 호출 빈도를 제어하는 토큰 버킷 구현입니다.
+
+- 전역 버킷(프로세스 전체) + API ID별 버킷을 동시에 적용
+- 버킷마다 초당 허용량(rate)과 버스트 용량(capacity)을 별도 설정
+- 락은 토큰 예약(계산)에만 사용하고, 대기(sleep)는 락 밖에서 수행
+  → 여러 스레드가 서로의 sleep에 막히지 않음
+- 호출별 대기 시간을 집계하여 limiter 대기와 네트워크 지연을 구분 가능
+================================================================
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """단일 토큰 버킷 (예약 방식)"""
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate: 초당 토큰 충전량 (= 초당 허용 요청 수)
+            capacity: 버킷 최대 용량 (= 버스트 허용량)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, now=None):
+        """
+        토큰 1개를 예약하고 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환합니다.
+        토큰이 부족하면 잔량이 음수가 되며, 이후 호출자는 그만큼 뒤로 밀립니다.
+        """
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            elapsed = now - self._last_refill
+            if elapsed > 0:
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._last_refill = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """전역 버킷 + 키(API ID)별 버킷을 조합한 Rate Limiter"""
+
+    def __init__(self, global_rate, global_burst, default_rate, default_burst, limits=None):
+        """
+        Args:
+            global_rate / global_burst: 프로세스 전체에 적용되는 버킷 설정
+            default_rate / default_burst: limits에 없는 키에 적용되는 기본 설정
+            limits: { 'ka10001': (rate, burst), ... } 키별 설정
+        """
+        self._global = TokenBucket(global_rate, global_burst)
+        self._default = (default_rate, default_burst)
+        self._limits = dict(limits or {})
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+        # 통계: { key: {'calls': n, 'waited_calls': n, 'total_wait': s, 'max_wait': s} }
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _get_bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    rate, burst = self._limits.get(key, self._default)
+                    bucket = TokenBucket(rate, burst)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def acquire(self, key):
+        """
+        요청 1건에 대한 토큰을 확보합니다 (필요 시 대기).
+
+        Returns:
+            float: limiter로 인해 대기한 시간(초)
+        """
+        now = time.monotonic()
+        wait = max(self._global.reserve(now), self._get_bucket(key).reserve(now))
+        if wait > 0:
+            time.sleep(wait)
+        self._record(key, wait)
+        return wait
+
+    def _record(self, key, wait):
+        with self._stats_lock:
+            stat = self._stats.setdefault(key, {'calls': 0, 'waited_calls': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+            stat['calls'] += 1
+            if wait > 0:
+                stat['waited_calls'] += 1
+                stat['total_wait'] += wait
+                stat['max_wait'] = max(stat['max_wait'], wait)
+
+    def get_stats(self):
+        """
+        키별 대기 통계 반환
+
+        Returns:
+            dict: { key: {'calls', 'waited_calls', 'total_wait', 'avg_wait', 'max_wait'} }
+        """
+        with self._stats_lock:
+            result = {}
+            for key, stat in self._stats.items():
+                result[key] = {
+                    'calls': stat['calls'],
+                    'waited_calls': stat['waited_calls'],
+                    'total_wait': round(stat['total_wait'], 3),
+                    'avg_wait': round(stat['total_wait'] / stat['calls'], 4) if stat['calls'] else 0.0,
+                    'max_wait': round(stat['max_wait'], 3)
+                }
+            return result
+
+    def reset_stats(self):
+        """통계 초기화"""
+        with self._stats_lock:
+            self._stats = {}
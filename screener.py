@@ -0,0 +1,370 @@
+"""
+유니버스 일괄 지표 계산 / 스크리너
+================================================================
+테마 캐시(themes_cache.json)의 전체 종목 + 관심종목 + 보유종목의 기술적 지표를
+(종목 수, 봉 수) 2차원 배열 한 번으로 계산해 스냅샷으로 보관하고,
+/api/screener 요청은 스냅샷을 필터/정렬만 합니다 (요청 시 지표 계산 없음).
+
+- 입력: OhlcvStore에 저장된 일봉의 최근 LOOKBACK개 종가 (오른쪽 정렬)
+  - 이력이 짧은 종목은 앞쪽을 첫 종가로 채움 → EMA/RSI/MACD는 단건 계산과 같은 값
+  - 이동평균/스퀴즈는 실제 봉 수가 창보다 짧으면 NaN/False (단건 계산과 같은 규칙)
+- 요약/신호 판단은 단건 계산과 같은 TechnicalIndicators.summarize_values 사용
+- 스냅샷은 cache/screener_snapshot.json에 저장 (재시작 직후에도 바로 응답)
+- 갱신: 장 마감 후 스케줄러(sync=True: 일봉 저장소 증분 갱신 후 계산) 또는 수동 갱신
+================================================================
+"""
+import concurrent.futures
+import datetime
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+import config
+import indicator_engine as engine
+from logger import Logger
+from technical_indicators import TechnicalIndicators
+
+
+class StockScreener:
+    """테마 유니버스 일괄 지표 계산 + 스크리너"""
+
+    # 일괄 계산에 사용할 최근 봉 수 (단건 분석의 최소 일봉 수와 같게)
+    LOOKBACK = getattr(config, 'SCREENER_LOOKBACK', 160)
+    # sync 갱신 시 일봉 저장소 동시 갱신 수 (호출 제한은 KiwoomApi rate limiter가 관리)
+    SYNC_WORKERS = getattr(config, 'SCREENER_SYNC_WORKERS', 4)
+
+    BB_WINDOW = 20
+    NUM_STD = 2
+    SQUEEZE_WINDOW = 120
+    # calculate_indicators가 '데이터부족'을 반환하는 기준과 같음
+    MIN_BARS = 20
+
+    SORT_FIELDS = ('rsi', 'macd_gap', 'percent_b', 'bandwidth', 'change_rate', 'close')
+    MACD_FILTERS = ('golden', 'dead', 'above', 'below')
+    MA_ALIASES = {'bull': '정배열', 'bear': '역배열'}
+    MAX_LIMIT = 500
+
+    def __init__(self, ohlcv_store, theme_service, data_fetcher=None, kiwoom=None, snapshot_file=None):
+        """
+        Args:
+            ohlcv_store: 공유 OhlcvStore 인스턴스 (일봉 입력)
+            theme_service: 공유 ThemeService 인스턴스 (테마 캐시 종목)
+            data_fetcher: DataFetcher (관심종목, 없으면 제외)
+            kiwoom: KiwoomApi (보유종목, 없으면 제외)
+            snapshot_file: 스냅샷 경로 (기본값: cache/screener_snapshot.json)
+        """
+        self.ohlcv_store = ohlcv_store
+        self.theme_service = theme_service
+        self.data_fetcher = data_fetcher
+        self.kiwoom = kiwoom
+        self.snapshot_file = snapshot_file or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'cache', 'screener_snapshot.json'
+        )
+        os.makedirs(os.path.dirname(self.snapshot_file), exist_ok=True)
+
+        self._snapshot = self._load_snapshot()
+        self._refresh_lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # 유니버스
+    # ------------------------------------------------------------
+    def get_universe(self):
+        """
+        테마 캐시 종목 + 관심종목 + 보유종목
+
+        Returns:
+            dict: {종목코드: {'name', 'themes': [테마명, ...], 'sources': ['theme'/'watchlist'/'holdings', ...]}}
+        """
+        universe = {}
+
+        def add(code, name, source, theme=None):
+            code = self._clean_code(code)
+            if not code:
+                return
+            entry = universe.setdefault(code, {'name': None, 'themes': [], 'sources': []})
+            if name and not entry['name']:
+                entry['name'] = name.strip()
+            if theme and theme not in entry['themes']:
+                entry['themes'].append(theme)
+            if source not in entry['sources']:
+                entry['sources'].append(source)
+
+        for theme in self.theme_service.get_cached_themes():
+            for stock in theme.get('stocks', []):
+                add(stock.get('stk_cd'), stock.get('stk_nm'), 'theme', theme.get('thema_nm'))
+
+        if self.data_fetcher is not None:
+            try:
+                for code in self.data_fetcher.load_watchlist():
+                    add(code, None, 'watchlist')
+            except Exception as e:
+                Logger.warning("Screener", f"Failed to load watchlist: {e}")
+
+        if self.kiwoom is not None:
+            try:
+                balance = self.kiwoom.get_account_balance(update_realtime_price=False)
+                for holding in (balance or {}).get('holdings', []):
+                    add(holding.get('stk_cd'), holding.get('stk_nm'), 'holdings')
+            except Exception as e:
+                Logger.warning("Screener", f"Failed to load holdings: {e}")
+
+        return universe
+
+    # ------------------------------------------------------------
+    # 일괄 계산
+    # ------------------------------------------------------------
+    def refresh(self, sync=False):
+        """
+        유니버스 전체 지표를 다시 계산해 스냅샷 교체
+
+        Args:
+            sync: True이면 일봉 저장소를 먼저 증분 갱신 (네트워크), False이면 저장된 일봉만 사용
+
+        Returns:
+            bool: 갱신 여부 (이미 갱신 중이면 False)
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            Logger.info("Screener", "Refresh already in progress, skipped")
+            return False
+
+        try:
+            start = time.perf_counter()
+            universe = self.get_universe()
+            bars = self._collect_bars(list(universe), sync)
+            loaded = time.perf_counter()
+
+            rows = self.compute(bars)
+            computed = time.perf_counter()
+
+            for code, row in rows.items():
+                row.update(universe[code])
+            ordered = sorted(rows.values(), key=lambda r: r['code'])
+
+            snapshot = {
+                'updated_at': datetime.datetime.now().isoformat(),
+                'date': max((r['date'] for r in ordered), default=None),
+                'universe_count': len(universe),
+                'count': len(ordered),
+                'load_ms': round((loaded - start) * 1000, 1),
+                'compute_ms': round((computed - loaded) * 1000, 1),
+                'rows': ordered
+            }
+            self._snapshot = snapshot
+            self._save_snapshot(snapshot)
+
+            Logger.info("Screener", f"Snapshot updated: {len(ordered)}/{len(universe)} stocks "
+                                    f"(load {snapshot['load_ms']}ms, compute {snapshot['compute_ms']}ms)")
+            return True
+        except Exception as e:
+            Logger.error("Screener", f"Refresh failed: {e}")
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def _collect_bars(self, codes, sync):
+        """종목별 일봉 배열 수집 {code: (6, N) 배열 또는 None}"""
+        if not sync:
+            return {code: self.ohlcv_store.load_bars(code) for code in codes}
+
+        def fetch(code):
+            try:
+                return self.ohlcv_store.get_bars(code, min_bars=self.LOOKBACK)
+            except Exception as e:
+                Logger.warning("Screener", f"{code}: failed to sync daily bars: {e}")
+                return None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.SYNC_WORKERS,
+                                                   thread_name_prefix='screener') as executor:
+            return dict(zip(codes, executor.map(fetch, codes)))
+
+    def compute(self, bars_by_code):
+        """
+        종목별 일봉을 (종목 수, LOOKBACK) 종가 행렬로 쌓아 지표를 한 번에 계산
+
+        Args:
+            bars_by_code: {종목코드: OhlcvStore (6, N) 배열}
+
+        Returns:
+            dict: {종목코드: 지표 행 dict}
+        """
+        codes = [code for code, bars in bars_by_code.items()
+                 if bars is not None and bars.shape[1] >= self.MIN_BARS]
+        if not codes:
+            return {}
+
+        width = self.LOOKBACK
+        close = np.full((len(codes), width), np.nan)
+        lengths = np.empty(len(codes), dtype=np.int64)
+        last_dates = []
+        for i, code in enumerate(codes):
+            tail = bars_by_code[code][:, -width:]
+            lengths[i] = tail.shape[1]
+            close[i, width - tail.shape[1]:] = tail[self.ohlcv_store.CLOSE]
+            last_dates.append(str(int(tail[self.ohlcv_store.DATE, -1])))
+
+        # 앞쪽 빈 구간은 첫 종가로 채움 (상수 구간은 EMA/RSI 초기값을 바꾸지 않음)
+        close = engine.fill_gaps(close)
+        squeeze_window = min(self.SQUEEZE_WINDOW, width)
+        result = engine.compute_all(close, bb_window=self.BB_WINDOW, num_std=self.NUM_STD,
+                                    squeeze_window=squeeze_window)
+
+        def last(name, min_count, offset=1):
+            """마지막(offset=2면 직전) 값, 실제 봉 수가 부족한 행은 NaN"""
+            return np.where(lengths - (offset - 1) >= min_count, result[name][:, -offset], np.nan)
+
+        ma5, ma20, ma60 = last('ma5', 5), last('ma20', 20), last('ma60', 60)
+        prev_ma5, prev_ma20 = last('ma5', 5, offset=2), last('ma20', 20, offset=2)
+        # 단건 계산은 밴드폭 최솟값 구간에 NaN이 섞이면 스퀴즈 False
+        is_squeeze = result['is_squeeze'][:, -1] & (lengths >= squeeze_window + self.BB_WINDOW - 1)
+
+        gap = result['macd'] - result['macd_signal']
+        golden = (gap[:, -1] > 0) & (gap[:, -2] <= 0)
+        dead = (gap[:, -1] < 0) & (gap[:, -2] >= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_rate = (close[:, -1] / close[:, -2] - 1) * 100
+
+        rows = {}
+        for i, code in enumerate(codes):
+            technical = TechnicalIndicators.summarize_values(
+                count=int(lengths[i]),
+                current_price=close[i, -1],
+                rsi=result['rsi'][i, -1],
+                macd=result['macd'][i, -1],
+                macd_signal_line=result['macd_signal'][i, -1],
+                ma5=ma5[i], ma20=ma20[i], ma60=ma60[i],
+                prev_ma5=prev_ma5[i], prev_ma20=prev_ma20[i]
+            )
+            bollinger = TechnicalIndicators.summarize_bollinger_values(
+                result['upper'][i, -1], result['sma'][i, -1], result['lower'][i, -1],
+                result['bandwidth'][i, -1], result['percent_b'][i, -1], is_squeeze[i]
+            )
+            row = {
+                'code': code,
+                'date': last_dates[i],
+                'bars': int(lengths[i]),
+                'close': int(close[i, -1]),
+                'change_rate': round(float(change_rate[i]), 2),
+                **technical,
+                'macd_gap': round(float(gap[i, -1]), 2),
+                'macd_cross': '골든크로스' if golden[i] else '데드크로스' if dead[i] else None,
+                **bollinger
+            }
+            rows[code] = {k: None if isinstance(v, float) and math.isnan(v) else v for k, v in row.items()}
+        return rows
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    def get_snapshot(self):
+        """현재 스냅샷 (없으면 저장된 일봉만으로 즉시 생성)"""
+        if self._snapshot is None:
+            self.refresh(sync=False)
+        return self._snapshot
+
+    def screen(self, rsi_min=None, rsi_max=None, macd=None, ma=None, percent_b_min=None, percent_b_max=None,
+               squeeze=None, source=None, sort='rsi', order='desc', limit=50):
+        """
+        스냅샷 필터/정렬
+
+        Args:
+            rsi_min, rsi_max: RSI 범위
+            macd: 'golden'/'dead' (마지막 봉에서 시그널 교차), 'above'/'below' (MACD가 시그널 위/아래)
+            ma: '정배열'/'역배열' (또는 'bull'/'bear'), '골든크로스'/'데드크로스'
+            percent_b_min, percent_b_max: %B 범위
+            squeeze: True/False - 볼린저 스퀴즈 여부
+            source: 'theme'/'watchlist'/'holdings'
+            sort: SORT_FIELDS 중 하나, order: 'asc'/'desc'
+            limit: 최대 반환 수 (MAX_LIMIT 이하)
+
+        Returns:
+            dict: {'updated_at', 'date', 'total', 'count', 'rows'}
+
+        Raises:
+            ValueError: 지원하지 않는 정렬/필터 값
+        """
+        if sort not in self.SORT_FIELDS:
+            raise ValueError(f"sort must be one of {', '.join(self.SORT_FIELDS)}")
+        if macd and macd not in self.MACD_FILTERS:
+            raise ValueError(f"macd must be one of {', '.join(self.MACD_FILTERS)}")
+        ma = self.MA_ALIASES.get(ma, ma)
+
+        def within(value, low, high):
+            if low is None and high is None:
+                return True
+            if value is None:
+                return False
+            return (low is None or value >= low) and (high is None or value <= high)
+
+        def matches(row):
+            if not within(row['rsi'], rsi_min, rsi_max):
+                return False
+            if not within(row['percent_b'], percent_b_min, percent_b_max):
+                return False
+            if macd == 'golden' and row['macd_cross'] != '골든크로스':
+                return False
+            if macd == 'dead' and row['macd_cross'] != '데드크로스':
+                return False
+            if macd == 'above' and not row['macd_gap'] > 0:
+                return False
+            if macd == 'below' and not row['macd_gap'] < 0:
+                return False
+            if ma and row['ma_signal'] != ma:
+                return False
+            if squeeze is not None and row['is_squeeze'] != squeeze:
+                return False
+            if source and source not in row.get('sources', []):
+                return False
+            return True
+
+        snapshot = self.get_snapshot() or {}
+        matched = [row for row in snapshot.get('rows', []) if matches(row)]
+
+        # 값이 없는 행(예: %B 계산 불가)은 정렬 방향과 관계없이 뒤로
+        present = [row for row in matched if row.get(sort) is not None]
+        present.sort(key=lambda row: row[sort], reverse=(order != 'asc'))
+        ranked = present + [row for row in matched if row.get(sort) is None]
+
+        limit = max(1, min(int(limit or 50), self.MAX_LIMIT))
+        return {
+            'updated_at': snapshot.get('updated_at'),
+            'date': snapshot.get('date'),
+            'total': len(ranked),
+            'count': min(limit, len(ranked)),
+            'rows': ranked[:limit]
+        }
+
+    # ------------------------------------------------------------
+    # 스냅샷 파일
+    # ------------------------------------------------------------
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_file):
+            return None
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            Logger.warning("Screener", f"Failed to load snapshot ({e}), will rebuild")
+            return None
+
+    def _save_snapshot(self, snapshot):
+        temp_path = self.snapshot_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(temp_path, self.snapshot_file)
+        except Exception as e:
+            Logger.warning("Screener", f"Failed to save snapshot: {e}")
+
+    @staticmethod
+    def _clean_code(code):
+        """종목코드 정규화 ('A' 접두사, 테마 종목의 '_AL' 같은 시장 접미사 제거)"""
+        if not code or not isinstance(code, str):
+            return None
+        code = code.strip().split('_')[0]
+        if code.startswith('A'):
+            code = code[1:]
+        return code or None
@@ -20,15 +20,14 @@ if __name__ == "__main__":
     if kiwoom.get_access_token():
         Logger.info("Server", "인증 완료!")
     
-    # 2. 테마 캐시 초기화 (서버 시작 전 필수)
-    Logger.info("Theme", "테마 캐시 초기화 중...")
+    # 2. 테마 캐시 확인 (만료/없음이면 백그라운드에서 갱신, 서버는 바로 시작)
     if not theme_service.is_cache_valid():
-        Logger.info("Theme", "캐시가 없거나 만료됨. 새로 생성합니다...")
-        if theme_service.update_cache():
-            cache_info = theme_service.get_cache_info()
-            Logger.info("Theme", f"캐시 생성 완료: {cache_info.get('theme_count')}개 테마")
+        cache_info = theme_service.get_cache_info()
+        if cache_info.get('exists'):
+            Logger.info("Theme", f"캐시 만료. 기존 캐시({cache_info.get('theme_count')}개 테마)로 시작하고 백그라운드에서 갱신합니다...")
         else:
-            Logger.error("Theme", "캐시 생성 실패 - 서비스 제한 모드로 시작")
+            Logger.info("Theme", "캐시가 없음. 백그라운드에서 생성합니다 (완료 전까지 테마 기능 제한)...")
+        theme_service.refresh_in_background()
     else:
         cache_info = theme_service.get_cache_info()
         Logger.info("Theme", f"기존 캐시 사용: {cache_info.get('theme_count')}개 테마")
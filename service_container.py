@@ -0,0 +1,80 @@
+"""
+서비스 컨테이너
+================================================================
+애플리케이션 수명 동안 한 번만 생성되어 모든 요청이 공유하는 서비스 모음입니다.
+
+요청마다 StockAnalysisService를 새로 만들면 KiwoomApi / GeminiService
+(GeminiCache, ExchangeRateFetcher) / ThemeService(테마 캐시 JSON 로드)를
+매번 다시 구성하고, 메모리 캐시(차트 60초, 펀더멘털 300초)도 응답 후 버려집니다.
+컨테이너는 서버 시작 시 이 객체들을 한 번 구성하여 라우트에 주입합니다.
+================================================================
+"""
+import threading
+
+from kis_api import KiwoomApi
+from data_fetcher import DataFetcher
+from theme_service import ThemeService
+from finviz_market_crawler import FinvizMarketFetcher
+from gemini_service import GeminiService
+from stock_analysis_service import StockAnalysisService
+from ohlcv_store import OhlcvStore
+from indicator_state import IndicatorStateStore
+from screener import StockScreener
+from shared_cache import SharedCache
+from logger import Logger
+
+
+class ServiceContainer:
+    """애플리케이션 범위(싱글톤) 서비스 컨테이너"""
+
+    def __init__(self):
+        Logger.info("Services", "Building application services...")
+
+        # 프로세스 간 공유 캐시 (같은 호스트의 워커 프로세스끼리 AI 분석/시장 데이터 공유)
+        self.shared_cache = SharedCache()
+
+        # Kiwoom API 클라이언트 (HTTP 세션/토큰/rate limiter는 클래스 레벨에서 공유)
+        self.kiwoom = KiwoomApi()
+
+        # 일봉 OHLCV 로컬 저장소 (cache/ohlcv, 증분 갱신)
+        self.ohlcv_store = OhlcvStore(self.kiwoom)
+        # 종목별 증분 지표 상태 (일봉 파일 옆에 저장)
+        self.indicator_states = IndicatorStateStore(self.ohlcv_store.base_dir)
+
+        # 관심종목 관리
+        self.data_fetcher = DataFetcher(kiwoom_api=self.kiwoom)
+
+        # 테마 서비스 (테마 캐시 JSON은 여기서 한 번만 로드)
+        self.theme_service = ThemeService(api=self.kiwoom)
+
+        # 글로벌 마켓 데이터 페처
+        self.market_fetcher = FinvizMarketFetcher()
+
+        # Gemini 서비스 (GeminiCache 메모리 캐시를 요청 간 공유)
+        self.gemini = GeminiService(shared_cache=self.shared_cache)
+
+        # MK AI 검색 브라우저 풀 준비 (드라이버 확인 + Chrome 기동은 수 초 걸리므로 백그라운드)
+        threading.Thread(target=self.gemini.warm_mk_browser_pool, name="mk-browser-warmup", daemon=True).start()
+
+        # 환율 정보 페처 (GeminiService와 같은 인스턴스 사용)
+        self.exchange_rate_fetcher = self.gemini.exchange_rate_fetcher
+
+        # 종목 종합 분석 서비스 (위 인스턴스 주입)
+        self.analysis = StockAnalysisService(
+            kiwoom=self.kiwoom,
+            gemini=self.gemini,
+            theme_service=self.theme_service,
+            ohlcv_store=self.ohlcv_store,
+            indicator_states=self.indicator_states,
+            shared_cache=self.shared_cache
+        )
+
+        # 테마 유니버스 일괄 지표 스크리너 (사전 계산 스냅샷)
+        self.screener = StockScreener(
+            self.ohlcv_store,
+            self.theme_service,
+            data_fetcher=self.data_fetcher,
+            kiwoom=self.kiwoom
+        )
+
+        Logger.info("Services", "Application services ready.")
@@ -0,0 +1,221 @@
+"""
+프로세스 간 공유 캐시
+================================================================
+한 서버(호스트)에서 여러 워커 프로세스가 실행될 때, 각 프로세스의 메모리 캐시는 서로 보이지 않아
+같은 Finviz 스크래핑 / Gemini 분석을 프로세스마다 반복합니다.
+이 모듈은 같은 호스트의 모든 프로세스가 함께 쓰는 키-값 캐시와 키별 프로세스 간 락을 제공합니다.
+
+- 저장소: 공유 메모리(/dev/shm, tmpfs) 위의 SQLite(WAL) 파일 하나
+  /dev/shm이 없는 환경(Windows 등)은 cache/shared 디렉토리를 사용
+- 값은 JSON 직렬화, 항목별 만료 시각(expires_at)
+- 락: 키별 잠금 파일 + OS 파일 락(fcntl.flock / msvcrt.locking)
+  프로세스가 죽으면 OS가 락을 풀어주므로 남은 잠금 파일이 다른 프로세스를 막지 않음
+- get_or_compute(): 값이 없으면 락을 잡은 한 프로세스만 계산하고 나머지는 그 결과를 읽음
+================================================================
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+from logger import Logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """잠금 파일 기반 프로세스 간 배타 락 (같은 프로세스의 다른 스레드끼리도 배타적)"""
+
+    def __init__(self, path, timeout=None, poll_interval=0.05):
+        """
+        Args:
+            path: 잠금 파일 경로
+            timeout: 최대 대기 시간 (초, None이면 무한 대기)
+            poll_interval: 재시도 간격 (초)
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def acquire(self):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        handle = open(self.path, 'a+')
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                self._file = handle
+                return True
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    handle.close()
+                    raise TimeoutError(f"lock timed out: {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        handle, self._file = self._file, None
+        if handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.close()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class SharedCache:
+    """호스트 범위 공유 키-값 캐시 (여러 워커 프로세스 공유)"""
+
+    def __init__(self, base_dir=None, namespace="stock-analysis"):
+        """
+        Args:
+            base_dir: 저장 디렉토리 (기본값: config.SHARED_CACHE_DIR → /dev/shm/{namespace} → cache/shared)
+            namespace: /dev/shm 아래 디렉토리 이름 (같은 호스트의 다른 앱과 분리)
+        """
+        self.base_dir = base_dir or getattr(config, 'SHARED_CACHE_DIR', None) or self._default_dir(namespace)
+        self.lock_dir = os.path.join(self.base_dir, 'locks')
+        os.makedirs(self.lock_dir, exist_ok=True)
+        self.db_path = os.path.join(self.base_dir, 'shared_cache.db')
+
+        self._local = threading.local()
+        self._init_schema()
+
+    @staticmethod
+    def _default_dir(namespace):
+        if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+            uid = os.getuid() if hasattr(os, 'getuid') else 0
+            return os.path.join('/dev/shm', f"{namespace}-{uid}")
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'shared')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS shared_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL
+            )
+        """)
+
+    # ------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------
+    def get_entry(self, key):
+        """
+        Returns:
+            (value, updated_at, expires_at) - 없거나 만료되었으면 (None, None, None)
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT value, updated_at, expires_at FROM shared_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            Logger.warning("SharedCache", f"Read failed ({key}): {e}")
+            return None, None, None
+        if row is None or (row[2] is not None and row[2] < time.time()):
+            return None, None, None
+        return json.loads(row[0]), row[1], row[2]
+
+    def get(self, key):
+        return self.get_entry(key)[0]
+
+    def set(self, key, value, ttl=None):
+        """
+        Args:
+            ttl: 유효 시간 (초, None이면 만료 없음)
+        """
+        now = time.time()
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO shared_cache (key, value, updated_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, default=str), now, None if ttl is None else now + ttl)
+            )
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            Logger.warning("SharedCache", f"Write failed ({key}): {e}")
+            return False
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM shared_cache WHERE key = ?", (key,))
+
+    def purge_expired(self):
+        cursor = self._connect().execute(
+            "DELETE FROM shared_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    # ------------------------------------------------------------
+    # 프로세스 간 락 / 1회 계산
+    # ------------------------------------------------------------
+    def lock(self, key, timeout=None):
+        """키별 프로세스 간 락 (with 문으로 사용)"""
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return FileLock(os.path.join(self.lock_dir, f"{digest}.lock"), timeout=timeout)
+
+    def get_or_compute(self, key, compute, ttl=None, timeout=None):
+        """
+        값이 있으면 반환, 없으면 호스트 전체에서 한 프로세스만 compute() 실행
+
+        Args:
+            compute: 인자 없는 계산 함수 (None을 반환하면 저장하지 않음)
+            ttl: 저장 유효 시간 (초)
+            timeout: 락 대기 상한 (초). 넘으면 락 없이 직접 계산
+
+        Returns:
+            (value, computed) - computed는 이 호출이 직접 계산했는지 여부
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, False
+
+        lock = self.lock(key, timeout=timeout)
+        try:
+            lock.acquire()
+        except TimeoutError:
+            Logger.warning("SharedCache", f"Lock wait timed out ({key}), computing without lock")
+            lock = None
+
+        try:
+            # 락을 기다리는 동안 다른 프로세스가 계산했을 수 있으므로 다시 확인
+            if lock is not None:
+                value = self.get(key)
+                if value is not None:
+                    return value, False
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl=ttl)
+            return value, True
+        finally:
+            if lock is not None:
+                lock.release()
@@ -0,0 +1,89 @@
+"""
+Single-flight 중복 실행 방지
+================================================================
+같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 기다려 함께 사용합니다.
+(여러 카드/브라우저 탭이 같은 종목을 동시에 요청할 때 스크래핑 + Gemini 호출을 1회로)
+
+- 첫 호출자(leader)가 작업을 실행하고, 실행 중 들어온 호출자(follower)는 완료를 기다림
+- 작업이 예외를 던지면 기다리던 호출자에게도 같은 예외 전달
+- 완료 후에는 키를 제거하므로 결과를 보관하지 않음 (결과 캐시는 GeminiCache 담당)
+================================================================
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 동시 실행 1회 보장 (스레드 안전)"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.executions = 0  # 실제 실행 횟수
+        self.shared = 0  # 실행 중인 결과를 기다려 공유한 횟수 (절약한 실행 수)
+
+    def do(self, key, fn, timeout=None):
+        """
+        Args:
+            key: 중복 판단 키 (hashable)
+            fn: 인자 없는 작업 함수
+            timeout: follower 최대 대기 시간 (초, None이면 완료까지)
+
+        Returns:
+            (result, shared) - shared는 다른 호출자의 실행 결과를 공유했는지 여부
+
+        Raises:
+            fn이 던진 예외, follower 대기 시간 초과 시 TimeoutError
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"single-flight wait timed out: {key}")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self):
+        """현재 실행 중인 키 목록"""
+        with self._lock:
+            return list(self._calls)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'shared': self.shared,
+                'in_flight': len(self._calls)
+            }
@@ -392,6 +392,21 @@ const API = {
         }
     },
 
+    // 감성 분석 (여러 종목 묶음) - 서버에서 여러 종목을 한 번의 AI 호출로 분석
+    async fetchSentimentBatch(codes) {
+        try {
+            const response = await fetch(`${API_BASE}/api/analysis/sentiment/batch`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ codes })
+            });
+            return await response.json();
+        } catch (error) {
+            Logger.error('API', '묶음 감성 분석 로드 실패:', error);
+            return { success: false, message: error.message };
+        }
+    },
+
     // 수급 정보 (단일 종목)
     // 수급 정보 (단일 종목) - 큐 시스템 적용
     async fetchSupplyDemand(code) {
@@ -509,6 +524,8 @@ const API = {
                             onProgress('technical', data.data);
                         } else if (data.type === 'news') {
                             onProgress('news', data.data);
+                        } else if (data.type === 'outlook_partial') {
+                            onProgress('outlook_partial', data.data);
                         } else if (data.type === 'outlook') {
                             onProgress('outlook', data.data);
                         } else if (data.type === 'complete') {
@@ -227,29 +227,51 @@ function createSentimentElements(stockCode) {
 // UI.js에서 사용할 수 있도록 전역 노출
 window.createSentimentElements = createSentimentElements;
 
+function isSentimentCached(code, now) {
+    // 캐시 확인 (30분)
+    return sentimentCache[code] && (now - sentimentCache[code].timestamp < 30 * 60 * 1000);
+}
+
 async function updateAllSentiments(holdings) {
-    for (let i = 0; i < holdings.length; i++) {
-        const stock = holdings[i];
-        // holdings 배열의 요소가 객체인지 확인 (관심종목의 경우 {stk_cd: code} 형태로 전달됨)
-        const code = stock.stk_cd || stock.code;
+    // holdings 배열의 요소가 객체인지 확인 (관심종목의 경우 {stk_cd: code} 형태로 전달됨)
+    const codes = holdings.map(stock => stock.stk_cd || stock.code).filter(code => code);
 
-        if (code) {
-            // 7초 딜레이 추가 (첫 번째 종목은 즉시 실행)
-            if (i > 0) {
-                // 설정된 딜레이 사용 (기본값 15초)
-                const delay = (window.SENTIMENT_UPDATE_DELAY_SECONDS || 15) * 1000;
-                await new Promise(resolve => setTimeout(resolve, delay));
+    // 1. 캐시에 없는 종목은 묶음 요청 한 번으로 분석 (서버가 여러 종목을 한 번의 AI 호출로 처리)
+    const now = Date.now();
+    const pending = codes.filter(code => !isSentimentCached(code, now));
+    if (pending.length > 1) {
+        const result = await API.fetchSentimentBatch(pending);
+        if (result.success && result.data) {
+            for (const code of pending) {
+                if (result.data[code]) {
+                    sentimentCache[code] = { timestamp: Date.now(), data: result.data[code] };
+                }
             }
-            await updateSingleSentiment(code);
         }
     }
+
+    // 2. 캐시된 종목은 바로 표시, 묶음 결과에 없는 종목만 기존처럼 종목별로 순차 요청
+    let requested = 0;
+    for (const code of codes) {
+        if (isSentimentCached(code, Date.now())) {
+            renderRibbon(code, sentimentCache[code].data);
+            continue;
+        }
+        // 7초 딜레이 추가 (첫 번째 종목은 즉시 실행)
+        if (requested > 0) {
+            // 설정된 딜레이 사용 (기본값 15초)
+            const delay = (window.SENTIMENT_UPDATE_DELAY_SECONDS || 15) * 1000;
+            await new Promise(resolve => setTimeout(resolve, delay));
+        }
+        requested++;
+        await updateSingleSentiment(code);
+    }
 }
 
 async function updateSingleSentiment(code) {
     try {
         const now = Date.now();
-        // 캐시 확인 (30분)
-        if (sentimentCache[code] && (now - sentimentCache[code].timestamp < 30 * 60 * 1000)) {
+        if (isSentimentCached(code, now)) {
             renderRibbon(code, sentimentCache[code].data);
             return;
         }
@@ -560,6 +560,10 @@ Object.assign(window.UI, {
                         this.renderNews(data);  // 뉴스 탭 업데이트
                         this.updateOverviewWithNews(data);  // 종합 탭 뉴스 섹션 업데이트
                     }
+                    else if (type === 'outlook_partial') {
+                        // 4단계 진행 중: AI 전망 생성 중인 부분을 도착하는 대로 표시 (최종 결과로 대체됨)
+                        this.updateOverviewWithOutlook(data);
+                    }
                     else if (type === 'outlook') {
                         // 4단계: AI 전망
                         allData.outlook = data;
@@ -738,6 +742,8 @@ Object.assign(window.UI, {
     // AI 전망 부분만 업데이트 (기존 내용 유지)
     updateOverviewWithOutlook(outlook) {
         if (!outlook) return;
+        // 스트리밍 중간 결과는 아직 도착하지 않은 섹션을 '생성 중'으로 표시
+        const pending = outlook.partial ? '생성 중...' : null;
         const recommendationClass =
             outlook.recommendation === '매수' ? 'buy' :
                 outlook.recommendation === '매도' ? 'sell' : 'neutral';
@@ -751,18 +757,18 @@ Object.assign(window.UI, {
                 <!-- [NEW] 핵심 논리 -->
                 <div class="key-logic" style="margin-top: 1rem; padding: 1rem; background: rgba(255,255,255,0.05); border-radius: 8px;">
                     <h4 style="margin-bottom: 0.5rem; color: var(--text-primary);">핵심 논리</h4>
-                    <div style="font-family: inherit; color: var(--text-secondary); line-height: 1.6; white-space: pre-line;">${formatAIText(outlook.key_logic || '논리 정보 없음')}</div>
+                    <div style="font-family: inherit; color: var(--text-secondary); line-height: 1.6; white-space: pre-line;">${formatAIText(outlook.key_logic || pending || '논리 정보 없음')}</div>
                 </div>
 
                 <div class="trading-scenario" style="margin-top: 1rem; padding: 1rem; background: rgba(255,255,255,0.05); border-radius: 8px;">
                     <h4 style="margin-bottom: 0.5rem; color: var(--text-primary);">매매 시나리오</h4>
-                    <div style="font-family: inherit; color: var(--text-secondary); line-height: 1.6; white-space: pre-line;">${formatAIText(outlook.trading_scenario || '시나리오 정보 없음')}</div>
+                    <div style="font-family: inherit; color: var(--text-secondary); line-height: 1.6; white-space: pre-line;">${formatAIText(outlook.trading_scenario || pending || '시나리오 정보 없음')}</div>
                 </div>
                 
                 <!-- [NEW] 상세 분석 -->
                 <div class="detailed-analysis" style="margin-top: 1rem; padding: 1rem; background: rgba(255,255,255,0.05); border-radius: 8px;">
                     <h4 style="margin-bottom: 0.5rem; color: var(--text-primary);">상세 분석</h4>
-                    <div style="font-family: inherit; color: var(--text-secondary); line-height: 1.6; white-space: pre-line;">${formatAIText(outlook.detailed_analysis || outlook.reasoning || '분석 내용 없음')}</div>
+                    <div style="font-family: inherit; color: var(--text-secondary); line-height: 1.6; white-space: pre-line;">${formatAIText(outlook.detailed_analysis || outlook.reasoning || pending || '분석 내용 없음')}</div>
                 </div>
             </div>
         `;
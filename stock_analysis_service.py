@@ -2,23 +2,58 @@ from kis_api import KiwoomApi
 from gemini_service import GeminiService
 from technical_indicators import TechnicalIndicators
 from theme_service import ThemeService
+from ohlcv_store import OhlcvStore
+from indicator_state import IndicatorStateStore
+from market_session import MarketSession
+from task_graph import TaskGraph
+from llm_scheduler import LLMScheduler
+import concurrent.futures
 import config
 import time
+import threading
 from logger import Logger
 
 class StockAnalysisService:
     """주식 종목 종합 분석 서비스"""
     
-    def __init__(self):
-        self.kiwoom = KiwoomApi()
-        # 자동으로 액세스 토큰 획득
+    # 분석 단계 실행용 공유 스레드 풀 (모든 요청/인스턴스가 공유, 동시 실행 상한)
+    MAX_WORKERS = getattr(config, 'ANALYSIS_MAX_WORKERS', 16)
+    _executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='analysis')
+    
+    # 지표 계산에 필요한 최소 일봉 수 (MA60, 볼린저 120일 스퀴즈 + 20일 밴드)
+    CHART_MIN_BARS = getattr(config, 'ANALYSIS_CHART_MIN_BARS', 160)
+    # 묶음 감성 분석 시 종목별 기본 정보(시세/수급/지표)를 동시에 수집할 종목 수
+    BATCH_PREFETCH_WORKERS = 4
+    
+    # 확정 구간 볼린저 히스토리 캐시 유지 시간 (확정 봉이 바뀌면 키가 달라져 다시 계산)
+    BOLLINGER_HISTORY_TTL = 6 * 3600
+    # 실시간 현재가를 당일 봉에 반영하는 세션
+    LIVE_PRICE_SESSIONS = (MarketSession.REGULAR, MarketSession.POST_AUCTION)
+    
+    def __init__(self, kiwoom=None, gemini=None, theme_service=None, ohlcv_store=None, indicator_states=None, shared_cache=None):
+        """
+        Args:
+            kiwoom: 공유 KiwoomApi 인스턴스 (없으면 새로 생성)
+            gemini: 공유 GeminiService 인스턴스 (없으면 새로 생성)
+            theme_service: 공유 ThemeService 인스턴스 (없으면 새로 생성)
+            ohlcv_store: 공유 OhlcvStore 인스턴스 (없으면 새로 생성)
+            indicator_states: 공유 IndicatorStateStore 인스턴스 (없으면 새로 생성)
+            shared_cache: 프로세스 간 공유 캐시 (SharedCache, 없으면 프로세스 메모리 캐시만 사용)
+        """
+        self.kiwoom = kiwoom or KiwoomApi()
+        # 자동으로 액세스 토큰 획득 (공유 토큰이 유효하면 네트워크 요청 없음)
         self.kiwoom.get_access_token()
-        self.gemini = GeminiService()
-        self.theme_service = ThemeService()
+        self.gemini = gemini or GeminiService()
+        self.theme_service = theme_service or ThemeService(api=self.kiwoom)
+        self.ohlcv_store = ohlcv_store or OhlcvStore(self.kiwoom)
+        self.indicator_states = indicator_states or IndicatorStateStore(self.ohlcv_store.base_dir)
         
-        # 메모리 캐시 초기화
+        # 메모리 캐시 초기화 (요청 스레드 간 공유되므로 락으로 보호)
         # 구조: { 'key': { 'data': ..., 'timestamp': ..., 'ttl': ... } }
         self._memory_cache = {}
+        self._cache_lock = threading.Lock()
+        # 펀더멘털/시장 지수처럼 워커 프로세스 간에도 같은 값은 공유 캐시에 함께 저장
+        self.shared_cache = shared_cache
         
     def _safe_int(self, value):
         """안전한 정수 변환"""
@@ -29,193 +64,180 @@ class StockAnalysisService:
         except (ValueError, TypeError):
             return 0
 
-    def _get_cached_data(self, key):
-        """캐시된 데이터 조회"""
-        if key in self._memory_cache:
-            cache_item = self._memory_cache[key]
-            current_time = time.time()
-            if current_time - cache_item['timestamp'] < cache_item['ttl']:
-                return cache_item['data']
-            else:
-                # 만료된 캐시 삭제
-                del self._memory_cache[key]
+    def _get_cached_data(self, key, shared=False):
+        """캐시된 데이터 조회 (shared=True이면 메모리 미스 시 프로세스 간 공유 캐시 확인)"""
+        with self._cache_lock:
+            cache_item = self._memory_cache.get(key)
+            if cache_item:
+                current_time = time.time()
+                if current_time - cache_item['timestamp'] < cache_item['ttl']:
+                    return cache_item['data']
+                else:
+                    # 만료된 캐시 삭제
+                    del self._memory_cache[key]
+        
+        if shared and self.shared_cache is not None:
+            data, updated_at, expires_at = self.shared_cache.get_entry(f"analysis:{key}")
+            if data is not None:
+                # 공유 캐시 항목의 남은 유효 시간만큼 메모리에도 보관
+                with self._cache_lock:
+                    self._memory_cache[key] = {
+                        'data': data,
+                        'timestamp': updated_at,
+                        'ttl': (expires_at - updated_at) if expires_at else 0
+                    }
+                return data
         return None
 
-    def _set_cached_data(self, key, data, ttl=60):
-        """데이터 캐싱"""
-        self._memory_cache[key] = {
-            'data': data,
-            'timestamp': time.time(),
-            'ttl': ttl
-        }
+    def _set_cached_data(self, key, data, ttl=60, shared=False):
+        """데이터 캐싱 (shared=True이면 프로세스 간 공유 캐시에도 저장)"""
+        with self._cache_lock:
+            self._memory_cache[key] = {
+                'data': data,
+                'timestamp': time.time(),
+                'ttl': ttl
+            }
+        if shared and self.shared_cache is not None:
+            self.shared_cache.set(f"analysis:{key}", data, ttl=ttl)
 
-    def get_full_analysis(self, code, stock_name=None, force_refresh=False, global_market_data=None, lightweight=False):
+    def get_full_analysis(self, code, stock_name=None, force_refresh=False, global_market_data=None, lightweight=False, priority=None):
         """
         종목에 대한 종합 분석 수행
         
+        각 단계를 의존성 그래프(TaskGraph)로 구성하여 공유 스레드 풀에서 실행합니다.
+        현재가/수급/차트/펀더멘털/시장지수/뉴스는 서로 겹쳐서 조회되고,
+        AI 전망(outlook)만 모든 단계가 끝나기를 기다립니다.
+        
         Args:
             code: 종목코드
             stock_name: 종목명 (선택, 없으면 API로 조회)
             force_refresh: 캐시 강제 갱신 여부
             global_market_data: 외부에서 주입된 글로벌 시장 데이터 (선택)
             lightweight: True면 AI 분석을 스킵하고 기본 정보만 반환 (빠른 응답)
+            priority: Gemini 호출 우선순위 (LLMScheduler.SENTIMENT 등, 기본값: INTERACTIVE)
             
         Returns:
-            종합 분석 데이터
+            종합 분석 데이터 (_debug.stage_timings에 단계별 소요 시간 포함)
         """
         try:
             # 종목 코드 정규화 (A 접두사 제거)
             normalized_code = code.lstrip('A') if code and code.startswith('A') else code
-            # Logger.debug("Analysis", f"Stock code normalization: {code} → {normalized_code}")
+            
+            graph = TaskGraph(self._executor)
             
             # 1. 현재가 정보 조회 (실시간 데이터이므로 캐싱 안 함)
-            price_info = self.kiwoom.get_current_price(normalized_code)
+            graph.add('price', lambda: self.kiwoom.get_current_price(normalized_code))
             
-            if not price_info:
-                return {'success': False, 'message': '주가 정보 조회 실패'}
+            # 2. 수급 데이터 조회 (get_supply_demand_data 자체 캐싱 사용)
+            graph.add('supply_demand', lambda: self.get_supply_demand_data(normalized_code))
             
-            stock_name = stock_name or price_info.get('name', '알 수 없음')
+            # 3. 일봉 데이터 조회 (로컬 저장소) → 기술적 지표 계산 (증분 상태 + 실시간 현재가)
+            graph.add('chart', lambda: self._get_daily_chart(normalized_code, force_refresh))
+            graph.add(
+                'indicators',
+                lambda chart, price_info: self._calculate_indicators(chart, code=normalized_code, price_info=price_info),
+                deps=['chart', 'price']
+            )
             
-            # 2. 수급 데이터 조회 (get_supply_demand_data 자체 캐싱 사용)
-            # get_supply_demand_data가 내부적으로 캐싱을 관리하므로 여기서는 중복 캐싱하지 않음
-            supply_demand = self.get_supply_demand_data(normalized_code)
+            # 4. 펀더멘털 데이터 수집 - 캐싱 적용
+            graph.add('fundamental', lambda: self._get_fundamental_data(normalized_code, force_refresh))
             
-            # 3. 기술적 지표 계산 (일봉 데이터 필요, 캐싱 적용)
-            # 일봉 데이터는 양이 많으므로 데이터 자체를 캐싱
-            chart_cache_key = f"chart_{normalized_code}"
-            daily_chart = None
+            # 5. 국내 시장 지수 (KOSPI/KOSDAQ) - 캐싱 적용
+            graph.add('market_index', lambda: self._get_market_index_cached(force_refresh))
             
-            if not force_refresh:
-                daily_chart = self._get_cached_data(chart_cache_key)
-                
-            if not daily_chart:
-                daily_chart = self.kiwoom.get_daily_chart_data(normalized_code)
-                if daily_chart:
-                    self._set_cached_data(chart_cache_key, daily_chart, ttl=60) # 60초 캐시
-            
-            # 일봉 데이터가 있으면 전처리
-            price_data = []
-            if daily_chart:
-                # 디버깅: 첫 번째 데이터 항목 출력하여 키 확인
-                if len(daily_chart) > 0:
-                    # Logger.debug("Analysis", f"First chart item keys: {daily_chart[0].keys()}")
-                    # Logger.debug("Analysis", f"First chart item sample: {daily_chart[0]}")
-                    pass
-
-                # kis_api.py에서 이미 표준화된 키(date, close, high, low, volume)로 변환되어 반환됨
-                price_data = daily_chart
-                
-                # 날짜 오름차순 정렬 (과거 -> 현재)
-                price_data.sort(key=lambda x: x['date'])
-                
-            technical = TechnicalIndicators.calculate_indicators(price_data)
-            bollinger = TechnicalIndicators.calculate_bollinger_bands(price_data)
-            
-            # 4-5. 뉴스 분석과 시장 데이터 수집을 병렬로 처리 (성능 개선)
-            news_analysis = {
-                'news_summary': '뉴스 분석을 사용할 수 없습니다',
-                'reason': 'Gemini API가 설정되지 않았습니다',
-                'sentiment': '중립',
-                'raw_response': ''
-            }
-            market_data = {}
+            def resolve_name(price_info):
+                if not price_info:
+                    raise ValueError('주가 정보 조회 실패')
+                return stock_name or price_info.get('name', '알 수 없음')
+            
+            graph.add('stock_name', resolve_name, deps=['price'])
             
             if not lightweight:
-                # 병렬 처리: 뉴스 분석 + 테마 조회
-                import concurrent.futures
-                
-                def fetch_news():
+                # 6. 뉴스 분석 (MK/네이버 수집 + Gemini)
+                def fetch_news(price_info, name):
                     try:
                         return self.gemini.search_and_analyze_news(
-                            stock_name=stock_name,
+                            stock_name=name,
                             stock_code=normalized_code,
                             current_price=price_info.get('price'),
                             change_rate=price_info.get('rate'),
-                            force_refresh=force_refresh
+                            force_refresh=force_refresh,
+                            priority=priority
                         )
                     except Exception as e:
                         Logger.warning("Analysis", f"뉴스 분석 건너뜀: {e}")
-                        return news_analysis  # 기본값 반환
+                        return self._get_default_news_analysis()
                 
-                # ThreadPoolExecutor로 병렬 실행 (뉴스 분석만)
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    news_future = executor.submit(fetch_news)
-                    
-                    # 결과 대기
-                    news_analysis = news_future.result()
-                    
-                # 테마 정보는 ThemeService에서 직접 조회 (빠름)
-                try:
-                    # 전체 테마 가져오기 (캐시됨)
-                    all_themes = self.theme_service.get_themes().get('themes', [])
-                    
-                    # 등락률 기준 정렬 (내림차순)
-                    sorted_themes = sorted(all_themes, key=lambda x: float(x.get('flu_rt', 0) or 0), reverse=True)
-                    
-                    # 상위 3개 추출
-                    top_themes = []
-                    for t in sorted_themes[:3]:
-                        name = t.get('thema_nm')
-                        rate = t.get('flu_rt')
-                        top_themes.append(f"{name}({rate}%)")
-                        
-                    market_themes = ", ".join(top_themes) if top_themes else "정보 없음"
-                except Exception as e:
-                    Logger.error("Analysis", f"테마 조회 실패: {e}")
-                    market_themes = "정보 없음"
+                graph.add('news', fetch_news, deps=['price', 'stock_name'])
+                
+                # 7. 주도 테마 (ThemeService 캐시에서 직접 조회 - 빠름)
+                graph.add('market_themes', self._get_market_themes_string)
             else:
-                market_themes = '정보 없음'  # 경량 모드
-            
-            # 5. 시장 데이터 구성
-            market_data = self.get_market_context(stock_name, global_market_data, force_refresh, market_themes)
+                graph.add('market_themes', lambda: '정보 없음')  # 경량 모드
             
-            # 6. 펀더멘털 데이터 수집 - 캐싱 적용
-            fundamental_key = f"fundamental_{normalized_code}"
-            fundamental_data = None
+            # 8. 시장 데이터 구성 (지수 + 글로벌 + 테마)
+            graph.add(
+                'market_context',
+                lambda name, index_str, themes: self.get_market_context(
+                    name, global_market_data, force_refresh, themes, market_index_str=index_str
+                ),
+                deps=['stock_name', 'market_index', 'market_themes']
+            )
             
-            if not force_refresh:
-                fundamental_data = self._get_cached_data(fundamental_key)
-                
-            if not fundamental_data:
-                try:
-                    fundamental_data = self.kiwoom.get_stock_fundamental_info(normalized_code)
-                    if not fundamental_data:
-                        fundamental_data = {}
-                    else:
-                        self._set_cached_data(fundamental_key, fundamental_data, ttl=300) # 5분 캐시
-                except Exception as e:
-                    Logger.error("Analysis", f"펀더멘털 데이터 수집 실패: {e}")
-                    fundamental_data = {}
-
-            # 7. AI 전망 생성 (Gemini) - Optional, 경량 모드 시 스킵
-            outlook = {
-                'recommendation': '중립',
-                'confidence': 0,
-                'reasoning': 'AI 전망을 사용할 수 없습니다 (Gemini API가 설정되지 않았습니다)',
-                'raw_response': ''
-            }
+            # 9. AI 전망 생성 (Gemini) - 모든 단계 완료 후 실행, 경량 모드 시 스킵
             if not lightweight:
-                try:
-                    # Logger.debug("Analysis", f"AI 전망 생성 요청 - 펀더멘털 데이터: {fundamental_data}")
-                    # stock_info에 정규화된 코드 전달
-                    stock_info_for_outlook = {
-                        'code': normalized_code,  # 정규화된 코드 사용!
-                        'price': price_info.get('price'),
-                        'rate': price_info.get('rate')
-                    }
-                    outlook = self.gemini.generate_outlook(
-                        stock_name=stock_name,
-                        stock_info=stock_info_for_outlook,
-                        supply_demand=supply_demand,
-                        technical_indicators=technical,
-                        news_analysis=news_analysis,
-                        market_data=market_data,
-                        fundamental_data=fundamental_data,
-                        bollinger_data=bollinger,
-                        force_refresh=force_refresh
-                    )
-                except Exception as e:
-                    Logger.error("Analysis", f"AI 전망 건너뜀: {e}")
+                def generate_outlook(price_info, name, supply_demand, indicators, news_analysis, market_data, fundamental_data):
+                    try:
+                        # stock_info에 정규화된 코드 전달
+                        stock_info_for_outlook = {
+                            'code': normalized_code,  # 정규화된 코드 사용!
+                            'price': price_info.get('price'),
+                            'rate': price_info.get('rate')
+                        }
+                        return self.gemini.generate_outlook(
+                            stock_name=name,
+                            stock_info=stock_info_for_outlook,
+                            supply_demand=supply_demand,
+                            technical_indicators=indicators['technical'],
+                            news_analysis=news_analysis,
+                            market_data=market_data,
+                            fundamental_data=fundamental_data,
+                            bollinger_data=indicators['bollinger'],
+                            force_refresh=force_refresh,
+                            priority=priority
+                        )
+                    except Exception as e:
+                        Logger.error("Analysis", f"AI 전망 건너뜀: {e}")
+                        return self._get_default_outlook()
+                
+                graph.add(
+                    'outlook', generate_outlook,
+                    deps=['price', 'stock_name', 'supply_demand', 'indicators', 'news', 'market_context', 'fundamental']
+                )
+            
+            graph_start = time.perf_counter()
+            results, errors, timings = graph.run()
+            total_ms = round((time.perf_counter() - graph_start) * 1000, 1)
+            
+            price_info = results.get('price')
+            if not price_info:
+                return {'success': False, 'message': '주가 정보 조회 실패'}
+            
+            for name, error in errors.items():
+                Logger.warning("Analysis", f"단계 '{name}' 실패: {error}")
+            
+            stock_name = results.get('stock_name', stock_name)
+            supply_demand = results.get('supply_demand') or self._get_default_supply_demand()
+            indicators = results.get('indicators') or self._calculate_indicators(None)
+            technical = indicators['technical']
+            bollinger = indicators['bollinger']
+            news_analysis = results.get('news') or self._get_default_news_analysis()
+            fundamental_data = results.get('fundamental') or {}
+            outlook = results.get('outlook') or self._get_default_outlook()
+            
+            Logger.debug("Analysis", f"{normalized_code} 종합 분석 {total_ms:.0f}ms: " + ", ".join(
+                f"{name}={t['duration_ms']:.0f}ms" for name, t in timings.items()
+            ))
             
             # 종합 결과 반환 (정규화된 코드 사용)
             return {
@@ -248,6 +270,11 @@ class StockAnalysisService:
                         '_cache_info': outlook.get('_cache_info', {})
                     },
                     'fundamental_data': fundamental_data
+                },
+                '_debug': {
+                    'total_ms': total_ms,
+                    'stage_timings': timings,
+                    'failed_stages': {name: str(error) for name, error in errors.items()}
                 }
             }
 
@@ -259,21 +286,221 @@ class StockAnalysisService:
                 'message': f'분석 중 오류 발생: {str(e)}'
             }
     
-    def get_market_context(self, stock_name, global_market_data=None, force_refresh=False, market_themes="정보 없음"):
+    def get_batch_sentiment(self, codes, force_refresh=False, global_market_data=None, priority=LLMScheduler.SENTIMENT):
+        """
+        여러 종목의 카드용 감성 분석 (묶음 전망)
+        
+        종목별 기본 정보는 AI 없이(lightweight) 수집하고, AI 전망은 GeminiService.generate_outlook_batch로
+        여러 종목을 한 번에 요청합니다. 이미 생성된 상세 전망(outlook 캐시)이 있으면 그것을 우선 사용합니다.
+        묶음 응답에서 결과를 찾지 못한 종목은 결과에서 빠지며, 클라이언트(main.js)가 종목별 요청으로 대체합니다.
+        (요청 하나에서 개별 AI 분석을 여러 번 이어서 실행하지 않음)
+        
+        Args:
+            codes: 종목코드 목록
+            
+        Returns:
+            dict: {요청한 종목코드: {'code', 'news_sentiment', 'supply_trend', 'ai_recommendation',
+                                   'ai_confidence', 'price_strategy', 'batched'}} - 조회 실패/묶음 결과 없는 종목은 제외
+        """
+        by_code = {}
+        for code in codes:
+            normalized = code.lstrip('A') if code and code.startswith('A') else code
+            if normalized:
+                by_code.setdefault(normalized, code)
+        if not by_code:
+            return {}
+        
+        # 1. 기본 정보 (현재가/수급/지표/펀더멘털) 병렬 수집
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.BATCH_PREFETCH_WORKERS) as executor:
+            basics = dict(zip(by_code, executor.map(
+                lambda code: self.get_full_analysis(code, force_refresh=force_refresh,
+                                                    global_market_data=global_market_data, lightweight=True),
+                by_code
+            )))
+        basics = {code: result['data'] for code, result in basics.items() if result.get('success')}
+        
+        # 2. 이미 생성된 상세 전망/뉴스 분석 재사용
+        full_outlooks = {} if force_refresh else self.gemini.cache.load_many(list(basics), 'outlook')
+        news = {} if force_refresh else self.gemini.cache.load_many(list(basics), 'news')
+        
+        # 3. 나머지는 묶음 전망
+        batch_codes = [code for code in basics if code not in full_outlooks]
+        batch_outlooks = {}
+        if batch_codes:
+            first = basics[batch_codes[0]]['stock_info']['name']
+            market_data = self.get_market_context(first, global_market_data, force_refresh, self._get_market_themes_string())
+            stocks = [{
+                'code': code,
+                'name': basics[code]['stock_info']['name'],
+                'price': basics[code]['stock_info']['current_price'],
+                'rate': basics[code]['stock_info']['change_rate'],
+                'supply_demand': basics[code]['supply_demand'],
+                'technical': basics[code]['technical'],
+                'bollinger': basics[code]['bollinger'],
+                'fundamental': basics[code]['fundamental_data'],
+                'news_analysis': news.get(code)
+            } for code in batch_codes]
+            try:
+                batch_outlooks = self.gemini.generate_outlook_batch(
+                    stocks, market_data=market_data, theme_service=self.theme_service,
+                    force_refresh=force_refresh, priority=priority
+                )
+            except Exception as e:
+                Logger.error("Analysis", f"묶음 전망 실패 (클라이언트가 종목별 요청으로 대체): {e}")
+        
+        cards = {}
+        for code, data in basics.items():
+            outlook = full_outlooks.get(code) or batch_outlooks.get(code)
+            if outlook is None:
+                # 4. 묶음 응답에서 빠진 종목은 제외 (클라이언트가 종목별 감성 분석으로 대체)
+                continue
+            
+            cards[by_code[code]] = {
+                'code': by_code[code],
+                'news_sentiment': (news.get(code) or {}).get('sentiment') or outlook.get('news_sentiment', '중립'),
+                'supply_trend': data['supply_demand'].get('trend'),
+                'ai_recommendation': outlook.get('recommendation', '중립'),
+                'ai_confidence': outlook.get('confidence', 0),
+                'price_strategy': outlook.get('price_strategy'),
+                'batched': code not in full_outlooks
+            }
+        return cards
+    
+    def _get_daily_chart(self, code, force_refresh=False):
+        """일봉 데이터 조회 (로컬 OHLCV 저장소, 날짜 오름차순 정렬)"""
+        # 저장소가 신선도를 판단하여 필요한 경우에만 최신 봉을 증분 조회
+        return self.ohlcv_store.get_daily_chart(code, min_bars=self.CHART_MIN_BARS, force_refresh=force_refresh)
+    
+    def _calculate_indicators(self, price_data, code=None, price_info=None):
+        """
+        기술적 지표 + 볼린저 밴드 계산
+        
+        종목 코드가 주어지면 종목별 증분 지표 상태(IndicatorStateStore)를 사용합니다.
+        확정 봉까지의 누적값은 재사용하고 마지막 봉(장중이면 실시간 현재가)만 O(1)로 반영하며,
+        볼린저 히스토리는 확정 구간 결과를 캐싱한 뒤 마지막 항목만 붙입니다.
+        """
+        if not code or not price_data or len(price_data) <= IndicatorStateStore.MIN_BARS:
+            # 배열 변환과 엔진 계산을 한 번만 수행 (지표/볼린저가 같은 버퍼 공유)
+            return TechnicalIndicators.calculate_all(price_data)
+        
+        try:
+            live_date, live_price = None, None
+            if price_info and MarketSession.get_current_session()["session"] in self.LIVE_PRICE_SESSIONS:
+                live_date, live_price = MarketSession.get_business_date(), price_info.get('price')
+            
+            live = self.indicator_states.live_indicators(code, price_data, date=live_date, price=live_price)
+            history = self._get_committed_bollinger_history(code, price_data, live['committed_count'])
+            if history is None or live['bollinger_summary'] is None:
+                return TechnicalIndicators.calculate_all(price_data)
+            
+            history = history[-(TechnicalIndicators.HISTORY_DAYS - 1):] + [live['history_point']]
+            return {
+                'technical': live['technical'],
+                'bollinger': {'summary': live['bollinger_summary'], 'history': history}
+            }
+        except Exception as e:
+            Logger.warning("Analysis", f"증분 지표 계산 실패, 전체 계산으로 대체: {e}")
+            return TechnicalIndicators.calculate_all(price_data)
+    
+    def _get_committed_bollinger_history(self, code, price_data, committed_count):
+        """확정 봉 구간의 볼린저 히스토리 (확정 봉 수/마지막 날짜가 같으면 캐시 재사용)"""
+        committed = price_data[:committed_count]
+        if not committed:
+            return None
+        
+        cache_key = f"bollinger_history_{code}"
+        marker = (committed_count, committed[-1]['date'], committed[-1]['close'])
+        cached = self._get_cached_data(cache_key)
+        if cached and cached['marker'] == marker:
+            return cached['history']
+        
+        result = TechnicalIndicators.calculate_bollinger_bands(committed)
+        if not result:
+            return None
+        self._set_cached_data(cache_key, {'marker': marker, 'history': result['history']}, ttl=self.BOLLINGER_HISTORY_TTL)
+        return result['history']
+    
+    def record_live_price(self, code, price_info):
+        """
+        현재가 조회 결과를 종목의 증분 지표 상태에 반영 (장중, 이미 로드된 종목만 - O(1))
+        """
+        if not price_info or MarketSession.get_current_session()["session"] not in self.LIVE_PRICE_SESSIONS:
+            return False
+        normalized_code = code.lstrip('A') if code and code.startswith('A') else code
+        return self.indicator_states.apply_price(normalized_code, MarketSession.get_business_date(), price_info.get('price'))
+    
+    def _get_fundamental_data(self, code, force_refresh=False):
+        """펀더멘털 데이터 조회 (300초 메모리 캐시)"""
+        fundamental_key = f"fundamental_{code}"
+        fundamental_data = None
+        
+        if not force_refresh:
+            fundamental_data = self._get_cached_data(fundamental_key, shared=True)
+            
+        if not fundamental_data:
+            try:
+                fundamental_data = self.kiwoom.get_stock_fundamental_info(code)
+                if not fundamental_data:
+                    fundamental_data = {}
+                else:
+                    self._set_cached_data(fundamental_key, fundamental_data, ttl=300, shared=True) # 5분 캐시
+            except Exception as e:
+                Logger.error("Analysis", f"펀더멘털 데이터 수집 실패: {e}")
+                fundamental_data = {}
+        
+        return fundamental_data
+    
+    def _get_market_index_cached(self, force_refresh=False):
+        """코스피/코스닥 지수 문자열 (60초 메모리 캐시)"""
+        market_index_key = "market_index"
+        market_index_str = None
+        if not force_refresh:
+            market_index_str = self._get_cached_data(market_index_key, shared=True)
+        
+        if not market_index_str:
+            market_index_str = self._get_market_indices_string()
+            self._set_cached_data(market_index_key, market_index_str, ttl=60, shared=True)
+        
+        return market_index_str
+    
+    def _get_market_themes_string(self):
+        """등락률 상위 3개 테마 문자열 (AI 프롬프트용, 테마 캐시 갱신 시 미리 정렬된 순위 사용)"""
+        try:
+            return self.theme_service.get_market_themes_string(3)
+        except Exception as e:
+            Logger.error("Analysis", f"테마 조회 실패: {e}")
+            return "정보 없음"
+    
+    def _get_default_news_analysis(self):
+        """기본 뉴스 분석 데이터 반환"""
+        return {
+            'news_summary': '뉴스 분석을 사용할 수 없습니다',
+            'reason': 'Gemini API가 설정되지 않았습니다',
+            'sentiment': '중립',
+            'raw_response': ''
+        }
+    
+    def _get_default_outlook(self):
+        """기본 AI 전망 데이터 반환"""
+        return {
+            'recommendation': '중립',
+            'confidence': 0,
+            'reasoning': 'AI 전망을 사용할 수 없습니다 (Gemini API가 설정되지 않았습니다)',
+            'raw_response': ''
+        }
+    
+    def get_market_context(self, stock_name, global_market_data=None, force_refresh=False, market_themes="정보 없음", market_index_str=None):
         """
         시장 상황 데이터 구성 (AI 분석용)
+        
+        Args:
+            market_index_str: 미리 조회한 국내 지수 문자열 (없으면 여기서 조회)
         """
         market_data = {}
         try:
             # 1. 시장 지수 (KOSPI/KOSDAQ) - 캐싱 적용
-            market_index_key = "market_index"
-            market_index_str = None
-            if not force_refresh:
-                market_index_str = self._get_cached_data(market_index_key)
-            
             if not market_index_str:
-                market_index_str = self._get_market_indices_string()
-                self._set_cached_data(market_index_key, market_index_str, ttl=60)
+                market_index_str = self._get_market_index_cached(force_refresh)
             
             market_data['market_index'] = market_index_str
             
@@ -368,7 +595,7 @@ class StockAnalysisService:
                 else:
                     trend = "혼조세"
                 
-                # 수급 정보는 REST API 실시간 데이터이므로 캐싱하지 않음
+                # 캐싱은 KiwoomApi가 (종목, 영업일) 단위로 수행 (장중 짧은 TTL)
                 return {
                     'foreign_buy': investor_data.get('foreign_buy', 0),
                     'foreign_sell': investor_data.get('foreign_sell', 0),
@@ -385,6 +612,31 @@ class StockAnalysisService:
             Logger.error("Analysis", f"수급 데이터 조회 실패: {e}")
             return self._get_default_supply_demand()
     
+    def get_supply_demand_history(self, code, days=20):
+        """
+        수급 추이 조회 (추세 차트용)
+        
+        Args:
+            code: 종목코드
+            days: 조회 일수
+            
+        Returns:
+            {'series': [{'date', 'foreign_net', 'institution_net', 'individual_net'}, ...],
+             'cumulative': 기간 누적 순매수}
+        """
+        try:
+            series = self.kiwoom.get_investor_flow_history(code, days=days) or []
+        except Exception as e:
+            Logger.error("Analysis", f"수급 추이 조회 실패: {e}")
+            series = []
+        
+        cumulative = {
+            'foreign_net': sum(row['foreign_net'] for row in series),
+            'institution_net': sum(row['institution_net'] for row in series),
+            'individual_net': sum(row['individual_net'] for row in series)
+        }
+        return {'series': series, 'cumulative': cumulative}
+    
     def _get_default_supply_demand(self):
         """기본 수급 데이터 반환"""
         return {
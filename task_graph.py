@@ -0,0 +1,127 @@
+"""
+작업 의존성 그래프 실행기
+================================================================
+의존 관계를 선언한 작업들을 공유 스레드 풀에서 실행합니다.
+
+- 의존 작업이 모두 끝난 작업부터 즉시 제출 → 서로 독립적인 작업은 겹쳐서 실행
+- 작업 함수는 선언한 의존 작업들의 결과를 순서대로 인자로 받음
+- 실패한 작업에 의존하는 작업은 실행하지 않고 건너뜀
+- 작업별 시작 시각/소요 시간을 기록하여 요청 프로파일로 활용
+
+사용 예:
+    graph = TaskGraph(executor)
+    graph.add('price', fetch_price)
+    graph.add('chart', fetch_chart)
+    graph.add('indicators', calc_indicators, deps=['chart'])
+    results, errors, timings = graph.run()
+================================================================
+"""
+import concurrent.futures
+import time
+
+
+class SkippedError(Exception):
+    """의존 작업 실패로 실행되지 않은 작업"""
+
+
+class TaskGraph:
+    """의존성 그래프 기반 병렬 작업 실행기"""
+
+    def __init__(self, executor):
+        """
+        Args:
+            executor: 작업을 실행할 (공유) concurrent.futures.Executor
+        """
+        self._executor = executor
+        self._tasks = {}  # { name: (fn, deps) } - 선언 순서 유지
+
+    def add(self, name, fn, deps=()):
+        """
+        작업 추가
+
+        Args:
+            name: 작업 이름 (고유)
+            fn: 실행할 함수. deps 순서대로 의존 작업 결과를 인자로 받음
+            deps: 의존 작업 이름 목록 (먼저 add 되어 있어야 함)
+        """
+        if name in self._tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ValueError(f"Unknown dependency '{dep}' for task '{name}'")
+        self._tasks[name] = (fn, tuple(deps))
+        return self
+
+    def run(self):
+        """
+        모든 작업 실행 (의존 작업이 끝나는 대로 다음 작업 제출)
+
+        Returns:
+            (results, errors, timings)
+            - results: { name: 결과 }
+            - errors: { name: 예외 } (건너뛴 작업은 SkippedError)
+            - timings: { name: {'start_ms': 그래프 시작 기준, 'duration_ms': 소요 시간} }
+        """
+        graph_start = time.perf_counter()
+        results, errors, timings = {}, {}, {}
+
+        waiting = {name: set(deps) for name, (_, deps) in self._tasks.items()}
+        dependents = {name: [] for name in self._tasks}
+        for name, (_, deps) in self._tasks.items():
+            for dep in deps:
+                dependents[dep].append(name)
+
+        futures = {}
+
+        def submit(name):
+            fn, deps = self._tasks[name]
+            args = [results[dep] for dep in deps]
+            futures[self._executor.submit(self._timed, fn, args, graph_start)] = name
+
+        def skip(name, reason):
+            errors[name] = SkippedError(reason)
+            for child in dependents[name]:
+                if child not in errors:
+                    skip(child, f"dependency '{name}' did not complete")
+
+        for name, deps in list(waiting.items()):
+            if not deps:
+                submit(name)
+
+        while futures:
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                value, error, timing = future.result()
+                timings[name] = timing
+
+                if error is not None:
+                    errors[name] = error
+                    for child in dependents[name]:
+                        if child not in errors:
+                            skip(child, f"dependency '{name}' failed: {error}")
+                    continue
+
+                results[name] = value
+                for child in dependents[name]:
+                    waiting[child].discard(name)
+                    if not waiting[child] and child not in errors:
+                        submit(child)
+
+        return results, errors, timings
+
+    @staticmethod
+    def _timed(fn, args, graph_start):
+        """작업 실행 + 시간 측정 (예외는 결과로 전달)"""
+        start = time.perf_counter()
+        value, error = None, None
+        try:
+            value = fn(*args)
+        except Exception as e:
+            error = e
+        end = time.perf_counter()
+        timing = {
+            'start_ms': round((start - graph_start) * 1000, 1),
+            'duration_ms': round((end - start) * 1000, 1)
+        }
+        return value, error, timing
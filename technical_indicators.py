@@ -1,17 +1,22 @@
-import pandas as pd
 import numpy as np
 
+import indicator_engine as engine
+
+
 class TechnicalIndicators:
-    """기술적 지표 계산 클래스 (pandas-ta 의존성 제거됨)"""
-    
+    """기술적 지표 계산 클래스 (NumPy 벡터화 엔진 indicator_engine.py 래퍼)"""
+
+    # 볼린저 밴드 히스토리 길이 (차트 및 AI 분석용)
+    HISTORY_DAYS = 120
+
     @staticmethod
     def calculate_indicators(price_data):
         """
         주가 데이터로부터 기술적 지표 계산
-        
+
         Args:
-            price_data: DataFrame with columns ['date', 'close', 'high', 'low', 'volume']
-            
+            price_data: List of dicts or DataFrame with columns ['date', 'close', 'high', 'low', 'volume']
+
         Returns:
             {
                 'rsi': RSI 값,
@@ -27,117 +32,36 @@ class TechnicalIndicators:
         try:
             if price_data is None or len(price_data) < 20:
                 return TechnicalIndicators._get_default_indicators()
-            
-            df = pd.DataFrame(price_data)
-            
-            # 컬럼명 통일 (소문자로)
-            df.columns = df.columns.str.lower()
-            
+
+            columns = TechnicalIndicators._extract_columns(price_data, ('close',))
+
             # close 컬럼이 있는지 확인
-            if 'close' not in df.columns:
+            if 'close' not in columns:
                 return TechnicalIndicators._get_default_indicators()
-            
-            # 데이터 타입을 숫자로 변환
-            df['close'] = pd.to_numeric(df['close'], errors='coerce')
-            
+
+            close = engine.as_float_array(columns['close'])
+
             # 데이터 개수 확인
-            print(f"[TechnicalIndicators] Calculating for {len(df)} records")
-            
-            # --- RSI 계산 (14일) - Wilder's Smoothing Method ---
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).fillna(0)
-            loss = (-delta.where(delta < 0, 0)).fillna(0)
-            
-            # Wilder's smoothing: EMA with alpha = 1/14
-            avg_gain = gain.ewm(alpha=1/14, adjust=False).mean()
-            avg_loss = loss.ewm(alpha=1/14, adjust=False).mean()
-            
-            # Avoid division by zero
-            rs = avg_gain / avg_loss.replace(0, np.nan)
-            rsi_series = 100 - (100 / (1 + rs))
-            
-            # fillna(100) for cases where loss is 0 (infinite gain)
-            rsi_series = rsi_series.fillna(100)
-            
-            current_rsi = rsi_series.iloc[-1] if not rsi_series.empty else 50
-            
-            # RSI 신호 판단
-            if current_rsi > 70:
-                rsi_signal = "과매수"
-            elif current_rsi < 30:
-                rsi_signal = "과매도"
-            else:
-                rsi_signal = "중립"
-            
-            # --- MACD 계산 ---
-            # EMA 12, 26
-            ema12 = df['close'].ewm(span=12, adjust=False).mean()
-            ema26 = df['close'].ewm(span=26, adjust=False).mean()
-            macd_line_series = ema12 - ema26
-            signal_line_series = macd_line_series.ewm(span=9, adjust=False).mean()
-            
-            macd_line = macd_line_series.iloc[-1]
-            signal_line = signal_line_series.iloc[-1]
-            
-            if macd_line > signal_line:
-                macd_signal = "상승"
-            elif macd_line < signal_line:
-                macd_signal = "하락"
-            else:
-                macd_signal = "중립"
-            
-            # --- 이동평균선 계산 ---
-            ma5_series = df['close'].rolling(window=5).mean()
-            ma20_series = df['close'].rolling(window=20).mean()
-            ma60_series = df['close'].rolling(window=60).mean()
-            
-            ma5 = ma5_series.iloc[-1] if len(df) >= 5 else df['close'].iloc[-1]
-            ma20 = ma20_series.iloc[-1] if len(df) >= 20 else df['close'].iloc[-1]
-            ma60 = ma60_series.iloc[-1] if len(df) >= 60 else df['close'].iloc[-1]
-            
-            # 이동평균선 배열 신호
-            current_price = df['close'].iloc[-1]
-            
-            # NaN 처리
-            if np.isnan(ma5): ma5 = current_price
-            if np.isnan(ma20): ma20 = current_price
-            if np.isnan(ma60): ma60 = current_price
-            
-            if current_price > ma5 > ma20 > ma60:
-                ma_signal = "정배열"
-            elif current_price < ma5 < ma20 < ma60:
-                ma_signal = "역배열"
-            elif len(df) >= 2:
-                prev_ma5 = ma5_series.iloc[-2]
-                prev_ma20 = ma20_series.iloc[-2]
-                
-                if not np.isnan(prev_ma5) and not np.isnan(prev_ma20):
-                    if prev_ma5 < prev_ma20 and ma5 > ma20:
-                        ma_signal = "골든크로스"
-                    elif prev_ma5 > prev_ma20 and ma5 < ma20:
-                        ma_signal = "데드크로스"
-                    else:
-                        ma_signal = "중립"
-                else:
-                    ma_signal = "중립"
-            else:
-                ma_signal = "중립"
-            
-            return {
-                'rsi': round(float(current_rsi), 2),
-                'rsi_signal': rsi_signal,
-                'macd': round(float(macd_line), 2),
-                'macd_signal': macd_signal,
-                'ma5': round(float(ma5), 2),
-                'ma20': round(float(ma20), 2),
-                'ma60': round(float(ma60), 2),
-                'ma_signal': ma_signal
+            print(f"[TechnicalIndicators] Calculating for {len(close)} records")
+
+            macd_line, signal_line = engine.macd(close)
+            result = {
+                'rsi': engine.rsi(close),
+                'macd': macd_line,
+                'macd_signal': signal_line,
+                'ma5': engine.rolling_mean(close, 5),
+                'ma20': engine.rolling_mean(close, 20),
+                'ma60': engine.rolling_mean(close, 60)
             }
-            
+            return TechnicalIndicators._summarize_indicators(close, result)
+
         except Exception as e:
             print(f"[TechnicalIndicators] 계산 오류: {e}")
             return TechnicalIndicators._get_default_indicators()
-    
+
+    @staticmethod
+    def _get_default_indicators():
+        """데이터 부족 시 기본 지표"""
         return {
             'rsi': 50,
             'rsi_signal': "데이터부족",
@@ -153,12 +77,12 @@ class TechnicalIndicators:
     def calculate_bollinger_bands(price_data, window=20, num_std=2):
         """
         볼린저 밴드 및 스퀴즈 지표 계산
-        
+
         Args:
             price_data: List of dicts or DataFrame
             window: 이동평균 기간 (기본 20)
             num_std: 표준편차 승수 (기본 2)
-            
+
         Returns:
             dict: {
                 'summary': { 'upper': ..., 'middle': ..., 'lower': ..., 'bandwidth': ..., 'percent_b': ..., 'is_squeeze': ... },
@@ -166,75 +90,225 @@ class TechnicalIndicators:
             }
         """
         try:
-            if not price_data or len(price_data) < window:
+            if price_data is None or len(price_data) < window:
                 return None
-                
-            df = pd.DataFrame(price_data)
-            
-            # 컬럼명 통일
-            df.columns = df.columns.str.lower()
-            
-            # 숫자 변환
-            cols = ['close', 'open', 'high', 'low', 'volume']
-            for col in cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # 날짜 오름차순 정렬 (과거 -> 현재)
-            df = df.sort_values('date', ascending=True)
-            
-            # 볼린저 밴드 계산
-            df['sma'] = df['close'].rolling(window=window).mean()
-            df['std'] = df['close'].rolling(window=window).std()
-            df['upper_band'] = df['sma'] + (df['std'] * num_std)
-            df['lower_band'] = df['sma'] - (df['std'] * num_std)
-            
-            # %B (Percent B)
-            # (Price - Lower Band) / (Upper Band - Lower Band)
-            df['percent_b'] = (df['close'] - df['lower_band']) / (df['upper_band'] - df['lower_band'])
-            
-            # Bandwidth
-            # (Upper Band - Lower Band) / Middle Band
-            df['bandwidth'] = (df['upper_band'] - df['lower_band']) / df['sma']
-            
-            # Squeeze Detection (120일 기준 최저 Bandwidth 대비 5% 이내 근접 시)
-            # 데이터가 120개 미만이면 전체 기간 사용
-            min_window = min(120, len(df))
-            df['min_bandwidth_120'] = df['bandwidth'].rolling(window=min_window).min()
-            df['is_squeeze'] = df['bandwidth'] <= (df['min_bandwidth_120'] * 1.05)
-            
-            # 최신 값
-            last = df.iloc[-1]
-            
-            summary = {
-                'upper': round(float(last['upper_band']), 0),
-                'middle': round(float(last['sma']), 0),
-                'lower': round(float(last['lower_band']), 0),
-                'bandwidth': round(float(last['bandwidth']), 4),
-                'percent_b': round(float(last['percent_b']), 4),
-                'is_squeeze': bool(last['is_squeeze'])
-            }
-            
-            # 히스토리 (최근 120일) - 차트 및 AI 분석용
-            # 필요한 컬럼만 추출
-            history_df = df.tail(120).copy()
-            history = []
-            for _, row in history_df.iterrows():
-                history.append({
-                    'date': row['date'],
-                    'close': int(row['close']),
-                    'upper': round(float(row['upper_band']), 0) if not pd.isna(row['upper_band']) else None,
-                    'middle': round(float(row['sma']), 0) if not pd.isna(row['sma']) else None,
-                    'lower': round(float(row['lower_band']), 0) if not pd.isna(row['lower_band']) else None,
-                    'bandwidth': round(float(row['bandwidth']), 4) if not pd.isna(row['bandwidth']) else None,
-                    'is_squeeze': bool(row['is_squeeze']) if not pd.isna(row['is_squeeze']) else False
-                })
-                
-            return {
-                'summary': summary,
-                'history': history
-            }
-            
+
+            columns = TechnicalIndicators._extract_columns(price_data, ('date', 'close'))
+            dates, close = TechnicalIndicators._sorted_by_date(columns['date'], engine.as_float_array(columns['close']))
+
+            bands = engine.bollinger(close, window=window, num_std=num_std)
+            return TechnicalIndicators._summarize_bollinger(dates, close, bands)
+
         except Exception as e:
             print(f"[TechnicalIndicators] 볼린저 밴드 계산 오류: {e}")
             return None
+
+    @staticmethod
+    def calculate_all(price_data, window=20, num_std=2):
+        """
+        기술적 지표 + 볼린저 밴드를 한 번에 계산 (배열 변환/엔진 계산 1회)
+        calculate_indicators / calculate_bollinger_bands를 각각 호출한 것과 같은 결과를 반환합니다.
+
+        Returns:
+            {'technical': calculate_indicators 결과, 'bollinger': calculate_bollinger_bands 결과}
+        """
+        try:
+            count = len(price_data) if price_data is not None else 0
+            columns = TechnicalIndicators._extract_columns(price_data, ('date', 'close')) if count else {}
+            dates = columns.get('date')
+
+            # 데이터 부족/컬럼 누락/미정렬 데이터는 개별 함수가 기존 규칙대로 처리
+            if count < max(20, window) or 'close' not in columns or dates is None \
+                    or not TechnicalIndicators._is_sorted(dates):
+                return {
+                    'technical': TechnicalIndicators.calculate_indicators(price_data),
+                    'bollinger': TechnicalIndicators.calculate_bollinger_bands(price_data, window, num_std)
+                }
+
+            close = engine.as_float_array(columns['close'])
+            print(f"[TechnicalIndicators] Calculating for {len(close)} records")
+            result = engine.compute_all(close, bb_window=window, num_std=num_std)
+        except Exception as e:
+            print(f"[TechnicalIndicators] 계산 오류: {e}")
+            return {'technical': TechnicalIndicators._get_default_indicators(), 'bollinger': None}
+
+        try:
+            technical = TechnicalIndicators._summarize_indicators(close, result)
+        except Exception as e:
+            print(f"[TechnicalIndicators] 계산 오류: {e}")
+            technical = TechnicalIndicators._get_default_indicators()
+
+        try:
+            bollinger = TechnicalIndicators._summarize_bollinger(dates, close, result)
+        except Exception as e:
+            print(f"[TechnicalIndicators] 볼린저 밴드 계산 오류: {e}")
+            bollinger = None
+
+        return {'technical': technical, 'bollinger': bollinger}
+
+    # ------------------------------------------------------------
+    # 결과 정리 (엔진 배열 → 응답 dict)
+    # ------------------------------------------------------------
+    @staticmethod
+    def _summarize_indicators(close, result):
+        """엔진 결과의 마지막 값으로 지표 요약 및 신호 판단"""
+        count = len(close)
+        return TechnicalIndicators.summarize_values(
+            count=count,
+            current_price=close[-1],
+            rsi=result['rsi'][-1],
+            macd=result['macd'][-1],
+            macd_signal_line=result['macd_signal'][-1],
+            ma5=result['ma5'][-1] if count >= 5 else close[-1],
+            ma20=result['ma20'][-1] if count >= 20 else close[-1],
+            ma60=result['ma60'][-1] if count >= 60 else close[-1],
+            prev_ma5=result['ma5'][-2] if count >= 2 else np.nan,
+            prev_ma20=result['ma20'][-2] if count >= 2 else np.nan
+        )
+
+    @staticmethod
+    def summarize_values(count, current_price, rsi, macd, macd_signal_line, ma5, ma20, ma60, prev_ma5, prev_ma20):
+        """
+        최신 봉의 지표 값으로 calculate_indicators 결과 dict 구성
+        (배열 계산과 증분 계산(indicator_state.py)이 같은 신호 판단 로직을 공유)
+        """
+        # RSI 신호 판단
+        if rsi > 70:
+            rsi_signal = "과매수"
+        elif rsi < 30:
+            rsi_signal = "과매도"
+        else:
+            rsi_signal = "중립"
+
+        # MACD 신호 판단
+        if macd > macd_signal_line:
+            macd_signal = "상승"
+        elif macd < macd_signal_line:
+            macd_signal = "하락"
+        else:
+            macd_signal = "중립"
+
+        # NaN 처리
+        if np.isnan(ma5): ma5 = current_price
+        if np.isnan(ma20): ma20 = current_price
+        if np.isnan(ma60): ma60 = current_price
+
+        # 이동평균선 배열 신호
+        if current_price > ma5 > ma20 > ma60:
+            ma_signal = "정배열"
+        elif current_price < ma5 < ma20 < ma60:
+            ma_signal = "역배열"
+        elif count >= 2:
+            if not np.isnan(prev_ma5) and not np.isnan(prev_ma20):
+                if prev_ma5 < prev_ma20 and ma5 > ma20:
+                    ma_signal = "골든크로스"
+                elif prev_ma5 > prev_ma20 and ma5 < ma20:
+                    ma_signal = "데드크로스"
+                else:
+                    ma_signal = "중립"
+            else:
+                ma_signal = "중립"
+        else:
+            ma_signal = "중립"
+
+        return {
+            'rsi': round(float(rsi), 2),
+            'rsi_signal': rsi_signal,
+            'macd': round(float(macd), 2),
+            'macd_signal': macd_signal,
+            'ma5': round(float(ma5), 2),
+            'ma20': round(float(ma20), 2),
+            'ma60': round(float(ma60), 2),
+            'ma_signal': ma_signal
+        }
+
+    @staticmethod
+    def summarize_bollinger_values(upper, middle, lower, bandwidth, percent_b, is_squeeze):
+        """최신 봉의 밴드 값으로 calculate_bollinger_bands의 summary dict 구성"""
+        return {
+            'upper': round(float(upper), 0),
+            'middle': round(float(middle), 0),
+            'lower': round(float(lower), 0),
+            'bandwidth': round(float(bandwidth), 4),
+            'percent_b': round(float(percent_b), 4),
+            'is_squeeze': bool(is_squeeze)
+        }
+
+    @staticmethod
+    def _summarize_bollinger(dates, close, bands):
+        """엔진 결과로 볼린저 요약(최신 값) + 최근 HISTORY_DAYS일 히스토리 구성"""
+        summary = TechnicalIndicators.summarize_bollinger_values(
+            bands['upper'][-1], bands['sma'][-1], bands['lower'][-1],
+            bands['bandwidth'][-1], bands['percent_b'][-1], bands['is_squeeze'][-1]
+        )
+
+        # 히스토리 - 같은 배열의 마지막 구간을 잘라서 사용
+        tail = slice(-TechnicalIndicators.HISTORY_DAYS, None)
+
+        def rounded(values, digits):
+            return [None if np.isnan(v) else round(v, digits) for v in values[tail].tolist()]
+
+        history = [
+            {
+                'date': date,
+                'close': int(price),
+                'upper': upper,
+                'middle': middle,
+                'lower': lower,
+                'bandwidth': bandwidth,
+                'is_squeeze': squeeze
+            }
+            for date, price, upper, middle, lower, bandwidth, squeeze in zip(
+                list(dates)[tail],
+                close[tail].tolist(),
+                rounded(bands['upper'], 0),
+                rounded(bands['sma'], 0),
+                rounded(bands['lower'], 0),
+                rounded(bands['bandwidth'], 4),
+                bands['is_squeeze'][tail].tolist()
+            )
+        ]
+
+        return {
+            'summary': summary,
+            'history': history
+        }
+
+    # ------------------------------------------------------------
+    # 입력 변환
+    # ------------------------------------------------------------
+    @staticmethod
+    def _extract_columns(price_data, names):
+        """
+        List of dicts 또는 DataFrame에서 필요한 컬럼만 추출 (컬럼명 대소문자 무시)
+
+        Returns:
+            { name: [값, ...] } - 없는 컬럼은 포함하지 않음
+        """
+        if hasattr(price_data, 'columns'):  # DataFrame
+            lower = {str(c).lower(): c for c in price_data.columns}
+            return {name: price_data[lower[name]].tolist() for name in names if name in lower}
+
+        records = list(price_data)
+        columns = {}
+        for name in names:
+            if any(name in r for r in records):
+                columns[name] = [r.get(name) for r in records]
+                continue
+            # 대소문자가 다른 키 (예: 'Close')
+            values = [next((v for k, v in r.items() if str(k).lower() == name), None) for r in records]
+            if any(v is not None for v in values):
+                columns[name] = values
+        return columns
+
+    @staticmethod
+    def _is_sorted(dates):
+        return all(a <= b for a, b in zip(dates, dates[1:]))
+
+    @staticmethod
+    def _sorted_by_date(dates, close):
+        """날짜 오름차순 정렬 (과거 -> 현재). 이미 정렬되어 있으면 그대로 반환"""
+        if TechnicalIndicators._is_sorted(dates):
+            return dates, close
+        order = sorted(range(len(dates)), key=lambda i: dates[i])
+        return [dates[i] for i in order], close[order]
@@ -0,0 +1,128 @@
+"""
+BrowserPool 테스트
+- 반납된 세션을 재사용하고 동시 사용 수가 size를 넘지 않는지
+- max_uses회 사용하거나 오류가 난 세션은 종료 후 새로 생성하는지
+- 상태 확인에 실패한 세션은 빌려주지 않고 교체하는지
+- 모든 세션이 사용 중이면 반납을 기다리고, 시간이 지나면 TimeoutError
+"""
+import threading
+import time
+
+from browser_pool import BrowserPool
+
+
+class FakeDriver:
+    count = 0
+
+    def __init__(self):
+        FakeDriver.count += 1
+        self.id = FakeDriver.count
+        self.alive = True
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(**kwargs):
+    drivers = []
+
+    def factory():
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    pool = BrowserPool(factory, health_check=lambda driver: driver.alive, **kwargs)
+    return pool, drivers
+
+
+def test_reuse_and_concurrency():
+    pool, drivers = make_pool(size=2, max_uses=0)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work():
+        with pool.lease() as session:
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert peak[0] == 2
+    assert len(drivers) == 2  # 8번 사용에 브라우저는 2개만 생성
+    stats = pool.stats()
+    assert stats['leases'] == 8 and stats['idle'] == 2 and stats['in_use'] == 0
+    pool.close()
+    assert all(driver.quit_called for driver in drivers)
+
+
+def test_recycle_after_max_uses_and_error():
+    pool, drivers = make_pool(size=1, max_uses=2)
+    for _ in range(2):
+        with pool.lease():
+            pass
+    assert drivers[0].quit_called and len(drivers) == 1
+
+    with pool.lease() as session:
+        session.mark_broken()
+    assert drivers[1].quit_called
+
+    try:
+        with pool.lease():
+            raise ValueError("page crashed")
+    except ValueError:
+        pass
+    assert drivers[2].quit_called
+
+    with pool.lease() as session:
+        assert session.driver is drivers[3]
+    stats = pool.stats()
+    assert stats['recycled'] == 3 and stats['errors'] == 2 and stats['alive'] == 1
+    pool.close()
+
+
+def test_health_check_replaces_dead_session():
+    pool, drivers = make_pool(size=1)
+    assert pool.warm() == 1
+    drivers[0].alive = False
+
+    with pool.lease() as session:
+        assert session.driver is drivers[1]
+    assert drivers[0].quit_called
+    assert pool.stats()['health_failures'] == 1
+    pool.close()
+
+
+def test_lease_timeout():
+    pool, _ = make_pool(size=1, lease_timeout=0.05)
+    with pool.lease():
+        started = time.monotonic()
+        try:
+            with pool.lease():
+                assert False, "expected TimeoutError"
+        except TimeoutError:
+            pass
+        assert time.monotonic() - started >= 0.04
+    assert pool.stats()['wait_timeouts'] == 1
+
+    # 반납된 세션은 바로 빌릴 수 있음
+    with pool.lease():
+        pass
+    pool.close()
+
+
+if __name__ == "__main__":
+    test_reuse_and_concurrency()
+    test_recycle_after_max_uses_and_error()
+    test_health_check_replaces_dead_session()
+    test_lease_timeout()
+    print("[PASS] browser pool tests")
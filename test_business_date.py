@@ -0,0 +1,25 @@
+"""
+MarketSession.get_business_date 테스트
+- 주말/장 시작 전에는 직전 영업일, 그 외에는 당일을 기준일로 사용하는지
+"""
+import datetime
+
+from market_session import MarketSession
+
+
+def test_business_date():
+    cases = [
+        (datetime.datetime(2025, 11, 30, 14, 0), "20251128"),  # 일요일 → 금요일
+        (datetime.datetime(2025, 11, 29, 10, 0), "20251128"),  # 토요일 → 금요일
+        (datetime.datetime(2025, 11, 28, 15, 0), "20251128"),  # 금요일 장중 → 당일
+        (datetime.datetime(2025, 12, 1, 8, 0), "20251128"),    # 월요일 장 전 → 금요일
+        (datetime.datetime(2025, 12, 2, 8, 59), "20251201"),   # 화요일 장 전 → 월요일
+        (datetime.datetime(2025, 12, 1, 9, 30), "20251201"),   # 월요일 장중 → 당일
+    ]
+    for now, expected in cases:
+        assert MarketSession.get_business_date(now) == expected, f"{now}: {MarketSession.get_business_date(now)} != {expected}"
+
+
+if __name__ == "__main__":
+    test_business_date()
+    print("[PASS] business date tests")
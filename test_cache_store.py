@@ -0,0 +1,125 @@
+"""
+SQLiteCacheStore 테스트
+- 저장/조회, 압축 본문, 일괄 조회, 타입/접두어/시각 조회
+- 보관 기간 정리(purge)
+- 기존 {종목코드}_{타입}_{YYYYMMDD}.json 파일 이전
+- 여러 스레드 동시 쓰기/읽기 (WAL)
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+from cache_store import SQLiteCacheStore
+
+
+def test_put_get_and_compression():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteCacheStore(os.path.join(tmp, 'cache.db'))
+        small = {'sentiment': '긍정'}
+        large = {'raw_response': '상승 추세 유지 ' * 500}
+        store.put('005930', 'news', small)
+        store.put('005930', 'outlook', large, created_at=1000.0)
+
+        assert store.get('005930', 'news')[0] == small
+        assert store.get('005930', 'outlook') == (large, 1000.0)
+        assert store.get('000660', 'news') == (None, None)
+
+        encoding = store._connect().execute(
+            "SELECT encoding, length(payload) FROM analysis_cache WHERE analysis_type = 'outlook'").fetchone()
+        assert encoding[0] == SQLiteCacheStore.ENCODING_ZLIB
+        assert encoding[1] < len(json.dumps(large, ensure_ascii=False).encode('utf-8')) / 10
+
+        # 같은 키는 교체
+        store.put('005930', 'news', {'sentiment': '부정'})
+        assert store.get('005930', 'news')[0] == {'sentiment': '부정'}
+        assert store.count() == 2
+        store.close()
+
+
+def test_bulk_and_prefix_queries():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteCacheStore(os.path.join(tmp, 'cache.db'))
+        now = time.time()
+        for i, code in enumerate(('005930', '005380', '000660', 'MARKET')):
+            store.put(code, 'outlook', {'code': code}, created_at=now - i * 3600)
+        store.put('005930', 'news', {'code': '005930'}, created_at=now)
+
+        many = store.get_many(['005930', '000660', '999999'], 'outlook')
+        assert sorted(many) == ['000660', '005930']
+
+        recent = store.query(analysis_type='outlook', since=now - 5400)
+        assert [row[0] for row in recent] == ['005930', '005380']
+
+        prefixed = store.query(code_prefix='005')
+        assert sorted((row[0], row[1]) for row in prefixed) == [
+            ('005380', 'outlook'), ('005930', 'news'), ('005930', 'outlook')]
+
+        assert store.purge(now - 5400) == 2
+        store.vacuum()
+        assert store.count() == 3
+        store.close()
+
+
+def test_migrate_legacy_json_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = {
+            '005930_outlook_20240104.json': {'recommendation': '매도'},
+            '005930_outlook_20240105.json': {'recommendation': '매수'},
+            'A035420_outlook_20240105.json': {'recommendation': '관망'},
+            '000660_core_themes_20240105.json': ['HBM'],
+            'MARKET_korea_impact_20240105.json': {'summary': '중립'},
+        }
+        for i, (name, data) in enumerate(legacy.items()):
+            path = os.path.join(tmp, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.utime(path, (1000 + i, 1000 + i))
+        # 캐시 디렉토리의 다른 파일은 건드리지 않음
+        with open(os.path.join(tmp, 'screener_snapshot.json'), 'w') as f:
+            f.write('{}')
+
+        store = SQLiteCacheStore(os.path.join(tmp, 'cache.db'))
+        assert store.migrate_json_files(tmp) == 5
+        assert store.get('005930', 'outlook') == ({'recommendation': '매수'}, 1001)
+        # A 접두사 파일은 GeminiCache가 조회하는 정규화된 코드로 저장
+        assert store.get('035420', 'outlook')[0] == {'recommendation': '관망'}
+        assert store.get('A035420', 'outlook') == (None, None)
+        assert store.get('000660', 'core_themes')[0] == ['HBM']
+        assert store.get('MARKET', 'korea_impact')[0] == {'summary': '중립'}
+        assert [f for f in os.listdir(tmp) if f.endswith('.json')] == ['screener_snapshot.json']
+        store.close()
+
+
+def test_concurrent_access():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteCacheStore(os.path.join(tmp, 'cache.db'))
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(50):
+                    store.put(f"{i:06d}", 'news', {'writer': n, 'i': i})
+                    data, _ = store.get(f"{i:06d}", 'news')
+                    assert data['i'] == i
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors, errors
+        assert store.count() == 50
+        store.close()
+
+
+if __name__ == "__main__":
+    test_put_get_and_compression()
+    test_bulk_and_prefix_queries()
+    test_migrate_legacy_json_files()
+    test_concurrent_access()
+    print("[PASS] cache store tests")
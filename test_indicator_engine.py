@@ -0,0 +1,241 @@
+"""
+indicator_engine / TechnicalIndicators 테스트
+- 기존 pandas 구현(아래 legacy_*)과 결과가 같은지 (랜덤 워크 + 보합 구간 포함)
+- 2차원 (종목 수, 봉 수) 입력이 행별 1차원 계산과 같은지
+- EMA/MACD는 pandas ewm(adjust=False)와 비트 단위로 같은지 (보합 구간, NaN 종가, 긴 시계열)
+- 계산 횟수가 종목 수/봉 수와 무관한지 (행 단위 Python 반복 없음)
+- 마이크로벤치마크: 기존 pandas 경로 대비 속도 비교 (직접 실행 시 출력, INDICATOR_BENCHMARK=1이면 속도도 확인)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicator_engine as engine
+from technical_indicators import TechnicalIndicators
+
+
+# ------------------------------------------------------------
+# 기존 pandas 구현 (비교 기준)
+# ------------------------------------------------------------
+def legacy_indicators(price_data):
+    df = pd.DataFrame(price_data)
+    df['close'] = pd.to_numeric(df['close'], errors='coerce')
+    delta = df['close'].diff()
+    gain = (delta.where(delta > 0, 0)).fillna(0)
+    loss = (-delta.where(delta < 0, 0)).fillna(0)
+    avg_gain = gain.ewm(alpha=1/14, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1/14, adjust=False).mean()
+    rs = avg_gain / avg_loss.replace(0, np.nan)
+    rsi_series = (100 - (100 / (1 + rs))).fillna(100)
+    ema12 = df['close'].ewm(span=12, adjust=False).mean()
+    ema26 = df['close'].ewm(span=26, adjust=False).mean()
+    macd_line = ema12 - ema26
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    return {
+        'rsi': rsi_series.to_numpy(),
+        'macd': macd_line.to_numpy(),
+        'macd_signal': signal_line.to_numpy(),
+        'ma5': df['close'].rolling(window=5).mean().to_numpy(),
+        'ma20': df['close'].rolling(window=20).mean().to_numpy(),
+        'ma60': df['close'].rolling(window=60).mean().to_numpy(),
+    }
+
+
+def legacy_bollinger(price_data, window=20, num_std=2):
+    df = pd.DataFrame(price_data)
+    df['close'] = pd.to_numeric(df['close'], errors='coerce')
+    df = df.sort_values('date', ascending=True)
+    df['sma'] = df['close'].rolling(window=window).mean()
+    df['std'] = df['close'].rolling(window=window).std()
+    df['upper_band'] = df['sma'] + (df['std'] * num_std)
+    df['lower_band'] = df['sma'] - (df['std'] * num_std)
+    df['percent_b'] = (df['close'] - df['lower_band']) / (df['upper_band'] - df['lower_band'])
+    df['bandwidth'] = (df['upper_band'] - df['lower_band']) / df['sma']
+    min_window = min(120, len(df))
+    df['min_bandwidth_120'] = df['bandwidth'].rolling(window=min_window).min()
+    df['is_squeeze'] = df['bandwidth'] <= (df['min_bandwidth_120'] * 1.05)
+    last = df.iloc[-1]
+    summary = {
+        'upper': round(float(last['upper_band']), 0),
+        'middle': round(float(last['sma']), 0),
+        'lower': round(float(last['lower_band']), 0),
+        'bandwidth': round(float(last['bandwidth']), 4),
+        'percent_b': round(float(last['percent_b']), 4),
+        'is_squeeze': bool(last['is_squeeze'])
+    }
+    history = []
+    for _, row in df.tail(120).iterrows():
+        history.append({
+            'date': row['date'],
+            'close': int(row['close']),
+            'upper': round(float(row['upper_band']), 0) if not pd.isna(row['upper_band']) else None,
+            'middle': round(float(row['sma']), 0) if not pd.isna(row['sma']) else None,
+            'lower': round(float(row['lower_band']), 0) if not pd.isna(row['lower_band']) else None,
+            'bandwidth': round(float(row['bandwidth']), 4) if not pd.isna(row['bandwidth']) else None,
+            'is_squeeze': bool(row['is_squeeze']) if not pd.isna(row['is_squeeze']) else False
+        })
+    return {'summary': summary, 'history': history}
+
+
+# ------------------------------------------------------------
+# 테스트 데이터
+# ------------------------------------------------------------
+def make_prices(count, seed=0, flat_from=None, flat_len=0):
+    """랜덤 워크 일봉 (flat_from부터 flat_len일은 보합 - 거래정지 구간 흉내)"""
+    rng = np.random.default_rng(seed)
+    close = np.maximum(1000, 50000 + np.cumsum(rng.normal(0, 600, count))).round()
+    if flat_from is not None:
+        close[flat_from:flat_from + flat_len] = close[flat_from]
+    return [
+        {'date': f"{20200101 + i:08d}", 'close': int(c), 'open': int(c), 'high': int(c) + 100,
+         'low': int(c) - 100, 'volume': 1000 + i}
+        for i, c in enumerate(close)
+    ]
+
+
+def assert_close(a, b, tol=1e-7, label=""):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    assert a.shape == b.shape, label
+    assert np.array_equal(np.isnan(a), np.isnan(b)), f"{label}: NaN positions differ"
+    mask = ~np.isnan(a)
+    scale = np.maximum(1.0, np.abs(b[mask]))
+    err = np.max(np.abs(a[mask] - b[mask]) / scale) if mask.any() else 0.0
+    assert err < tol, f"{label}: max relative error {err}"
+
+
+# ------------------------------------------------------------
+# 테스트
+# ------------------------------------------------------------
+def test_engine_matches_pandas_series():
+    for count, flat in ((25, None), (130, None), (600, 100), (2500, 1800)):
+        data = make_prices(count, seed=count, flat_from=flat, flat_len=30)
+        close = np.array([d['close'] for d in data], dtype=float)
+        legacy = legacy_indicators(data)
+        result = engine.compute_all(close)
+        for key in legacy:
+            assert_close(result[key], legacy[key], label=f"{key} (n={count})")
+
+
+def test_wrappers_match_legacy_output():
+    for count, flat in ((20, None), (119, None), (121, None), (600, 500)):
+        data = make_prices(count, seed=count + 7, flat_from=flat, flat_len=40)
+        assert TechnicalIndicators.calculate_bollinger_bands(data) == legacy_bollinger(data), f"bollinger n={count}"
+
+        combined = TechnicalIndicators.calculate_all(data)
+        assert combined['technical'] == TechnicalIndicators.calculate_indicators(data)
+        assert combined['bollinger'] == TechnicalIndicators.calculate_bollinger_bands(data)
+
+    # 미정렬 입력: 볼린저는 날짜순 정렬 후 계산
+    data = make_prices(200, seed=3)
+    shuffled = list(reversed(data))
+    assert TechnicalIndicators.calculate_bollinger_bands(shuffled) == legacy_bollinger(shuffled)
+
+    # 데이터 부족
+    assert TechnicalIndicators.calculate_indicators(data[:10])['rsi_signal'] == "데이터부족"
+    assert TechnicalIndicators.calculate_bollinger_bands(data[:10]) is None
+
+
+def test_two_dimensional_input_matches_rows():
+    rows = [np.array([d['close'] for d in make_prices(300, seed=s)], dtype=float) for s in range(5)]
+    batch = engine.compute_all(np.vstack(rows))
+    for i, row in enumerate(rows):
+        single = engine.compute_all(row)
+        for key in ('rsi', 'macd', 'macd_signal', 'ma60', 'upper', 'bandwidth', 'min_bandwidth'):
+            assert_close(batch[key][i], single[key], tol=1e-9, label=f"{key} row {i}")
+
+
+def test_ema_and_macd_match_pandas_exactly():
+    flat_tail = np.array([d['close'] for d in make_prices(300, seed=11, flat_from=150, flat_len=150)], dtype=float)
+    with_nan = np.array([d['close'] for d in make_prices(200, seed=12)], dtype=float)
+    with_nan[[0, 57, 58, 120]] = np.nan
+    long_series = np.array([d['close'] for d in make_prices(3000, seed=13)], dtype=float)
+
+    for label, close in (('flat tail', flat_tail), ('NaN close', with_nan), ('long', long_series)):
+        series = pd.Series(close)
+        for span in (12, 26):
+            expected = series.ewm(span=span, adjust=False).mean().to_numpy()
+            assert np.array_equal(engine.ema(close, 2.0 / (span + 1)), expected, equal_nan=True), f"ema{span} ({label})"
+
+        line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        macd_line, signal_line = engine.macd(close)
+        assert np.array_equal(macd_line, line.to_numpy(), equal_nan=True), f"macd ({label})"
+        assert np.array_equal(signal_line, line.ewm(span=9, adjust=False).mean().to_numpy(), equal_nan=True), f"signal ({label})"
+
+    # 보합 구간: MACD = 시그널 = 0 → 중립
+    flat = [{'date': f"{20200101 + i:08d}", 'close': 50000} for i in range(100)]
+    assert TechnicalIndicators.calculate_indicators(flat)['macd_signal'] == "중립"
+    for data in (make_prices(300, seed=11, flat_from=150, flat_len=150), make_prices(3000, seed=13)):
+        legacy = legacy_indicators(data)
+        diff = legacy['macd'][-1] - legacy['macd_signal'][-1]
+        label = "상승" if diff > 0 else "하락" if diff < 0 else "중립"
+        assert TechnicalIndicators.calculate_indicators(data)['macd_signal'] == label
+
+
+def count_engine_lines(close):
+    """compute_all 실행 중 indicator_engine.py에서 실행된 줄 수"""
+    counted = [0]
+    engine_file = engine.__file__
+
+    def tracer(frame, event, arg):
+        if frame.f_code.co_filename != engine_file:
+            return None
+        if event == 'line':
+            counted[0] += 1
+        return tracer
+
+    sys.settrace(tracer)
+    try:
+        engine.compute_all(close)
+    finally:
+        sys.settrace(None)
+    return counted[0]
+
+
+def test_compute_all_has_no_per_row_loop():
+    # 봉 수/종목 수가 달라도 엔진 코드 실행 줄 수가 같아야 함 (배열 연산만 사용)
+    small = np.array([d['close'] for d in make_prices(130, seed=1)], dtype=float)
+    batch = np.vstack([[d['close'] for d in make_prices(2000, seed=s)] for s in range(20)]).astype(float)
+    assert count_engine_lines(small) == count_engine_lines(batch)
+
+
+def benchmark(count=600, repeat=50):
+    """기존 pandas 경로 vs 엔진 (지표 + 볼린저 1회 계산 기준)"""
+    data = make_prices(count, seed=1)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy_indicators(data)
+        legacy_bollinger(data)
+    legacy_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        TechnicalIndicators.calculate_all(data)
+    engine_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    print(f"[BENCH] {count} bars: pandas {legacy_ms:.2f}ms, engine {engine_ms:.2f}ms "
+          f"({legacy_ms / max(engine_ms, 1e-9):.1f}x)")
+    return legacy_ms, engine_ms
+
+
+def test_engine_is_faster_than_pandas():
+    """실행 환경 부하에 따라 흔들리므로 INDICATOR_BENCHMARK=1일 때만 확인 (여유 있는 기준)"""
+    if os.environ.get('INDICATOR_BENCHMARK') != '1':
+        return
+    legacy_ms, engine_ms = benchmark(repeat=20)
+    assert engine_ms < legacy_ms * 0.8
+
+
+if __name__ == "__main__":
+    test_engine_matches_pandas_series()
+    test_wrappers_match_legacy_output()
+    test_two_dimensional_input_matches_rows()
+    test_ema_and_macd_match_pandas_exactly()
+    test_compute_all_has_no_per_row_loop()
+    test_engine_is_faster_than_pandas()
+    print("[PASS] indicator engine parity tests")
+    for n in (120, 600, 2500):
+        benchmark(n)
@@ -0,0 +1,100 @@
+"""
+IncrementalIndicatorState 테스트
+- 일봉 전체로 구성한 상태가 TechnicalIndicators와 같은 값을 내는지
+- 장중 현재가 갱신(같은 날짜)과 다음 날 봉 추가를 O(1) 갱신으로 반영해도 전체 계산과 같은지
+- JSON 직렬화/복원 후에도 같은 결과인지
+"""
+import json
+import random
+import tempfile
+
+from indicator_state import IncrementalIndicatorState, IndicatorStateStore
+from technical_indicators import TechnicalIndicators
+
+
+def make_bars(count, seed=0):
+    rng = random.Random(seed)
+    price = 50000
+    bars = []
+    for i in range(count):
+        price = max(1000, price + rng.randint(-800, 800))
+        if 100 <= i < 130:
+            price = bars[-1]['close']  # 보합 구간 (거래정지 흉내)
+        bars.append({'date': f"{20200101 + i:08d}", 'close': price, 'open': price, 'high': price, 'low': price, 'volume': 1})
+    return bars
+
+
+def expected(bars):
+    bollinger = TechnicalIndicators.calculate_bollinger_bands(bars)
+    return (
+        TechnicalIndicators.calculate_indicators(bars),
+        bollinger['summary'] if bollinger else None,
+        bollinger['history'][-1] if bollinger else None
+    )
+
+
+def actual(state):
+    return state.technical(), state.bollinger_summary(), state.bollinger_history_point()
+
+
+def test_state_matches_full_calculation():
+    for count in (10, 25, 65, 140, 400):
+        bars = make_bars(count, seed=count)
+        state = IncrementalIndicatorState.from_bars(bars)
+        assert actual(state) == expected(bars), f"n={count}"
+
+
+def test_intraday_updates_and_next_day():
+    bars = make_bars(300, seed=1)
+    state = IncrementalIndicatorState.from_bars(bars)
+
+    # 장중: 같은 날짜의 현재가가 여러 번 바뀜
+    for price in (bars[-1]['close'] + 500, bars[-1]['close'] - 1200, bars[-1]['close'] + 30):
+        assert state.update(bars[-1]['date'], price)
+        live = bars[:-1] + [dict(bars[-1], close=price)]
+        assert actual(state) == expected(live)
+
+    # 다음 날: 전날 봉 확정 후 새 봉
+    bars = live + [dict(bars[-1], date="20991231", close=live[-1]['close'] + 700)]
+    assert state.update("20991231", bars[-1]['close'])
+    assert actual(state) == expected(bars)
+
+    # 지난 날짜는 무시
+    assert not state.update("20200101", 1)
+
+
+def test_serialization_round_trip():
+    bars = make_bars(200, seed=2)
+    state = IncrementalIndicatorState.from_bars(bars)
+    restored = IncrementalIndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+    assert actual(restored) == actual(state)
+
+    restored.update(bars[-1]['date'], bars[-1]['close'] + 900)
+    state.update(bars[-1]['date'], bars[-1]['close'] + 900)
+    assert actual(restored) == actual(state)
+
+
+def test_store_catches_up_incrementally():
+    with tempfile.TemporaryDirectory() as tmp:
+        bars = make_bars(200, seed=3)
+        store = IndicatorStateStore(base_dir=tmp)
+        first = store.live_indicators("005930", bars)
+        assert first['committed_count'] == 199
+
+        # 새 봉 1개 추가 → 다시 구성하지 않고 확정 봉 1개만 늘어남
+        bars = bars + [dict(bars[-1], date="20991231", close=bars[-1]['close'] + 100)]
+        second = store.live_indicators("005930", bars)
+        assert second['committed_count'] == 200
+        assert second['technical'] == TechnicalIndicators.calculate_indicators(bars)
+
+        # 파일에서 복원한 저장소도 같은 결과
+        reloaded = IndicatorStateStore(base_dir=tmp).live_indicators("005930", bars)
+        assert reloaded == second
+
+
+if __name__ == "__main__":
+    test_state_matches_full_calculation()
+    test_intraday_updates_and_next_day()
+    test_serialization_round_trip()
+    test_store_catches_up_incrementally()
+    print("[PASS] incremental indicator state tests")
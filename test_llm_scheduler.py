@@ -0,0 +1,129 @@
+"""
+LLMScheduler 테스트
+- 동시 실행 수가 max_concurrency를 넘지 않는지
+- 대기 중인 작업은 우선순위(INTERACTIVE > SENTIMENT > PREWARM) 순으로 실행되는지
+- 429/503(RetryableLLMError)이면 백오프 후 재시도하고, 한도를 넘으면 호출자에게 오류가 전달되는지
+- 분당 토큰 한도를 넘으면 다음 작업 시작을 미루는지
+"""
+import threading
+import time
+
+from llm_scheduler import LLMScheduler, RetryableLLMError, priority_scope, current_priority
+
+
+def test_concurrency_cap():
+    scheduler = LLMScheduler(max_concurrency=2)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def call():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return 'ok'
+
+    futures = [scheduler.submit(call) for _ in range(8)]
+    assert [f.result(timeout=5) for f in futures] == ['ok'] * 8
+    assert peak[0] == 2
+    assert scheduler.stats()['completed'] == 8
+    scheduler.close()
+
+
+def test_priority_order():
+    scheduler = LLMScheduler(max_concurrency=1)
+    gate = threading.Event()
+    order = []
+
+    # 워커 하나를 막아두고 나머지 작업을 큐에 쌓음
+    blocker = scheduler.submit(gate.wait)
+    time.sleep(0.05)
+    futures = [
+        scheduler.submit(lambda: order.append('prewarm'), priority=LLMScheduler.PREWARM),
+        scheduler.submit(lambda: order.append('sentiment'), priority=LLMScheduler.SENTIMENT),
+        scheduler.submit(lambda: order.append('interactive-1'), priority=LLMScheduler.INTERACTIVE),
+        scheduler.submit(lambda: order.append('interactive-2'), priority=LLMScheduler.INTERACTIVE),
+    ]
+    stats = scheduler.stats()
+    assert stats['running'] == 1
+    assert stats['queued'] == {'interactive': 2, 'sentiment': 1, 'prewarm': 1}
+
+    gate.set()
+    blocker.result(timeout=5)
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ['interactive-1', 'interactive-2', 'sentiment', 'prewarm']
+    scheduler.close()
+
+
+def test_backoff_and_retry():
+    scheduler = LLMScheduler(max_concurrency=1, max_retries=2, backoff_base=0.05, backoff_max=0.2)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RetryableLLMError("Quota exceeded (429)")
+        return 'ok'
+
+    assert scheduler.submit(flaky).result(timeout=5) == 'ok'
+    assert len(attempts) == 3
+    # 두 번째 백오프는 첫 번째의 2배
+    assert attempts[1] - attempts[0] >= 0.04
+    assert attempts[2] - attempts[1] >= 0.09
+    stats = scheduler.stats()
+    assert stats['retries'] == 2 and stats['backoffs'] == 2
+    assert stats['backoff_seconds'] == 0  # 성공 후 초기화
+
+    def always_busy():
+        raise RetryableLLMError("Service unavailable (503)")
+
+    try:
+        scheduler.submit(always_busy).result(timeout=5)
+        assert False, "expected RetryableLLMError"
+    except RetryableLLMError as e:
+        assert "503" in str(e)
+    assert scheduler.stats()['failed'] == 1
+    scheduler.close()
+
+
+def test_token_budget_delays_next_job():
+    scheduler = LLMScheduler(max_concurrency=2, tokens_per_minute=1000)
+    scheduler.WINDOW_SECONDS = 0.3
+    started = []
+
+    def call(tokens):
+        started.append(time.monotonic())
+        scheduler.record_usage(tokens)  # 예상치(600)를 실제 사용량으로 보정
+        return tokens
+
+    first = scheduler.submit(lambda: call(700), estimated_tokens=600)
+    first.result(timeout=5)
+    second = scheduler.submit(lambda: call(100), estimated_tokens=600)
+    second.result(timeout=5)
+
+    # 700 + 600 > 1000이므로 첫 작업 사용분이 구간에서 빠질 때까지 대기
+    assert started[1] - started[0] >= 0.25
+    assert scheduler.stats()['tokens_used'] == 800
+    scheduler.close()
+
+
+def test_priority_scope():
+    assert current_priority(LLMScheduler.INTERACTIVE) == LLMScheduler.INTERACTIVE
+    with priority_scope(LLMScheduler.PREWARM):
+        assert current_priority(LLMScheduler.INTERACTIVE) == LLMScheduler.PREWARM
+        with priority_scope(None):
+            assert current_priority(LLMScheduler.INTERACTIVE) == LLMScheduler.PREWARM
+    assert current_priority(LLMScheduler.INTERACTIVE) == LLMScheduler.INTERACTIVE
+
+
+if __name__ == "__main__":
+    test_concurrency_cap()
+    test_priority_order()
+    test_backoff_and_retry()
+    test_token_budget_delays_next_job()
+    test_priority_scope()
+    print("[PASS] llm scheduler tests")
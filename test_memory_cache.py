@@ -0,0 +1,92 @@
+"""
+LRUMemoryCache 테스트
+- 항목 수 / 바이트 상한 초과 시 가장 오래 사용하지 않은 항목부터 제거되는지
+- 항목별 TTL 만료와 백그라운드 정리
+- 여러 스레드 동시 접근 시 카운터/크기 일관성
+"""
+import threading
+import time
+
+from memory_cache import LRUMemoryCache
+
+
+def test_lru_entry_limit():
+    cache = LRUMemoryCache(max_entries=3, max_bytes=0, sweep_interval=0)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key)
+    cache.get('a')  # a를 최근 사용으로
+    cache.put('d', 'd')
+
+    assert 'b' not in cache
+    assert all(key in cache for key in ('a', 'c', 'd'))
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget():
+    cache = LRUMemoryCache(max_entries=100, max_bytes=10_000, sweep_interval=0)
+    for i in range(10):
+        cache.put(f"k{i}", {'raw_response': 'x' * 3000})
+    stats = cache.stats()
+    assert stats['bytes'] <= 10_000
+    assert stats['entries'] == 3
+    assert 'k9' in cache and 'k0' not in cache
+
+    # 예산보다 큰 단일 항목은 저장하지 않음
+    assert not cache.put('huge', 'x' * 20_000)
+    assert len(cache) == 3
+
+
+def test_ttl_and_counters():
+    cache = LRUMemoryCache(sweep_interval=0)
+    now = time.time()
+    cache.put('news', {'summary': 'ok'}, ttl=600, timestamp=now - 100)
+    cache.put('outlook', {'summary': 'old'}, ttl=600, timestamp=now - 700)
+
+    value, age = cache.get('news', now=now)
+    assert value == {'summary': 'ok'} and 99 < age < 101
+    assert cache.get('outlook', now=now) == (None, None)
+    assert cache.get('missing') == (None, None)
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 2, 1)
+    assert stats['entries'] == 1
+
+
+def test_background_sweep():
+    cache = LRUMemoryCache(sweep_interval=0.05)
+    cache.put('a', 'value', ttl=0.01)
+    cache.put('b', 'value')  # 만료 없음
+    time.sleep(0.2)
+    assert 'a' not in cache and 'b' in cache
+    assert cache.stats()['expirations'] == 1
+    cache.close()
+
+
+def test_concurrent_access():
+    cache = LRUMemoryCache(max_entries=50, max_bytes=0, sweep_interval=0)
+
+    def worker(n):
+        for i in range(2000):
+            key = f"{(n * 7 + i) % 120}"
+            if cache.get(key)[0] is None:
+                cache.put(key, key * 10, ttl=60)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert stats['entries'] <= 50
+    assert stats['hits'] + stats['misses'] == 8 * 2000
+    assert stats['bytes'] == sum(len(k) * 10 for k in list(cache._entries))
+
+
+if __name__ == "__main__":
+    test_lru_entry_limit()
+    test_byte_budget()
+    test_ttl_and_counters()
+    test_background_sweep()
+    test_concurrent_access()
+    print("[PASS] memory cache tests")
@@ -0,0 +1,84 @@
+"""
+NaverThemeScraper.scrape_all_themes 테스트 (네트워크 없이 페이지 조회를 대체)
+- 목록 페이지의 등락률/종목 수가 이전 결과와 같은 테마는 상세 페이지를 다시 조회하지 않는지
+- 체크포인트에 저장된(중단 전에 끝낸) 테마는 이어서 진행할 때 건너뛰는지
+- 상세 조회가 실패하면 이전 종목을 유지하고, 완료 후 체크포인트를 지우는지
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+from theme_service import NaverThemeScraper
+
+
+LIST = [
+    {'name': f'테마{i}', 'link': f'/theme/{i}', 'fluctuation': float(i), 'member_count': 2}
+    for i in range(6)
+]
+
+
+def run(previous=None, checkpoint_file=None, fail_links=()):
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch_soup(url):
+        return url
+
+    def parse_stocks(url):
+        link = url.replace("https://finance.naver.com", "")
+        with lock:
+            fetched.append(link)
+        time.sleep(0.01)
+        if link in fail_links:
+            raise IOError("connection reset")
+        return [{'code': link.split('/')[-1] * 6, 'name': f'종목{link}'}]
+
+    names = ('scrape_theme_list', '_fetch_soup', '_parse_stocks')
+    originals = {name: NaverThemeScraper.__dict__[name] for name in names}
+    NaverThemeScraper.scrape_theme_list = classmethod(lambda cls: [dict(theme) for theme in LIST])
+    NaverThemeScraper._fetch_soup = staticmethod(fetch_soup)
+    NaverThemeScraper._parse_stocks = staticmethod(parse_stocks)
+    try:
+        themes = NaverThemeScraper.scrape_all_themes(previous_themes=previous, checkpoint_file=checkpoint_file, workers=3)
+    finally:
+        for name, original in originals.items():
+            setattr(NaverThemeScraper, name, original)
+    return themes, sorted(fetched)
+
+
+def test_full_then_conditional_refetch():
+    themes, fetched = run()
+    assert [t['link'] for t in themes] == [t['link'] for t in LIST]  # 목록 순서 유지
+    assert len(fetched) == 6 and themes[0]['member_count'] == 2
+
+    # 등락률이 바뀐 테마만 다시 조회
+    previous = [dict(t) for t in themes]
+    previous[1]['fluctuation'] = 9.9
+    previous[4]['member_count'] = 3
+    themes, fetched = run(previous=previous)
+    assert fetched == ['/theme/1', '/theme/4']
+    assert themes[0]['stocks'] == previous[0]['stocks']
+
+
+def test_resume_from_checkpoint_and_keep_previous_on_failure():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        checkpoint = os.path.join(cache_dir, 'naver_themes_cache.json.checkpoint')
+        done = {t['link']: dict(t, stocks=[{'code': '000000', 'name': '이전'}]) for t in LIST[:3]}
+        with open(checkpoint, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': time.time(), 'themes': done}, f)
+
+        previous = [dict(LIST[5], fluctuation=-1.0, stocks=[{'code': '555555', 'name': '유지'}])]
+        themes, fetched = run(previous=previous, checkpoint_file=checkpoint, fail_links={'/theme/5'})
+
+        assert fetched == ['/theme/3', '/theme/4', '/theme/5']
+        assert themes[0]['stocks'][0]['name'] == '이전'
+        assert themes[5]['stocks'][0]['name'] == '유지' and themes[5]['fluctuation'] == 5.0
+        assert not os.path.exists(checkpoint)
+
+
+if __name__ == "__main__":
+    test_full_then_conditional_refetch()
+    test_resume_from_checkpoint_and_keep_previous_on_failure()
+    print("[PASS] naver scraper tests")
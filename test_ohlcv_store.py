@@ -0,0 +1,90 @@
+"""
+OhlcvStore 테스트
+- 최초 조회 시 저장 후, 신선한 동안에는 네트워크 요청이 없는지
+- 갱신 시 마지막 저장일 이후 봉만 교체/추가되는지
+- min_bars가 부족하면 연속조회(next-key)로 과거 이력을 보충하는지
+"""
+import datetime
+import tempfile
+
+from ohlcv_store import OhlcvStore
+
+
+def _bars(dates, base=100):
+    return [{'date': d, 'open': base, 'high': base + 1, 'low': base - 1, 'close': base, 'volume': 10} for d in dates]
+
+
+def _dates(start, count):
+    """start(포함)부터 과거 방향으로 평일 날짜 count개 (최신일 우선)"""
+    day = datetime.datetime.strptime(start, "%Y%m%d")
+    result = []
+    while len(result) < count:
+        if day.weekday() < 5:
+            result.append(day.strftime("%Y%m%d"))
+        day -= datetime.timedelta(days=1)
+    return result
+
+
+class FakeChartApi:
+    """ka10081 페이지 응답을 흉내내는 가짜 API (페이지당 page_size개, 최신일 우선)"""
+
+    def __init__(self, all_dates, page_size=100):
+        self.all_dates = all_dates
+        self.page_size = page_size
+        self.calls = 0
+        self.close = 100
+
+    def get_daily_chart_page(self, code, base_dt=None, next_key=None):
+        self.calls += 1
+        dates = [d for d in self.all_dates if base_dt is None or d <= base_dt]
+        offset = int(next_key) if next_key else 0
+        page = dates[offset:offset + self.page_size]
+        more = offset + self.page_size < len(dates)
+        return _bars(page, self.close), (str(offset + self.page_size) if more else None)
+
+
+def test_fresh_store_needs_no_network():
+    with tempfile.TemporaryDirectory() as tmp:
+        api = FakeChartApi(_dates("20240105", 50))
+        store = OhlcvStore(api, base_dir=tmp)
+
+        first = store.get_daily_chart("005930")
+        assert len(first) == 50
+        assert first[0]['date'] < first[-1]['date']
+        calls = api.calls
+
+        # 방금 동기화했으므로 재조회 없음
+        again = store.get_daily_chart("005930")
+        assert again == first
+        assert api.calls == calls
+
+
+def test_incremental_update_replaces_tail():
+    with tempfile.TemporaryDirectory() as tmp:
+        api = FakeChartApi(_dates("20240105", 50))
+        store = OhlcvStore(api, base_dir=tmp)
+        store.get_daily_chart("005930")
+
+        # 새 봉 2개 추가
+        api.all_dates = _dates("20240109", 52)
+        bars = store.get_bars("005930", force_refresh=True)
+        assert bars.shape[1] == 52
+        assert int(bars[OhlcvStore.DATE, -1]) == 20240109
+
+
+def test_backfill_with_continuation():
+    with tempfile.TemporaryDirectory() as tmp:
+        api = FakeChartApi(_dates("20240105", 450), page_size=100)
+        store = OhlcvStore(api, base_dir=tmp)
+
+        bars = store.get_bars("005930", min_bars=300)
+        assert bars.shape[1] >= 300
+        dates = bars[OhlcvStore.DATE]
+        assert (dates[1:] > dates[:-1]).all()
+
+
+if __name__ == "__main__":
+    test_fresh_store_needs_no_network()
+    test_incremental_update_replaces_tail()
+    test_backfill_with_continuation()
+    print("[PASS] ohlcv store tests")
@@ -0,0 +1,140 @@
+"""
+묶음 전망(generate_outlook_batch) 테스트
+- 한 번의 응답을 "### 종목코드" 구분선으로 나눠 종목별 outlook으로 변환하는지
+- 응답에 없는/형식이 깨진 종목은 결과에서 빠지는지 (호출자가 개별 호출로 대체)
+- 묶음 크기만큼 나눠서 호출하고 결과를 캐시에 저장하는지
+- get_batch_sentiment: 묶음 결과가 없는 종목은 서버에서 개별 분석하지 않고 결과에서 제외하는지
+"""
+import tempfile
+from types import SimpleNamespace
+
+from conftest import close_gemini_service, make_gemini_service
+from stock_analysis_service import StockAnalysisService
+
+
+BATCH_RESPONSE = """
+### 005930
+1. 투자의견: 분할매수 (신뢰도: 75점)
+2. 핵심 논리: 미국 반도체 강세와 외국인 순매수
+3. 매매 시나리오:
+   - 진입: 75,000원 (근거: 20일선 지지)
+   - 목표: 82,000원 (근거: 전고점)
+   - 손절: 72,000원 (근거: 60일선 이탈)
+4. 상세 분석: 커플링 호재가 유효합니다.
+5. 뉴스 심리: 긍정
+
+### 000660
+투자의견을 제시할 수 없습니다.
+
+### 035420
+1. 투자의견: 관망 (신뢰도: 40점)
+2. 핵심 논리: 개별 이슈 부재
+3. 매매 시나리오:
+   - 진입: 180,000원
+   - 목표: 195,000원
+   - 손절: 170,000원
+4. 상세 분석: 방향성 확인 필요.
+5. 뉴스 심리: [부정]
+"""
+
+
+def make_service(cache_dir, responses):
+    service, model = make_gemini_service(cache_dir, lambda prompt, stream: responses.pop(0))
+    service.outlook_batch_size = 2
+    service._fetch_batch_headlines = lambda codes: {code: ['실적 개선 기대'] for code in codes}
+    return service, model
+
+
+def stock(code, name):
+    return {
+        'code': code, 'name': name, 'price': 75500, 'rate': 1.2,
+        'supply_demand': {'foreign_net': 1000, 'institution_net': -200},
+        'technical': {'ma5': 75000, 'ma20': 74000, 'ma60': 72000, 'rsi': 55},
+        'bollinger': None, 'fundamental': {'per': 12.3}
+    }
+
+
+def test_split_batch_outlook():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service, _ = make_service(cache_dir, [])
+        results = service._split_batch_outlook(BATCH_RESPONSE, ['005930', '000660', '035420'])
+        close_gemini_service(service)
+
+    assert sorted(results) == ['005930', '035420']  # 000660은 형식이 깨져 제외
+    samsung = results['005930']
+    assert samsung['recommendation'] == '분할매수' and samsung['confidence'] == 75
+    assert samsung['price_strategy']['entry'].startswith('75,000원')
+    assert samsung['news_sentiment'] == '긍정'
+    assert '뉴스 심리' not in samsung['detailed_analysis']
+    assert results['035420']['news_sentiment'] == '부정'
+    assert results['035420']['recommendation'] == '관망'
+
+
+def test_batch_calls_per_chunk_and_caches():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        second_chunk = "### 051910\n1. 투자의견: 매수 (신뢰도: 60점)\n2. 핵심 논리: 테스트\n5. 뉴스 심리: 중립\n"
+        service, model = make_service(cache_dir, [BATCH_RESPONSE, second_chunk])
+        stocks = [stock('005930', '삼성전자'), stock('000660', 'SK하이닉스'),
+                  stock('035420', 'NAVER'), stock('A051910', 'LG화학')]
+
+        results = service.generate_outlook_batch(stocks, market_data={'market_index': 'KOSPI 2600'})
+
+        # 4종목 / 묶음 크기 2 → 2회 호출, 두 번째 묶음 응답에 없는 035420과 형식이 깨진 000660은 제외
+        assert len(model.prompts) == 2
+        assert '삼성전자' in model.prompts[0] and 'SK하이닉스' in model.prompts[0]
+        assert '실적 개선 기대' in model.prompts[0]
+        assert sorted(results) == ['005930', '051910']
+        assert results['005930']['_cache_info']['reason'] == 'batch'
+        assert service.batch_calls == 2 and service.batch_parse_failures == 2
+
+        # 같은 종목 재요청은 캐시에서 (추가 호출 없음)
+        cached = service.generate_outlook_batch([stock('005930', '삼성전자')])
+        assert len(model.prompts) == 2
+        assert cached['005930']['recommendation'] == '분할매수'
+        assert cached['005930']['_cache_info']['reason'] == 'batch_cache'
+        close_gemini_service(service)
+
+
+def make_analysis_service(generate_outlook_batch):
+    gemini = SimpleNamespace(cache=SimpleNamespace(load_many=lambda codes, analysis_type: {}),
+                             generate_outlook_batch=generate_outlook_batch)
+    service = StockAnalysisService(
+        kiwoom=SimpleNamespace(get_access_token=lambda: True), gemini=gemini,
+        theme_service=SimpleNamespace(get_market_themes_string=lambda limit: "정보 없음"),
+        ohlcv_store=object(), indicator_states=object()
+    )
+    service.full_calls = []
+
+    def get_full_analysis(code, force_refresh=False, global_market_data=None, lightweight=False, priority=None):
+        service.full_calls.append((code, lightweight))
+        return {'success': True, 'data': {
+            'stock_info': {'name': f'종목{code}', 'current_price': 1000, 'change_rate': 1.0},
+            'supply_demand': {'trend': '매수우위'}, 'technical': {}, 'bollinger': None, 'fundamental_data': {}
+        }}
+
+    service.get_full_analysis = get_full_analysis
+    service.get_market_context = lambda *args, **kwargs: {}
+    return service
+
+
+def test_batch_sentiment_leaves_out_missing_codes():
+    outlook = {'recommendation': '매수', 'confidence': 60, 'price_strategy': None, 'news_sentiment': '긍정'}
+    service = make_analysis_service(lambda stocks, **kwargs: {'005930': dict(outlook)})
+    cards = service.get_batch_sentiment(['A005930', '000660'])
+    assert list(cards) == ['A005930'] and cards['A005930']['batched'] is True
+    assert all(lightweight for _, lightweight in service.full_calls)
+
+    # 묶음 호출이 실패해도 요청 안에서 개별 AI 분석을 이어서 실행하지 않음
+    def fail(stocks, **kwargs):
+        raise RuntimeError("batch failed")
+
+    service = make_analysis_service(fail)
+    assert service.get_batch_sentiment(['005930', '000660']) == {}
+    assert sorted(service.full_calls) == [('000660', True), ('005930', True)]
+
+
+if __name__ == "__main__":
+    test_split_batch_outlook()
+    test_batch_calls_per_chunk_and_caches()
+    test_batch_sentiment_leaves_out_missing_codes()
+    print("[PASS] outlook batch tests")
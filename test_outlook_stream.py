@@ -0,0 +1,95 @@
+"""
+전망 스트리밍(generate_outlook_stream) 테스트
+- Gemini 응답 조각이 도착하는 대로 섹션별 중간 결과(outlook_partial)가 전달되는지
+- 매매 시나리오의 가격 전략이 조각 단위로 채워지는지
+- 최종 결과(outlook)는 마지막에 한 번 전달되고 캐시에 저장되는지
+"""
+import tempfile
+from types import SimpleNamespace
+
+from conftest import close_gemini_service, make_gemini_service
+
+
+CHUNKS = [
+    "1. 투자의견: 분할매수 (신뢰도: 70점)\n",
+    "2. 핵심 논리 (3줄 요약):\n   - [미국연동]: 반도체 강세\n",
+    "3. 매매 시나리오:\n   - 진입: 75,000원 (근거: 20일선)\n",
+    "   - 목표: 82,000원 (근거: 전고점)\n   - 손절: 72,000원 (근거: 60일선)\n",
+    "4. 상세 분석:\n   커플링 호재가 유효합니다.\n",
+]
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("no text parts")
+        return self._text
+
+
+class FakeStreamResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.usage_metadata = None
+
+    def __iter__(self):
+        for text in self.chunks:
+            yield FakeChunk(text)
+        self.usage_metadata = SimpleNamespace(total_token_count=1234)
+
+
+def make_service(cache_dir):
+    return make_gemini_service(cache_dir, lambda prompt, stream: FakeStreamResponse(CHUNKS[:2] + [None] + CHUNKS[2:]))
+
+
+def stream(service):
+    return list(service.generate_outlook_stream(
+        stock_name='삼성전자',
+        stock_info={'code': '005930', 'price': 75500, 'rate': 1.2},
+        supply_demand={'foreign_net': 1000, 'institution_net': -200},
+        technical_indicators={'ma5': 75000, 'ma20': 74000, 'ma60': 72000},
+        news_analysis={'sentiment': '긍정', 'reason': '실적 개선'},
+        market_data={'sector': '반도체'}
+    ))
+
+
+def test_stream_partials_then_final():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service, model = make_service(cache_dir)
+        events = stream(service)
+
+        kinds = [kind for kind, _ in events]
+        assert kinds[-1] == 'outlook' and kinds.count('outlook') == 1
+        partials = [data for kind, data in events if kind == 'outlook_partial']
+        assert len(partials) == len(CHUNKS)
+        assert model.streams == [True]
+
+        # 첫 조각부터 투자의견 표시, 섹션은 도착 순서대로 채워짐
+        assert partials[0]['recommendation'] == '분할매수' and partials[0]['confidence'] == 70
+        assert partials[0]['key_logic'] == '' and partials[0]['partial'] is True
+        assert '반도체 강세' in partials[1]['key_logic']
+        assert partials[2]['price_strategy']['entry'].startswith('75,000원')
+        assert partials[2]['price_strategy']['target'] == ''
+        assert partials[3]['price_strategy']['stop_loss'].startswith('72,000원')
+        assert partials[3]['detailed_analysis'] == ''
+        assert '커플링' in partials[4]['detailed_analysis']
+
+        final = events[-1][1]
+        assert final['recommendation'] == '분할매수'
+        assert final['raw_response'] == ''.join(CHUNKS)
+        assert service.scheduler.stats()['tokens_used'] == 1234
+
+        # 최종 결과는 캐시되어 다음 요청은 스트리밍 없이 바로 반환
+        cached = stream(service)
+        assert [kind for kind, _ in cached] == ['outlook']
+        assert cached[0][1]['_cache_info']['cached'] is True
+        assert model.streams == [True]
+        close_gemini_service(service)
+
+
+if __name__ == "__main__":
+    test_stream_partials_then_final()
+    print("[PASS] outlook stream tests")
@@ -0,0 +1,119 @@
+"""
+PromptCache 테스트
+- 필드별 양자화 규칙 (호가 단위 가격대, RSI 소수점, 수량 유효숫자, 등락률 단위)
+- 양자화 구간 안의 작은 변화는 같은 키, 실질적인 변화는 다른 키
+- TTL이 지난 결과는 무시
+- 전망 캐시: 신호 라벨/수급 방향이 바뀌거나 가격이 범위를 벗어나면 TTL 안이라도 새로 생성,
+  장중 작은 틱 변화는 유지, 같은 상황이면 강제 갱신이어도 재사용
+"""
+import os
+import tempfile
+import time
+
+from cache_store import SQLiteCacheStore
+from conftest import close_gemini_service, make_gemini_service
+from prompt_cache import PromptCache
+
+
+def test_quantization_rules():
+    cache = PromptCache(store=None)
+    assert cache.tick_size(1500) == 1 and cache.tick_size(75500) == 100 and cache.tick_size(800000) == 1000
+    assert cache.normalize({'current_price': 75540}) == {'current_price': 76000}  # 호가 100원 × 10
+    assert cache.normalize({'current_price': '75,540'}) == {'current_price': 76000}
+    assert cache.normalize({'rsi': 55.27}) == {'rsi': 55.3}
+    assert cache.normalize({'foreign_net': 123456}) == {'foreign_net': 120000}
+    assert cache.normalize({'macd': 0.01234}) == {'macd': 0.012}
+    assert cache.normalize({'change_rate': 1.32}) == {'change_rate': 1.5}
+    assert cache.normalize({'bollinger': {'upper': 80120, 'percent_b': 0.62}}) == {'bollinger': {'upper': 80000, 'percent_b': 0.6}}
+    assert cache.normalize({'news_context': '  뉴스\n\n  제목  '}) == {'news_context': '뉴스 제목'}
+
+
+def test_key_stability():
+    cache = PromptCache(store=None)
+    base = {'stock_code': '005930', 'current_price': 75500, 'rsi': 55.21, 'foreign_net': 120300}
+    same = {'foreign_net': 118000, 'rsi': 55.24, 'current_price': 75700, 'stock_code': '005930'}
+    moved = dict(base, current_price=77000)
+
+    key = cache.make_key('OUTLOOK_GENERATION_PROMPT', base)
+    assert len(key) == 32
+    assert cache.make_key('OUTLOOK_GENERATION_PROMPT', same) == key
+    assert cache.make_key('OUTLOOK_GENERATION_PROMPT', moved) != key
+    assert cache.make_key('INVESTMENT_ANALYSIS_PROMPT', base) != key
+
+
+def test_get_put_and_ttl():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        store = SQLiteCacheStore(os.path.join(cache_dir, 'gemini_cache.db'))
+        cache = PromptCache(store, ttl=60)
+        key = cache.make_key('MARKET_EVENT_ANALYSIS_PROMPT', {'headlines_list': '- 헤드라인'})
+
+        assert cache.get('MARKET_EVENT_ANALYSIS_PROMPT', key) is None
+        cache.put('MARKET_EVENT_ANALYSIS_PROMPT', key, {'events': ['a']})
+        assert cache.get('MARKET_EVENT_ANALYSIS_PROMPT', key) == {'events': ['a']}
+
+        store.put(key, 'prompt:MARKET_EVENT_ANALYSIS_PROMPT', {'events': ['old']}, created_at=time.time() - 120)
+        assert cache.get('MARKET_EVENT_ANALYSIS_PROMPT', key) is None
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+        store.close()
+
+
+def make_service(cache_dir):
+    return make_gemini_service(cache_dir, lambda prompt, stream: "1. 투자의견: 분할매수 (신뢰도: 70점)\n2. 핵심 논리: 테스트\n")
+
+
+def outlook(service, price, force_refresh=False, rsi=31.0, rsi_signal='중립', macd_signal='상승', foreign_net=1000, institution_net=-200):
+    return service.generate_outlook(
+        stock_name='삼성전자',
+        stock_info={'code': '005930', 'price': price, 'rate': 1.2},
+        supply_demand={'foreign_net': foreign_net, 'institution_net': institution_net},
+        technical_indicators={'ma5': 75000, 'ma20': 74000, 'ma60': 72000, 'rsi': rsi, 'rsi_signal': rsi_signal,
+                              'macd': 12.3, 'macd_signal': macd_signal, 'ma_signal': '정배열'},
+        news_analysis={'sentiment': '긍정', 'reason': '실적 개선'},
+        market_data={'sector': '반도체'},
+        force_refresh=force_refresh
+    )
+
+
+def test_outlook_reuse_and_invalidation():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service, model = make_service(cache_dir)
+        first = outlook(service, 75500)
+        assert first['recommendation'] == '분할매수' and len(model.prompts) == 1
+
+        # 강제 갱신이어도 입력이 같은 가격대면 프롬프트 캐시 재사용
+        reused = outlook(service, 75600, force_refresh=True)
+        assert reused['_cache_info']['reason'] == 'prompt_cache' and len(model.prompts) == 1
+
+        # 가격이 범위를 벗어나면 TTL 안의 종목 캐시도 무효화하고 새로 생성
+        outlook(service, 79000)
+        assert len(model.prompts) == 2
+        close_gemini_service(service)
+
+
+def test_small_tick_keeps_outlook():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service, model = make_service(cache_dir)
+        outlook(service, 75500)
+
+        # 장중 작은 변화: 가격 +0.05%, RSI 31.0 → 31.1, 수급 수량 변화 (방향 같음)
+        cached = outlook(service, 75540, rsi=31.1, foreign_net=1800, institution_net=-50)
+        assert cached['_cache_info']['cached'] is True and len(model.prompts) == 1
+
+        # 수급 방향 전환 → 새로 생성
+        outlook(service, 75540, institution_net=300)
+        assert len(model.prompts) == 2
+
+        # 신호 라벨 변경 → 새로 생성
+        outlook(service, 75540, institution_net=300, macd_signal='하락')
+        assert len(model.prompts) == 3
+        assert outlook(service, 75600, institution_net=300, macd_signal='하락')['_cache_info']['cached'] is True
+        close_gemini_service(service)
+
+
+if __name__ == "__main__":
+    test_quantization_rules()
+    test_key_stability()
+    test_get_put_and_ttl()
+    test_outlook_reuse_and_invalidation()
+    test_small_tick_keeps_outlook()
+    print("[PASS] prompt cache tests")
@@ -0,0 +1,59 @@
+"""
+토큰 버킷 Rate Limiter 테스트
+- 버스트 용량까지는 대기 없이 통과하는지
+- 버스트 이후에는 설정된 속도로 제한되는지
+- 서로 다른 API ID는 서로의 버킷에 영향을 주지 않는지
+- 대기 중인 스레드끼리 락을 잡고 막히지 않는지
+"""
+import threading
+import time
+
+from rate_limiter import RateLimiter, TokenBucket
+
+
+def test_burst_then_throttle():
+    bucket = TokenBucket(rate=10, capacity=3)
+    now = time.monotonic()
+    waits = [bucket.reserve(now) for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert abs(waits[3] - 0.1) < 1e-9
+    assert abs(waits[4] - 0.2) < 1e-9
+
+
+def test_per_key_budgets_are_independent():
+    limiter = RateLimiter(global_rate=100, global_burst=100, default_rate=1, default_burst=1,
+                          limits={'ka10001': (1, 1)})
+    assert limiter.acquire('ka10001') == 0.0
+    # 다른 API ID는 ka10001 버킷이 비어 있어도 즉시 통과
+    assert limiter.acquire('ka10081') == 0.0
+
+    stats = limiter.get_stats()
+    assert stats['ka10001']['calls'] == 1
+    assert stats['ka10081']['waited_calls'] == 0
+
+
+def test_concurrent_waiters_do_not_serialize_on_lock():
+    # 초당 20회, 버스트 5 → 10건 처리 시 약 0.25초 (락을 잡고 sleep하면 훨씬 길어짐)
+    limiter = RateLimiter(global_rate=20, global_burst=5, default_rate=20, default_burst=5)
+    threads = [threading.Thread(target=limiter.acquire, args=('ka10001',)) for _ in range(10)]
+
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5, f"took {elapsed:.2f}s"
+    stats = limiter.get_stats()['ka10001']
+    assert stats['calls'] == 10
+    assert stats['waited_calls'] == 5
+    print(f"10 calls in {elapsed:.3f}s, total limiter wait {stats['total_wait']}s")
+
+
+if __name__ == "__main__":
+    test_burst_then_throttle()
+    test_per_key_budgets_are_independent()
+    test_concurrent_waiters_do_not_serialize_on_lock()
+    print("[PASS] rate limiter tests")
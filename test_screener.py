@@ -0,0 +1,147 @@
+"""
+StockScreener 테스트
+- 2차원 일괄 계산 결과가 종목별 TechnicalIndicators 계산과 같은지 (이력 길이가 서로 다른 종목 포함)
+- 유니버스(테마 + 관심종목 + 보유종목) 코드 정규화
+- 필터/정렬
+- 약 2,000종목 일괄 계산 및 스크리닝 시간
+"""
+import random
+import tempfile
+import time
+
+from ohlcv_store import OhlcvStore
+from screener import StockScreener
+from technical_indicators import TechnicalIndicators
+
+
+def make_records(count, seed):
+    rng = random.Random(seed)
+    price = rng.randint(5000, 100000)
+    records = []
+    for i in range(count):
+        price = max(100, price + rng.randint(-price // 30, price // 30))
+        records.append({'date': str(20200101 + i), 'open': price, 'high': price, 'low': price,
+                        'close': price, 'volume': 1000})
+    return records
+
+
+class FakeStore:
+    CLOSE = OhlcvStore.CLOSE
+    DATE = OhlcvStore.DATE
+
+    def __init__(self, records_by_code):
+        self.bars = {code: OhlcvStore.from_records(r) for code, r in records_by_code.items()}
+
+    def load_bars(self, code):
+        return self.bars.get(code)
+
+
+class FakeThemeService:
+    def __init__(self, codes):
+        self.codes = codes
+
+    def get_cached_themes(self):
+        half = len(self.codes) // 2
+        return [
+            {'thema_nm': '테마A', 'stocks': [{'stk_cd': f"{c}_AL", 'stk_nm': f"종목{c}"} for c in self.codes[:half]]},
+            {'thema_nm': '테마B', 'stocks': [{'stk_cd': f"{c}_AL", 'stk_nm': f"종목{c}"} for c in self.codes[half:]]}
+        ]
+
+
+class FakeWatchlist:
+    def __init__(self, codes):
+        self.codes = codes
+
+    def load_watchlist(self):
+        return list(self.codes)
+
+
+def build(records_by_code, tmp, watchlist=()):
+    codes = list(records_by_code)
+    return StockScreener(FakeStore(records_by_code), FakeThemeService(codes),
+                         data_fetcher=FakeWatchlist(watchlist),
+                         snapshot_file=f"{tmp}/snapshot.json")
+
+
+def close_enough(a, b, tol=0.011):
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) <= tol
+    return a == b
+
+
+def test_batch_matches_single_stock():
+    records = {f"{i:06d}": make_records(n, seed=i) for i, n in enumerate((19, 20, 45, 61, 125, 139, 140, 160))}
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = build(records, tmp).compute(FakeStore(records).bars)
+
+    assert "000000" not in rows  # 20봉 미만은 제외
+    for code, recs in records.items():
+        if len(recs) < 20:
+            continue
+        row = rows[code]
+        technical = TechnicalIndicators.calculate_indicators(recs)
+        summary = TechnicalIndicators.calculate_bollinger_bands(recs)['summary']
+        for key, value in list(technical.items()) + list(summary.items()):
+            tol = 0.00011 if key in ('bandwidth', 'percent_b') else 1.0 if key in ('upper', 'middle', 'lower') else 0.011
+            assert close_enough(row[key], value, tol), f"{code} ({len(recs)} bars) {key}: {row[key]} != {value}"
+
+
+def test_universe_and_screen():
+    records = {f"{i:06d}": make_records(160, seed=100 + i) for i in range(40)}
+    with tempfile.TemporaryDirectory() as tmp:
+        screener = build(records, tmp, watchlist=["A000001", "999999"])
+        universe = screener.get_universe()
+        assert "000001" in universe and "000001_AL" not in universe
+        assert universe["000001"]['sources'] == ['theme', 'watchlist']
+        assert universe["000001"]['themes'] == ['테마A']
+
+        assert screener.refresh()
+        snapshot = screener.get_snapshot()
+        assert snapshot['universe_count'] == 41 and snapshot['count'] == 40  # 999999는 일봉 없음
+
+        result = screener.screen(rsi_min=40, sort='rsi', order='asc', limit=5)
+        rsi = [r['rsi'] for r in result['rows']]
+        assert rsi == sorted(rsi) and all(v >= 40 for v in rsi)
+        assert result['count'] == min(5, result['total'])
+
+        bulls = screener.screen(ma='bull', limit=500)['rows']
+        assert all(r['ma_signal'] == '정배열' for r in bulls)
+        assert all(r['macd_gap'] > 0 for r in screener.screen(macd='above', limit=500)['rows'])
+        assert [r['code'] for r in screener.screen(source='watchlist')['rows']] == ["000001"]
+
+        # 재시작 후 스냅샷 파일에서 바로 응답
+        reloaded = build(records, tmp)
+        assert reloaded.get_snapshot()['updated_at'] == snapshot['updated_at']
+
+        try:
+            screener.screen(sort='unknown')
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_universe_benchmark(count=2000):
+    records = {f"{i:06d}": make_records(160, seed=i) for i in range(count)}
+    store = FakeStore(records)
+    with tempfile.TemporaryDirectory() as tmp:
+        screener = build(records, tmp)
+
+        start = time.perf_counter()
+        rows = screener.compute(store.bars)
+        compute_ms = (time.perf_counter() - start) * 1000
+        assert len(rows) == count
+
+        screener.refresh()
+        start = time.perf_counter()
+        screener.screen(rsi_max=30, squeeze=False, sort='percent_b', order='asc')
+        screen_ms = (time.perf_counter() - start) * 1000
+
+    print(f"[Benchmark] {count} stocks: compute {compute_ms:.1f}ms, screen {screen_ms:.2f}ms")
+    assert compute_ms < 1000
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_stock()
+    test_universe_and_screen()
+    test_universe_benchmark()
+    print("[PASS] screener tests")
@@ -0,0 +1,76 @@
+"""
+SharedCache 테스트 (프로세스 간 공유)
+- 여러 워커 프로세스가 동시에 같은 키를 요청해도 업스트림 호출(비싼 분석)은 1회만 일어나는지
+- 모든 워커가 같은 결과를 받는지
+- 만료(TTL) 처리
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+
+from shared_cache import SharedCache
+
+
+def _worker(base_dir, counter_path, start_at, results):
+    """워커 프로세스: 시작 시각을 맞춘 뒤 같은 키를 요청"""
+    cache = SharedCache(base_dir=base_dir)
+
+    def upstream_analysis():
+        # 업스트림 호출 기록 (프로세스마다 한 줄씩 추가되므로 줄 수 = 호출 수)
+        with open(counter_path, 'a') as f:
+            f.write(f"{os.getpid()}\n")
+        time.sleep(0.5)
+        return {'recommendation': '매수', 'pid': os.getpid()}
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+    value, computed = cache.get_or_compute('gemini:005930:outlook', upstream_analysis, ttl=60, timeout=30)
+    results.put((os.getpid(), value, computed))
+
+
+def test_workers_share_one_upstream_call(workers=6):
+    with tempfile.TemporaryDirectory() as tmp:
+        counter_path = os.path.join(tmp, 'upstream_calls.txt')
+        SharedCache(base_dir=tmp)  # 스키마 생성
+
+        ctx = multiprocessing.get_context('spawn')
+        results = ctx.Queue()
+        start_at = time.time() + 1.5
+        processes = [ctx.Process(target=_worker, args=(tmp, counter_path, start_at, results)) for _ in range(workers)]
+        for p in processes:
+            p.start()
+        outcomes = [results.get(timeout=30) for _ in processes]
+        for p in processes:
+            p.join(timeout=10)
+
+        with open(counter_path) as f:
+            calls = f.read().split()
+
+        assert len(calls) == 1, f"upstream called {len(calls)} times"
+        values = [value for _, value, _ in outcomes]
+        assert all(value == values[0] for value in values)
+        assert sum(1 for _, _, computed in outcomes if computed) == 1
+        assert values[0]['pid'] == int(calls[0])
+
+
+def test_ttl_and_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SharedCache(base_dir=tmp)
+        cache.set('market:global', {'indices': [1, 2]}, ttl=0.05)
+        cache.set('analysis:market_index', "KOSPI 2,600")
+
+        value, updated_at, expires_at = cache.get_entry('market:global')
+        assert value == {'indices': [1, 2]} and abs(expires_at - updated_at - 0.05) < 1e-6
+        assert cache.get('analysis:market_index') == "KOSPI 2,600"
+
+        time.sleep(0.1)
+        assert cache.get('market:global') is None
+        assert cache.purge_expired() == 1
+        assert cache.get_or_compute('missing', lambda: None) == (None, True)
+
+
+if __name__ == "__main__":
+    test_ttl_and_entry()
+    test_workers_share_one_upstream_call()
+    print("[PASS] shared cache tests")
@@ -0,0 +1,76 @@
+"""
+SingleFlight 테스트
+- 같은 키 동시 요청은 1회만 실행되고 모두 같은 결과를 받는지
+- 예외도 기다리던 호출자에게 전달되는지
+- 완료 후 같은 키는 다시 실행되는지
+"""
+import concurrent.futures
+import threading
+import time
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_analysis():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {'summary': 'ok'}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        first = executor.submit(flight.do, ('005930', 'outlook', '20240105'), slow_analysis)
+        started.wait()
+        others = [executor.submit(flight.do, ('005930', 'outlook', '20240105'), slow_analysis) for _ in range(7)]
+        results = [first.result()] + [f.result() for f in others]
+
+    assert len(calls) == 1
+    assert all(result == {'summary': 'ok'} for result, _ in results)
+    assert [shared for _, shared in results].count(False) == 1
+    assert flight.stats() == {'executions': 1, 'shared': 7, 'in_flight': 0}
+
+    # 완료 후에는 다시 실행
+    flight.do(('005930', 'outlook', '20240105'), slow_analysis)
+    assert len(calls) == 2
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, (code, 'news', '20240105'), lambda c=code: c)
+                   for code in ('005930', '000660', '035420')]
+        assert sorted(f.result()[0] for f in futures) == ['000660', '005930', '035420']
+    assert flight.stats()['executions'] == 3
+
+
+def test_error_propagates_to_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("quota exceeded")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        first = executor.submit(flight.do, 'key', failing)
+        started.wait()
+        second = executor.submit(flight.do, 'key', failing)
+        for future in (first, second):
+            try:
+                future.result()
+                assert False, "expected RuntimeError"
+            except RuntimeError as e:
+                assert str(e) == "quota exceeded"
+    assert flight.in_flight() == []
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_execution()
+    test_different_keys_run_independently()
+    test_error_propagates_to_waiters()
+    print("[PASS] single flight tests")
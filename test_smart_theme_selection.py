@@ -20,6 +20,10 @@ def test_smart_theme_selection():
         {'theme_name': '환율 하락 수혜', 'theme_fluctuation': -1.5}
     ]
     mock_theme_service.find_themes_by_stock.return_value = mock_themes
+    mock_theme_service.get_active_themes.return_value = [
+        {'theme_name': t['theme_name'], 'source': 'Kiwoom', 'fluctuation': t['theme_fluctuation']}
+        for t in mock_themes if t['theme_fluctuation'] >= 1.0
+    ]
     
     # 2. Initialize GeminiService
     gemini = GeminiService()
@@ -0,0 +1,74 @@
+"""
+GeminiCache stale-while-revalidate 테스트
+- 파일 TTL이 지난 결과를 유예 구간 안에서는 바로 반환하고 백그라운드 갱신을 1회만 예약하는지
+- 유예 구간을 넘긴 결과나 revalidate가 없는 호출은 기존처럼 미스인지
+"""
+import os
+import tempfile
+import threading
+import time
+
+from cache_store import SQLiteCacheStore
+from gemini_cache import GeminiCache
+
+
+def make_cache(tmp):
+    return GeminiCache(store=SQLiteCacheStore(os.path.join(tmp, 'gemini_cache.db')))
+
+
+def age_entry(cache, code, analysis_type, seconds):
+    data, _ = cache.store.get(code, analysis_type)
+    cache.store.put(code, analysis_type, data, created_at=time.time() - seconds)
+    cache._memory_cache.clear()
+
+
+def test_stale_entry_served_and_revalidated_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        cache.save('005930', 'outlook', {'recommendation': '매수'})
+        age_entry(cache, '005930', 'outlook', cache.CACHE_TTL_FILE + 60)
+
+        release = threading.Event()
+        calls = []
+
+        def revalidate():
+            calls.append(1)
+            release.wait(2)
+            cache.save('005930', 'outlook', {'recommendation': '중립'})
+
+        for _ in range(5):
+            data, info = cache.load('005930', 'outlook', revalidate=revalidate)
+            assert data == {'recommendation': '매수'}
+            assert info['stale'] and info['revalidating'] and info['age_seconds'] > cache.CACHE_TTL_FILE
+
+        release.set()
+        deadline = time.time() + 2
+        while cache.get_stats()['revalidating'] and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert len(calls) == 1
+        assert cache.get_stats()['stale_served'] == 5
+        data, info = cache.load('005930', 'outlook', revalidate=revalidate)
+        assert data == {'recommendation': '중립'} and info['reason'] == 'memory_hit'
+
+
+def test_hard_maximum_and_plain_load_block():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        cache.save('005930', 'news', {'sentiment': '긍정'})
+
+        # revalidate 없이 호출하면 기존처럼 만료
+        age_entry(cache, '005930', 'news', cache.CACHE_TTL_FILE + 60)
+        data, info = cache.load('005930', 'news')
+        assert data is None and info['reason'].startswith('expired')
+
+        # 유예 구간을 넘기면 revalidate가 있어도 만료 (호출자가 직접 갱신)
+        age_entry(cache, '005930', 'news', cache.CACHE_TTL_FILE + cache.STALE_GRACE + 60)
+        data, info = cache.load('005930', 'news', revalidate=lambda: None)
+        assert data is None and info['reason'].startswith('expired')
+
+
+if __name__ == "__main__":
+    test_stale_entry_served_and_revalidated_once()
+    test_hard_maximum_and_plain_load_block()
+    print("[PASS] stale-while-revalidate tests")
@@ -0,0 +1,61 @@
+"""
+TaskGraph 테스트
+- 독립 작업이 겹쳐서 실행되는지 (전체 시간 ≈ 가장 긴 경로)
+- 의존 작업 결과가 선언 순서대로 전달되는지
+- 실패한 작업의 하위 작업은 건너뛰는지
+"""
+import concurrent.futures
+import time
+
+from task_graph import TaskGraph, SkippedError
+
+
+def _sleep_then(value, seconds=0.2):
+    def run(*args):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_independent_tasks_overlap():
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        graph = TaskGraph(executor)
+        graph.add('price', _sleep_then(100))
+        graph.add('supply', _sleep_then('supply'))
+        graph.add('chart', _sleep_then([1, 2, 3]))
+        graph.add('news', _sleep_then('news'))
+        graph.add('outlook', lambda p, s, c, n: (p, s, len(c), n), deps=['price', 'supply', 'chart', 'news'])
+
+        start = time.perf_counter()
+        results, errors, timings = graph.run()
+        elapsed = time.perf_counter() - start
+
+    assert not errors
+    assert results['outlook'] == (100, 'supply', 3, 'news')
+    # 직렬 실행 시 0.8초 이상, 병렬 실행 시 약 0.2초
+    assert elapsed < 0.5, f"took {elapsed:.2f}s"
+    assert timings['outlook']['start_ms'] >= 200
+
+
+def test_failure_skips_dependents():
+    def fail():
+        raise RuntimeError("boom")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        graph = TaskGraph(executor)
+        graph.add('price', fail)
+        graph.add('name', lambda p: p['name'], deps=['price'])
+        graph.add('context', lambda n: n, deps=['name'])
+        graph.add('chart', lambda: 'chart')
+        results, errors, _ = graph.run()
+
+    assert results == {'chart': 'chart'}
+    assert isinstance(errors['price'], RuntimeError)
+    assert isinstance(errors['name'], SkippedError)
+    assert isinstance(errors['context'], SkippedError)
+
+
+if __name__ == "__main__":
+    test_independent_tasks_overlap()
+    test_failure_skips_dependents()
+    print("[PASS] task graph tests")
@@ -0,0 +1,126 @@
+"""
+ThemeIndex 테스트
+- 종목코드/종목명 조회 결과가 기존 선형 검색(find_themes_by_stock)과 같은지
+- 코드 표기('A005930', '094820_AL')와 종목명 대소문자/공백 차이를 무시하는지
+- 부분 문자열 검색은 기존과 같이 테마마다 처음 일치한 종목 1개만 반환하는지
+"""
+import json
+import os
+
+from theme_index import ThemeIndex, normalize_code
+
+KIWOOM_THEMES = [
+    {'thema_grp_cd': '111', 'thema_nm': '반도체', 'flu_rt': '+1.91', 'stocks': [
+        {'stk_cd': '005930_AL', 'stk_nm': '삼성전자', 'cur_prc': '+75500', 'flu_rt': '+1.20'},
+        {'stk_cd': '005935_AL', 'stk_nm': '삼성전자우', 'cur_prc': '+61000', 'flu_rt': '+0.80'},
+        {'stk_cd': '000660_AL', 'stk_nm': 'SK하이닉스', 'cur_prc': '+180000', 'flu_rt': '+2.10'},
+    ]},
+    {'thema_grp_cd': '222', 'thema_nm': '우선주', 'flu_rt': '-0.50', 'stocks': [
+        {'stk_cd': '005935_AL', 'stk_nm': '삼성전자우', 'cur_prc': '+61000', 'flu_rt': '+0.80'},
+    ]},
+]
+
+NAVER_THEMES = [
+    {'name': '시스템반도체', 'link': '/theme/1', 'fluctuation': 2.5, 'stocks': [
+        {'code': '000660', 'name': 'SK하이닉스'}, {'code': '005930', 'name': '삼성전자'},
+    ]},
+]
+
+
+def linear_find(kiwoom_themes, naver_themes, keyword):
+    """기존 find_themes_by_stock의 선형 검색 (비교 기준)"""
+    keyword = keyword.lower()
+    matched = []
+    for theme in kiwoom_themes:
+        for stock in theme.get('stocks', []):
+            if keyword in stock.get('stk_nm', '').lower() or keyword in stock.get('stk_cd', '').lower():
+                matched.append(('Kiwoom', theme.get('thema_nm'), stock.get('stk_cd')))
+                break
+    for theme in naver_themes:
+        for stock in theme.get('stocks', []):
+            if keyword in stock.get('name', '').lower() or keyword in stock.get('code', '').lower():
+                matched.append(('Naver', theme.get('name'), stock.get('code')))
+                break
+    return matched
+
+
+def summary(results):
+    return [(r['source'], r['theme_name'], r['stock_code']) for r in results]
+
+
+def test_exact_lookups():
+    index = ThemeIndex(KIWOOM_THEMES, NAVER_THEMES)
+    assert normalize_code('A005930') == '005930' and normalize_code('094820_AL') == '094820'
+
+    by_code = index.find('005930')
+    assert summary(by_code) == [('Kiwoom', '반도체', '005930_AL'), ('Naver', '시스템반도체', '005930')]
+    assert by_code[0]['theme_fluctuation'] == '+1.91' and by_code[0]['stock_price'] == '+75500'
+    assert summary(index.find('A005930')) == summary(by_code)
+
+    # 종목명이 정확히 일치하면 그 종목만 (삼성전자우는 제외)
+    assert summary(index.find('삼성전자')) == summary(by_code)
+    assert summary(index.find('sk 하이닉스')) == [('Kiwoom', '반도체', '000660_AL'), ('Naver', '시스템반도체', '000660')]
+    assert index.codes_for_name('SK하이닉스') == ['000660']
+
+    # 결과를 수정해도 인덱스에는 영향 없음
+    by_code[0]['theme_name'] = 'changed'
+    assert index.find('005930')[0]['theme_name'] == '반도체'
+
+
+def test_fuzzy_search_matches_linear_scan():
+    index = ThemeIndex(KIWOOM_THEMES, NAVER_THEMES)
+    for keyword in ['삼성', '전자우', '하이닉', '0059', 'sk', '없는종목']:
+        assert summary(index.find(keyword)) == linear_find(KIWOOM_THEMES, NAVER_THEMES, keyword), keyword
+
+
+def test_theme_members():
+    index = ThemeIndex(KIWOOM_THEMES, NAVER_THEMES)
+    theme = index.get_theme('반도체')
+    assert theme['fluctuation'] == '+1.91'
+    assert [m['code'] for m in theme['members']] == ['005930', '005935', '000660']
+    assert index.get_theme('시스템반도체', source='Naver')['fluctuation'] == 2.5
+    assert index.get_theme('없는테마') is None
+
+
+def test_derived_views():
+    index = ThemeIndex(KIWOOM_THEMES, NAVER_THEMES)
+    hot = index.hot_themes()
+    assert [t['theme_name'] for t in hot] == ['반도체', '우선주']
+    assert hot[0]['fluctuation'] == 1.91 and hot[0]['fluctuation_text'] == '+1.91'
+    assert len(index.hot_themes(1)) == 1
+
+    # 강세 테마: 등락률 1.0% 이상 소속 테마 (키움 → 네이버 순)
+    assert [(t['theme_name'], t['fluctuation']) for t in index.active_themes('A005930')] == [('반도체', 1.91), ('시스템반도체', 2.5)]
+    assert index.active_themes('005935') == [{'theme_name': '반도체', 'source': 'Kiwoom', 'fluctuation': 1.91}]
+    assert index.active_themes('999999') == []
+
+    breadth = index.breadth()
+    assert breadth['theme_count'] == 2 and breadth['advancing'] == 1 and breadth['declining'] == 1
+    assert breadth['strong_count'] == 1 and breadth['top_theme'] == '반도체'
+    assert ThemeIndex().breadth() == {'theme_count': 0}
+
+
+def test_real_cache_files():
+    """저장소의 테마 캐시로 코드 조회 결과가 선형 검색과 같은지 확인"""
+    kiwoom_file = 'static/data/themes_cache.json'
+    naver_file = 'static/data/naver_themes_cache.json'
+    if not (os.path.exists(kiwoom_file) and os.path.exists(naver_file)):
+        return
+    with open(kiwoom_file, encoding='utf-8') as f:
+        kiwoom_themes = json.load(f)['themes']
+    with open(naver_file, encoding='utf-8') as f:
+        naver_themes = json.load(f)['themes']
+
+    index = ThemeIndex(kiwoom_themes, naver_themes)
+    codes = sorted({normalize_code(s['stk_cd']) for t in kiwoom_themes for s in t.get('stocks', [])})
+    for code in codes[:200]:
+        assert summary(index.find(code)) == linear_find(kiwoom_themes, naver_themes, code), code
+
+
+if __name__ == "__main__":
+    test_exact_lookups()
+    test_fuzzy_search_matches_linear_scan()
+    test_theme_members()
+    test_derived_views()
+    test_real_cache_files()
+    print("[PASS] theme index tests")
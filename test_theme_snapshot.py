@@ -0,0 +1,167 @@
+"""
+테마 스냅샷(theme_snapshot) 테스트
+- 스냅샷을 읽으면 JSON 캐시와 같은 데이터가 나오는지 (같은 종목 정보는 정수 id로 한 번만 저장)
+- 헤더만 읽어서 메타데이터를 확인할 수 있는지
+- ThemeService는 JSON 파일이 바뀌면 스냅샷 대신 JSON을 읽고 스냅샷을 다시 만드는지
+- 저장소의 캐시 파일로 JSON/스냅샷 로드 시간과 메모리 비교
+"""
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from theme_service import ThemeService
+from theme_snapshot import SnapshotError, ThemeSnapshot, read_header, write_snapshot
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'data')
+
+KIWOOM = {'updated_at': '2025-01-02T09:00:00', 'theme_count': 2, 'themes': [
+    {'thema_grp_cd': '111', 'thema_nm': '반도체', 'flu_rt': '+1.91', 'stocks': [
+        {'stk_cd': '005930_AL', 'stk_nm': '삼성전자', 'cur_prc': '+75500', 'flu_rt': '+1.20'},
+        {'stk_cd': '000660_AL', 'stk_nm': 'SK하이닉스', 'cur_prc': '+180000', 'flu_rt': '+2.10'},
+    ]},
+    {'thema_grp_cd': '222', 'thema_nm': '빈 테마', 'flu_rt': '0.00', 'stocks': []},
+    {'thema_grp_cd': '333', 'thema_nm': '대형주', 'stocks': [
+        {'stk_cd': '005930_AL', 'stk_nm': '삼성전자', 'cur_prc': '+75500', 'flu_rt': '+1.20'},
+    ]},
+]}
+
+NAVER = {'updated_at': datetime.now().isoformat(), 'theme_count': 1, 'themes': [
+    {'name': '시스템반도체', 'link': '/theme/1', 'fluctuation': 2.5, 'member_count': 2, 'stocks': [
+        {'code': '000660', 'name': 'SK하이닉스'}, {'code': '005930', 'name': '삼성전자', 'rate': None},
+    ]},
+]}
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'themes_snapshot.bin')
+        write_snapshot(path, KIWOOM, NAVER, source_mtimes=(1.5, 2.25))
+
+        header = read_header(path)
+        assert header['source_mtimes'] == [1.5, 2.25]
+        assert header['kiwoom']['theme_count'] == 3 and header['kiwoom']['stock_count'] == 2
+        assert header['naver']['updated_at'] == NAVER['updated_at']
+
+        with ThemeSnapshot(path) as snapshot:
+            assert snapshot.source_mtimes == (1.5, 2.25)
+            kiwoom = snapshot.kiwoom()
+            assert kiwoom['themes'] == KIWOOM['themes'] and kiwoom['updated_at'] == KIWOOM['updated_at']
+            assert snapshot.naver()['themes'] == NAVER['themes']
+            # 같은 종목은 같은 dict 공유
+            assert kiwoom['themes'][0]['stocks'][0] is kiwoom['themes'][2]['stocks'][0]
+            assert snapshot.kiwoom() is kiwoom
+
+        with open(path, 'r+b') as f:
+            f.write(b'XXXX')
+        try:
+            ThemeSnapshot(path)
+            assert False, "corrupt snapshot should be rejected"
+        except SnapshotError:
+            pass
+
+
+def test_service_uses_snapshot():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, 'themes_cache.json')
+        naver_file = os.path.join(tmp, 'naver_themes_cache.json')
+        write_json(cache_file, KIWOOM)
+        write_json(naver_file, NAVER)
+
+        # 첫 로드: JSON을 읽고 스냅샷 생성
+        service = ThemeService(cache_file=cache_file, naver_cache_file=naver_file, api=object())
+        snapshot_file = os.path.join(tmp, 'themes_snapshot.bin')
+        assert service.snapshot_file == snapshot_file and os.path.exists(snapshot_file)
+        assert tuple(read_header(snapshot_file)['source_mtimes']) == service._index.source_mtimes
+
+        # 다음 로드: JSON 파일을 읽지 않고 스냅샷 사용
+        reads = []
+        original = ThemeService._read_cache_file
+        ThemeService._read_cache_file = lambda self, path: reads.append(path) or original(self, path)
+        try:
+            service = ThemeService(cache_file=cache_file, naver_cache_file=naver_file, api=object())
+            assert reads == []
+            assert [t['theme_name'] for t in service.find_themes_by_stock('005930')] == ['반도체', '대형주', '시스템반도체']
+
+            # JSON이 바뀌면 JSON을 다시 읽고 스냅샷 갱신
+            changed = dict(KIWOOM, themes=KIWOOM['themes'][:1])
+            write_json(cache_file, changed)
+            os.utime(cache_file, (time.time() + 5, time.time() + 5))
+            assert [t['theme_name'] for t in service.find_themes_by_stock('005930')] == ['반도체', '시스템반도체']
+            assert reads == [cache_file, naver_file]
+            assert read_header(snapshot_file)['kiwoom']['theme_count'] == 1
+        finally:
+            ThemeService._read_cache_file = original
+
+        # 손상된 스냅샷은 무시하고 JSON 사용
+        with open(snapshot_file, 'wb') as f:
+            f.write(b'broken')
+        service = ThemeService(cache_file=cache_file, naver_cache_file=naver_file, api=object())
+        assert service.get_cache_info()['theme_count'] == 1
+        assert ThemeSnapshot(snapshot_file).kiwoom()['themes'] == changed['themes']
+
+
+def measure(load, repeat=5):
+    """(결과, 최소 로드 시간, 로드 후 남은 메모리, 최대 메모리) - 시간은 tracemalloc 없이 측정"""
+    elapsed = min(_timed(load) for _ in range(repeat))
+    tracemalloc.start()
+    data = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, elapsed, current, peak
+
+
+def _timed(load):
+    started = time.perf_counter()
+    load()
+    return time.perf_counter() - started
+
+
+def test_benchmark_against_json():
+    files = [os.path.join(DATA_DIR, 'themes_cache.json'), os.path.join(DATA_DIR, 'naver_themes_cache.json')]
+    if not all(os.path.exists(path) for path in files):
+        print("[SKIP] theme cache files not found")
+        return
+
+    def load_json():
+        result = []
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                result.append(json.load(f))
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'themes_snapshot.bin')
+        kiwoom, naver = load_json()
+        write_snapshot(path, kiwoom, naver)
+
+        def load_snapshot():
+            with ThemeSnapshot(path) as snapshot:
+                return [snapshot.kiwoom(), snapshot.naver()]
+
+        json_data, json_time, json_current, json_peak = measure(load_json)
+        snap_data, snap_time, snap_current, snap_peak = measure(load_snapshot)
+
+        assert snap_data[0]['themes'] == json_data[0]['themes']
+        assert snap_data[1]['themes'] == json_data[1]['themes']
+        assert snap_current < json_current
+
+        json_size = sum(os.path.getsize(p) for p in files)
+        print(f"  JSON:     {json_size // 1024} KB, {json_time * 1000:.1f} ms, "
+              f"{json_current // 1024} KB resident (peak {json_peak // 1024} KB)")
+        print(f"  Snapshot: {os.path.getsize(path) // 1024} KB, {snap_time * 1000:.1f} ms, "
+              f"{snap_current // 1024} KB resident (peak {snap_peak // 1024} KB)")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_service_uses_snapshot()
+    test_benchmark_against_json()
+    print("[PASS] theme snapshot tests")
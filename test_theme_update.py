@@ -0,0 +1,93 @@
+"""
+ThemeService.update_cache 테스트
+- 이전 캐시와 종목 수/등락률/대표 종목이 같은 테마는 구성 종목(ka90002)을 다시 조회하지 않는지
+- 바뀐 테마만 워커 풀로 병렬 조회하는지, 조회 실패 시 이전 종목을 유지하는지
+- 캐시 파일은 임시 파일 + os.replace로 교체되고 인덱스도 새 데이터로 바뀌는지
+"""
+import os
+import tempfile
+import threading
+import time
+
+from theme_service import ThemeService
+
+
+class FakeThemeApi:
+    def __init__(self, themes, fail_codes=()):
+        self.themes = themes
+        self.fail_codes = set(fail_codes)
+        self.stock_calls = []
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def get_access_token(self):
+        return True
+
+    def get_theme_group_list(self):
+        return [dict(theme) for theme in self.themes]
+
+    def get_theme_stocks(self, theme_code):
+        with self.lock:
+            self.stock_calls.append(theme_code)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        if theme_code in self.fail_codes:
+            return None
+        return [{'stk_cd': f'{theme_code}000_AL', 'stk_nm': f'종목{theme_code}', 'cur_prc': '1000', 'flu_rt': '+1.00'}]
+
+
+def theme(code, flu_rt='+1.00', stk_num='1'):
+    return {'thema_grp_cd': code, 'thema_nm': f'테마{code}', 'flu_rt': flu_rt, 'stk_num': stk_num,
+            'rising_stk_num': '1', 'fall_stk_num': '0', 'main_stk': f'종목{code}'}
+
+
+def make_service(cache_dir, api):
+    service = ThemeService(
+        cache_file=os.path.join(cache_dir, 'themes_cache.json'),
+        naver_cache_file=os.path.join(cache_dir, 'naver_themes_cache.json'),
+        api=api
+    )
+    service.update_workers = 3
+    return service
+
+
+def test_incremental_update():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        api = FakeThemeApi([theme(str(code)) for code in range(100, 106)])
+        service = make_service(cache_dir, api)
+
+        assert service.update_cache()
+        assert sorted(api.stock_calls) == [str(code) for code in range(100, 106)]
+        assert 1 < api.peak <= 3
+        assert service.find_themes_by_stock('102000')[0]['theme_name'] == '테마102'
+
+        # 등락률이 바뀐 테마 하나만 다시 조회
+        api.stock_calls = []
+        api.themes[2] = theme('102', flu_rt='+3.50')
+        assert service.update_cache()
+        assert api.stock_calls == ['102']
+        assert service.find_themes_by_stock('102000')[0]['theme_fluctuation'] == '+3.50'
+        assert service.get_hot_themes(1)[0]['theme_name'] == '테마102'  # 순위도 갱신 시 다시 계산
+        assert service.get_market_themes_string(1) == '테마102(+3.50%)'
+        assert [t['theme_name'] for t in service.get_active_themes('102000')] == ['테마102']
+        assert len(service.get_cached_themes()[0]['stocks']) == 1  # 재사용한 테마도 종목 유지
+
+        # 조회 실패 시 이전 종목 유지, 전체 갱신은 모든 테마 조회
+        api.stock_calls = []
+        api.themes[3] = theme('103', flu_rt='-1.00')
+        api.fail_codes = {'103'}
+        assert service.update_cache(full_refresh=True)
+        assert len(api.stock_calls) == 6
+        assert service.find_themes_by_stock('103000')[0]['theme_fluctuation'] == '-1.00'
+
+        # 임시 파일은 남지 않음 (스냅샷은 갱신된 캐시로 다시 생성)
+        assert sorted(os.listdir(cache_dir)) == ['themes_cache.json', 'themes_snapshot.bin']
+
+
+if __name__ == "__main__":
+    test_incremental_update()
+    print("[PASS] theme update tests")
@@ -0,0 +1,85 @@
+"""
+TokenManager 테스트
+- 동시에 여러 스레드가 토큰을 요청해도 발급 요청은 1회만 발생하는지
+- 거부된(stale) 토큰으로 갱신 요청 시 이미 교체된 토큰을 재사용하는지
+- 디스크에 저장된 토큰을 새 인스턴스가 재사용하는지
+"""
+import os
+import tempfile
+import threading
+import time
+
+from token_manager import TokenManager
+
+
+class FakeIssuer:
+    """발급 횟수를 세는 가짜 토큰 발급 함수"""
+
+    def __init__(self, delay=0.2):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        expires = time.strftime("%Y%m%d%H%M%S", time.localtime(time.time() + 86400))
+        return f"token-{n}", expires
+
+
+def _make_manager(issuer, cache_file):
+    return TokenManager("test-key", issuer, cache_file=cache_file)
+
+
+def test_concurrent_requests_issue_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        issuer = FakeIssuer()
+        manager = _make_manager(issuer, os.path.join(tmp, 'token.json'))
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.get_token())) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert issuer.calls == 1
+        assert results == ["token-1"] * 10
+
+
+def test_stale_token_refresh_is_deduplicated():
+    with tempfile.TemporaryDirectory() as tmp:
+        issuer = FakeIssuer(delay=0.05)
+        manager = _make_manager(issuer, os.path.join(tmp, 'token.json'))
+        first = manager.get_token()
+
+        # 같은 토큰으로 거부당한 요청 5건 → 갱신은 1회
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.refresh(stale_token=first))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert issuer.calls == 2
+        assert set(results) == {"token-2"}
+
+
+def test_persisted_token_is_reused():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, 'token.json')
+        issuer = FakeIssuer(delay=0)
+        _make_manager(issuer, cache_file).get_token()
+
+        restarted = _make_manager(issuer, cache_file)
+        assert restarted.peek() == "token-1"
+        assert issuer.calls == 1
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_issue_once()
+    test_stale_token_refresh_is_deduplicated()
+    test_persisted_token_is_reused()
+    print("[PASS] token manager tests")
@@ -0,0 +1,286 @@
+"""
+테마 메모리 인덱스
+================================================================
+ThemeService.find_themes_by_stock()은 분석/전망마다 themes_cache.json(약 280KB)을 다시 읽고
+키움/네이버 테마의 모든 종목을 부분 문자열로 순회했습니다.
+이 모듈은 두 캐시를 한 번 읽어 만든 불변(읽기 전용) 인덱스를 제공합니다.
+
+- 종목코드 → 소속 테마 (find_themes_by_stock 결과 형식 그대로, 키움 → 네이버 테마 순)
+- 정규화한 종목명 → 종목코드
+- (출처, 테마명) → 테마 등락률 + 구성 종목
+- 조회는 딕셔너리 조회 한 번, 정확히 일치하는 코드/종목명이 없을 때만
+  기존과 같은 부분 문자열 검색 (종목 수만큼이 아니라 고유 종목명/코드 수만큼 순회)
+- 파생 데이터도 인덱스를 만들 때 한 번 계산 (요청마다 정렬/필터링하지 않음)
+  - 등락률 상위 테마 (키움 테마, 등락률 내림차순)
+  - 종목별 강세 테마 (소속 테마 중 등락률 active_threshold% 이상)
+  - 테마 시장 폭 (상승/하락 테마 수, 평균/중앙 등락률, 상승/하락 종목 수)
+- 캐시가 갱신되면 새 인덱스를 만들어 통째로 교체 (조회 중인 스레드는 이전 인덱스를 끝까지 사용)
+================================================================
+"""
+import re
+import statistics
+
+KIWOOM = 'Kiwoom'
+NAVER = 'Naver'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_code(code):
+    """'A005930', '094820_AL' 같은 표기를 6자리 종목코드로 통일"""
+    code = (code or '').strip().upper().split('_')[0]
+    if len(code) == 7 and code.startswith('A') and code[1:].isdigit():
+        code = code[1:]
+    return code
+
+
+def normalize_name(name):
+    """종목명 정규화 (대소문자/공백 무시)"""
+    return _WHITESPACE.sub('', name or '').lower()
+
+
+def to_float(value):
+    """'+1.91', '-0.50', 2.5 같은 등락률 값을 float로 (변환할 수 없으면 0.0)"""
+    try:
+        return float(str(value).replace(',', '').replace('%', '').strip() or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ThemeIndex:
+    """키움 + 네이버 테마 캐시의 불변 인덱스 (생성 후 수정하지 않으므로 락 없이 공유)"""
+
+    def __init__(self, kiwoom_themes=None, naver_themes=None, updated_at=None, naver_updated_at=None, source_mtimes=None,
+                 active_threshold=1.0):
+        """
+        Args:
+            kiwoom_themes: 키움 테마 목록 (themes_cache.json의 themes)
+            naver_themes: 네이버 테마 목록 (naver_themes_cache.json의 themes)
+            updated_at: 키움 캐시 갱신 시각 (ISO 문자열)
+            naver_updated_at: 네이버 캐시 갱신 시각 (ISO 문자열)
+            source_mtimes: 인덱스를 만들 때 읽은 캐시 파일 수정 시각 (다른 프로세스의 갱신 감지용)
+            active_threshold: 종목별 강세 테마로 볼 최소 테마 등락률 (%)
+        """
+        self.kiwoom_themes = list(kiwoom_themes or [])
+        self.naver_themes = list(naver_themes or [])
+        self.updated_at = updated_at
+        self.naver_updated_at = naver_updated_at
+        self.source_mtimes = source_mtimes
+        self.active_threshold = active_threshold
+
+        by_code = {}  # 코드 → [(정렬 키, 결과 항목)]
+        by_name = {}  # 정규화 종목명 → [코드]
+        search_keys = {}  # (소문자 종목명, 소문자 원본 코드) → 코드 (부분 문자열 검색용)
+        themes = {}  # (출처, 테마명) → 테마 정보
+
+        for theme_idx, theme in enumerate(self.kiwoom_themes):
+            theme_name = theme.get('thema_nm', 'Unknown')
+            members = []
+            for stock_idx, stock in enumerate(theme.get('stocks', [])):
+                raw_code = stock.get('stk_cd', '')
+                code = normalize_code(raw_code)
+                members.append({
+                    'code': code,
+                    'name': stock.get('stk_nm'),
+                    'price': stock.get('cur_prc'),
+                    'change': stock.get('flu_rt')
+                })
+                by_code.setdefault(code, []).append(((0, theme_idx, stock_idx), {
+                    'source': KIWOOM,
+                    'theme_code': theme.get('thema_grp_cd'),
+                    'theme_name': theme_name,
+                    'theme_fluctuation': theme.get('flu_rt'),
+                    'stock_name': stock.get('stk_nm'),
+                    'stock_code': raw_code,
+                    'stock_price': stock.get('cur_prc'),
+                    'stock_change': stock.get('flu_rt')
+                }))
+                self._add_name(by_name, search_keys, stock.get('stk_nm', ''), raw_code, code)
+            themes[(KIWOOM, theme_name)] = {
+                'source': KIWOOM,
+                'theme_code': theme.get('thema_grp_cd'),
+                'theme_name': theme_name,
+                'fluctuation': theme.get('flu_rt'),
+                'members': tuple(members)
+            }
+
+        for theme_idx, theme in enumerate(self.naver_themes):
+            theme_name = theme.get('name', 'Unknown')
+            members = []
+            for stock_idx, stock in enumerate(theme.get('stocks', [])):
+                raw_code = stock.get('code', '')
+                code = normalize_code(raw_code)
+                members.append({'code': code, 'name': stock.get('name'), 'price': None, 'change': None})
+                by_code.setdefault(code, []).append(((1, theme_idx, stock_idx), {
+                    'source': NAVER,
+                    'theme_code': None,  # 네이버는 코드가 없음 (링크로 대체 가능)
+                    'theme_name': theme_name,
+                    'theme_fluctuation': theme.get('fluctuation', 0.0),
+                    'theme_link': theme.get('link'),
+                    'stock_name': stock.get('name'),
+                    'stock_code': raw_code,
+                    # 네이버 스크래핑 데이터에는 현재가/등락률이 없음
+                    'stock_price': None,
+                    'stock_change': None
+                }))
+                self._add_name(by_name, search_keys, stock.get('name', ''), raw_code, code)
+            themes[(NAVER, theme_name)] = {
+                'source': NAVER,
+                'theme_code': None,
+                'theme_name': theme_name,
+                'theme_link': theme.get('link'),
+                'fluctuation': theme.get('fluctuation', 0.0),
+                'members': tuple(members)
+            }
+
+        self._by_code = {code: tuple(entries) for code, entries in by_code.items()}
+        self._by_name = {name: tuple(codes) for name, codes in by_name.items()}
+        self._search_keys = tuple(search_keys.items())
+        self._themes = themes
+
+        self._hot_themes = self._build_hot_themes()
+        self._breadth = self._build_breadth()
+        self._active_by_code = self._build_active_themes()
+
+    # ------------------------------------------------------------
+    # 파생 데이터 (인덱스 생성 시 1회 계산)
+    # ------------------------------------------------------------
+    def _build_hot_themes(self):
+        """키움 테마를 등락률 내림차순으로 (같으면 원래 순서)"""
+        ranked = []
+        for theme in self.kiwoom_themes:
+            ranked.append({
+                'theme_code': theme.get('thema_grp_cd'),
+                'theme_name': theme.get('thema_nm', 'Unknown'),
+                'fluctuation': to_float(theme.get('flu_rt')),
+                'fluctuation_text': theme.get('flu_rt'),
+                'stock_count': int(to_float(theme.get('stk_num'))) if theme.get('stk_num') is not None else len(theme.get('stocks', [])),
+                'rising_count': int(to_float(theme.get('rising_stk_num'))),
+                'falling_count': int(to_float(theme.get('fall_stk_num'))),
+                'main_stocks': theme.get('main_stk')
+            })
+        ranked.sort(key=lambda item: -item['fluctuation'])
+        return tuple(ranked)
+
+    def _build_breadth(self):
+        fluctuations = [theme['fluctuation'] for theme in self._hot_themes]
+        if not fluctuations:
+            return {'theme_count': 0}
+        advancing = sum(1 for value in fluctuations if value > 0)
+        declining = sum(1 for value in fluctuations if value < 0)
+        return {
+            'theme_count': len(fluctuations),
+            'advancing': advancing,
+            'declining': declining,
+            'unchanged': len(fluctuations) - advancing - declining,
+            'advance_ratio': round(advancing / len(fluctuations), 4),
+            'strong_count': sum(1 for value in fluctuations if value >= self.active_threshold),
+            'avg_fluctuation': round(statistics.fmean(fluctuations), 2),
+            'median_fluctuation': round(statistics.median(fluctuations), 2),
+            'rising_stocks': sum(theme['rising_count'] for theme in self._hot_themes),
+            'falling_stocks': sum(theme['falling_count'] for theme in self._hot_themes),
+            'top_theme': self._hot_themes[0]['theme_name']
+        }
+
+    def _build_active_themes(self):
+        """종목코드 → 소속 테마 중 등락률 active_threshold% 이상 (find 결과 순서)"""
+        active = {}
+        for code in self._by_code:
+            themes = tuple(
+                {'theme_name': entry['theme_name'], 'source': entry['source'], 'fluctuation': fluctuation}
+                for entry in self._collect([code])
+                for fluctuation in [to_float(entry['theme_fluctuation'])]
+                if fluctuation >= self.active_threshold
+            )
+            if themes:
+                active[code] = themes
+        return active
+
+    @staticmethod
+    def _add_name(by_name, search_keys, name, raw_code, code):
+        if not code:
+            return
+        normalized = normalize_name(name)
+        if normalized:
+            codes = by_name.setdefault(normalized, [])
+            if code not in codes:
+                codes.append(code)
+        search_keys.setdefault((name.lower(), raw_code.lower()), code)
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    @property
+    def theme_count(self):
+        return len(self.kiwoom_themes)
+
+    @property
+    def stock_count(self):
+        return len(self._by_code)
+
+    def codes_for_name(self, name):
+        """종목명(대소문자/공백 무시)이 정확히 일치하는 종목코드 목록"""
+        return list(self._by_name.get(normalize_name(name), ()))
+
+    def themes_for_code(self, code):
+        """종목코드가 속한 테마 목록 (find_themes_by_stock 결과 형식)"""
+        return self._collect([normalize_code(code)])
+
+    def find(self, keyword):
+        """
+        종목코드/종목명으로 소속 테마 검색
+        정확히 일치하는 코드/종목명이 있으면 딕셔너리 조회, 없으면 기존과 같은 부분 문자열 검색
+        (테마마다 처음 일치한 종목 1개, 키움 테마 → 네이버 테마 순)
+        """
+        keyword = (keyword or '').strip()
+        if not keyword:
+            return []
+        code = normalize_code(keyword)
+        if code in self._by_code:
+            return self._collect([code])
+        codes = self._by_name.get(normalize_name(keyword))
+        if codes:
+            return self._collect(codes)
+        return self._collect(self.fuzzy_codes(keyword))
+
+    def fuzzy_codes(self, keyword):
+        """종목명 또는 원본 코드에 keyword가 포함된 종목코드 (대소문자 무시)"""
+        keyword = keyword.lower()
+        codes = []
+        seen = set()
+        for (name, raw_code), code in self._search_keys:
+            if code not in seen and (keyword in name or keyword in raw_code):
+                seen.add(code)
+                codes.append(code)
+        return codes
+
+    def hot_themes(self, limit=None):
+        """등락률 상위 키움 테마 (theme_name, fluctuation, fluctuation_text, stock_count, rising/falling_count, main_stocks)"""
+        ranked = self._hot_themes if limit is None else self._hot_themes[:limit]
+        return [dict(theme) for theme in ranked]
+
+    def active_themes(self, code, limit=None):
+        """종목이 속한 테마 중 오늘 강세(등락률 active_threshold% 이상)인 테마"""
+        themes = self._active_by_code.get(normalize_code(code), ())
+        return [dict(theme) for theme in (themes if limit is None else themes[:limit])]
+
+    def breadth(self):
+        """테마 시장 폭 통계 (상승/하락/보합 테마 수, 평균/중앙 등락률, 상승/하락 종목 수)"""
+        return dict(self._breadth)
+
+    def get_theme(self, theme_name, source=KIWOOM):
+        """
+        테마 정보 (source, theme_code, theme_name, fluctuation, members)
+        members는 (code, name, price, change) 딕셔너리의 튜플 (네이버 테마는 price/change 없음)
+        """
+        return self._themes.get((source, theme_name))
+
+    def _collect(self, codes):
+        """여러 종목의 소속 테마를 합쳐 원래 순서(키움 → 네이버, 테마 순)로 정렬, 테마당 1개"""
+        best = {}
+        for code in codes:
+            for sort_key, entry in self._by_code.get(code, ()):
+                theme_key = sort_key[:2]
+                if theme_key not in best or sort_key < best[theme_key][0]:
+                    best[theme_key] = (sort_key, entry)
+        return [dict(entry) for _, entry in sorted(best.values(), key=lambda item: item[0])]
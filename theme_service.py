@@ -6,136 +6,275 @@
 
 주요 기능:
 - update_cache(): REST API에서 테마 데이터 가져와 JSON 저장
+  (이전 캐시와 비교해 바뀐 테마만 구성 종목 재조회, 여러 워커로 병렬 조회, 임시 파일 + os.replace로 교체)
 - get_themes(): 캐시된 테마 목록 반환
 - search_theme(keyword): 키워드로 테마 검색
 - is_cache_valid(): 캐시 유효성 확인 (1일 기준)
+- find_themes_by_stock(): 종목이 속한 테마 조회 (메모리 인덱스, ThemeIndex)
+- get_hot_themes() / get_active_themes() / get_theme_breadth(): 캐시 갱신 시 미리 계산한 상위 테마/종목별 강세 테마/시장 폭
+- 두 JSON 캐시는 사람이 확인할 수 있도록 그대로 내보내고, 서비스는 압축 스냅샷(themes_snapshot.bin)을 읽음
 """
 
 import os
 import json
+import threading
+import time
 import requests
+import concurrent.futures
 import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
+import config
 from kis_api import KiwoomApi
+from rate_limiter import RateLimiter
+from theme_index import ThemeIndex
+from theme_snapshot import ThemeSnapshot, write_snapshot
 from logger import Logger
 
 class NaverThemeScraper:
     """
     네이버 금융 테마 페이지에서 테마와 종목 정보를 스크래핑하는 클래스
+    
+    - keep-alive 공유 세션 + 호스트별 요청 빈도 제한 (NAVER_SCRAPE_RATE)
+    - 테마 상세 페이지는 워커 풀로 병렬 조회 (NAVER_SCRAPE_WORKERS)
+    - 진행 상황을 체크포인트 파일에 저장하여 중단된 실행은 끝난 테마부터 이어서 진행
+    - 목록 페이지의 등락률/종목 수가 이전 결과와 같은 테마는 상세 페이지를 다시 조회하지 않음
     """
     
     BASE_URL = "https://finance.naver.com/sise/theme.nhn"
     HEADERS = {'User-Agent': 'Mozilla/5.0'}
+    LIST_PAGES = 7
+    
+    # 호스트별 요청 빈도 (초당 허용량, 버스트)
+    HOST_RATE = getattr(config, 'NAVER_SCRAPE_RATE', (5, 2))
+    WORKERS = getattr(config, 'NAVER_SCRAPE_WORKERS', 4)
+    HTTP_TIMEOUT = 10
+    # 체크포인트 저장 간격 (완료한 테마 수) / 이어서 진행할 수 있는 최대 경과 시간 (초)
+    CHECKPOINT_INTERVAL = 10
+    CHECKPOINT_MAX_AGE = 24 * 3600
+    
+    _session = None
+    _session_lock = threading.Lock()
+    # 네이버 금융 한 호스트만 사용하므로 전역 버킷도 같은 한도
+    _limiter = RateLimiter(
+        global_rate=HOST_RATE[0], global_burst=HOST_RATE[1],
+        default_rate=HOST_RATE[0], default_burst=HOST_RATE[1]
+    )
+    
+    @classmethod
+    def _get_session(cls):
+        """공유 HTTP 세션 (커넥션 풀 크기 = 워커 수, 5xx/연결 오류 재시도)"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+                    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(cls.WORKERS, 2), max_retries=retry)
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.headers.update(cls.HEADERS)
+                    cls._session = session
+        return cls._session
+    
+    @classmethod
+    def _fetch_soup(cls, url):
+        """호스트별 빈도 제한을 지키며 페이지를 가져와 파싱"""
+        cls._limiter.acquire(urlparse(url).netloc)
+        res = cls._get_session().get(url, timeout=cls.HTTP_TIMEOUT)
+        res.raise_for_status()
+        res.encoding = 'cp949'
+        return BeautifulSoup(res.text, 'html.parser')
+    
+    @staticmethod
+    def _parse_theme_rows(soup):
+        """목록 페이지의 테마 행 (이름, 링크, 등락률, 종목 수)"""
+        rows = []
+        # table.type_1 tr 태그 순회 (헤더 제외)
+        for tr in soup.select('table.type_1 tr'):
+            tds = tr.select('td')
+            if len(tds) < 2: continue # 데이터가 없는 행 제외
+            
+            a_tag = tds[0].select_one('a')
+            if not a_tag: continue
+            
+            # 등락률 추출 (2번째 컬럼)
+            # 예: +1.52% -> 1.52
+            fluctuation_text = tds[1].text.strip().replace('%', '')
+            try:
+                fluctuation = float(fluctuation_text)
+            except:
+                fluctuation = 0.0
+            
+            # 종목 수 = 상승 + 보합 + 하락 종목 수 (4~6번째 컬럼)
+            try:
+                member_count = sum(int(td.text.strip().replace(',', '')) for td in tds[3:6])
+            except ValueError:
+                member_count = None
+            
+            rows.append({
+                "name": a_tag.text.strip(),
+                "link": a_tag['href'],
+                "fluctuation": fluctuation,
+                "member_count": member_count if len(tds) >= 6 else None
+            })
+        return rows
     
     @staticmethod
-    def scrape_all_themes():
+    def _parse_stocks(soup):
+        """상세 페이지의 구성 종목 (table.type_5, 거래정지 등 '*' 표시 제거)"""
+        stocks = []
+        for item in soup.select('table.type_5 tr td.name a'):
+            stock_name = item.text.strip()
+            code_match = re.search(r'code=(\d+)', item['href'])
+            if code_match:
+                if stock_name.endswith(" *"): 
+                    stock_name = stock_name[:-2]
+                stocks.append({
+                    "code": code_match.group(1),
+                    "name": stock_name
+                })
+        return stocks
+    
+    @classmethod
+    def scrape_theme_list(cls):
+        """
+        테마 목록(1~7페이지)을 병렬로 가져옴
+        
+        Returns:
+            list: 테마 목록 (페이지 순서, 각 테마는 'name', 'link', 'fluctuation', 'member_count' 포함)
+        """
+        def fetch_page(page):
+            Logger.debug("ThemeScraper", f"Scanning list page {page}/{cls.LIST_PAGES}...")
+            return cls._parse_theme_rows(cls._fetch_soup(f"{cls.BASE_URL}?&page={page}"))
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=cls.WORKERS, thread_name_prefix="naver-list") as executor:
+            pages = list(executor.map(fetch_page, range(1, cls.LIST_PAGES + 1)))
+        
+        themes = []
+        seen = set()
+        for rows in pages:
+            for row in rows:
+                if row['link'] not in seen:
+                    seen.add(row['link'])
+                    themes.append(row)
+        return themes
+    
+    @classmethod
+    def scrape_all_themes(cls, previous_themes=None, checkpoint_file=None, workers=None):
         """
         네이버 금융의 모든 테마(1~7페이지)를 스크래핑하여 반환합니다.
-        주의: 약 250개 이상의 페이지를 방문하므로 시간이 오래 걸립니다 (3~5분).
+        약 250개의 상세 페이지를 워커 풀로 나눠 방문합니다 (호스트별 빈도 제한 적용).
+        
+        Args:
+            previous_themes (list): 이전 결과 (등락률/종목 수가 같은 테마는 상세 페이지 재사용, 조회 실패 시 대체)
+            checkpoint_file (str): 진행 상황 저장 파일 (있으면 중단된 실행을 이어서 진행, 완료 후 삭제)
+            workers (int): 상세 페이지 동시 조회 수 (기본값: NAVER_SCRAPE_WORKERS)
         
         Returns:
-            list: 테마 목록 (각 테마는 'name', 'link', 'stocks' 포함)
+            list: 테마 목록 (각 테마는 'name', 'link', 'fluctuation', 'member_count', 'stocks' 포함)
         """
         Logger.info("ThemeScraper", "Starting FULL scrape of all themes (Pages 1-7)...")
-        all_themes = []
         
         try:
             # 1. 모든 테마 링크 수집 (1~7페이지)
-            theme_links = []
-            for page in range(1, 8):
-                url = f"{NaverThemeScraper.BASE_URL}?&page={page}"
-                Logger.debug("ThemeScraper", f"Scanning list page {page}/7...")
-                
-                res = requests.get(url, headers=NaverThemeScraper.HEADERS)
-                res.encoding = 'cp949'
-                soup = BeautifulSoup(res.text, 'html.parser')
-                
-                # table.type_1 tr 태그 순회 (헤더 제외)
-                for tr in soup.select('table.type_1 tr'):
-                    tds = tr.select('td')
-                    if len(tds) < 2: continue # 데이터가 없는 행 제외
-                    
-                    a_tag = tds[0].select_one('a')
-                    if not a_tag: continue
-                    
-                    theme_name = a_tag.text.strip()
-                    theme_link = a_tag['href']
-                    
-                    # 등락률 추출 (2번째 컬럼)
-                    # 예: +1.52% -> 1.52
-                    fluctuation_text = tds[1].text.strip().replace('%', '')
-                    try:
-                        fluctuation = float(fluctuation_text)
-                    except:
-                        fluctuation = 0.0
-                    
-                    theme_links.append({
-                        "name": theme_name,
-                        "link": theme_link,
-                        "fluctuation": fluctuation
-                    })
-                
-                # 차단 방지 지연
-                import time
-                time.sleep(0.1)
+            theme_links = cls.scrape_theme_list()
+            if not theme_links:
+                Logger.error("ThemeScraper", "No themes found on list pages.")
+                return []
             
-            Logger.info("ThemeScraper", f"Found {len(theme_links)} themes total. Starting detail scrape...")
+            # 2. 체크포인트(중단된 실행에서 끝낸 테마)와 이전 결과로 상세 조회 대상 결정
+            finished = cls._load_checkpoint(checkpoint_file)
+            previous = {theme.get('link'): theme for theme in previous_themes or []}
+            results = {}
+            pending = []
+            resumed = reused = 0
+            for theme in theme_links:
+                link = theme['link']
+                prev = previous.get(link)
+                if link in finished:
+                    results[link] = dict(finished[link], fluctuation=theme['fluctuation'], member_count=theme['member_count'])
+                    resumed += 1
+                elif (prev is not None and prev.get('stocks') and theme['member_count'] is not None
+                      and prev.get('member_count') == theme['member_count'] and prev.get('fluctuation') == theme['fluctuation']):
+                    results[link] = dict(theme, stocks=prev['stocks'])
+                    reused += 1
+                else:
+                    pending.append(theme)
             
-            # 2. 각 테마별 상세 페이지 방문
-            for idx, theme in enumerate(theme_links, 1):
-                theme_name = theme['name']
-                theme_link = theme['link']
-                
-                if idx % 10 == 0:
-                    Logger.info("ThemeScraper", f"Processing theme {idx}/{len(theme_links)}: {theme_name}")
-                
-                detail_url = "https://finance.naver.com" + theme_link
-                
-                try:
-                    res_detail = requests.get(detail_url, headers=NaverThemeScraper.HEADERS)
-                    res_detail.encoding = 'cp949'
-                    soup_detail = BeautifulSoup(res_detail.text, 'html.parser')
-                    
-                    stocks = []
-                    items = soup_detail.select('table.type_5 tr td.name a')
-                    
-                    for item in items:
-                        stock_name = item.text.strip()
-                        code_match = re.search(r'code=(\d+)', item['href'])
-                        if code_match:
-                            stock_code = code_match.group(1)
-                            if stock_name.endswith(" *"): 
-                                stock_name = stock_name[:-2]
-                            
-                            stocks.append({
-                                "code": stock_code,
-                                "name": stock_name
-                            })
-                    
-                    all_themes.append({
-                        "name": theme_name,
-                        "link": theme_link,
-                        "fluctuation": theme.get('fluctuation', 0.0),
-                        "stocks": stocks
-                    })
-                    
-                    # 차단 방지 지연
-                    time.sleep(0.1)
+            Logger.info("ThemeScraper", f"Found {len(theme_links)} themes total: {len(pending)} to scrape, "
+                                        f"{resumed} resumed from checkpoint, {reused} unchanged.")
+            
+            # 3. 각 테마별 상세 페이지 병렬 방문 (완료 순서대로 체크포인트 저장)
+            def fetch_detail(theme):
+                return cls._parse_stocks(cls._fetch_soup("https://finance.naver.com" + theme['link']))
+            
+            failed = 0
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers or cls.WORKERS, thread_name_prefix="naver-theme") as executor:
+                futures = {executor.submit(fetch_detail, theme): theme for theme in pending}
+                for idx, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                    theme = futures[future]
+                    try:
+                        results[theme['link']] = dict(theme, stocks=future.result())
+                    except Exception as e:
+                        failed += 1
+                        Logger.error("ThemeScraper", f"Error scraping detail for {theme['name']}: {e}")
+                        prev = previous.get(theme['link'])
+                        if prev and prev.get('stocks'):
+                            results[theme['link']] = dict(theme, stocks=prev['stocks'])
                     
-                except Exception as e:
-                    Logger.error("ThemeScraper", f"Error scraping detail for {theme_name}: {e}")
-                    continue
+                    if idx % cls.CHECKPOINT_INTERVAL == 0:
+                        Logger.info("ThemeScraper", f"Processing theme {idx}/{len(pending)}: {theme['name']}")
+                        cls._save_checkpoint(checkpoint_file, results)
+            
+            all_themes = [results[theme['link']] for theme in theme_links if theme['link'] in results]
+            cls._remove_checkpoint(checkpoint_file)
             
-            Logger.info("ThemeScraper", f"Full scrape completed. {len(all_themes)} themes processed.")
+            Logger.info("ThemeScraper", f"Full scrape completed. {len(all_themes)} themes processed ({failed} failed).")
             return all_themes
             
         except Exception as e:
             Logger.error("ThemeScraper", f"Error during full scrape: {e}")
             return []
-
+    
+    @classmethod
+    def _load_checkpoint(cls, checkpoint_file):
+        """중단된 실행에서 끝낸 테마 {link: theme} (없거나 오래됐으면 빈 dict)"""
+        if not checkpoint_file or not os.path.exists(checkpoint_file):
+            return {}
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if time.time() - data.get('saved_at', 0) > cls.CHECKPOINT_MAX_AGE:
+                return {}
+            return data.get('themes', {})
+        except Exception as e:
+            Logger.warning("ThemeScraper", f"Ignoring unreadable checkpoint: {e}")
+            return {}
+    
     @staticmethod
-    def get_theme_stocks(target_theme_keyword):
+    def _save_checkpoint(checkpoint_file, results):
+        if not checkpoint_file:
+            return
+        temp_path = checkpoint_file + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': time.time(), 'themes': results}, f, ensure_ascii=False)
+            os.replace(temp_path, checkpoint_file)
+        except Exception as e:
+            Logger.warning("ThemeScraper", f"Failed to save checkpoint: {e}")
+    
+    @staticmethod
+    def _remove_checkpoint(checkpoint_file):
+        if checkpoint_file and os.path.exists(checkpoint_file):
+            try:
+                os.remove(checkpoint_file)
+            except OSError:
+                pass
+
+    @classmethod
+    def get_theme_stocks(cls, target_theme_keyword):
         """
         특정 키워드(예: 방위산업)를 포함하는 테마를 찾아
         해당 테마에 소속된 종목 리스트(코드, 종목명)를 반환합니다.
@@ -154,13 +293,8 @@ class NaverThemeScraper:
             
             # 1. 네이버 금융 테마 리스트 페이지 순회 (1~7페이지)
             # 네이버 금융 테마는 보통 7페이지 정도임
-            for page in range(1, 8):
-                url = f"{NaverThemeScraper.BASE_URL}?&page={page}"
-                # print(f"[NaverThemeScraper] Scanning page {page}...")
-                
-                res = requests.get(url, headers=NaverThemeScraper.HEADERS)
-                res.encoding = 'cp949' 
-                soup = BeautifulSoup(res.text, 'html.parser')
+            for page in range(1, cls.LIST_PAGES + 1):
+                soup = cls._fetch_soup(f"{cls.BASE_URL}?&page={page}")
                 
                 # 2. 테마 목록에서 'target_theme_keyword' 찾기
                 # table.type_1 a 태그 순회
@@ -179,31 +313,8 @@ class NaverThemeScraper:
                 return []
 
             # 3. 상세 테마 페이지 접속 (종목 리스트 확보)
-            detail_url = "https://finance.naver.com" + theme_link
-            res_detail = requests.get(detail_url, headers=NaverThemeScraper.HEADERS)
-            res_detail.encoding = 'cp949'
-            soup_detail = BeautifulSoup(res_detail.text, 'html.parser')
-
-            # 4. 종목 데이터 파싱
-            stock_list = []
-            # 테마 상세 페이지의 테이블 내 종목 링크들 추출
             # 상세 페이지는 table.type_5 를 사용함 (기존 type_1 아님)
-            items = soup_detail.select('table.type_5 tr td.name a')
-            
-            for item in items:
-                stock_name = item.text.strip()
-                # href에서 코드 추출
-                code_match = re.search(r'code=(\d+)', item['href'])
-                if code_match:
-                    stock_code = code_match.group(1)
-                    # *표시(거래정지 등)가 붙은 종목명 처리
-                    if stock_name.endswith(" *"): 
-                        stock_name = stock_name[:-2]
-                    
-                    stock_list.append({
-                        "code": stock_code,
-                        "name": stock_name
-                    })
+            stock_list = cls._parse_stocks(cls._fetch_soup("https://finance.naver.com" + theme_link))
 
             Logger.info("ThemeScraper", f"Found {len(stock_list)} stocks for theme '{theme_full_name}'")
             return stock_list
@@ -215,97 +326,238 @@ class NaverThemeScraper:
 class ThemeService:
     """테마 데이터 캐시 관리 서비스"""
     
-    def __init__(self, cache_file="static/data/themes_cache.json", naver_cache_file="static/data/naver_themes_cache.json"):
+    # 테마 목록(ka90001)에서 이 값들이 이전 캐시와 같으면 구성 종목(ka90002)을 다시 조회하지 않음
+    THEME_SIGNATURE_FIELDS = ('stk_num', 'flu_rt', 'rising_stk_num', 'fall_stk_num', 'main_stk')
+    
+    def __init__(self, cache_file="static/data/themes_cache.json", naver_cache_file="static/data/naver_themes_cache.json", api=None, snapshot_file=None):
         """
         Args:
             cache_file (str): 키움 테마 캐시 파일 경로
             naver_cache_file (str): 네이버 테마 캐시 파일 경로
+            api (KiwoomApi): 공유 KiwoomApi 인스턴스 (없으면 새로 생성)
+            snapshot_file (str): 두 캐시의 바이너리 스냅샷 경로 (기본값: cache_file과 같은 폴더의 themes_snapshot.bin)
         """
         self.cache_file = cache_file
         self.naver_cache_file = naver_cache_file
-        self.api = KiwoomApi()
+        self.snapshot_file = snapshot_file or os.path.join(os.path.dirname(cache_file), "themes_snapshot.bin")
+        self.api = api or KiwoomApi()
+        
+        # 구성 종목 병렬 조회 워커 수 (호출 빈도는 KiwoomApi의 공유 rate limiter가 제한)
+        self.update_workers = max(1, getattr(config, 'THEME_UPDATE_WORKERS', 3))
+        # 캐시 갱신은 한 번에 하나만 (동시에 요청되면 앞의 갱신이 끝난 뒤 변경분만 다시 확인)
+        self._update_lock = threading.Lock()
+        self._naver_update_lock = threading.Lock()
+        self._naver_expired = False
         
         # 캐시 디렉토리 생성
         os.makedirs(os.path.dirname(cache_file), exist_ok=True)
         
-        # 네이버 캐시 로드 (자동 갱신 체크 포함)
-        self.naver_themes = self.load_naver_cache()
+        # 테마 메모리 인덱스 (캐시 파일을 한 번 읽어 구성, 갱신 시 통째로 교체)
+        self._index = ThemeIndex()
+        self._index_lock = threading.Lock()
+        
+        # 캐시 로드 후 인덱스 구성 (네이버 캐시 30일 만료 시 백그라운드 갱신, 그동안은 기존 캐시 사용)
+        self._load_index()
+        self.load_naver_cache()
+        if self._naver_expired:
+            self.refresh_naver_in_background()
+
+    @property
+    def naver_themes(self):
+        """네이버 테마 목록 (읽기 전용)"""
+        return self._get_index().naver_themes
+
+    # ------------------------------------------------------------
+    # 메모리 인덱스
+    # ------------------------------------------------------------
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def _read_cache_file(self, path):
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            Logger.error("ThemeService", f"Error reading cache {path}: {e}")
+            return None
+
+    def _load_index(self):
+        """
+        캐시를 읽어 새 인덱스를 만들고 교체
+        스냅샷이 현재 JSON 파일들로 만든 것이면 스냅샷을, 아니면 JSON을 읽고 스냅샷을 다시 저장
+        (읽기에 실패한 파일은 이전 인덱스의 데이터 유지)
+        """
+        mtimes = (self._mtime(self.cache_file), self._mtime(self.naver_cache_file))
+        previous = self._index
+        
+        kiwoom_data, naver_data = self._read_snapshot(mtimes)
+        if kiwoom_data is None:
+            kiwoom_data = self._read_cache_file(self.cache_file)
+            naver_data = self._read_cache_file(self.naver_cache_file)
+            if kiwoom_data is not None and naver_data is not None and any(mtimes):
+                self._save_snapshot(kiwoom_data, naver_data, mtimes)
+        
+        if kiwoom_data is None:
+            kiwoom_data = {'updated_at': previous.updated_at, 'themes': previous.kiwoom_themes}
+        if naver_data is None:
+            naver_data = {'updated_at': previous.naver_updated_at, 'themes': previous.naver_themes}
+        
+        index = ThemeIndex(
+            kiwoom_data.get('themes', []), naver_data.get('themes', []),
+            updated_at=kiwoom_data.get('updated_at'), naver_updated_at=naver_data.get('updated_at'),
+            source_mtimes=mtimes,
+            active_threshold=getattr(config, 'ACTIVE_THEME_MIN_FLUCTUATION', 1.0)
+        )
+        self._index = index
+        Logger.debug("ThemeService", f"Theme index built: {index.theme_count} Kiwoom / {len(index.naver_themes)} Naver themes, {index.stock_count} stocks")
+        return index
+
+    def _read_snapshot(self, mtimes):
+        """
+        스냅샷의 (키움, 네이버) 캐시 데이터
+        스냅샷이 없거나 손상됐거나 다른 JSON 파일로 만든 것이면 (None, None)
+        """
+        if not os.path.exists(self.snapshot_file):
+            return None, None
+        try:
+            with ThemeSnapshot(self.snapshot_file) as snapshot:
+                if snapshot.source_mtimes != mtimes:
+                    return None, None
+                return snapshot.kiwoom(), snapshot.naver()
+        except Exception as e:
+            Logger.warning("ThemeService", f"Ignoring theme snapshot ({e}), reading JSON cache")
+            return None, None
+
+    def _save_snapshot(self, kiwoom_data, naver_data, mtimes):
+        try:
+            write_snapshot(self.snapshot_file, kiwoom_data, naver_data, source_mtimes=mtimes)
+        except Exception as e:
+            Logger.warning("ThemeService", f"Failed to save theme snapshot: {e}")
+
+    def _get_index(self):
+        """
+        현재 인덱스 (캐시 파일이 다른 프로세스/스크립트에서 갱신됐으면 다시 읽어서 교체)
+        """
+        index = self._index
+        mtimes = (self._mtime(self.cache_file), self._mtime(self.naver_cache_file))
+        if index.source_mtimes == mtimes:
+            return index
+        with self._index_lock:
+            index = self._index
+            if index.source_mtimes != mtimes:
+                index = self._load_index()
+        return index
 
     def load_naver_cache(self):
         """
-        네이버 테마 캐시를 로드합니다.
-        30일이 지났으면 update_naver_cache()를 호출하여 갱신을 시도합니다.
+        네이버 테마 캐시를 반환합니다 (인덱스에 로드된 데이터).
+        30일이 지났으면 만료로 표시하고 (생성자가 백그라운드 갱신 시작) 기존 테마를 그대로 반환합니다.
         """
         if not os.path.exists(self.naver_cache_file):
             Logger.warning("ThemeService", "Naver theme cache not found. Please run 'update_naver_cache.py' to generate it.")
             return []
             
+        index = self._get_index()
         try:
-            with open(self.naver_cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            updated_at_str = data.get('updated_at')
-            if updated_at_str:
-                updated_at = datetime.fromisoformat(updated_at_str)
+            if index.naver_updated_at:
+                updated_at = datetime.fromisoformat(index.naver_updated_at)
                 age = datetime.now() - updated_at
                 
                 # 30일 경과 체크
                 if age > timedelta(days=30):
-                    Logger.info("ThemeService", f"Naver cache expired (Age: {age.days} days). Triggering auto-update...")
-                    # 백그라운드에서 실행하거나 여기서 바로 실행 (시간이 오래 걸리므로 주의)
-                    # 여기서는 사용자가 '자동 갱신'을 원했으므로 바로 실행하지만, 
-                    # 실제 서비스에서는 별도 스레드나 프로세스로 돌리는 것이 좋음.
-                    # 일단은 동기적으로 실행하고 로그를 남김.
-                    if self.update_naver_cache():
-                        # 갱신 성공 시 다시 로드
-                        with open(self.naver_cache_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-            
-            themes = data.get('themes', [])
-            Logger.info("ThemeService", f"Loaded {len(themes)} Naver themes from cache.")
-            return themes
-            
+                    Logger.info("ThemeService", f"Naver cache expired (Age: {age.days} days). Refreshing in background...")
+                    self._naver_expired = True
         except Exception as e:
-            Logger.error("ThemeService", f"Error loading Naver cache: {e}")
-            return []
+            Logger.error("ThemeService", f"Error checking Naver cache age: {e}")
+            
+        Logger.info("ThemeService", f"Loaded {len(index.naver_themes)} Naver themes from cache.")
+        return index.naver_themes
 
     def update_naver_cache(self):
         """
         네이버 테마 전체를 스크래핑하여 캐시 파일로 저장합니다.
-        (수동 실행 또는 30일 만료 시 자동 실행)
+        (수동 실행 또는 30일 만료 시 백그라운드 실행)
+        이전 캐시와 등락률/종목 수가 같은 테마는 재사용하고, 중단되면 다음 실행에서 이어서 진행합니다.
         """
-        try:
-            Logger.info("ThemeService", "Updating Naver theme cache... This may take a few minutes.")
-            themes = NaverThemeScraper.scrape_all_themes()
-            
-            if not themes:
-                Logger.error("ThemeService", "Failed to scrape Naver themes.")
-                return False
+        with self._naver_update_lock:
+            try:
+                Logger.info("ThemeService", "Updating Naver theme cache... This may take a few minutes.")
+                themes = NaverThemeScraper.scrape_all_themes(
+                    previous_themes=self._get_index().naver_themes,
+                    checkpoint_file=self.naver_cache_file + ".checkpoint"
+                )
                 
-            cache_data = {
-                "updated_at": datetime.now().isoformat(),
-                "theme_count": len(themes),
-                "themes": themes
-            }
-            
-            with open(self.naver_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                if not themes:
+                    Logger.error("ThemeService", "Failed to scrape Naver themes.")
+                    return False
+                    
+                cache_data = {
+                    "updated_at": datetime.now().isoformat(),
+                    "theme_count": len(themes),
+                    "themes": themes
+                }
                 
-            Logger.info("ThemeService", f"[OK] Naver theme cache updated: {len(themes)} themes.")
-            return True
-            
-        except Exception as e:
-            Logger.error("ThemeService", f"Error updating Naver cache: {e}")
+                self._write_cache_file(self.naver_cache_file, cache_data)
+                self._naver_expired = False
+                
+                # 새 데이터로 인덱스 교체
+                with self._index_lock:
+                    self._load_index()
+                    
+                Logger.info("ThemeService", f"[OK] Naver theme cache updated: {len(themes)} themes.")
+                return True
+                
+            except Exception as e:
+                Logger.error("ThemeService", f"Error updating Naver cache: {e}")
+                return False
+
+    def refresh_naver_in_background(self):
+        """
+        네이버 테마 캐시 갱신을 백그라운드 스레드에서 시작 (이미 진행 중이면 무시)
+        
+        Returns:
+            bool: 새로 시작했으면 True
+        """
+        if self._naver_update_lock.locked():
             return False
+        threading.Thread(target=self.update_naver_cache, name="naver-theme-update", daemon=True).start()
+        return True
 
-    def update_cache(self):
+    def update_cache(self, full_refresh=False):
         """
         REST API에서 테마 데이터 가져와 JSON 파일로 저장
         각 테마의 종목 정보도 함께 저장하여 빠른 검색 지원
         
+        Args:
+            full_refresh (bool): True면 바뀌지 않은 테마도 구성 종목을 모두 다시 조회
+        
         Returns:
             bool: 성공 여부
         """
+        with self._update_lock:
+            return self._update_cache(full_refresh)
+
+    def refresh_in_background(self, full_refresh=False):
+        """
+        캐시 갱신을 백그라운드 스레드에서 시작 (이미 진행 중이면 무시)
+        갱신이 끝날 때까지는 기존 캐시로 응답
+        
+        Returns:
+            bool: 새로 시작했으면 True
+        """
+        if self._update_lock.locked():
+            return False
+        threading.Thread(target=self.update_cache, kwargs={'full_refresh': full_refresh},
+                         name="theme-update", daemon=True).start()
+        return True
+
+    def _update_cache(self, full_refresh):
         try:
             Logger.info("ThemeService", "Updating theme cache from REST API...")
             
@@ -321,24 +573,22 @@ class ThemeService:
                 Logger.warning("ThemeService", "No themes retrieved")
                 return False
             
-            Logger.info("ThemeService", f"Retrieved {len(themes)} themes. Fetching stocks for each theme...")
-            
-            # 2단계: 각 테마의 종목 정보 조회
-            for idx, theme in enumerate(themes, 1):
-                theme_code = theme.get('thema_grp_cd')
-                theme_name = theme.get('thema_nm', 'Unknown')
-                
-                # 진행 상황 표시 (매 10개마다)
-                if idx % 10 == 0:
-                    Logger.info("ThemeService", f"Progress: {idx}/{len(themes)} themes processed...")
-                
-                # 테마의 종목 목록 조회
-                stocks = self.api.get_theme_stocks(theme_code)
-                
-                if stocks:
-                    theme['stocks'] = stocks  # 종목 정보를 테마에 추가
+            # 2단계: 이전 캐시와 비교 (종목 수/등락률/대표 종목이 같으면 구성 종목 재사용)
+            # (전체 갱신이어도 이전 캐시는 조회 실패 시 대체용으로 사용)
+            previous = {theme.get('thema_grp_cd'): theme for theme in self._get_index().kiwoom_themes}
+            changed = []
+            for theme in themes:
+                prev = previous.get(theme.get('thema_grp_cd'))
+                if not full_refresh and prev is not None and self._theme_signature(prev) == self._theme_signature(theme) and self._has_stocks(prev):
+                    theme['stocks'] = prev['stocks']
                 else:
-                    theme['stocks'] = []  # 비어있으면 빈 리스트
+                    changed.append(theme)
+            
+            Logger.info("ThemeService", f"Retrieved {len(themes)} themes: {len(changed)} changed, "
+                                        f"{len(themes) - len(changed)} unchanged. Fetching stocks for changed themes...")
+            
+            # 3단계: 바뀐 테마의 종목 정보 병렬 조회
+            failed = self._fetch_theme_stocks(changed, previous)
             
             # 캐시 데이터 구성
             cache_data = {
@@ -347,16 +597,70 @@ class ThemeService:
                 "themes": themes
             }
             
-            # JSON 파일로 저장
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # JSON 파일로 저장 (읽는 쪽은 항상 완전한 파일만 봄)
+            self._write_cache_file(self.cache_file, cache_data)
             
-            Logger.info("ThemeService", f"[OK] Cache updated successfully: {len(themes)} themes with stock info")
+            # 새 데이터로 인덱스 교체
+            with self._index_lock:
+                self._load_index()
+            
+            Logger.info("ThemeService", f"[OK] Cache updated successfully: {len(themes)} themes with stock info "
+                                        f"({len(changed)} re-fetched, {failed} failed)")
             return True
             
         except Exception as e:
             Logger.error("ThemeService", f"Error updating cache: {e}")
             return False
+
+    def _fetch_theme_stocks(self, themes, previous):
+        """
+        테마별 구성 종목을 워커 풀로 조회하여 theme['stocks']에 채움
+        조회에 실패한 테마는 이전 캐시의 종목을 유지 (없으면 빈 리스트)
+        
+        Returns:
+            int: 조회에 실패한 테마 수
+        """
+        def fetch(theme):
+            try:
+                return self.api.get_theme_stocks(theme.get('thema_grp_cd'))
+            except Exception as e:
+                Logger.error("ThemeService", f"Error fetching stocks for theme {theme.get('thema_nm')}: {e}")
+                return None
+        
+        failed = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.update_workers, thread_name_prefix="theme-stocks") as executor:
+            for idx, (theme, stocks) in enumerate(zip(themes, executor.map(fetch, themes)), 1):
+                # 진행 상황 표시 (매 10개마다)
+                if idx % 10 == 0:
+                    Logger.info("ThemeService", f"Progress: {idx}/{len(themes)} themes processed...")
+                
+                if stocks is None:
+                    failed += 1
+                    prev = previous.get(theme.get('thema_grp_cd'))
+                    stocks = prev.get('stocks', []) if prev else []
+                theme['stocks'] = stocks or []
+        return failed
+
+    @classmethod
+    def _theme_signature(cls, theme):
+        return tuple(theme.get(field) for field in cls.THEME_SIGNATURE_FIELDS)
+
+    @staticmethod
+    def _has_stocks(theme):
+        """구성 종목을 이미 조회한 테마인지 (종목 수가 0인 테마는 빈 목록도 정상)"""
+        return 'stocks' in theme and (bool(theme['stocks']) or str(theme.get('stk_num', '')).strip() in ('0', ''))
+
+    @staticmethod
+    def _write_cache_file(path, data):
+        """임시 파일에 쓴 뒤 os.replace로 교체 (다른 스레드/프로세스가 쓰는 도중의 파일을 읽지 않도록)"""
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
     
     def get_themes(self, force_refresh=False):
         """
@@ -373,18 +677,24 @@ class ThemeService:
             Logger.info("ThemeService", "Cache not found or force refresh requested")
             self.update_cache()
         
-        # 캐시 유효성 확인 (1일 경과 시 갱신)
+        # 캐시 유효성 확인 (1일 경과 시 백그라운드 갱신, 그동안은 기존 캐시로 응답)
         elif not self.is_cache_valid():
-            Logger.info("ThemeService", "Cache expired, refreshing...")
-            self.update_cache()
+            if self.refresh_in_background():
+                Logger.info("ThemeService", "Cache expired, refreshing in background...")
         
-        # 캐시 데이터 로드
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            Logger.error("ThemeService", f"Error reading cache: {e}")
-            return {"updated_at": None, "theme_count": 0, "themes": []}
+        # 메모리 인덱스의 데이터 반환 (themes 목록은 공유되므로 수정하지 말 것)
+        index = self._get_index()
+        return {"updated_at": index.updated_at, "theme_count": index.theme_count, "themes": index.kiwoom_themes}
+    
+    def get_cached_themes(self):
+        """
+        캐시 파일의 테마 목록 반환 (만료 여부와 관계없이 갱신하지 않음)
+        배치 작업처럼 API 호출 없이 현재 캐시만 필요한 경우에 사용
+
+        Returns:
+            list: 테마 목록 (캐시가 없으면 빈 리스트, 공유 목록이므로 수정하지 말 것)
+        """
+        return self._get_index().kiwoom_themes
     
     def search_theme(self, keyword):
         """
@@ -424,10 +734,7 @@ class ThemeService:
             return False
         
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            updated_at = datetime.fromisoformat(data.get('updated_at', ''))
+            updated_at = datetime.fromisoformat(self._get_index().updated_at or '')
             age = datetime.now() - updated_at
             
             return age < timedelta(hours=max_age_hours)
@@ -452,13 +759,12 @@ class ThemeService:
             }
         
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            index = self._get_index()
             
             return {
                 "exists": True,
-                "updated_at": data.get('updated_at'),
-                "theme_count": data.get('theme_count', 0),
+                "updated_at": index.updated_at,
+                "theme_count": index.theme_count,
                 "is_valid": self.is_cache_valid()
             }
         except Exception as e:
@@ -473,8 +779,9 @@ class ThemeService:
     
     def find_themes_by_stock(self, stock_name_or_code):
         """
-        주식 이름 또는 코드로 해당 주식이 속한 테마 찾기 (캐시된 데이터 사용)
+        주식 이름 또는 코드로 해당 주식이 속한 테마 찾기 (메모리 인덱스 사용)
         키움 테마와 네이버 테마를 모두 검색합니다.
+        코드/종목명이 정확히 일치하면 인덱스 조회, 아니면 종목명/코드 부분 문자열 검색
         
         Args:
             stock_name_or_code (str): 주식 이름 또는 코드
@@ -482,71 +789,46 @@ class ThemeService:
         Returns:
             list: 해당 주식이 속한 테마 목록과 종목 정보
         """
-        Logger.debug("ThemeSearch", f"Searching themes for stock: '{stock_name_or_code}'")
-        matched_themes = []
-        search_keyword = stock_name_or_code.lower()
-        
-        # 1. 키움 테마 검색
-        themes_data = self.get_themes()
-        kiwoom_themes = themes_data.get('themes', [])
-        
-        Logger.debug("ThemeSearch", f"Searching in {len(kiwoom_themes)} Kiwoom themes...")
-        for theme in kiwoom_themes:
-            theme_code = theme.get('thema_grp_cd')
-            theme_name = theme.get('thema_nm', 'Unknown')
-            stocks = theme.get('stocks', [])
-            
-            for stock in stocks:
-                stock_name = stock.get('stk_nm', '').lower()
-                stock_code = stock.get('stk_cd', '').lower()
-                
-                if search_keyword in stock_name or search_keyword in stock_code:
-                    Logger.debug("ThemeSearch", f"  [Kiwoom MATCH]: '{stock.get('stk_nm')}' found in '{theme_name}'")
-                    matched_themes.append({
-                        'source': 'Kiwoom',
-                        'theme_code': theme_code,
-                        'theme_name': theme_name,
-                        'theme_fluctuation': theme.get('flu_rt'),
-                        'stock_name': stock.get('stk_nm'),
-                        'stock_code': stock.get('stk_cd'),
-                        'stock_price': stock.get('cur_prc'),
-                        'stock_change': stock.get('flu_rt')
-                    })
-                    break
-
-        # 2. 네이버 테마 검색
-        Logger.debug("ThemeSearch", f"Searching in {len(self.naver_themes)} Naver themes...")
-        for theme in self.naver_themes:
-            theme_name = theme.get('name', 'Unknown')
-            theme_link = theme.get('link')
-            stocks = theme.get('stocks', [])
-            
-            for stock in stocks:
-                stock_name = stock.get('name', '').lower()
-                stock_code = stock.get('code', '').lower()
-                
-                if search_keyword in stock_name or search_keyword in stock_code:
-                    Logger.debug("ThemeSearch", f"  [Naver MATCH]: '{stock.get('name')}' found in '{theme_name}'")
-                    matched_themes.append({
-                        'source': 'Naver',
-                        'theme_code': None, # 네이버는 코드가 없음 (링크로 대체 가능)
-                        'theme_name': theme_name,
-                        'theme_fluctuation': theme.get('fluctuation', 0.0),
-                        'theme_link': theme_link,
-                        'stock_name': stock.get('name'),
-                        'stock_code': stock.get('code'),
-                        # 네이버 스크래핑 데이터에는 현재가/등락률이 없을 수 있음 (상세 페이지 파싱 시 추가 가능하지만 현재는 없음)
-                        'stock_price': None,
-                        'stock_change': None
-                    })
-                    break
+        matched_themes = self._get_index().find(stock_name_or_code)
         
         # 최종 결과 요약 로그
         if matched_themes:
             theme_names = [f"{t['theme_name']}({t['source']})" for t in matched_themes]
             Logger.info("ThemeSearch", f"[RESULT] 주식 '{stock_name_or_code}' 매칭 결과: {', '.join(theme_names)}")
-            Logger.debug("ThemeSearch", f"  -> 총 {len(matched_themes)}개 테마 발견 (검색 시간: 즉시)")
         else:
             Logger.info("ThemeSearch", f"[X] 주식 '{stock_name_or_code}'와 매칭되는 테마를 찾지 못했습니다.")
         
         return matched_themes
+
+    def get_hot_themes(self, limit=10):
+        """
+        등락률 상위 키움 테마 (캐시 갱신 시 미리 정렬)
+        
+        Returns:
+            list: [{'theme_code', 'theme_name', 'fluctuation', 'fluctuation_text', 'stock_count',
+                    'rising_count', 'falling_count', 'main_stocks'}, ...]
+        """
+        return self._get_index().hot_themes(limit)
+
+    def get_market_themes_string(self, limit=3):
+        """등락률 상위 테마 문자열 (AI 프롬프트용, 예: '원자력(+1.91%), 반도체(+1.20%)')"""
+        top_themes = [f"{t['theme_name']}({t['fluctuation_text']}%)" for t in self._get_index().hot_themes(limit)]
+        return ", ".join(top_themes) if top_themes else "정보 없음"
+
+    def get_active_themes(self, stock_name_or_code, limit=3):
+        """
+        종목이 속한 테마 중 오늘 강세 테마 (테마 등락률 ACTIVE_THEME_MIN_FLUCTUATION% 이상, 기본 1.0%)
+        
+        Returns:
+            list: [{'theme_name', 'source', 'fluctuation'}, ...]
+        """
+        index = self._get_index()
+        codes = index.codes_for_name(stock_name_or_code) or [stock_name_or_code]
+        active = []
+        for code in codes:
+            active.extend(index.active_themes(code))
+        return active[:limit] if limit is not None else active
+
+    def get_theme_breadth(self):
+        """테마 시장 폭 (상승/하락/보합 테마 수, 평균/중앙 등락률, 상승/하락 종목 수)"""
+        return self._get_index().breadth()
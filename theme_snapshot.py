@@ -0,0 +1,282 @@
+"""
+테마 캐시 바이너리 스냅샷
+================================================================
+themes_cache.json(약 280KB)과 naver_themes_cache.json(약 590KB)은 사람이 보기 좋게
+indent=2로 저장되어 ThemeService를 만들 때마다 두 파일 전체를 파싱합니다.
+이 모듈은 두 캐시를 하나의 압축된 스냅샷 파일(themes_snapshot.bin)로 저장합니다.
+JSON 파일은 사람이 확인할 수 있도록 그대로 내보내고, 서비스는 스냅샷을 읽습니다.
+
+파일 구조 (리틀 엔디언)
+  magic(8) | 헤더 길이(uint32) | 헤더(JSON) | 본문(4바이트 정렬 섹션들)
+  - 헤더: 버전, 출처별 갱신 시각/테마 수/필드 이름, 원본 JSON 파일 수정 시각, 섹션 위치
+    → 본문을 파싱하지 않고 메타데이터만 읽을 수 있음 (read_header)
+  - values: 모든 값(종목명, 코드, 가격, 등락률 문자열 등)을 한 번씩만 저장한 compact JSON 배열
+  - 출처(kiwoom/naver)별 int32 배열
+    - stocks: 종목 행 (필드별 값 id, 없으면 -1) - 같은 종목 정보는 정수 종목 id 하나로 공유
+    - themes: 테마 행 (stocks 제외 필드별 값 id)
+    - member_offsets / members: 테마별 구성 종목 id 목록
+  - 본문은 mmap으로 열어 섹션 단위로 필요할 때 디코딩 (ThemeSnapshot.kiwoom() / naver())
+================================================================
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+MAGIC = b"THSNAP1\n"
+VERSION = 1
+SOURCES = ('kiwoom', 'naver')
+MISSING = -1
+
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일 형식 오류 (호출자는 JSON 캐시로 대체)"""
+
+
+def read_header(path):
+    """
+    본문을 읽지 않고 헤더(메타데이터)만 반환
+
+    Returns:
+        dict: {'version', 'source_mtimes', 'kiwoom': {'updated_at', 'theme_count', ...}, 'naver': {...}, 'sections'}
+    """
+    with open(path, 'rb') as f:
+        header, _ = _read_header(f)
+    return header
+
+
+def _read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise SnapshotError("not a theme snapshot")
+    raw_length = f.read(_HEADER_LENGTH.size)
+    if len(raw_length) != _HEADER_LENGTH.size:
+        raise SnapshotError("truncated header")
+    (length,) = _HEADER_LENGTH.unpack(raw_length)
+    header = json.loads(f.read(length).decode('utf-8'))
+    if header.get('version') != VERSION:
+        raise SnapshotError(f"unsupported snapshot version: {header.get('version')}")
+    return header, len(MAGIC) + _HEADER_LENGTH.size + length
+
+
+class ThemeSnapshot:
+    """
+    스냅샷 파일 (mmap, 출처별 지연 디코딩)
+
+    Example:
+        with ThemeSnapshot(path) as snapshot:
+            kiwoom = snapshot.kiwoom()   # {'updated_at', 'theme_count', 'themes'}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.header, self._body_start = _read_header(self._file)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._values = None
+        self._decoded = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    @property
+    def source_mtimes(self):
+        mtimes = self.header.get('source_mtimes')
+        return tuple(mtimes) if mtimes is not None else None
+
+    def kiwoom(self):
+        """키움 캐시 데이터 (themes_cache.json과 같은 형식)"""
+        return self._decode('kiwoom')
+
+    def naver(self):
+        """네이버 캐시 데이터 (naver_themes_cache.json과 같은 형식)"""
+        return self._decode('naver')
+
+    # ------------------------------------------------------------
+    # 디코딩
+    # ------------------------------------------------------------
+    def _section(self, name):
+        offset, length = self.header['sections'][name]
+        start = self._body_start + offset
+        if start + length > len(self._mmap):
+            raise SnapshotError(f"truncated section: {name}")
+        return memoryview(self._mmap)[start:start + length]
+
+    def _ints(self, name):
+        view = self._section(name)
+        try:
+            values = array('i')
+            values.frombytes(view)
+        finally:
+            view.release()
+        if self.header.get('byteorder') != sys.byteorder:
+            values.byteswap()
+        return values.tolist()
+
+    def _decode(self, source):
+        with self._lock:
+            if source in self._decoded:
+                return self._decoded[source]
+            if self._mmap is None:
+                raise SnapshotError("snapshot is closed")
+
+            if self._values is None:
+                view = self._section('values')
+                try:
+                    self._values = json.loads(bytes(view).decode('utf-8'))
+                finally:
+                    view.release()
+            values = self._values
+            meta = self.header[source]
+
+            stock_fields = meta['stock_fields']
+            stock_rows = self._ints(f'{source}.stocks')
+            width = len(stock_fields)
+            stocks = [
+                {field: values[value_id] for field, value_id in zip(stock_fields, stock_rows[i:i + width]) if value_id != MISSING}
+                for i in range(0, len(stock_rows), width)
+            ] if width else []
+
+            theme_fields = meta['theme_fields']
+            theme_rows = self._ints(f'{source}.themes')
+            offsets = self._ints(f'{source}.member_offsets')
+            members = self._ints(f'{source}.members')
+            width = len(theme_fields)
+            themes = []
+            for idx in range(meta['theme_count']):
+                row = theme_rows[idx * width:(idx + 1) * width]
+                theme = {field: values[value_id] for field, value_id in zip(theme_fields, row) if value_id != MISSING}
+                # 같은 종목 id는 같은 dict를 공유 (읽기 전용으로 사용)
+                theme['stocks'] = [stocks[stock_id] for stock_id in members[offsets[idx]:offsets[idx + 1]]]
+                themes.append(theme)
+
+            data = {'updated_at': meta.get('updated_at'), 'theme_count': len(themes), 'themes': themes}
+            self._decoded[source] = data
+            return data
+
+
+# ------------------------------------------------------------
+# 인코딩
+# ------------------------------------------------------------
+class _Encoder:
+    def __init__(self):
+        self.values = []
+        self._value_ids = {}
+        self.sections = []  # (이름, bytes)
+
+    def value_id(self, value):
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False)  # 중첩 값은 문자열로 보관 (테마 캐시에는 없음)
+        key = (type(value), value)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            value_id = self._value_ids[key] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def add_ints(self, name, ints):
+        self.sections.append((name, array('i', ints).tobytes()))
+
+    def encode_source(self, source, data):
+        themes = (data or {}).get('themes', [])
+        theme_fields = _field_order(theme for theme in themes)
+        theme_fields = [field for field in theme_fields if field != 'stocks']
+        stock_fields = _field_order(stock for theme in themes for stock in theme.get('stocks', []))
+
+        stock_ids = {}
+        stock_rows = []
+        theme_rows = []
+        offsets = [0]
+        members = []
+        for theme in themes:
+            theme_rows.extend(self.value_id(theme[field]) if field in theme else MISSING for field in theme_fields)
+            for stock in theme.get('stocks', []):
+                row = tuple(self.value_id(stock[field]) if field in stock else MISSING for field in stock_fields)
+                stock_id = stock_ids.get(row)
+                if stock_id is None:
+                    stock_id = stock_ids[row] = len(stock_ids)
+                    stock_rows.extend(row)
+                members.append(stock_id)
+            offsets.append(len(members))
+
+        self.add_ints(f'{source}.stocks', stock_rows)
+        self.add_ints(f'{source}.themes', theme_rows)
+        self.add_ints(f'{source}.member_offsets', offsets)
+        self.add_ints(f'{source}.members', members)
+        return {
+            'updated_at': (data or {}).get('updated_at'),
+            'theme_count': len(themes),
+            'stock_count': len(stock_ids),
+            'theme_fields': theme_fields,
+            'stock_fields': stock_fields
+        }
+
+
+def _field_order(rows):
+    """처음 나온 순서대로 필드 이름 (모든 행의 합집합)"""
+    fields = {}
+    for row in rows:
+        for field in row:
+            fields.setdefault(field, None)
+    return list(fields)
+
+
+def write_snapshot(path, kiwoom_data, naver_data, source_mtimes=None):
+    """
+    키움/네이버 캐시 데이터를 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 os.replace로 교체)
+
+    Args:
+        kiwoom_data: {'updated_at', 'theme_count', 'themes'} (themes_cache.json 형식)
+        naver_data: {'updated_at', 'theme_count', 'themes'} (naver_themes_cache.json 형식)
+        source_mtimes: 스냅샷을 만든 JSON 파일들의 수정 시각 (JSON이 따로 바뀌었는지 확인용)
+    """
+    encoder = _Encoder()
+    header = {
+        'version': VERSION,
+        'byteorder': sys.byteorder,
+        'source_mtimes': list(source_mtimes) if source_mtimes is not None else None,
+        'kiwoom': encoder.encode_source('kiwoom', kiwoom_data),
+        'naver': encoder.encode_source('naver', naver_data),
+    }
+    values = json.dumps(encoder.values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    sections = [('values', values)] + encoder.sections
+
+    body = bytearray()
+    header['sections'] = {}
+    for name, data in sections:
+        header['sections'][name] = [len(body), len(data)]
+        body += data
+        body += b'\0' * (-len(body) % 4)
+
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (-(len(MAGIC) + _HEADER_LENGTH.size + len(header_bytes)) % 4)
+
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            f.write(body)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
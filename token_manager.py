@@ -0,0 +1,236 @@
+"""
+키움 접근토큰 관리자
+================================================================
+프로세스 전체에서 하나의 접근토큰을 공유하기 위한 토큰 저장소입니다.
+
+- 자격증명(BASE_URL + APP_KEY)별로 하나의 TokenManager 인스턴스만 생성
+- expires_dt를 파싱하여 만료 전 백그라운드에서 미리 갱신
+- Single-flight 갱신: 동시에 여러 스레드가 갱신을 요청해도 실제 발급 요청은 1회,
+  나머지 스레드는 그 결과를 기다렸다가 공유
+- 디스크(cache/kiwoom_token.json)에 저장하여 서버 재시작 시 유효한 토큰 재사용
+================================================================
+"""
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+
+import config
+from logger import Logger
+
+
+class TokenManager:
+    """자격증명별 접근토큰 저장소 (프로세스 전역 공유)"""
+
+    # 만료 몇 초 전에 미리 갱신할지 (기본 10분)
+    REFRESH_MARGIN = getattr(config, 'KIWOOM_TOKEN_REFRESH_MARGIN', 600)
+    # 만료 시각을 알 수 없을 때 가정하는 유효 시간 (초)
+    DEFAULT_LIFETIME = 6 * 3600
+    # 다른 스레드의 갱신 결과를 기다리는 최대 시간 (초)
+    REFRESH_WAIT_TIMEOUT = 30
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_credentials(cls, base_url, app_key, issue_fn):
+        """
+        자격증명에 해당하는 공유 TokenManager 반환 (없으면 생성)
+
+        Args:
+            base_url: API 도메인
+            app_key: 앱 키
+            issue_fn: 토큰 발급 함수. 성공 시 (token, expires) 튜플, 실패 시 None 반환
+        """
+        key_id = hashlib.sha256(f"{base_url}|{app_key}".encode('utf-8')).hexdigest()[:16]
+        with cls._instances_lock:
+            manager = cls._instances.get(key_id)
+            if manager is None:
+                manager = cls(key_id, issue_fn)
+                cls._instances[key_id] = manager
+            return manager
+
+    def __init__(self, key_id, issue_fn, cache_file=None):
+        self.key_id = key_id
+        self._issue_fn = issue_fn
+        self.cache_file = cache_file or os.path.join(os.path.dirname(__file__), 'cache', 'kiwoom_token.json')
+
+        self._token = None
+        self._expires_dt = None  # 원본 만료 문자열 (표시용)
+        self._expires_at = 0.0  # 만료 시각 (epoch seconds)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._refreshing = False
+        self._timer = None
+
+        self._load_from_disk()
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    @property
+    def expires_dt(self):
+        return self._expires_dt
+
+    def peek(self):
+        """네트워크 요청 없이 현재 유효한 토큰 반환 (없으면 None)"""
+        with self._cond:
+            return self._token if self._is_valid() else None
+
+    def get_token(self):
+        """유효한 토큰 반환. 없거나 만료되었으면 갱신 후 반환 (실패 시 None)"""
+        token = self.peek()
+        if token:
+            return token
+        return self.refresh()
+
+    def _is_valid(self):
+        return bool(self._token) and time.time() < self._expires_at
+
+    # ------------------------------------------------------------
+    # 갱신 (Single-flight)
+    # ------------------------------------------------------------
+    def refresh(self, stale_token=None):
+        """
+        토큰 갱신 (동시 호출 시 1회만 발급)
+
+        Args:
+            stale_token: 호출자가 거부당한 토큰. 이미 다른 스레드가 새 토큰으로
+                         교체했다면 발급 요청 없이 새 토큰을 반환합니다.
+
+        Returns:
+            str: 새 토큰 (실패 시 None)
+        """
+        with self._cond:
+            if stale_token and self._token and self._token != stale_token and self._is_valid():
+                return self._token
+
+            if self._refreshing:
+                # 다른 스레드가 발급 중 → 결과 대기
+                deadline = time.time() + self.REFRESH_WAIT_TIMEOUT
+                while self._refreshing and time.time() < deadline:
+                    self._cond.wait(timeout=max(0.0, deadline - time.time()))
+                return self._token if self._is_valid() else None
+
+            self._refreshing = True
+
+        result = None
+        try:
+            result = self._issue_fn()
+        except Exception as e:
+            Logger.error("Auth", f"Token issue failed: {e}")
+        finally:
+            with self._cond:
+                if result:
+                    token, expires = result
+                    self._token = token
+                    self._expires_dt = expires
+                    self._expires_at = self._parse_expiry(expires)
+                self._refreshing = False
+                self._cond.notify_all()
+
+        if not result:
+            return None
+
+        self._save_to_disk()
+        self._schedule_background_refresh()
+        return self._token
+
+    def invalidate(self):
+        """현재 토큰 폐기 (다음 get_token 호출 시 재발급)"""
+        with self._cond:
+            self._token = None
+            self._expires_at = 0.0
+
+    def _schedule_background_refresh(self):
+        """만료 REFRESH_MARGIN초 전에 백그라운드 갱신 예약"""
+        delay = self._expires_at - self.REFRESH_MARGIN - time.time()
+        if delay <= 0:
+            return
+
+        if self._timer:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+        Logger.debug("Auth", f"Background token refresh scheduled in {delay / 60:.0f} min")
+
+    def _background_refresh(self):
+        Logger.info("Auth", "Refreshing token before expiry...")
+        if not self.refresh():
+            Logger.warning("Auth", "Background token refresh failed. Will retry on next request.")
+
+    @classmethod
+    def _parse_expiry(cls, expires):
+        """
+        만료 정보를 epoch seconds로 변환
+        - 키움 expires_dt: 'YYYYMMDDHHMMSS'
+        - expires_in: 남은 초 (숫자)
+        """
+        now = time.time()
+        if expires is None:
+            return now + cls.DEFAULT_LIFETIME
+
+        text = str(expires).strip()
+        if len(text) == 14 and text.isdigit():
+            try:
+                return datetime.datetime.strptime(text, "%Y%m%d%H%M%S").timestamp()
+            except ValueError:
+                pass
+        try:
+            seconds = float(text)
+            if 0 < seconds < 10 * 24 * 3600:
+                return now + seconds
+        except ValueError:
+            pass
+
+        Logger.warning("Auth", f"Unknown token expiry format: {expires}. Assuming {cls.DEFAULT_LIFETIME // 3600}h lifetime.")
+        return now + cls.DEFAULT_LIFETIME
+
+    # ------------------------------------------------------------
+    # 디스크 저장/복원
+    # ------------------------------------------------------------
+    def _load_from_disk(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key_id') != self.key_id:
+                return  # 다른 자격증명으로 발급된 토큰
+
+            expires_at = float(data.get('expires_at', 0))
+            if time.time() < expires_at - self.REFRESH_MARGIN:
+                self._token = data.get('token')
+                self._expires_dt = data.get('expires_dt')
+                self._expires_at = expires_at
+                Logger.info("Auth", f"Reusing persisted token. Expires: {self._expires_dt}")
+                self._schedule_background_refresh()
+        except Exception as e:
+            Logger.warning("Auth", f"Failed to load persisted token: {e}")
+
+    def _save_to_disk(self):
+        with self._cond:
+            data = {
+                'key_id': self.key_id,
+                'token': self._token,
+                'expires_dt': self._expires_dt,
+                'expires_at': self._expires_at
+            }
+        temp_path = self.cache_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            # 토큰은 민감 정보이므로 소유자만 읽을 수 있게 생성
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.cache_file)
+        except Exception as e:
+            Logger.warning("Auth", f"Failed to persist token: {e}")
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
@@ -3,7 +3,7 @@ from theme_service import ThemeService
 def main():
     print("=== Naver Theme Cache Manual Update ===")
     print("This script will scrape ALL themes from Naver Finance.")
-    print("It may take 3-5 minutes. Please wait...")
+    print("Unchanged themes are reused and an interrupted run resumes where it stopped. Please wait...")
     
     service = ThemeService()
     success = service.update_naver_cache()